@@ -0,0 +1,55 @@
+"""Add sync_checkpoints and projects.sync_cancel_requested.
+
+A sync used to commit the whole corpus in one transaction at the very end. A redeploy
+part-way through rolled every written document back, ``reset_stuck_syncing`` turned the
+project into an "error", and the next run started from zero: the tarball again, every
+file parsed again.
+
+``sync_checkpoints`` holds one row per in-flight sync - the manifest it is working from
+and the paths whose documents are already committed - so an interrupted sync resumes
+where it stopped. The row is deleted in the commit that finishes the sync.
+
+``projects.sync_cancel_requested`` is the flag ``DELETE /projects/{slug}/sync`` raises.
+The engine checks it at each checkpoint and stops at the batch boundary. A column rather
+than process memory, so the request is honoured by whichever process owns the sync.
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "015"
+down_revision: str | None = "014"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sync_checkpoints",
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("state", sa.String(20), nullable=False, server_default="running"),
+        sa.Column("manifest", sa.Text(), nullable=False, server_default="{}"),
+        sa.Column("processed_paths", sa.Text(), nullable=False, server_default="[]"),
+        sa.Column("fetch_path", sa.String(20), nullable=True),
+        sa.Column("started_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("project_id"),
+    )
+    op.add_column(
+        "projects",
+        sa.Column(
+            "sync_cancel_requested", sa.Boolean(), nullable=False, server_default=sa.false()
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("projects", "sync_cancel_requested")
+    op.drop_table("sync_checkpoints")
@@ -0,0 +1,48 @@
+"""Add leases and cache_generations for multi-worker deployments.
+
+Running uvicorn with several workers starts the app's lifespan once per worker, so
+every worker used to start its own freshness poller - four workers, four pollers, four
+times the GitHub traffic - and its own startup housekeeping.
+
+``leases`` backs a lease-based leader election: one worker holds the ``poller`` lease
+and renews it; if it dies, the lease expires and another worker takes it over.
+
+``cache_generations`` is the invalidation channel between workers: a counter per scope,
+bumped in the transaction that changes the data, and watched by every worker so its
+in-memory caches never outlive the rows they were built from.
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "016"
+down_revision: str | None = "015"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "leases",
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("holder", sa.String(255), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.create_table(
+        "cache_generations",
+        sa.Column("scope", sa.String(100), nullable=False),
+        sa.Column("generation", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("scope"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("cache_generations")
+    op.drop_table("leases")
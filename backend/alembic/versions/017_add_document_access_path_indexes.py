@@ -0,0 +1,54 @@
+"""Add composite indexes for the hot document queries.
+
+The documents table had the unique (project_id, file_path) index and single-column
+indexes on epic, story and ref_id. None of them helps the queries the dashboard runs on
+every page view, so those queries paid for what an index should do:
+
+* ``list_documents`` filters on project_id (and optionally doc_type / status), then
+  sorts on synced_at, title, status or type - a scan of the project plus a temp B-tree
+  sort, repeated for the COUNT and again for each page;
+* the stats endpoints group by (project_id, doc_type) and (project_id, status);
+* ``get_document`` looks up (project_id, doc_type, doc_id).
+
+Each index below leads with project_id (every hot query is per project), then the
+equality filter, then the sort key, so SQLite can seek, read in order and stop at the
+page boundary. The stats ones carry every column their query reads, so those are
+answered from the index without touching the table. See the Document model for which
+query each index serves, and tests/test_query_plans.py for the guard that keeps it so.
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "017"
+down_revision: str | None = "016"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_INDEXES = {
+    "ix_documents_project_type_status": ["project_id", "doc_type", "status"],
+    "ix_documents_project_status_synced": ["project_id", "status", "synced_at"],
+    "ix_documents_project_synced": ["project_id", "synced_at"],
+    "ix_documents_project_type_synced": ["project_id", "doc_type", "synced_at"],
+    "ix_documents_project_title": ["project_id", "title"],
+    "ix_documents_project_type_title": ["project_id", "doc_type", "title"],
+    "ix_documents_project_type_doc_id": ["project_id", "doc_type", "doc_id"],
+}
+
+
+def upgrade() -> None:
+    for name, columns in _INDEXES.items():
+        op.create_index(name, "documents", columns)
+    # Give the planner real statistics for the new indexes straight away, rather than
+    # its defaults until somebody happens to run ANALYZE.
+    op.execute("ANALYZE documents")
+
+
+def downgrade() -> None:
+    for name in _INDEXES:
+        op.drop_index(name, table_name="documents")
@@ -0,0 +1,81 @@
+"""Add document_refs, the normalised reference edges between documents.
+
+Alias and dependency resolution matched the comma-joined ``aliases`` and ``depends_on``
+columns with four ``LIKE`` patterns per id. No index serves ``LIKE '%,US0042,%'``, so
+every relationship lookup scanned the whole project. ``document_refs`` holds one row per
+(document, kind, target), indexed in both directions, and the relationship queries
+become indexed lookups on it.
+
+The table is backfilled here from every existing document, so relationships keep
+resolving on upgrade without waiting for a resync; from then on it is maintained at
+flush time (see db/models/document_ref.py).
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+from sdlc_lens.utils.sdlc_ids import reference_edges
+
+revision: str = "018"
+down_revision: str | None = "017"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_BACKFILL_BATCH = 500
+
+
+def upgrade() -> None:
+    refs = op.create_table(
+        "document_refs",
+        sa.Column("src_doc_id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(20), nullable=False),
+        sa.Column("target_norm_id", sa.String(60), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["src_doc_id"], ["documents.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("src_doc_id", "kind", "target_norm_id"),
+    )
+    op.create_index(
+        "ix_document_refs_target", "document_refs", ["project_id", "kind", "target_norm_id"]
+    )
+
+    bind = op.get_bind()
+    result = bind.execute(
+        sa.text(
+            "SELECT id, project_id, ref_id, epic, story, depends_on, aliases, content "
+            "FROM documents"
+        )
+    )
+    while batch := result.fetchmany(_BACKFILL_BATCH):
+        rows = [
+            {
+                "src_doc_id": doc.id,
+                "project_id": doc.project_id,
+                "kind": kind,
+                "target_norm_id": target,
+                "position": position,
+            }
+            for doc in batch
+            for kind, target, position in reference_edges(
+                ref_id=doc.ref_id,
+                epic=doc.epic,
+                story=doc.story,
+                depends_on=doc.depends_on,
+                aliases=doc.aliases,
+                body=doc.content,
+            )
+        ]
+        if rows:
+            bind.execute(refs.insert(), rows)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_document_refs_target", table_name="document_refs")
+    op.drop_table("document_refs")
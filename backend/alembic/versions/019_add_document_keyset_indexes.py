@@ -0,0 +1,31 @@
+"""Add the indexes keyset pagination of the document list needs.
+
+Cursor pagination orders the list by (sort column, id), so that "the rows after the
+last one you saw" is exact even where the sort column has ties. An index on
+(project_id, <sort column>) ends in the implicit rowid and serves that order; the
+wider indexes from migration 017 put synced_at between the two and do not, so sorting
+the unfiltered list by status or by type fell back to a temp B-tree sort.
+
+Revision ID: 019
+Revises: 018
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "019"
+down_revision: str | None = "018"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_documents_project_status", "documents", ["project_id", "status"])
+    op.create_index("ix_documents_project_type", "documents", ["project_id", "doc_type"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_documents_project_type", table_name="documents")
+    op.drop_index("ix_documents_project_status", table_name="documents")
@@ -0,0 +1,114 @@
+"""Move document bodies off-row into document_contents, compressed and deduplicated.
+
+``documents.content`` held each markdown body inline, so every scan of ``documents`` -
+the stats group-bys, the listings - walked the bodies' overflow pages too. Bodies move
+to ``document_contents``: one zlib-compressed row per distinct body, keyed by the
+sha256 of its text, referenced from the new ``documents.content_hash``. Documents whose
+bodies are byte-identical (the same file in two projects or on two branches) share one
+row.
+
+The FTS5 index was an external-content table over ``documents``; its content table is
+now the ``documents_fts_source`` view, which inflates each body with the
+``sdlc_inflate()`` SQL function (registered on every connection, including this one -
+see db/models/document_content.py). The index is rebuilt over the view here.
+
+``content`` is dropped with ALTER TABLE DROP COLUMN (SQLite 3.35+). SQLite does not
+shrink the file when a column goes; the freed pages are reused, and a ``VACUUM``
+returns them to the filesystem.
+
+Revision ID: 020
+Revises: 019
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+from sdlc_lens.db.models.document_content import content_digest, deflate
+
+revision: str = "020"
+down_revision: str | None = "019"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_BACKFILL_BATCH = 500
+
+_FTS_TOKENIZE = "tokenize=\"unicode61 tokenchars '_'\""
+_SOURCE_VIEW_SQL = (
+    "CREATE VIEW documents_fts_source AS "
+    "SELECT d.id AS id, d.title AS title, sdlc_inflate(c.body) AS content "
+    "FROM documents d LEFT JOIN document_contents c ON c.hash = d.content_hash"
+)
+
+
+def _recreate_fts(content_table: str) -> None:
+    op.execute("DROP TABLE IF EXISTS documents_fts")
+    op.execute(
+        "CREATE VIRTUAL TABLE documents_fts USING fts5("
+        "title, content, "
+        f"content={content_table}, content_rowid=id, {_FTS_TOKENIZE})"
+    )
+    op.execute("INSERT INTO documents_fts(documents_fts) VALUES('rebuild')")
+
+
+def upgrade() -> None:
+    contents = op.create_table(
+        "document_contents",
+        sa.Column("hash", sa.String(64), nullable=False),
+        sa.Column("body", sa.LargeBinary(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("hash"),
+    )
+    # Raw DDL: op.add_column() cannot add a foreign key on SQLite outside batch mode,
+    # but ADD COLUMN ... REFERENCES can, for a column that defaults to NULL.
+    op.execute(
+        "ALTER TABLE documents ADD COLUMN content_hash VARCHAR(64) "
+        "REFERENCES document_contents (hash)"
+    )
+    op.create_index("ix_documents_content_hash", "documents", ["content_hash"])
+
+    bind = op.get_bind()
+    result = bind.execute(sa.text("SELECT id, content FROM documents"))
+    while batch := result.fetchmany(_BACKFILL_BATCH):
+        bodies = {}
+        hashes = []
+        for doc in batch:
+            digest = content_digest(doc.content)
+            bodies[digest] = doc.content
+            hashes.append({"doc_id": doc.id, "digest": digest})
+        bind.execute(
+            contents.insert().prefix_with("OR IGNORE"),
+            [
+                {"hash": digest, "body": deflate(text), "size": len(text.encode())}
+                for digest, text in bodies.items()
+            ],
+        )
+        bind.execute(
+            sa.text("UPDATE documents SET content_hash = :digest WHERE id = :doc_id"), hashes
+        )
+    result.close()
+
+    op.execute("DROP TABLE IF EXISTS documents_fts")
+    op.execute("ALTER TABLE documents DROP COLUMN content")
+    op.execute(_SOURCE_VIEW_SQL)
+    _recreate_fts("documents_fts_source")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS documents_fts")
+    op.add_column("documents", sa.Column("content", sa.Text(), nullable=False, server_default=""))
+    op.execute(
+        "UPDATE documents SET content = COALESCE("
+        "(SELECT sdlc_inflate(c.body) FROM document_contents c "
+        "WHERE c.hash = documents.content_hash), '')"
+    )
+    op.execute("DROP VIEW IF EXISTS documents_fts_source")
+    # content_hash carries a foreign key, which DROP COLUMN refuses; batch mode rebuilds
+    # the table without it.
+    with op.batch_alter_table("documents") as batch:
+        batch.drop_index("ix_documents_content_hash")
+        batch.drop_column("content_hash")
+    op.drop_table("document_contents")
+    _recreate_fts("documents")
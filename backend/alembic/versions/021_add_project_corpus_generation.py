@@ -0,0 +1,32 @@
+"""Add projects.corpus_generation, the validator behind the read endpoints' ETags.
+
+A counter per project that moves only when a sync (or deletion) actually changes the
+project's documents. The GET endpoints derive weak ETags from it and answer
+``If-None-Match`` with 304 before running their queries. Existing projects start at 0;
+their first changing sync moves them on.
+
+Revision ID: 021
+Revises: 020
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "021"
+down_revision: str | None = "020"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "projects",
+        sa.Column("corpus_generation", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("projects", "corpus_generation")
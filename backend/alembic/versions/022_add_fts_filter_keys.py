@@ -0,0 +1,56 @@
+"""Index each document's project and type in documents_fts, so scoped searches filter first.
+
+A search scoped to one project ran ``documents_fts MATCH`` over the whole corpus, ranked
+every match in every project, and only then joined ``documents`` and ``projects`` to
+drop the ones outside the scope - and its COUNT did all of that a second time. The FTS5
+table gains two filter columns, ``project_key`` and ``type_key``, each holding one
+token per document (``p<project id>``, ``t<hex of the doc type>``); a scoped search
+ANDs the token into its MATCH expression, and FTS5 produces only the documents in
+scope. See services/fts.py.
+
+The columns come from the ``documents_fts_source`` view, which is recreated with them,
+and the index is rebuilt. The rebuild inflates every body once (``sdlc_inflate()`` is
+registered on this connection too - see db/models/document_content.py).
+
+Revision ID: 022
+Revises: 021
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "022"
+down_revision: str | None = "021"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_FTS_TOKENIZE = "tokenize=\"unicode61 tokenchars '_'\""
+_VIEW_FROM = "FROM documents d LEFT JOIN document_contents c ON c.hash = d.content_hash"
+
+
+def _recreate(view_columns: str, fts_columns: str) -> None:
+    op.execute("DROP TABLE IF EXISTS documents_fts")
+    op.execute("DROP VIEW IF EXISTS documents_fts_source")
+    op.execute(
+        "CREATE VIEW documents_fts_source AS "
+        f"SELECT d.id AS id, d.title AS title, sdlc_inflate(c.body) AS content{view_columns} "
+        f"{_VIEW_FROM}"
+    )
+    op.execute(
+        f"CREATE VIRTUAL TABLE documents_fts USING fts5({fts_columns}, "
+        f"content=documents_fts_source, content_rowid=id, {_FTS_TOKENIZE})"
+    )
+    op.execute("INSERT INTO documents_fts(documents_fts) VALUES('rebuild')")
+
+
+def upgrade() -> None:
+    _recreate(
+        ", 'p' || d.project_id AS project_key, 't' || lower(hex(d.doc_type)) AS type_key",
+        "title, content, project_key, type_key",
+    )
+
+
+def downgrade() -> None:
+    _recreate("", "title, content")
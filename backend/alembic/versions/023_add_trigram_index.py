@@ -0,0 +1,67 @@
+"""Add documents_trigram, an FTS5 trigram index for substring and id-fragment search.
+
+The word index (documents_fts) matches whole unicode61 tokens, so a search for the head
+of an id ("US00", "01KX8B") or the middle of a word finds nothing. This index holds
+every three-character sequence of each document's doc_id, title and body, and a quoted
+phrase matches any substring of three characters or more.
+
+Its external content is the ``documents_trigram_source`` view. Three triggers on
+documents keep it current row by row, in the writing transaction - see
+services/fts.py. The index is filled once here; the rebuild inflates every body
+(``sdlc_inflate()`` is registered on this connection too - see
+db/models/document_content.py).
+
+Revision ID: 023
+Revises: 022
+Create Date: 2026-10-19
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "023"
+down_revision: str | None = "022"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_INDEX_NEW = (
+    "INSERT INTO documents_trigram(rowid, doc_id, title, content) "
+    "SELECT id, doc_id, title, content FROM documents_trigram_source WHERE id = new.id;"
+)
+_REMOVE_OLD = (
+    "INSERT INTO documents_trigram(documents_trigram, rowid, doc_id, title, content) "
+    "VALUES ('delete', old.id, old.doc_id, old.title, "
+    "sdlc_inflate((SELECT body FROM document_contents WHERE hash = old.content_hash)));"
+)
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE VIEW documents_trigram_source AS "
+        "SELECT d.id AS id, d.doc_id AS doc_id, d.title AS title, "
+        "sdlc_inflate(c.body) AS content "
+        "FROM documents d LEFT JOIN document_contents c ON c.hash = d.content_hash"
+    )
+    op.execute(
+        "CREATE VIRTUAL TABLE documents_trigram USING fts5(doc_id, title, content, "
+        'content=documents_trigram_source, content_rowid=id, tokenize="trigram")'
+    )
+    op.execute(
+        f"CREATE TRIGGER documents_trigram_ai AFTER INSERT ON documents BEGIN {_INDEX_NEW} END"
+    )
+    op.execute(
+        f"CREATE TRIGGER documents_trigram_ad AFTER DELETE ON documents BEGIN {_REMOVE_OLD} END"
+    )
+    op.execute(
+        "CREATE TRIGGER documents_trigram_au AFTER UPDATE OF doc_id, title, content_hash "
+        f"ON documents BEGIN {_REMOVE_OLD} {_INDEX_NEW} END"
+    )
+    op.execute("INSERT INTO documents_trigram(documents_trigram) VALUES('rebuild')")
+
+
+def downgrade() -> None:
+    for trigger in ("documents_trigram_au", "documents_trigram_ad", "documents_trigram_ai"):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS documents_trigram")
+    op.execute("DROP VIEW IF EXISTS documents_trigram_source")
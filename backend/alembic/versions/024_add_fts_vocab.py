@@ -0,0 +1,27 @@
+"""Add documents_fts_vocab, the word index's vocabulary, for search suggestions.
+
+An fts5vocab table over documents_fts: one row per (term, column) with the number of
+documents it appears in. It stores nothing of its own - it reads the index - so it
+needs no rebuild and stays current with it. See services/suggest.py.
+
+Revision ID: 024
+Revises: 023
+Create Date: 2026-10-19
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "024"
+down_revision: str | None = "023"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE VIRTUAL TABLE documents_fts_vocab USING fts5vocab(documents_fts, 'col')")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS documents_fts_vocab")
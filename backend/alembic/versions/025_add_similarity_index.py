@@ -0,0 +1,76 @@
+"""Add the similarity index: document_signatures and document_bands.
+
+Each document's MinHash signature and its LSH band buckets (utils/minhash.py), from
+which ``GET .../documents/{type}/{id}/similar`` finds the documents with the most
+vocabulary in common without reading any body at request time.
+
+Both tables are backfilled here from every stored body, so the endpoint answers on
+upgrade without waiting for a resync; from then on they are maintained at flush time
+(see db/models/document_similarity.py).
+
+Revision ID: 025
+Revises: 024
+Create Date: 2026-10-19
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+from sdlc_lens.db.models.document_content import inflate
+from sdlc_lens.db.models.document_similarity import similarity_rows
+
+revision: str = "025"
+down_revision: str | None = "024"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_BACKFILL_BATCH = 500
+
+
+def upgrade() -> None:
+    signatures = op.create_table(
+        "document_signatures",
+        sa.Column("document_id", sa.Integer(), nullable=False),
+        sa.Column("signature", sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(["document_id"], ["documents.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("document_id"),
+    )
+    bands = op.create_table(
+        "document_bands",
+        sa.Column("document_id", sa.Integer(), nullable=False),
+        sa.Column("band", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("bucket", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["document_id"], ["documents.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("document_id", "band"),
+    )
+    op.create_index("ix_document_bands_bucket", "document_bands", ["project_id", "band", "bucket"])
+
+    bind = op.get_bind()
+    result = bind.execute(
+        sa.text(
+            "SELECT d.id, d.project_id, c.body FROM documents d "
+            "JOIN document_contents c ON c.hash = d.content_hash"
+        )
+    )
+    while batch := result.fetchmany(_BACKFILL_BATCH):
+        signature_rows: list[dict] = []
+        band_rows: list[dict] = []
+        for doc in batch:
+            doc_signatures, doc_bands = similarity_rows(
+                doc.id, doc.project_id, inflate(doc.body) or ""
+            )
+            signature_rows += doc_signatures
+            band_rows += doc_bands
+        if signature_rows:
+            bind.execute(signatures.insert(), signature_rows)
+            bind.execute(bands.insert(), band_rows)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_document_bands_bucket", table_name="document_bands")
+    op.drop_table("document_bands")
+    op.drop_table("document_signatures")
@@ -0,0 +1,60 @@
+"""Add the stored health report: health_reports and health_findings.
+
+Each project's health-check findings, computed at the end of a sync - re-checking only
+what the sync changed - so that ``GET /projects/{slug}/health-check`` reads them back
+instead of loading the project and running every rule (see
+db/models/health_report.py).
+
+Nothing is backfilled: a project without a current report is checked live, as before,
+until its next sync stores one.
+
+Revision ID: 026
+Revises: 025
+Create Date: 2026-10-19
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "026"
+down_revision: str | None = "025"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "health_reports",
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("generation", sa.Integer(), nullable=False),
+        sa.Column("total_documents", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("project_id"),
+    )
+    op.create_table(
+        "health_findings",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("document_id", sa.Integer(), nullable=True),
+        sa.Column("rule_id", sa.String(length=40), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("severity", sa.String(length=10), nullable=False),
+        sa.Column("category", sa.String(length=20), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("suggested_fix", sa.Text(), nullable=False),
+        sa.Column("affected", sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["document_id"], ["documents.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_health_findings_project", "health_findings", ["project_id", "document_id"])
+    op.create_index("ix_health_findings_document", "health_findings", ["document_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_health_findings_document", table_name="health_findings")
+    op.drop_index("ix_health_findings_project", table_name="health_findings")
+    op.drop_table("health_findings")
+    op.drop_table("health_reports")
@@ -0,0 +1,148 @@
+"""Database size and stats latency, bodies inline (revision 019) vs off-row (020).
+
+Migrates a throwaway database to revision 019, where ``documents.content`` holds every
+body inline, fills it with ``--projects`` projects of ``--docs`` documents each - the
+same files in every project, as when one repository is registered once per branch -
+and measures the file size and the latency of the stats queries and of a listing. Then it
+upgrades to 020, which moves the bodies into compressed, deduplicated
+``document_contents`` rows, VACUUMs, and measures again.
+
+    PYTHONPATH=src python benchmarks/bench_content_store.py --docs 2000 --projects 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from sdlc_lens.db.models import Project
+from sdlc_lens.services.documents import list_documents_page
+from sdlc_lens.services.stats import get_project_stats
+
+_BACKEND = Path(__file__).resolve().parents[1]
+
+
+def _alembic(url: str) -> Config:
+    # In-memory config, not alembic.ini: env.py would otherwise prefer the environment's
+    # database URL over this one.
+    os.environ.pop("SDLC_LENS_DATABASE_URL", None)
+    cfg = Config()
+    cfg.set_main_option("script_location", str(_BACKEND / "alembic"))
+    cfg.set_main_option("sqlalchemy.url", url)
+    return cfg
+
+
+def _body(n: int) -> str:
+    words = " ".join(f"word{(n * 7 + i) % 500}" for i in range(400))
+    return f"# US{n:04d}: Story {n}\n\n## Acceptance criteria\n\n{words}\n"
+
+
+def _fill(db_file: Path, projects: int, docs: int) -> None:
+    conn = sqlite3.connect(db_file)
+    try:
+        for p in range(1, projects + 1):
+            conn.execute(
+                "INSERT INTO projects (id, slug, name) VALUES (?, ?, ?)", (p, f"p{p}", f"P{p}")
+            )
+            conn.executemany(
+                "INSERT INTO documents (project_id, doc_type, doc_id, title, status, content, "
+                "file_path, file_hash) VALUES (?, ?, ?, ?, ?, ?, ?, 'h')",
+                [
+                    (
+                        p,
+                        "story" if n % 4 else "epic",
+                        f"US{n:04d}",
+                        f"Story {n}",
+                        ("Draft", "In Progress", "Done")[n % 3],
+                        _body(n),
+                        f"stories/US{n:04d}.md",
+                    )
+                    for n in range(docs)
+                ],
+            )
+        # Index the bodies as a sync would, so both layouts carry the same FTS5 index.
+        conn.execute("INSERT INTO documents_fts(documents_fts) VALUES('rebuild')")
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+
+def _vacuum(db_file: Path) -> None:
+    conn = sqlite3.connect(db_file)
+    try:
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+
+async def _latencies(url: str, rounds: int) -> dict[str, list[float]]:
+    """Per round, on a fresh connection (an empty SQLite page cache): the stats of every
+    project, and a page of every project's listing sorted by title - which, unlike the
+    covering-index stats queries, reads the table rows themselves.
+    """
+    engine = create_async_engine(url, echo=False, poolclass=NullPool)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    latencies: dict[str, list[float]] = {"stats": [], "list": []}
+    for _ in range(rounds):
+        async with factory() as session:
+            projects = (await session.execute(select(Project))).scalars().all()
+            started = time.perf_counter()
+            for project in projects:
+                await get_project_stats(session, project)
+            latencies["stats"].append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            for project in projects:
+                await list_documents_page(
+                    session, project.id, sort="title", per_page=100, page=10, with_total=True
+                )
+            latencies["list"].append((time.perf_counter() - started) * 1000)
+    await engine.dispose()
+    return latencies
+
+
+def _report(label: str, db_file: Path, latencies: dict[str, list[float]]) -> None:
+    size_mib = db_file.stat().st_size / (1024 * 1024)
+    timings = "  ".join(
+        f"{name} p50 {statistics.median(values):7.2f} ms" for name, values in latencies.items()
+    )
+    print(f"{label:>8}: {size_mib:8.2f} MiB  {timings}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--projects", type=int, default=2)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    print(f"{args.projects} projects x {args.docs} documents, {args.rounds} rounds")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = Path(tmp) / "bench.db"
+        url = f"sqlite+aiosqlite:///{db_file}"
+        cfg = _alembic(url)
+
+        await asyncio.to_thread(command.upgrade, cfg, "019")
+        _fill(db_file, args.projects, args.docs)
+        _vacuum(db_file)
+        _report("inline", db_file, await _latencies(url, args.rounds))
+
+        await asyncio.to_thread(command.upgrade, cfg, "020")
+        _vacuum(db_file)
+        _report("off-row", db_file, await _latencies(url, args.rounds))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
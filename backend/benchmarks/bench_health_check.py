@@ -0,0 +1,112 @@
+"""Health-check rule engine: run time against project size, to show it scales linearly.
+
+Builds synthetic projects of increasing size (``--sizes``, up to 50k documents by
+default) shaped like real ones: one epic per ``--stories-per-epic`` stories, a plan and a
+test-spec for most stories, a sprinkling of bugs and CRs, a tenth of the epics Done, and
+statuses written the many ways real frontmatter writes them (``**Done** - shipped``,
+``In Progress``, ``Won't Implement``...). The documents are plain objects with the
+columns ``get_health_check_documents`` selects, so only ``run_health_check`` itself is
+timed - no database.
+
+For each size it reports the best of ``--repeat`` runs, the time per document (flat
+when the engine is linear) and the number of findings - and, for comparison, what a sync
+that rewrote ``--changed`` documents costs through ``recheck_documents``. That runs only
+the rules their changes can reach, but still indexes the whole project for their
+evidence, so it saves the rules' share of the time rather than the indexing's.
+
+    PYTHONPATH=src python benchmarks/bench_health_check.py --sizes 5000 10000 25000 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import random
+import time
+from types import SimpleNamespace
+
+from sdlc_lens.services.health_check import recheck_documents, run_health_check
+
+_NOW = datetime.datetime(2026, 10, 19, tzinfo=datetime.UTC)
+_STORY_STATUSES = ("Draft", "Ready", "In Progress", "**Done** - shipped", "Done")
+_STORY_STATUSES += ("Won't Implement",)
+_EPIC_STATUSES = ("Draft", "In Progress", "Ready")
+_BODY = "# Title\n\n" + "Acceptance criteria and implementation notes. " * 3
+
+
+def _doc(n: int, doc_type: str, doc_id: str, **fields) -> SimpleNamespace:
+    columns = {
+        "id": n,
+        "doc_id": doc_id,
+        "doc_type": doc_type,
+        "title": doc_id,
+        "status": "Draft",
+        "owner": "owner",
+        "priority": "P1",
+        "story_points": 3,
+        "epic": None,
+        "story": None,
+        "ref_id": doc_id,
+        "depends_on": None,
+        "aliases": None,
+        "file_path": f"{doc_type}s/{doc_id}.md",
+        "synced_at": _NOW,
+        "content": _BODY,
+    }
+    columns.update(fields)
+    return SimpleNamespace(**columns)
+
+
+def _project(size: int, stories_per_epic: int, rng: random.Random) -> list[SimpleNamespace]:
+    docs = [_doc(0, "prd", "prd"), _doc(1, "trd", "trd")]
+    epic = None
+    while len(docs) < size:
+        n = len(docs)
+        if epic is None or rng.random() < 1 / stories_per_epic:
+            status = "Done" if rng.random() < 0.1 else rng.choice(_EPIC_STATUSES)
+            epic = f"EP{n:05d}"
+            docs.append(_doc(n, "epic", epic, status=status))
+            continue
+        story = f"US{n:05d}"
+        docs.append(_doc(n, "story", story, epic=epic, status=rng.choice(_STORY_STATUSES)))
+        if rng.random() < 0.8:
+            docs.append(_doc(n + 1, "plan", f"PL{n:05d}", story=story, epic=epic))
+        if rng.random() < 0.7:
+            docs.append(_doc(n + 2, "test-spec", f"TS{n:05d}", story=story, epic=epic))
+        if rng.random() < 0.1:
+            docs.append(_doc(n + 3, "bug", f"BG{n:05d}", story=story, status="inbox"))
+        if rng.random() < 0.05:
+            # A reference to a story that does not exist.
+            docs.append(_doc(n + 4, "cr", f"CR{n:05d}", story=f"US9{n:05d}"))
+    return docs[:size]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 10000, 25000, 50000])
+    parser.add_argument("--stories-per-epic", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--changed", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(49)
+    for size in args.sizes:
+        docs = _project(size, args.stories_per_epic, rng)
+        changed = rng.sample(docs, min(args.changed, size))
+        best = incremental = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            result = run_health_check(docs, project_slug="bench", now=_NOW)
+            best = min(best, time.perf_counter() - started)
+            started = time.perf_counter()
+            recheck_documents(docs, changed)
+            incremental = min(incremental, time.perf_counter() - started)
+        print(
+            f"{size:>6} documents: {best * 1000:8.1f} ms, "
+            f"{best * 1e6 / size:5.1f} us/document, {len(result.findings)} findings; "
+            f"{len(changed)} changed: {incremental * 1000:6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
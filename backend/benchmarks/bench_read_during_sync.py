@@ -0,0 +1,126 @@
+"""Read latency on GET-shaped queries while a large sync is writing.
+
+Builds a synthetic local project of ``--docs`` documents, syncs it, then re-syncs it
+with every document changed while a reader issues the dashboard's queries in a loop.
+Reports read latency for two connection profiles:
+
+* ``legacy`` - one default engine, rollback journal, no tuning (the old session.py);
+* ``tuned``  - the performance profile in db/session.py: WAL, a single-connection
+  writer and a pooled read-only reader.
+
+    PYTHONPATH=src python benchmarks/bench_read_during_sync.py --docs 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from sdlc_lens.config import settings
+from sdlc_lens.db.models import Base, Project
+from sdlc_lens.db.session import create_engines
+from sdlc_lens.services.documents import list_documents
+from sdlc_lens.services.fts import FTS5_CREATE_SQL
+from sdlc_lens.services.stats import get_project_stats
+from sdlc_lens.services.sync_engine import sync_project
+
+
+def _write_corpus(root: Path, docs: int, revision: int) -> None:
+    for n in range(docs):
+        folder = root / ("stories" if n % 4 else "epics")
+        folder.mkdir(parents=True, exist_ok=True)
+        prefix = "US" if n % 4 else "EP"
+        body = " ".join(f"word{(n * 7 + i) % 500}" for i in range(300))
+        (folder / f"{prefix}{n:04d}-doc.md").write_text(
+            f"# {prefix}{n:04d}: Document {n}\n\n> **Status:** Draft\n> **Rev:** {revision}\n\n"
+            f"{body}\n"
+        )
+
+
+def _legacy_engines(url: str):
+    engine = create_async_engine(url, echo=False)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _fk(dbapi_conn, _):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    return engine, engine
+
+
+async def _run(profile: str, docs: int, workdir: Path) -> list[float]:
+    url = f"sqlite+aiosqlite:///{workdir / f'{profile}.db'}"
+    writer, reader = _legacy_engines(url) if profile == "legacy" else create_engines(url)
+    async with writer.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text(FTS5_CREATE_SQL))
+    write_factory = async_sessionmaker(writer, expire_on_commit=False)
+    read_factory = async_sessionmaker(reader, expire_on_commit=False)
+
+    corpus = workdir / f"{profile}-corpus"
+    _write_corpus(corpus, docs, revision=1)
+    async with write_factory() as session:
+        project = Project(slug="bench", name="bench", sdlc_path=str(corpus))
+        session.add(project)
+        await session.commit()
+        await sync_project(project, session)
+        project_id = project.id
+
+    _write_corpus(corpus, docs, revision=2)  # every document changes
+    latencies: list[float] = []
+    done = asyncio.Event()
+
+    async def _reader() -> None:
+        while not done.is_set():
+            started = time.perf_counter()
+            async with read_factory() as session:
+                project = (
+                    await session.execute(select(Project).where(Project.slug == "bench"))
+                ).scalar_one()
+                await list_documents(session, project_id, per_page=50)
+                await get_project_stats(session, project)
+            latencies.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(0.005)
+
+    async def _sync() -> None:
+        async with write_factory() as session:
+            project = await session.get(Project, project_id)
+            await sync_project(project, session)
+        done.set()
+
+    await asyncio.gather(_sync(), _reader(), _reader())
+    await writer.dispose()
+    if reader is not writer:
+        await reader.dispose()
+    return latencies
+
+
+def _report(profile: str, latencies: list[float]) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1] if ordered else 0.0
+    print(
+        f"{profile:>7}: {len(ordered):5d} reads  p50 {statistics.median(ordered):8.1f} ms  "
+        f"p95 {p95:8.1f} ms  max {max(ordered):8.1f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=2000)
+    args = parser.parse_args()
+    print(f"{args.docs} documents, {settings.sqlite_reader_pool_size} pooled readers")
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in ("legacy", "tuned"):
+            _report(profile, await _run(profile, args.docs, Path(tmp)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,186 @@
+"""Scoped search latency: filtering by join (revision 021) vs inside the index (022).
+
+Migrates a throwaway database to revision 021, fills it with ``--projects`` projects of
+``--docs`` documents each - different bodies drawn from one vocabulary, so a common word
+matches in every project - and times a search scoped to one project (and to one project
+and type) the way the search service did before 022: MATCH over the whole corpus, then
+joins to ``documents`` and ``projects`` to filter, for the COUNT and again for the page.
+Then it upgrades to 022, which indexes each document's project and type as key tokens,
+and times the same searches through ``search_documents``.
+
+    PYTHONPATH=src python benchmarks/bench_scoped_search.py --projects 40 --docs 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from sdlc_lens.db.models.document_content import content_digest, deflate
+from sdlc_lens.services.search import search_documents
+
+_BACKEND = Path(__file__).resolve().parents[1]
+_TYPES = ("story", "epic", "bug", "test-spec")
+_QUERY = "widget"
+
+# The search service's statements before revision 022, with the scope as join filters.
+_JOINED = (
+    "FROM documents_fts "
+    "JOIN documents d ON documents_fts.rowid = d.id "
+    "JOIN projects p ON d.project_id = p.id "
+    "WHERE documents_fts MATCH :query AND p.slug = :slug{type_filter}"
+)
+_JOINED_COUNT = "SELECT COUNT(*) " + _JOINED
+_JOINED_PAGE = (
+    "SELECT d.id, bm25(documents_fts) AS rank, d.doc_id, d.doc_type, d.title, "
+    "p.slug, p.name, d.status, "
+    "snippet(documents_fts, 1, '<mark>', '</mark>', '...', 32) AS snippet "
+    + _JOINED
+    + " ORDER BY bm25(documents_fts), d.id LIMIT 21"
+)
+
+
+def _alembic(url: str) -> Config:
+    # In-memory config, not alembic.ini: env.py would otherwise prefer the environment's
+    # database URL over this one.
+    os.environ.pop("SDLC_LENS_DATABASE_URL", None)
+    cfg = Config()
+    cfg.set_main_option("script_location", str(_BACKEND / "alembic"))
+    cfg.set_main_option("sqlalchemy.url", url)
+    return cfg
+
+
+def _body(rng: random.Random) -> str:
+    words = " ".join(f"word{rng.randrange(2000)}" for _ in range(300))
+    # A third of the documents mention the query term.
+    extra = f" the {_QUERY} panel" if rng.random() < 0.33 else ""
+    return f"## Acceptance criteria\n\n{words}{extra}\n"
+
+
+def _fill(db_file: Path, projects: int, docs: int) -> None:
+    rng = random.Random(40)
+    conn = sqlite3.connect(db_file)
+    try:
+        for p in range(1, projects + 1):
+            conn.execute(
+                "INSERT INTO projects (id, slug, name) VALUES (?, ?, ?)", (p, f"p{p}", f"P{p}")
+            )
+            rows = []
+            for n in range(docs):
+                body = _body(rng)
+                digest = content_digest(body)
+                conn.execute(
+                    "INSERT OR IGNORE INTO document_contents (hash, body, size) VALUES (?, ?, ?)",
+                    (digest, deflate(body), len(body)),
+                )
+                rows.append(
+                    (p, _TYPES[n % len(_TYPES)], f"D{n:05d}", f"Document {n}", digest, f"{n}.md")
+                )
+            conn.executemany(
+                "INSERT INTO documents (project_id, doc_type, doc_id, title, content_hash, "
+                "file_path, file_hash) VALUES (?, ?, ?, ?, ?, ?, 'h')",
+                rows,
+            )
+        conn.commit()
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+async def _rebuild(url: str) -> None:
+    # Through SQLAlchemy: the index's source view needs sdlc_inflate().
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.execute(text("INSERT INTO documents_fts(documents_fts) VALUES('rebuild')"))
+    await engine.dispose()
+
+
+async def _time(rounds: int, run) -> float:
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await run()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def _measure_joined(url: str, rounds: int, slug: str) -> dict[str, float]:
+    engine = create_async_engine(url)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    timings = {}
+    async with factory() as session:
+        for label, doc_type in (("project", None), ("project+type", "story")):
+            type_filter = " AND d.doc_type = :doc_type" if doc_type else ""
+            params = {"query": f'"{_QUERY}"', "slug": slug, "doc_type": doc_type}
+            count_sql = text(_JOINED_COUNT.format(type_filter=type_filter))
+            page_sql = text(_JOINED_PAGE.format(type_filter=type_filter))
+
+            async def run(count_sql=count_sql, page_sql=page_sql, params=params) -> None:
+                await session.execute(count_sql, params)
+                (await session.execute(page_sql, params)).all()
+
+            timings[label] = await _time(rounds, run)
+    await engine.dispose()
+    return timings
+
+
+async def _measure_keyed(url: str, rounds: int, slug: str) -> dict[str, float]:
+    engine = create_async_engine(url)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    timings = {}
+    async with factory() as session:
+        for label, doc_type in (("project", None), ("project+type", "story")):
+
+            async def run(doc_type=doc_type) -> None:
+                await search_documents(
+                    session, query=_QUERY, project_slug=slug, doc_type=doc_type, with_facets=False
+                )
+
+            timings[label] = await _time(rounds, run)
+    await engine.dispose()
+    return timings
+
+
+def _report(label: str, timings: dict[str, float]) -> None:
+    cells = "  ".join(f"{scope} p50 {ms:7.2f} ms" for scope, ms in timings.items())
+    print(f"{label:>8}: {cells}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=40)
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=30)
+    args = parser.parse_args()
+    print(f"{args.projects} projects x {args.docs} documents, {args.rounds} rounds")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = Path(tmp) / "bench.db"
+        url = f"sqlite+aiosqlite:///{db_file}"
+        cfg = _alembic(url)
+        slug = f"p{args.projects // 2}"
+
+        await asyncio.to_thread(command.upgrade, cfg, "021")
+        _fill(db_file, args.projects, args.docs)
+        await _rebuild(url)
+        _report("joined", await _measure_joined(url, args.rounds, slug))
+
+        await asyncio.to_thread(command.upgrade, cfg, "022")
+        _report("keyed", await _measure_keyed(url, args.rounds, slug))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,159 @@
+"""Search latency with the result cache: a first search, a repeat and the next page.
+
+Migrates a throwaway database to revision 022, fills it with ``--projects`` projects of
+``--docs`` documents each (30k by default) and upgrades it to head. Then, through the
+ASGI app, it times ``GET /api/v1/search`` for a few popular queries, each:
+
+* ``cold``: the first request, which runs the search (the cache is emptied first);
+* ``repeat``: the same request again, answered from the search cache;
+* ``page 2 cold`` / ``page 2 repeat``: the next page by cursor, first and again.
+
+and reports p50 of each, with the cache's hit rate at the end.
+
+    PYTHONPATH=src python benchmarks/bench_search_cache.py --projects 30 --docs 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from sdlc_lens.db.models.document_content import content_digest, deflate
+from sdlc_lens.services.result_cache import search_cache
+
+_BACKEND = Path(__file__).resolve().parents[1]
+_TYPES = ("story", "epic", "bug", "test-spec")
+_SYLLABLES = ("au", "then", "ti", "ca", "tion", "log", "in", "ses", "sion", "val", "ida")
+_SYLLABLES += ("te", "re", "port", "ing", "con", "fig", "ur", "ac", "count", "mi", "gra")
+_QUERIES = ("token", "authentication", "login config", "status:draft token*")
+
+
+def _alembic(url: str) -> Config:
+    # In-memory config, not alembic.ini: env.py would otherwise prefer the environment's
+    # database URL over this one.
+    os.environ.pop("SDLC_LENS_DATABASE_URL", None)
+    cfg = Config()
+    cfg.set_main_option("script_location", str(_BACKEND / "alembic"))
+    cfg.set_main_option("sqlalchemy.url", url)
+    return cfg
+
+
+def _fill(db_file: Path, projects: int, docs: int) -> None:
+    rng = random.Random(45)
+    vocabulary = sorted(
+        {"".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(3000)}
+        | {"token", "authentication", "login", "config"}
+    )
+    conn = sqlite3.connect(db_file)
+    try:
+        for p in range(1, projects + 1):
+            conn.execute(
+                "INSERT INTO projects (id, slug, name) VALUES (?, ?, ?)", (p, f"p{p}", f"P{p}")
+            )
+            for n in range(docs):
+                body = " ".join(rng.choice(vocabulary) for _ in range(250))
+                digest = content_digest(body)
+                conn.execute(
+                    "INSERT OR IGNORE INTO document_contents (hash, body, size) VALUES (?, ?, ?)",
+                    (digest, deflate(body), len(body)),
+                )
+                conn.execute(
+                    "INSERT INTO documents (project_id, doc_type, doc_id, title, status, "
+                    "content_hash, file_path, file_hash) VALUES (?, ?, ?, ?, ?, ?, ?, 'h')",
+                    (
+                        p,
+                        _TYPES[n % len(_TYPES)],
+                        f"US{n:04d}",
+                        " ".join(rng.choice(vocabulary) for _ in range(4)),
+                        "Draft" if n % 3 else "Done",
+                        digest,
+                        f"{n}.md",
+                    ),
+                )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+async def _timed(client: AsyncClient, params: dict) -> tuple[float, dict]:
+    started = time.perf_counter()
+    response = await client.get("/api/v1/search", params=params)
+    elapsed = (time.perf_counter() - started) * 1000
+    response.raise_for_status()
+    return elapsed, response.json()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=30)
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    print(f"{args.projects} projects x {args.docs} documents, {args.rounds} rounds")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = Path(tmp) / "bench.db"
+        url = f"sqlite+aiosqlite:///{db_file}"
+        cfg = _alembic(url)
+        await asyncio.to_thread(command.upgrade, cfg, "022")
+        _fill(db_file, args.projects, args.docs)
+        await asyncio.to_thread(command.upgrade, cfg, "head")
+
+        engine = create_async_engine(url)
+        factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with factory() as session:
+            await session.execute(
+                text("INSERT INTO documents_fts(documents_fts) VALUES('rebuild')")
+            )
+            await session.commit()
+
+        from sdlc_lens.api.deps import get_read_db
+        from sdlc_lens.main import create_app
+
+        app = create_app()
+        # One INFO line per request would swamp the report.
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+
+        async def read_db():
+            async with factory() as session:
+                yield session
+
+        app.dependency_overrides[get_read_db] = read_db
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://b") as client:
+            for query in _QUERIES:
+                samples: dict[str, list[float]] = {}
+                for _ in range(args.rounds):
+                    search_cache.clear()
+                    params = {"q": query}
+                    for label in ("cold", "repeat"):
+                        elapsed, body = await _timed(client, params)
+                        samples.setdefault(label, []).append(elapsed)
+                    params = {"q": query, "cursor": body["next_cursor"]}
+                    for label in ("page 2 cold", "page 2 repeat"):
+                        elapsed, _ = await _timed(client, params)
+                        samples.setdefault(label, []).append(elapsed)
+                report = "  ".join(
+                    f"{label} {statistics.median(values):7.2f} ms"
+                    for label, values in samples.items()
+                )
+                print(f"{query!r:>22}: {report}")
+        print(f"search cache hit rate: {search_cache.hit_rate:.2f}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,200 @@
+"""Search statement shapes: two statements, or one pass that ranks and counts together.
+
+Migrates a throwaway database, fills it with ``--projects`` projects of ``--docs``
+documents each - a third of them mention the query word - and times one search as:
+
+* ``two passes``: ``search_documents`` with facets - the facet GROUP BY over every match,
+  then the ranked page with its snippets;
+* ``one pass``: the same answer from one statement over a materialised CTE of the ranked
+  matches, which the page and the facet groups are both read from, then the page's
+  snippets;
+* ``count + page``: ``search_documents`` without facets - the index-only COUNT, then the
+  page;
+* ``window``: ``COUNT(*) OVER ()`` over the materialised ranked matches instead, then
+  the page's snippets.
+
+Walking the index costs a fraction of a millisecond; scoring and joining every match is
+what a search pays for, and a single pass does both and then materialises every match.
+
+    PYTHONPATH=src python benchmarks/bench_search_passes.py --projects 40 --docs 750
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+# Imported for its side effect too: every engine gets sdlc_inflate(), which the trigram
+# index's triggers and the word index's rebuild read bodies through.
+from sdlc_lens.db.models.document_content import content_digest, deflate
+from sdlc_lens.services.fts import BM25_RANK
+from sdlc_lens.services.search import search_documents
+
+_BACKEND = Path(__file__).resolve().parents[1]
+_QUERY = "widget"
+_MATCH = '{title content} : "widget"'
+_JOINED = (
+    "FROM documents_fts "
+    "JOIN documents d ON documents_fts.rowid = d.id "
+    "JOIN projects p ON d.project_id = p.id "
+    "WHERE documents_fts MATCH :query"
+)
+_ONE_PASS = (
+    f"WITH matches AS MATERIALIZED (SELECT d.id AS id, {BM25_RANK} AS rank, "
+    f"d.project_id AS project_id, d.doc_type AS doc_type, d.status AS status {_JOINED}), "
+    "page AS (SELECT id, rank FROM matches ORDER BY rank, id LIMIT 21) "
+    "SELECT 0, id, rank, NULL, NULL, NULL FROM page "
+    "UNION ALL "
+    "SELECT 1, g.n, NULL, p.slug, g.doc_type, g.status FROM ("
+    "SELECT project_id, doc_type, status, COUNT(*) AS n FROM matches GROUP BY 1, 2, 3"
+    ") g JOIN projects p ON p.id = g.project_id"
+)
+_SNIPPETS = (
+    "SELECT d.id, d.doc_id, d.doc_type, d.title, p.slug, p.name, d.status, "
+    f"-{BM25_RANK}, snippet(documents_fts, 1, '<mark>', '</mark>', '...', 32) "
+    f"{_JOINED} AND d.id IN :ids"
+)
+_WINDOW = (
+    f"WITH matches AS MATERIALIZED (SELECT d.id AS id, {BM25_RANK} AS rank {_JOINED}) "
+    "SELECT id, rank, COUNT(*) OVER () FROM matches ORDER BY rank, id LIMIT 21"
+)
+
+
+def _alembic(url: str) -> Config:
+    # In-memory config, not alembic.ini: env.py would otherwise prefer the environment's
+    # database URL over this one.
+    os.environ.pop("SDLC_LENS_DATABASE_URL", None)
+    cfg = Config()
+    cfg.set_main_option("script_location", str(_BACKEND / "alembic"))
+    cfg.set_main_option("sqlalchemy.url", url)
+    return cfg
+
+
+def _body(rng: random.Random) -> str:
+    words = " ".join(f"word{rng.randrange(2000)}" for _ in range(300))
+    # A third of the documents mention the query term.
+    extra = f" the {_QUERY} panel" if rng.random() < 0.33 else ""
+    return f"## Acceptance criteria\n\n{words}{extra}\n"
+
+
+async def _fill(url: str, projects: int, docs: int) -> None:
+    rng = random.Random(41)
+    engine = create_async_engine(url)
+
+    async with engine.begin() as conn:
+        for p in range(1, projects + 1):
+            await conn.execute(
+                text("INSERT INTO projects (id, slug, name) VALUES (:id, :slug, :name)"),
+                {"id": p, "slug": f"p{p}", "name": f"P{p}"},
+            )
+            contents = []
+            rows = []
+            for n in range(docs):
+                body = _body(rng)
+                digest = content_digest(body)
+                contents.append({"hash": digest, "body": deflate(body), "size": len(body)})
+                rows.append(
+                    {
+                        "project_id": p,
+                        "doc_type": "story",
+                        "doc_id": f"D{n:05d}",
+                        "title": f"Document {n}",
+                        "hash": digest,
+                        "path": f"{n}.md",
+                    }
+                )
+            await conn.execute(
+                text(
+                    "INSERT OR IGNORE INTO document_contents (hash, body, size) "
+                    "VALUES (:hash, :body, :size)"
+                ),
+                contents,
+            )
+            await conn.execute(
+                text(
+                    "INSERT INTO documents (project_id, doc_type, doc_id, title, content_hash, "
+                    "file_path, file_hash) "
+                    "VALUES (:project_id, :doc_type, :doc_id, :title, :hash, :path, 'h')"
+                ),
+                rows,
+            )
+        await conn.execute(text("INSERT INTO documents_fts(documents_fts) VALUES('rebuild')"))
+        await conn.execute(text("ANALYZE"))
+    await engine.dispose()
+
+
+async def _time(rounds: int, run) -> float:
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await run()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def _measure(url: str, rounds: int) -> dict[str, float]:
+    engine = create_async_engine(url)
+
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    params = {"query": _MATCH}
+    timings = {}
+    async with factory() as session:
+
+        async def two_passes() -> None:
+            await search_documents(session, query=_QUERY, mode="words")
+
+        snippets = text(_SNIPPETS).bindparams(bindparam("ids", expanding=True))
+
+        async def one_pass() -> None:
+            rows = (await session.execute(text(_ONE_PASS), params)).all()
+            ids = [row[1] for row in rows if row[0] == 0]
+            (await session.execute(snippets, {**params, "ids": ids})).all()
+
+        async def count_and_page() -> None:
+            await search_documents(session, query=_QUERY, mode="words", with_facets=False)
+
+        async def window() -> None:
+            ids = [row[0] for row in await session.execute(text(_WINDOW), params)]
+            (await session.execute(snippets, {**params, "ids": ids})).all()
+
+        for label, run in (
+            ("two passes", two_passes),
+            ("one pass", one_pass),
+            ("count + page", count_and_page),
+            ("window", window),
+        ):
+            timings[label] = await _time(rounds, run)
+    await engine.dispose()
+    return timings
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=40)
+    parser.add_argument("--docs", type=int, default=750)
+    parser.add_argument("--rounds", type=int, default=30)
+    args = parser.parse_args()
+    print(f"{args.projects} projects x {args.docs} documents, {args.rounds} rounds")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = Path(tmp) / "bench.db"
+        url = f"sqlite+aiosqlite:///{db_file}"
+        await asyncio.to_thread(command.upgrade, _alembic(url), "head")
+        await _fill(url, args.projects, args.docs)
+        for label, ms in (await _measure(url, args.rounds)).items():
+            print(f"{label:>12}: p50 {ms:7.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
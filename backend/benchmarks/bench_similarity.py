@@ -0,0 +1,220 @@
+"""Similarity index (025): backfill time, size, per-document upkeep and top-k latency.
+
+Migrates a throwaway database to revision 024 and fills it with ``--projects`` projects
+of ``--docs`` documents each (30k by default). Each body mixes words from one of
+``--topics`` topics with a template's worth of words shared by every document and a few
+random ones, so that documents of one topic are alike and every pair shares something,
+as documents written from one set of templates do. Then it upgrades to 025, which
+backfills the index, and reports:
+
+* how long the backfill took and the size of the two tables and their index;
+* the cost of indexing one document, what a sync pays per changed body;
+* ``similar_documents`` latency (p50, p99) for ``--queries`` random documents, with the
+  number of candidates the bands produced and how many of the top 10 share the
+  document's topic;
+* ``near_duplicate_clusters`` latency per project, what the health check adds, with
+  ``--copies`` copy-pasted documents per project to find.
+
+    PYTHONPATH=src python benchmarks/bench_similarity.py --projects 30 --docs 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from sdlc_lens.db.models.document_content import content_digest, deflate
+from sdlc_lens.db.models.document_similarity import similarity_rows
+from sdlc_lens.services.similarity import near_duplicate_clusters, similar_documents
+
+_BACKEND = Path(__file__).resolve().parents[1]
+_SYLLABLES = ("au", "then", "ti", "ca", "tion", "log", "in", "ses", "sion", "val", "ida")
+_SYLLABLES += ("te", "re", "port", "ing", "con", "fig", "ur", "ac", "count", "mi", "gra")
+
+
+def _alembic(url: str) -> Config:
+    # In-memory config, not alembic.ini: env.py would otherwise prefer the environment's
+    # database URL over this one.
+    os.environ.pop("SDLC_LENS_DATABASE_URL", None)
+    cfg = Config()
+    cfg.set_main_option("script_location", str(_BACKEND / "alembic"))
+    cfg.set_main_option("sqlalchemy.url", url)
+    return cfg
+
+
+def _vocabulary(rng: random.Random, size: int) -> list[str]:
+    words: set[str] = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def _bodies(rng: random.Random, topics: int, count: int) -> list[tuple[int, str]]:
+    """(topic, body) pairs."""
+    vocabulary = _vocabulary(rng, 20000)
+    template = rng.sample(vocabulary, 40)
+    topic_words = [rng.sample(vocabulary, 60) for _ in range(topics)]
+    bodies = []
+    for _ in range(count):
+        topic = rng.randrange(topics)
+        words = (
+            rng.choices(topic_words[topic], k=120)
+            + rng.choices(template, k=80)
+            + rng.choices(vocabulary, k=50)
+        )
+        rng.shuffle(words)
+        bodies.append((topic, " ".join(words)))
+    return bodies
+
+
+def _fill(
+    db_file: Path, projects: int, docs: int, topics: int, copies: int
+) -> dict[int, tuple[int, str, int]]:
+    """Fill the corpus; returns each documents.id's project, doc_id and topic.
+
+    The last ``copies`` documents of each project are copies of its first ones with a
+    sentence appended.
+    """
+    rng = random.Random(46)
+    bodies = _bodies(rng, topics, projects * docs)
+    for p in range(projects):
+        for n in range(copies):
+            topic, body = bodies[p * docs + n]
+            bodies[(p + 1) * docs - 1 - n] = (topic, body + " Copied for the next sprint.")
+    conn = sqlite3.connect(db_file)
+    conn.create_function("sdlc_inflate", 1, lambda b: zlib.decompress(b).decode())
+    documents: dict[int, tuple[int, str, int]] = {}
+    try:
+        for p in range(1, projects + 1):
+            conn.execute(
+                "INSERT INTO projects (id, slug, name) VALUES (?, ?, ?)", (p, f"p{p}", f"P{p}")
+            )
+            for n in range(docs):
+                topic, body = bodies[(p - 1) * docs + n]
+                digest = content_digest(body)
+                conn.execute(
+                    "INSERT OR IGNORE INTO document_contents (hash, body, size) VALUES (?, ?, ?)",
+                    (digest, deflate(body), len(body)),
+                )
+                cursor = conn.execute(
+                    "INSERT INTO documents (project_id, doc_type, doc_id, title, content_hash, "
+                    "file_path, file_hash) VALUES (?, 'story', ?, 't', ?, ?, 'h')",
+                    (p, f"US{n:04d}", digest, f"{n}.md"),
+                )
+                documents[cursor.lastrowid] = (p, f"US{n:04d}", topic)
+        conn.commit()
+    finally:
+        conn.close()
+    return documents
+
+
+def _table_bytes(db_file: Path, *names: str) -> int:
+    conn = sqlite3.connect(db_file)
+    try:
+        placeholders = ", ".join("?" for _ in names)
+        (size,) = conn.execute(
+            f"SELECT COALESCE(SUM(pgsize), 0) FROM dbstat WHERE name IN ({placeholders})", names
+        ).fetchone()
+        return size
+    finally:
+        conn.close()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=30)
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--topics", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--copies", type=int, default=5)
+    args = parser.parse_args()
+    print(f"{args.projects} projects x {args.docs} documents, {args.topics} topics")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = Path(tmp) / "bench.db"
+        url = f"sqlite+aiosqlite:///{db_file}"
+        cfg = _alembic(url)
+        await asyncio.to_thread(command.upgrade, cfg, "024")
+        documents = _fill(db_file, args.projects, args.docs, args.topics, args.copies)
+
+        started = time.perf_counter()
+        await asyncio.to_thread(command.upgrade, cfg, "025")
+        print(f"backfill: {time.perf_counter() - started:.1f} s")
+        index = _table_bytes(
+            db_file, "document_signatures", "document_bands", "ix_document_bands_bucket"
+        )
+        print(f"index: {index / 2**20:.1f} MiB")
+
+        sample = _bodies(random.Random(7), args.topics, 1000)
+        started = time.perf_counter()
+        for n, (_, body) in enumerate(sample):
+            similarity_rows(n, 1, body)
+        per_doc = (time.perf_counter() - started) * 1000 / len(sample)
+        print(f"indexing one document: {per_doc:.3f} ms")
+
+        engine = create_async_engine(url)
+        factory = async_sessionmaker(engine, expire_on_commit=False)
+        rng = random.Random(1)
+        ids = sorted(documents)
+        topic_of = {(p, doc_id): topic for p, doc_id, topic in documents.values()}
+        samples: list[float] = []
+        candidates: list[int] = []
+        on_topic: list[float] = []
+        async with factory() as session:
+            for _ in range(args.queries):
+                document_id = rng.choice(ids)
+                started = time.perf_counter()
+                similar = await similar_documents(session, document_id, limit=10)
+                samples.append((time.perf_counter() - started) * 1000)
+                (count,) = (
+                    await session.execute(
+                        text(
+                            "SELECT COUNT(DISTINCT other.document_id) FROM document_bands mine "
+                            "JOIN document_bands other ON other.project_id = mine.project_id "
+                            "AND other.band = mine.band AND other.bucket = mine.bucket "
+                            "WHERE mine.document_id = :id AND other.document_id != :id"
+                        ),
+                        {"id": document_id},
+                    )
+                ).one()
+                candidates.append(count)
+                project, _, topic = documents[document_id]
+                hits = [topic_of[project, item["doc_id"]] == topic for item in similar]
+                on_topic.append(sum(hits) / max(len(hits), 1))
+            clustering: list[float] = []
+            found: list[int] = []
+            for project in range(1, args.projects + 1):
+                started = time.perf_counter()
+                clusters = await near_duplicate_clusters(session, project, threshold=0.8)
+                clustering.append((time.perf_counter() - started) * 1000)
+                found.append(len(clusters))
+        await engine.dispose()
+
+        p99 = statistics.quantiles(samples, n=100)[98]
+        print(
+            f"similar_documents: p50 {statistics.median(samples):.2f} ms, p99 {p99:.2f} ms; "
+            f"candidates p50 {statistics.median(candidates):.0f} of {args.docs - 1}; "
+            f"top 10 on topic {statistics.mean(on_topic):.0%}"
+        )
+        print(
+            f"near_duplicate_clusters: p50 {statistics.median(clustering):.1f} ms, "
+            f"max {max(clustering):.1f} ms per project; "
+            f"clusters p50 {statistics.median(found):.0f} ({args.copies} planted)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
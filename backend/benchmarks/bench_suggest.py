@@ -0,0 +1,188 @@
+"""Suggest-as-you-type latency: GET /search/suggest vs asking the index per keystroke.
+
+Migrates a throwaway database to revision 022, fills it with ``--projects`` projects of
+``--docs`` documents each (30k by default) and upgrades it to head. Then it replays the
+keystrokes of a few typed queries and reports p50 and p99 per keystroke for:
+
+* ``fts5vocab``: completing the last word from the ``documents_fts_vocab`` table with a
+  prefix range query, as each keystroke would without the in-memory index;
+* ``search``: a full ranked ``search_documents`` call, what the search box would cost
+  without a suggest endpoint;
+* ``suggest``: ``GET /api/v1/search/suggest`` through the ASGI app, ETag and all, with
+  the index already built (its one-off build time per corpus state is reported too).
+
+    PYTHONPATH=src python benchmarks/bench_suggest.py --projects 30 --docs 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from sdlc_lens.db.models.document_content import content_digest, deflate
+from sdlc_lens.services.search import search_documents
+from sdlc_lens.services.suggest import build_suggest_index
+
+_BACKEND = Path(__file__).resolve().parents[1]
+_TYPES = ("story", "epic", "bug", "test-spec")
+_SYLLABLES = ("au", "then", "ti", "ca", "tion", "log", "in", "ses", "sion", "val", "ida")
+_SYLLABLES += ("te", "re", "port", "ing", "con", "fig", "ur", "ac", "count", "mi", "gra")
+_TYPED = ("authentication", "US0421", "login config", "reporting")
+
+_VOCAB_SQL = text(
+    "SELECT term, MAX(doc) AS docs FROM documents_fts_vocab "
+    "WHERE term >= :lo AND term < :hi AND col IN ('title', 'content') "
+    "GROUP BY term ORDER BY docs DESC LIMIT 8"
+)
+
+
+def _alembic(url: str) -> Config:
+    # In-memory config, not alembic.ini: env.py would otherwise prefer the environment's
+    # database URL over this one.
+    os.environ.pop("SDLC_LENS_DATABASE_URL", None)
+    cfg = Config()
+    cfg.set_main_option("script_location", str(_BACKEND / "alembic"))
+    cfg.set_main_option("sqlalchemy.url", url)
+    return cfg
+
+
+def _fill(db_file: Path, projects: int, docs: int) -> None:
+    rng = random.Random(43)
+    vocabulary = sorted(
+        {"".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(20000)}
+        | {"authentication", "login", "config", "reporting"}
+    )
+    conn = sqlite3.connect(db_file)
+    try:
+        for p in range(1, projects + 1):
+            conn.execute(
+                "INSERT INTO projects (id, slug, name) VALUES (?, ?, ?)", (p, f"p{p}", f"P{p}")
+            )
+            for n in range(docs):
+                body = " ".join(rng.choice(vocabulary) for _ in range(250))
+                digest = content_digest(body)
+                conn.execute(
+                    "INSERT OR IGNORE INTO document_contents (hash, body, size) VALUES (?, ?, ?)",
+                    (digest, deflate(body), len(body)),
+                )
+                conn.execute(
+                    "INSERT INTO documents (project_id, doc_type, doc_id, title, content_hash, "
+                    "file_path, file_hash) VALUES (?, ?, ?, ?, ?, ?, 'h')",
+                    (
+                        p,
+                        _TYPES[n % len(_TYPES)],
+                        f"US{n:04d}",
+                        " ".join(rng.choice(vocabulary) for _ in range(4)),
+                        digest,
+                        f"{n}.md",
+                    ),
+                )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _keystrokes() -> list[str]:
+    return [typed[:n] for typed in _TYPED for n in range(1, len(typed) + 1)]
+
+
+def _summary(samples: list[float]) -> str:
+    p99 = statistics.quantiles(samples, n=100)[98]
+    return f"p50 {statistics.median(samples):7.2f} ms  p99 {p99:7.2f} ms"
+
+
+async def _time(rounds: int, run) -> list[float]:
+    samples = []
+    for _ in range(rounds):
+        for keystroke in _keystrokes():
+            started = time.perf_counter()
+            await run(keystroke)
+            samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=30)
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    print(
+        f"{args.projects} projects x {args.docs} documents, "
+        f"{len(_keystrokes())} keystrokes x {args.rounds} rounds"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = Path(tmp) / "bench.db"
+        url = f"sqlite+aiosqlite:///{db_file}"
+        cfg = _alembic(url)
+        await asyncio.to_thread(command.upgrade, cfg, "022")
+        _fill(db_file, args.projects, args.docs)
+        # 023 onwards, with the rebuilds they bring.
+        await asyncio.to_thread(command.upgrade, cfg, "head")
+
+        engine = create_async_engine(url)
+        factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with factory() as session:
+            await session.execute(
+                text("INSERT INTO documents_fts(documents_fts) VALUES('rebuild')")
+            )
+            await session.commit()
+
+            async def vocab(keystroke: str) -> None:
+                word = keystroke.split()[-1].lower()
+                hi = word[:-1] + chr(ord(word[-1]) + 1)
+                (await session.execute(_VOCAB_SQL, {"lo": word, "hi": hi})).all()
+
+            async def search(keystroke: str) -> None:
+                await search_documents(session, query=keystroke)
+
+            started = time.perf_counter()
+            index = await build_suggest_index(session)
+            built = (time.perf_counter() - started) * 1000
+            print(
+                f"index build: {built:.0f} ms ({len(index.terms)} terms, "
+                f"{len(index.documents)} documents)"
+            )
+            print(f"fts5vocab: {_summary(await _time(args.rounds, vocab))}")
+            print(f"   search: {_summary(await _time(args.rounds, search))}")
+
+        from sdlc_lens.api.deps import get_read_db
+        from sdlc_lens.main import create_app
+
+        app = create_app()
+        # One INFO line per request would swamp the report.
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+
+        async def read_db():
+            async with factory() as session:
+                yield session
+
+        app.dependency_overrides[get_read_db] = read_db
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://b") as client:
+
+            async def suggest(keystroke: str) -> None:
+                response = await client.get("/api/v1/search/suggest", params={"q": keystroke})
+                response.raise_for_status()
+
+            await suggest("warm")
+            print(f"  suggest: {_summary(await _time(args.rounds, suggest))}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,224 @@
+"""Trigram index size, build time, write overhead and substring-search latency (023).
+
+Migrates a throwaway database to revision 022, fills it with ``--projects`` projects of
+``--docs`` documents each (30k by default) - sequential and ULID-style ids, bodies
+drawn from a vocabulary of made-up words - and measures the word index and the cost of
+writing documents. Then it upgrades to 023, which adds the trigram index and the
+triggers that maintain it, and reports the index's size, how long it took to build, the
+same writes again (now indexed as they happen), and the latency of searches through
+``search_documents``: a whole word (the word index), an id fragment and a fragment of a
+word (both answered by the trigram index), and that word fragment by words alone, which
+finds nothing - the reason the trigram index exists.
+
+    PYTHONPATH=src python benchmarks/bench_trigram_index.py --projects 30 --docs 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from sdlc_lens.db.models.document_content import content_digest, deflate
+from sdlc_lens.services.search import search_documents
+
+_BACKEND = Path(__file__).resolve().parents[1]
+_TYPES = ("story", "epic", "bug", "test-spec")
+_SYLLABLES = ("au", "then", "ti", "ca", "tion", "log", "in", "ses", "sion", "val", "ida")
+_SYLLABLES += ("te", "re", "port", "ing", "con", "fig", "ur", "ac", "count", "mi", "gra")
+_ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+# (label, query, mode)
+_SEARCHES = (
+    ("whole word", "authentication", "auto"),
+    ("id fragment", "US004", "auto"),
+    ("ulid fragment", None, "auto"),  # filled in from the corpus
+    ("word fragment", "thentica", "auto"),
+    ("fragment, words", "thentica", "words"),
+)
+
+
+def _alembic(url: str) -> Config:
+    # In-memory config, not alembic.ini: env.py would otherwise prefer the environment's
+    # database URL over this one.
+    os.environ.pop("SDLC_LENS_DATABASE_URL", None)
+    cfg = Config()
+    cfg.set_main_option("script_location", str(_BACKEND / "alembic"))
+    cfg.set_main_option("sqlalchemy.url", url)
+    return cfg
+
+
+def _connect(db_file: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_file)
+    # The triggers of 023 read bodies through it, as the app's connections do.
+    conn.create_function(
+        "sdlc_inflate", 1, lambda b: None if b is None else zlib.decompress(b).decode()
+    )
+    return conn
+
+
+def _vocabulary(rng: random.Random, size: int = 3000) -> list[str]:
+    words = {"authentication"}
+    while len(words) < size:
+        words.add("".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def _ulid(rng: random.Random) -> str:
+    return "".join(rng.choice(_ULID_ALPHABET) for _ in range(26))
+
+
+def _rows(rng: random.Random, vocabulary: list[str], project_id: int, first: int, count: int):
+    for n in range(first, first + count):
+        body = " ".join(rng.choice(vocabulary) for _ in range(250))
+        doc_id = f"US{n:04d}" if n % 2 else _ulid(rng)
+        title = " ".join(rng.choice(vocabulary) for _ in range(4))
+        yield project_id, _TYPES[n % len(_TYPES)], doc_id, title, body, f"{n}.md"
+
+
+def _insert(conn: sqlite3.Connection, rows) -> None:
+    for project_id, doc_type, doc_id, title, body, path in rows:
+        digest = content_digest(body)
+        conn.execute(
+            "INSERT OR IGNORE INTO document_contents (hash, body, size) VALUES (?, ?, ?)",
+            (digest, deflate(body), len(body)),
+        )
+        conn.execute(
+            "INSERT INTO documents (project_id, doc_type, doc_id, title, content_hash, "
+            "file_path, file_hash) VALUES (?, ?, ?, ?, ?, ?, 'h')",
+            (project_id, doc_type, doc_id, title, digest, path),
+        )
+
+
+def _fill(db_file: Path, projects: int, docs: int) -> str:
+    """Fill the corpus; returns an 8-character fragment of one of its ULID-style ids."""
+    rng = random.Random(42)
+    vocabulary = _vocabulary(rng)
+    conn = _connect(db_file)
+    try:
+        for p in range(1, projects + 1):
+            conn.execute(
+                "INSERT INTO projects (id, slug, name) VALUES (?, ?, ?)", (p, f"p{p}", f"P{p}")
+            )
+            _insert(conn, _rows(rng, vocabulary, p, 0, docs))
+        conn.commit()
+        conn.execute("INSERT INTO documents_fts(documents_fts) VALUES('rebuild')")
+        conn.commit()
+        (ulid,) = conn.execute(
+            "SELECT doc_id FROM documents WHERE doc_id NOT LIKE 'US%'"
+        ).fetchone()
+        return ulid[5:13]
+    finally:
+        conn.close()
+
+
+def _time_writes(db_file: Path, writes: int) -> float:
+    """Milliseconds to insert ``writes`` documents, then delete them, in one transaction."""
+    rng = random.Random(7)
+    vocabulary = _vocabulary(rng)
+    conn = _connect(db_file)
+    try:
+        started = time.perf_counter()
+        _insert(conn, _rows(rng, vocabulary, 1, 1_000_000, writes))
+        conn.execute("DELETE FROM documents WHERE file_path GLOB '1??????.md'")
+        elapsed = (time.perf_counter() - started) * 1000
+        conn.rollback()
+        return elapsed
+    finally:
+        conn.close()
+
+
+def _index_bytes(db_file: Path, table: str) -> int:
+    conn = sqlite3.connect(db_file)
+    try:
+        (size,) = conn.execute(
+            "SELECT COALESCE(SUM(pgsize), 0) FROM dbstat WHERE name GLOB ?", (f"{table}_*",)
+        ).fetchone()
+        return size
+    finally:
+        conn.close()
+
+
+async def _measure_searches(url: str, rounds: int, searches) -> None:
+    engine = create_async_engine(url)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as session:
+        for label, query, mode in searches:
+            samples = []
+            for _ in range(rounds):
+                started = time.perf_counter()
+                result = await search_documents(session, query=query, mode=mode)
+                samples.append((time.perf_counter() - started) * 1000)
+            print(
+                f"  {label:>16} {query!r:>16}: p50 {statistics.median(samples):7.2f} ms  "
+                f"{result['total']:>6} matches by {result['mode']}"
+            )
+    await engine.dispose()
+
+
+async def _integrity_check(url: str) -> None:
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("INSERT INTO documents_trigram(documents_trigram) VALUES('integrity-check')")
+        )
+    await engine.dispose()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=30)
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--writes", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    print(f"{args.projects} projects x {args.docs} documents, {args.rounds} rounds")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = Path(tmp) / "bench.db"
+        url = f"sqlite+aiosqlite:///{db_file}"
+        cfg = _alembic(url)
+
+        await asyncio.to_thread(command.upgrade, cfg, "022")
+        ulid_fragment = _fill(db_file, args.projects, args.docs)
+        file_before = db_file.stat().st_size
+        print(f"word index      {_index_bytes(db_file, 'documents_fts') / 2**20:8.1f} MiB")
+        print(f"database file   {file_before / 2**20:8.1f} MiB")
+        before = _time_writes(db_file, args.writes)
+
+        started = time.perf_counter()
+        await asyncio.to_thread(command.upgrade, cfg, "023")
+        built = time.perf_counter() - started
+        print(
+            f"trigram index   {_index_bytes(db_file, 'documents_trigram') / 2**20:8.1f} MiB"
+            f"  (built in {built:.1f} s)"
+        )
+        print(f"database file   {db_file.stat().st_size / 2**20:8.1f} MiB")
+        after = _time_writes(db_file, args.writes)
+        print(
+            f"{args.writes} inserts + deletes: {before:.0f} ms without the trigram index, "
+            f"{after:.0f} ms with its triggers"
+        )
+
+        searches = [
+            (label, ulid_fragment if query is None else query, mode)
+            for label, query, mode in _SEARCHES
+        ]
+        await _measure_searches(url, args.rounds, searches)
+        await _integrity_check(url)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+"""Conditional GETs: weak ETags from the corpus generations, and 304s before the work.
+
+The dashboard re-requested every view on every navigation and got the same bytes back
+while nothing had been synced. The read endpoints now send an ``ETag`` derived from what
+their answer depends on - a project's ``corpus_generation``, the global corpus
+generation, the project rows themselves - and a client that sends it back in
+``If-None-Match`` gets ``304 Not Modified`` as soon as the route has read those
+counters, before any of the queries behind the body run.
+
+The tags are weak (``W/"..."``): they promise the same data, not the same bytes - a
+health check's ``checked_at`` differs between two runs over one corpus, and that is
+not a change a client needs to download.
+
+Each endpoint also sends a ``Cache-Control`` policy (:data:`CACHE_POLICIES`). Every
+policy is ``no-cache`` - store, but revalidate before each use - because any response
+can be outdated by a sync at any moment, and revalidating costs a lookup by primary key.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any
+
+from fastapi import Response
+from sqlalchemy import inspect, select
+
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services.coherence import CORPUS_SCOPE, read_generation
+
+if TYPE_CHECKING:
+    from fastapi import Request
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Per endpoint. Search and suggestion responses are also private: the query string
+# carries whatever the user typed, which has no business in a shared cache.
+CACHE_POLICIES = {
+    "projects": "no-cache",
+    "project": "no-cache",
+    "stats": "no-cache",
+    "documents": "no-cache",
+    "document": "no-cache",
+    "related": "no-cache",
+    "similar": "no-cache",
+    "health-check": "no-cache",
+    "search": "private, no-cache",
+    "suggest": "private, no-cache",
+    "aggregate-stats": "no-cache",
+}
+
+
+def weak_etag(*parts: Any) -> str:
+    """A weak ETag identifying the data ``parts`` describe."""
+    encoded = json.dumps(parts, separators=(",", ":"), default=str)
+    return f'W/"{hashlib.sha256(encoded.encode()).hexdigest()[:20]}"'
+
+
+def row_state(obj: Any) -> list[Any]:
+    """Every column value of a loaded ORM row - for responses that show the row itself."""
+    return [getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs]
+
+
+def project_etag(endpoint: str, project: Project, *parts: Any) -> str:
+    """The ETag of a read derived from one project's documents (and ``parts``).
+
+    ``created_at`` as well as the id: SQLite may hand a deleted project's id to the next
+    project registered, whose generation then starts again from 0.
+    """
+    return weak_etag(endpoint, project.id, project.created_at, project.corpus_generation, *parts)
+
+
+async def corpus_etag(db: AsyncSession, endpoint: str, *parts: Any) -> str:
+    """The ETag of a cross-project read: the global generation and every project row.
+
+    The rows as well as the generation, because these answers also show project fields
+    (names, sync status) that change without any document changing.
+    """
+    generation = await read_generation(db, CORPUS_SCOPE)
+    projects = (await db.execute(select(Project).order_by(Project.id))).scalars().all()
+    return weak_etag(endpoint, generation, [row_state(p) for p in projects], *parts)
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    """RFC 9110 weak comparison of ``etag`` against an If-None-Match header."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = _opaque(etag)
+    return any(_opaque(tag) == current for tag in if_none_match.split(","))
+
+
+def revalidate(request: Request, response: Response, etag: str, endpoint: str) -> Response | None:
+    """Attach the validators to ``response``; a 304 if the client's copy is current.
+
+    Call it once the route knows what its answer depends on and before it computes the
+    answer. A returned Response is the whole reply; ``None`` means build the body as
+    usual - ``response`` already carries the ETag and Cache-Control headers.
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_POLICIES[endpoint]}
+    response.headers.update(headers)
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return None
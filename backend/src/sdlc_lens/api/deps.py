@@ -1,5 +1,5 @@
 """API dependency injection."""
 
-from sdlc_lens.db.session import get_db
+from sdlc_lens.db.session import get_db, get_read_db
 
-__all__ = ["get_db"]
+__all__ = ["get_db", "get_read_db"]
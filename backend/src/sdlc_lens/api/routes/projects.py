@@ -1,5 +1,6 @@
 """Project API routes."""
 
+import datetime
 import math
 from typing import Annotated
 
@@ -7,13 +8,22 @@ from fastapi import APIRouter, BackgroundTasks, Depends, Query, Request, Respons
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from sdlc_lens.api.deps import get_db
+from sdlc_lens.api.conditional import (
+    corpus_etag,
+    project_etag,
+    revalidate,
+    row_state,
+    weak_etag,
+)
+from sdlc_lens.api.deps import get_db, get_read_db
 from sdlc_lens.api.schemas.documents import (
     DocumentDetail,
     DocumentListItem,
     DocumentRelationships,
     PaginatedDocuments,
     RelatedDocumentItem,
+    SimilarDocumentItem,
+    SimilarDocuments,
     SortField,
 )
 from sdlc_lens.api.schemas.github import (
@@ -30,6 +40,8 @@ from sdlc_lens.api.schemas.health_check import (
     HealthFindingSchema,
 )
 from sdlc_lens.api.schemas.projects import (
+    DiscoveryResponse,
+    DiscoverySkip,
     ProjectCreate,
     ProjectResponse,
     ProjectUpdate,
@@ -37,12 +49,17 @@ from sdlc_lens.api.schemas.projects import (
     mask_token,
 )
 from sdlc_lens.api.schemas.stats import ProjectStats
+from sdlc_lens.services.discovery import (
+    DiscoveryNotConfiguredError,
+    discover_projects,
+    sync_discovered,
+)
 from sdlc_lens.services.documents import (
+    LISTING_FIELDS,
     DocumentNotFoundError,
-    get_all_documents,
     get_document,
-    get_related_documents,
-    list_documents,
+    list_documents_page,
+    resolve_relationships,
 )
 from sdlc_lens.services.github_connection import (
     ConnectionNotFoundError,
@@ -55,7 +72,7 @@ from sdlc_lens.services.github_source import (
     list_repositories,
     repo_has_sdlc_studio,
 )
-from sdlc_lens.services.health_check import run_health_check
+from sdlc_lens.services.health_report import check_project_health
 from sdlc_lens.services.project import (
     EmptySlugError,
     PathNotFoundError,
@@ -68,12 +85,24 @@ from sdlc_lens.services.project import (
     list_projects,
     update_project,
 )
+from sdlc_lens.services.result_cache import result_cache
+from sdlc_lens.services.similarity import similar_documents
 from sdlc_lens.services.stats import get_project_stats
-from sdlc_lens.services.sync import SyncInProgressError, run_sync_task, trigger_sync
+from sdlc_lens.services.sync import (
+    SyncInProgressError,
+    SyncNotRunningError,
+    cancel_sync,
+    run_sync_task,
+    trigger_sync,
+)
+from sdlc_lens.utils.pagination import InvalidCursorError
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 DbDep = Annotated[AsyncSession, Depends(get_db)]
+# GET endpoints read through the pooled read-only engine, so a sync holding the writer
+# never stalls them (see db/session.py).
+ReadDbDep = Annotated[AsyncSession, Depends(get_read_db)]
 
 
 async def _project_response(db: AsyncSession, project) -> ProjectResponse:
@@ -260,15 +289,65 @@ async def check_repo_has_sdlc_studio(
     return HasSdlcStudioResponse(has_sdlc_studio=has)
 
 
+@router.post(
+    "/discover",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=DiscoveryResponse,
+)
+async def discover_local_projects(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: DbDep,
+) -> DiscoveryResponse | JSONResponse:
+    """Register every new sdlc-studio directory under allowed_project_base.
+
+    Registration happens before the response; the new projects then sync in the
+    background, a bounded number at a time. Returns 202 with what was found.
+    """
+    try:
+        result = await discover_projects(db)
+    except DiscoveryNotConfiguredError as exc:
+        return JSONResponse(
+            status_code=409,
+            content={"error": {"code": "DISCOVERY_NOT_CONFIGURED", "message": exc.message}},
+        )
+
+    if result.registered:
+        # Release the writer before the syncs need it, as trigger_sync_endpoint does.
+        await db.close()
+        background_tasks.add_task(
+            sync_discovered, result.registered, request.app.state.session_factory
+        )
+
+    return DiscoveryResponse(
+        found=result.found,
+        already_registered=result.already_registered,
+        registered=result.registered,
+        skipped=[DiscoverySkip(sdlc_path=path, reason=reason) for path, reason in result.skipped],
+        message=(
+            f"Registered {len(result.registered)} project(s); syncing in the background"
+            if result.registered
+            else "No new projects found"
+        ),
+    )
+
+
 @router.get("", response_model=list[ProjectResponse])
-async def list_all_projects(db: DbDep) -> list[ProjectResponse]:
+async def list_all_projects(
+    request: Request, response: Response, db: ReadDbDep
+) -> list[ProjectResponse] | Response:
     """List all registered projects."""
+    etag = await corpus_etag(db, "projects")
+    if (not_modified := revalidate(request, response, etag, "projects")) is not None:
+        return not_modified
     projects = await list_projects(db)
     return [await _project_response(db, p) for p in projects]
 
 
 @router.get("/{slug}", response_model=ProjectResponse)
-async def get_project(slug: str, db: DbDep) -> ProjectResponse | JSONResponse:
+async def get_project(
+    slug: str, request: Request, response: Response, db: ReadDbDep
+) -> ProjectResponse | Response:
     """Get a project by its slug."""
     try:
         project = await get_project_by_slug(db, slug)
@@ -277,11 +356,16 @@ async def get_project(slug: str, db: DbDep) -> ProjectResponse | JSONResponse:
             status_code=404,
             content={"error": {"code": "NOT_FOUND", "message": exc.message}},
         )
+    etag = weak_etag("project", row_state(project))
+    if (not_modified := revalidate(request, response, etag, "project")) is not None:
+        return not_modified
     return await _project_response(db, project)
 
 
 @router.get("/{slug}/stats", response_model=ProjectStats)
-async def get_project_stats_endpoint(slug: str, db: DbDep) -> ProjectStats | JSONResponse:
+async def get_project_stats_endpoint(
+    slug: str, request: Request, response: Response, db: ReadDbDep
+) -> ProjectStats | Response:
     """Get statistics for a project."""
     try:
         project = await get_project_by_slug(db, slug)
@@ -290,22 +374,64 @@ async def get_project_stats_endpoint(slug: str, db: DbDep) -> ProjectStats | JSO
             status_code=404,
             content={"error": {"code": "NOT_FOUND", "message": exc.message}},
         )
-    stats = await get_project_stats(db, project)
-    return ProjectStats(**stats)
+    # The whole row: the stats also show the project's name and last sync time.
+    etag = weak_etag("stats", row_state(project))
+    if (not_modified := revalidate(request, response, etag, "stats")) is not None:
+        return not_modified
+
+    async def _compute() -> ProjectStats:
+        return ProjectStats(**await get_project_stats(db, project))
+
+    # The tag names everything the answer is computed from, so it is also the cache key.
+    return await result_cache.get_or_compute(etag, _compute)
 
 
-@router.get("/{slug}/documents", response_model=PaginatedDocuments)
+@router.get(
+    "/{slug}/documents",
+    response_model=PaginatedDocuments,
+    # Drops the item fields a ?fields= request left out; every top-level field is set.
+    response_model_exclude_unset=True,
+)
 async def list_project_documents(
     slug: str,
-    db: DbDep,
+    request: Request,
+    response: Response,
+    db: ReadDbDep,
     type: str | None = Query(None),  # noqa: A002
     status_filter: str | None = Query(None, alias="status"),
     sort: SortField = Query(SortField.updated_at),
     order: str = Query("desc", pattern="^(asc|desc)$"),
     page: int = Query(1, ge=1),
     per_page: int = Query(50, ge=1),
-) -> PaginatedDocuments | JSONResponse:
-    """List documents for a project with filtering, sorting, and pagination."""
+    cursor: str | None = Query(None, max_length=1000),
+    include_total: bool = Query(True),
+    fields: str | None = Query(None, max_length=500),
+) -> PaginatedDocuments | Response:
+    """List documents for a project with filtering, sorting, and pagination.
+
+    ``cursor`` (from a previous page's ``next_cursor``) pages by keyset and takes
+    precedence over ``page``. ``include_total=false`` skips counting the whole result.
+    ``fields`` is a comma-separated subset of the item fields (e.g. ``doc_id,title``);
+    only those columns are read and returned.
+    """
+    requested = None
+    if fields is not None:
+        requested = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in requested if name not in LISTING_FIELDS]
+        if unknown or not requested:
+            return JSONResponse(
+                status_code=422,
+                content={
+                    "error": {
+                        "code": "VALIDATION_ERROR",
+                        "message": (
+                            f"Unknown field(s) {', '.join(unknown) or '(none given)'}; "
+                            f"choose from {', '.join(LISTING_FIELDS)}"
+                        ),
+                    }
+                },
+            )
+
     try:
         project = await get_project_by_slug(db, slug)
     except ProjectNotFoundError as exc:
@@ -314,36 +440,43 @@ async def list_project_documents(
             content={"error": {"code": "NOT_FOUND", "message": exc.message}},
         )
 
+    # The query parameters are part of the URL, and so already of what the tag names.
+    etag = project_etag("documents", project)
+    if (not_modified := revalidate(request, response, etag, "documents")) is not None:
+        return not_modified
+
     # Cap per_page at 100
     actual_per_page = min(per_page, 100)
 
-    docs, total = await list_documents(
-        db,
-        project.id,
-        doc_type=type,
-        status=status_filter,
-        sort=sort.value,
-        order=order,
-        page=page,
-        per_page=actual_per_page,
-    )
+    try:
+        result = await list_documents_page(
+            db,
+            project.id,
+            doc_type=type,
+            status=status_filter,
+            sort=sort.value,
+            order=order,
+            page=page,
+            per_page=actual_per_page,
+            cursor=cursor,
+            with_total=include_total,
+            fields=requested,
+        )
+    except InvalidCursorError as exc:
+        return JSONResponse(
+            status_code=400,
+            content={"error": {"code": "INVALID_CURSOR", "message": exc.message}},
+        )
 
-    pages = math.ceil(total / actual_per_page) if total > 0 else 0
+    total = result.total
+    pages = None
+    if total is not None:
+        pages = math.ceil(total / actual_per_page) if total > 0 else 0
 
+    names = requested if requested is not None else list(LISTING_FIELDS)
     items = [
-        DocumentListItem(
-            doc_id=doc.doc_id,
-            type=doc.doc_type,
-            title=doc.title,
-            status=doc.status,
-            owner=doc.owner,
-            priority=doc.priority,
-            story_points=doc.story_points,
-            epic=doc.epic,
-            story=doc.story,
-            updated_at=doc.synced_at,
-        )
-        for doc in docs
+        DocumentListItem(**{name: getattr(doc, LISTING_FIELDS[name].key) for name in names})
+        for doc in result.items
     ]
 
     return PaginatedDocuments(
@@ -352,11 +485,14 @@ async def list_project_documents(
         page=page,
         per_page=actual_per_page,
         pages=pages,
+        next_cursor=result.next_cursor,
     )
 
 
 @router.get("/{slug}/health-check", response_model=HealthCheckResponse)
-async def get_health_check(slug: str, db: DbDep) -> HealthCheckResponse | JSONResponse:
+async def get_health_check(
+    slug: str, request: Request, response: Response, db: ReadDbDep
+) -> HealthCheckResponse | Response:
     """Run a health check on a project's documentation."""
     try:
         project = await get_project_by_slug(db, slug)
@@ -365,31 +501,43 @@ async def get_health_check(slug: str, db: DbDep) -> HealthCheckResponse | JSONRe
             status_code=404,
             content={"error": {"code": "NOT_FOUND", "message": exc.message}},
         )
+    # The STALE_DOCUMENT rule moves with the clock as well as with the corpus; the hour
+    # in the tag bounds how late a document turning stale can be reported.
+    hour = datetime.datetime.now(datetime.UTC).strftime("%Y-%m-%dT%H")
+    etag = project_etag("health-check", project, hour)
+    if (not_modified := revalidate(request, response, etag, "health-check")) is not None:
+        return not_modified
+
+    async def _compute() -> HealthCheckResponse:
+        # The stored report, if the last sync left it current; the rules run live if not.
+        result = await check_project_health(db, project.id, slug)
+
+        return HealthCheckResponse(
+            project_slug=result.project_slug,
+            checked_at=result.checked_at,
+            total_documents=result.total_documents,
+            findings=[
+                HealthFindingSchema(
+                    rule_id=f.rule_id,
+                    severity=f.severity,
+                    category=f.category,
+                    message=f.message,
+                    affected_documents=[
+                        AffectedDocumentSchema(
+                            doc_id=ad.doc_id, doc_type=ad.doc_type, title=ad.title
+                        )
+                        for ad in f.affected_documents
+                    ],
+                    suggested_fix=f.suggested_fix,
+                )
+                for f in result.findings
+            ],
+            summary=result.summary,
+            score=result.score,
+        )
 
-    documents = await get_all_documents(db, project.id)
-    result = run_health_check(documents, project_slug=slug)
-
-    return HealthCheckResponse(
-        project_slug=result.project_slug,
-        checked_at=result.checked_at,
-        total_documents=result.total_documents,
-        findings=[
-            HealthFindingSchema(
-                rule_id=f.rule_id,
-                severity=f.severity,
-                category=f.category,
-                message=f.message,
-                affected_documents=[
-                    AffectedDocumentSchema(doc_id=ad.doc_id, doc_type=ad.doc_type, title=ad.title)
-                    for ad in f.affected_documents
-                ],
-                suggested_fix=f.suggested_fix,
-            )
-            for f in result.findings
-        ],
-        summary=result.summary,
-        score=result.score,
-    )
+    # checked_at stays that of the run that computed the report.
+    return await result_cache.get_or_compute(etag, _compute)
 
 
 @router.get(
@@ -400,9 +548,16 @@ async def get_document_related(
     slug: str,
     doc_type: str,
     doc_id: str,
-    db: DbDep,
-) -> DocumentRelationships | JSONResponse:
-    """Get parent chain and children for a document."""
+    request: Request,
+    response: Response,
+    db: ReadDbDep,
+) -> DocumentRelationships | Response:
+    """Get parent chain, children, dependencies and backlinks for a document.
+
+    ``mentioned_by`` lists the documents whose body mentions this one's id (or an id it
+    had before a migration) anywhere in prose, not only in the Epic / Story / Depends on
+    fields; the mentions are indexed at sync time (db/models/document_ref.py).
+    """
     try:
         project = await get_project_by_slug(db, slug)
     except ProjectNotFoundError as exc:
@@ -410,9 +565,35 @@ async def get_document_related(
             status_code=404,
             content={"error": {"code": "NOT_FOUND", "message": exc.message}},
         )
+    etag = project_etag("related", project)
+    if (not_modified := revalidate(request, response, etag, "related")) is not None:
+        return not_modified
 
-    try:
+    async def _compute() -> DocumentRelationships:
         doc = await get_document(db, project.id, doc_type, doc_id)
+        related = (await resolve_relationships(db, project.id, [doc]))[doc.id]
+
+        def _items(docs: list) -> list[RelatedDocumentItem]:
+            return [
+                RelatedDocumentItem(
+                    doc_id=d.doc_id, type=d.doc_type, title=d.title, status=d.status
+                )
+                for d in docs
+            ]
+
+        return DocumentRelationships(
+            doc_id=doc.doc_id,
+            type=doc.doc_type,
+            title=doc.title,
+            parents=_items(related.parents),
+            children=_items(related.children),
+            depends_on=_items(related.depends_on),
+            dependents=_items(related.dependents),
+            mentioned_by=_items(related.mentioned_by),
+        )
+
+    try:
+        return await result_cache.get_or_compute((etag, doc_type, doc_id), _compute)
     except DocumentNotFoundError:
         return JSONResponse(
             status_code=404,
@@ -424,23 +605,60 @@ async def get_document_related(
             },
         )
 
-    parents, children, depends_on, dependents = await get_related_documents(db, project.id, doc)
 
-    def _items(docs: list) -> list[RelatedDocumentItem]:
-        return [
-            RelatedDocumentItem(doc_id=d.doc_id, type=d.doc_type, title=d.title, status=d.status)
-            for d in docs
-        ]
+@router.get(
+    "/{slug}/documents/{doc_type}/{doc_id}/similar",
+    response_model=SimilarDocuments,
+)
+async def get_similar_documents(
+    slug: str,
+    doc_type: str,
+    doc_id: str,
+    request: Request,
+    response: Response,
+    db: ReadDbDep,
+    limit: Annotated[int, Query(ge=1, le=50)] = 10,
+) -> SimilarDocuments | Response:
+    """Get the documents of the project whose content is most like this one's.
+
+    Ranked by the estimated share of words the two bodies have in common, from the
+    similarity index kept up to date at sync time (services/similarity.py). Unlike
+    ``related``, which follows the epic, story and depends_on fields, this finds
+    documents nobody linked - the earlier bug with the same symptoms, say.
+    """
+    try:
+        project = await get_project_by_slug(db, slug)
+    except ProjectNotFoundError as exc:
+        return JSONResponse(
+            status_code=404,
+            content={"error": {"code": "NOT_FOUND", "message": exc.message}},
+        )
+    etag = project_etag("similar", project, limit)
+    if (not_modified := revalidate(request, response, etag, "similar")) is not None:
+        return not_modified
 
-    return DocumentRelationships(
-        doc_id=doc.doc_id,
-        type=doc.doc_type,
-        title=doc.title,
-        parents=_items(parents),
-        children=_items(children),
-        depends_on=_items(depends_on),
-        dependents=_items(dependents),
-    )
+    async def _compute() -> SimilarDocuments:
+        doc = await get_document(db, project.id, doc_type, doc_id)
+        similar = await similar_documents(db, doc.id, limit=limit)
+        return SimilarDocuments(
+            doc_id=doc.doc_id,
+            type=doc.doc_type,
+            title=doc.title,
+            similar=[SimilarDocumentItem(**item) for item in similar],
+        )
+
+    try:
+        return await result_cache.get_or_compute((etag, doc_type, doc_id), _compute)
+    except DocumentNotFoundError:
+        return JSONResponse(
+            status_code=404,
+            content={
+                "error": {
+                    "code": "NOT_FOUND",
+                    "message": f"Document not found: {doc_type}/{doc_id}",
+                }
+            },
+        )
 
 
 @router.get("/{slug}/documents/{doc_type}/{doc_id:path}", response_model=DocumentDetail)
@@ -448,8 +666,10 @@ async def get_document_detail(
     slug: str,
     doc_type: str,
     doc_id: str,
-    db: DbDep,
-) -> DocumentDetail | JSONResponse:
+    request: Request,
+    response: Response,
+    db: ReadDbDep,
+) -> DocumentDetail | Response:
     """Get a single document by type and doc_id."""
     import json as json_mod
 
@@ -460,9 +680,12 @@ async def get_document_detail(
             status_code=404,
             content={"error": {"code": "NOT_FOUND", "message": exc.message}},
         )
+    etag = project_etag("document", project)
+    if (not_modified := revalidate(request, response, etag, "document")) is not None:
+        return not_modified
 
     try:
-        doc = await get_document(db, project.id, doc_type, doc_id)
+        doc = await get_document(db, project.id, doc_type, doc_id, content=True)
     except DocumentNotFoundError as exc:
         return JSONResponse(
             status_code=404,
@@ -563,6 +786,10 @@ async def trigger_sync_endpoint(
             content={"error": {"code": "SYNC_IN_PROGRESS", "message": exc.message}},
         )
 
+    # Hand the writer connection back now: the sync below needs it, and this session is
+    # otherwise only closed after background tasks have run - a self-deadlock on the
+    # single-connection writer (see db/session.py).
+    await db.close()
     session_factory = request.app.state.session_factory
     background_tasks.add_task(run_sync_task, slug, session_factory)
 
@@ -571,3 +798,33 @@ async def trigger_sync_endpoint(
         sync_status="syncing",
         message="Sync started",
     )
+
+
+@router.delete(
+    "/{slug}/sync",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=SyncTriggerResponse,
+)
+async def cancel_sync_endpoint(slug: str, db: DbDep) -> SyncTriggerResponse | JSONResponse:
+    """Cancel a running sync. Returns 202; the sync stops at its next checkpoint.
+
+    Everything synced so far is kept, and the next sync resumes from the checkpoint.
+    """
+    try:
+        project = await cancel_sync(db, slug)
+    except ProjectNotFoundError as exc:
+        return JSONResponse(
+            status_code=404,
+            content={"error": {"code": "NOT_FOUND", "message": exc.message}},
+        )
+    except SyncNotRunningError as exc:
+        return JSONResponse(
+            status_code=409,
+            content={"error": {"code": "SYNC_NOT_RUNNING", "message": exc.message}},
+        )
+
+    return SyncTriggerResponse(
+        slug=project.slug,
+        sync_status=project.sync_status,
+        message="Cancellation requested",
+    )
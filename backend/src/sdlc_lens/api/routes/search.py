@@ -1,39 +1,128 @@
 """Full-text search API routes."""
 
-from typing import Annotated
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from sdlc_lens.api.deps import get_db
-from sdlc_lens.api.schemas.search import SearchResponse
-from sdlc_lens.services.search import search_documents
+from sdlc_lens.api.conditional import corpus_etag, revalidate
+from sdlc_lens.api.deps import get_read_db
+from sdlc_lens.api.schemas.search import SearchResponse, SuggestResponse
+from sdlc_lens.services.coherence import CORPUS_SCOPE, read_generation
+from sdlc_lens.services.result_cache import search_cache, suggest_cache
+from sdlc_lens.services.search import normalise_query, search_documents
+from sdlc_lens.services.suggest import build_suggest_index, suggest
+from sdlc_lens.utils.pagination import InvalidCursorError
 
 router = APIRouter(prefix="/search", tags=["search"])
 
-DbDep = Annotated[AsyncSession, Depends(get_db)]
+DbDep = Annotated[AsyncSession, Depends(get_read_db)]
 
 
 @router.get("", response_model=SearchResponse)
 async def search(
+    request: Request,
+    response: Response,
     db: DbDep,
     q: Annotated[str, Query(min_length=1, max_length=500)],
     project: str | None = None,
     type: str | None = None,  # noqa: A002
     page: Annotated[int, Query(ge=1)] = 1,
     per_page: Annotated[int, Query(ge=1, le=50)] = 20,
-) -> SearchResponse:
+    cursor: Annotated[str | None, Query(max_length=1000)] = None,
+    include_total: bool = True,
+    include_facets: bool = True,
+    mode: Literal["auto", "words", "substring"] = "auto",
+) -> SearchResponse | Response:
     """Search documents using full-text search.
 
     Returns matching documents ranked by relevance with highlighted
     snippets and optional filtering by project or document type.
+    ``cursor`` (a previous page's ``next_cursor``) pages by keyset and takes
+    precedence over ``page``; ``include_total=false`` skips counting every match.
+    ``facets`` counts the matches per project, type and status, for filter chips;
+    ``include_facets=false`` skips it.
+    ``mode=substring`` matches the query anywhere in a document's id, title or body
+    (three characters or more); ``mode=words`` only whole words. The default, ``auto``,
+    takes an id fragment such as ``US00`` as a substring and falls back to substrings
+    when the words match nothing; the response's ``mode`` says which answered.
+    A word search understands phrases, ``auth*`` prefixes, AND / OR / NOT (or
+    ``-term``), parentheses, ``title:`` and the filters ``type:``, ``status:``,
+    ``owner:`` and ``project:`` (services/search_query.py); a query that does not
+    parse is searched for as one literal phrase.
+    Pages are cached per worker for the corpus state they were read at (see
+    ``GET /api/v1/system/cache/search``), so a repeated or re-paged search costs a
+    lookup until the next sync changes something.
     """
-    result = await search_documents(
-        db,
-        query=q,
-        project_slug=project,
-        doc_type=type,
-        page=page,
-        per_page=per_page,
+    etag = await corpus_etag(db, "search")
+    if (not_modified := revalidate(request, response, etag, "search")) is not None:
+        return not_modified
+    query = normalise_query(q)
+
+    async def _compute() -> SearchResponse:
+        return SearchResponse(
+            **await search_documents(
+                db,
+                query=query,
+                project_slug=project,
+                doc_type=type,
+                page=page,
+                per_page=per_page,
+                cursor=cursor,
+                with_total=include_total,
+                with_facets=include_facets,
+                mode=mode,
+            )
+        )
+
+    # The ETag names the corpus generation the page was read at, so a sync that changes
+    # it makes every later search a new key and the old pages age out of the LRU.
+    key = (
+        "search",
+        etag,
+        query,
+        project,
+        type,
+        page,
+        per_page,
+        cursor,
+        include_total,
+        include_facets,
+        mode,
     )
-    return SearchResponse(**result)
+    try:
+        result = await search_cache.get_or_compute(key, _compute)
+    except InvalidCursorError as exc:
+        return JSONResponse(
+            status_code=400,
+            content={"error": {"code": "INVALID_CURSOR", "message": exc.message}},
+        )
+    return result
+
+
+@router.get("/suggest", response_model=SuggestResponse)
+async def search_suggest(
+    request: Request,
+    response: Response,
+    db: DbDep,
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    project: str | None = None,
+    type: str | None = None,  # noqa: A002
+    limit: Annotated[int, Query(ge=1, le=20)] = 8,
+) -> SuggestResponse | Response:
+    """Complete a partly typed query, cheaply enough to call on every keystroke.
+
+    ``terms`` completes the query's last word from the corpus's vocabulary, most
+    widely used first; ``documents`` lists documents whose id or title starts with the
+    query, narrowed by ``project`` and ``type``. Answered from an in-memory index built
+    once per corpus state (see services/suggest.py), never by a ranked search.
+    """
+    etag = await corpus_etag(db, "suggest")
+    if (not_modified := revalidate(request, response, etag, "suggest")) is not None:
+        return not_modified
+    # Keyed on the documents' generation, not the ETag: the ETag also moves with every
+    # project's sync status, and the index must outlive a sync that changed nothing.
+    generation = await read_generation(db, CORPUS_SCOPE)
+    index = await suggest_cache.get_or_compute(generation, lambda: build_suggest_index(db))
+    return SuggestResponse(**suggest(index, q, project_slug=project, doc_type=type, limit=limit))
@@ -2,20 +2,30 @@
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from sdlc_lens.api.deps import get_db
+from sdlc_lens.api.conditional import corpus_etag, revalidate
+from sdlc_lens.api.deps import get_read_db
 from sdlc_lens.api.schemas.stats import AggregateStats
+from sdlc_lens.services.result_cache import result_cache
 from sdlc_lens.services.stats import get_aggregate_stats
 
 router = APIRouter(prefix="/stats", tags=["stats"])
 
-DbDep = Annotated[AsyncSession, Depends(get_db)]
+DbDep = Annotated[AsyncSession, Depends(get_read_db)]
 
 
 @router.get("", response_model=AggregateStats)
-async def aggregate_stats(db: DbDep) -> AggregateStats:
+async def aggregate_stats(
+    request: Request, response: Response, db: DbDep
+) -> AggregateStats | Response:
     """Get aggregate statistics across all projects."""
-    stats = await get_aggregate_stats(db)
-    return AggregateStats(**stats)
+    etag = await corpus_etag(db, "aggregate-stats")
+    if (not_modified := revalidate(request, response, etag, "aggregate-stats")) is not None:
+        return not_modified
+
+    async def _compute() -> AggregateStats:
+        return AggregateStats(**await get_aggregate_stats(db))
+
+    return await result_cache.get_or_compute(etag, _compute)
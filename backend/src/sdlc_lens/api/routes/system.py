@@ -8,13 +8,14 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from sdlc_lens.api.deps import get_db
-from sdlc_lens.api.schemas.system import HealthResponse
+from sdlc_lens.api.deps import get_read_db
+from sdlc_lens.api.schemas.system import HealthResponse, ResultCacheStats
+from sdlc_lens.services.result_cache import result_cache, search_cache, suggest_cache
 from sdlc_lens.version import get_version
 
 router = APIRouter(prefix="/system", tags=["system"])
 
-DbDep = Annotated[AsyncSession, Depends(get_db)]
+DbDep = Annotated[AsyncSession, Depends(get_read_db)]
 
 
 @lru_cache(maxsize=1)
@@ -98,3 +99,21 @@ async def health_check(db: DbDep) -> HealthResponse:
         fts_ok=fts_ok,
         ready=db_connected and migration_ok and fts_ok,
     )
+
+
+@router.get("/cache", response_model=ResultCacheStats)
+async def result_cache_stats() -> ResultCacheStats:
+    """Counters of the worker that answers: each uvicorn worker has its own cache."""
+    return ResultCacheStats(**result_cache.stats())
+
+
+@router.get("/cache/search", response_model=ResultCacheStats)
+async def search_cache_stats() -> ResultCacheStats:
+    """The same counters for this worker's cache of search result pages."""
+    return ResultCacheStats(**search_cache.stats())
+
+
+@router.get("/cache/suggest", response_model=ResultCacheStats)
+async def suggest_cache_stats() -> ResultCacheStats:
+    """The same counters for this worker's one-entry cache of the suggest index."""
+    return ResultCacheStats(**suggest_cache.stats())
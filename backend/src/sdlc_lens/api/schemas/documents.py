@@ -14,26 +14,31 @@ class SortField(StrEnum):
 
 
 class DocumentListItem(BaseModel):
-    doc_id: str
-    type: str
-    title: str
-    status: str | None
-    owner: str | None
-    priority: str | None
-    story_points: int | None
-    epic: str | None
-    story: str | None
-    updated_at: datetime.datetime
+    # Every field is optional because ?fields= can ask for a subset; the listing
+    # endpoint omits the ones not asked for rather than sending them as null.
+    doc_id: str | None = None
+    type: str | None = None
+    title: str | None = None
+    status: str | None = None
+    owner: str | None = None
+    priority: str | None = None
+    story_points: int | None = None
+    epic: str | None = None
+    story: str | None = None
+    updated_at: datetime.datetime | None = None
 
     model_config = {"from_attributes": True}
 
 
 class PaginatedDocuments(BaseModel):
     items: list[DocumentListItem]
-    total: int
+    # None (with pages) when the request passed include_total=false.
+    total: int | None
     page: int
     per_page: int
-    pages: int
+    pages: int | None
+    # Pass back as ?cursor= for the next page; None on the last page.
+    next_cursor: str | None = None
 
 
 class DocumentDetail(BaseModel):
@@ -62,6 +67,18 @@ class RelatedDocumentItem(BaseModel):
     status: str | None
 
 
+class SimilarDocumentItem(RelatedDocumentItem):
+    # Estimated share of the two documents' words they have in common, 0 to 1.
+    score: float
+
+
+class SimilarDocuments(BaseModel):
+    doc_id: str
+    type: str
+    title: str
+    similar: list[SimilarDocumentItem]
+
+
 class DocumentRelationships(BaseModel):
     doc_id: str
     type: str
@@ -70,3 +87,5 @@ class DocumentRelationships(BaseModel):
     children: list[RelatedDocumentItem]
     depends_on: list[RelatedDocumentItem] = []
     dependents: list[RelatedDocumentItem] = []
+    # Documents whose body mentions this one ("what links here").
+    mentioned_by: list[RelatedDocumentItem] = []
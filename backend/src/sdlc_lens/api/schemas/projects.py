@@ -139,3 +139,18 @@ class ErrorDetail(BaseModel):
 
 class ErrorResponse(BaseModel):
     error: ErrorDetail
+
+
+class DiscoverySkip(BaseModel):
+    sdlc_path: str
+    reason: str
+
+
+class DiscoveryResponse(BaseModel):
+    """Outcome of a discovery scan of allowed_project_base."""
+
+    found: int
+    already_registered: int
+    registered: list[str]
+    skipped: list[DiscoverySkip]
+    message: str
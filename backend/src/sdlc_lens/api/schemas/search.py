@@ -1,5 +1,7 @@
 """Pydantic schemas for search endpoints."""
 
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -16,11 +18,53 @@ class SearchResultItem(BaseModel):
     score: float
 
 
+class SearchFacets(BaseModel):
+    """How many of the matches fall in each project, type and status ("null": none)."""
+
+    by_project: dict[str, int]
+    by_type: dict[str, int]
+    by_status: dict[str, int]
+
+
 class SearchResponse(BaseModel):
     """Response body for the full-text search endpoint."""
 
     items: list[SearchResultItem]
-    total: int
+    # None when the request passed include_total=false.
+    total: int | None
+    # None when the request passed include_facets=false.
+    facets: SearchFacets | None = None
+    # The index that answered: whole words, or substrings (trigram).
+    mode: Literal["words", "substring"] = "words"
     query: str
     page: int = Field(default=1)
     per_page: int = Field(default=20)
+    # Pass back as ?cursor= for the next page; None on the last page.
+    next_cursor: str | None = None
+
+
+class SuggestedTerm(BaseModel):
+    """A completion of the query's last word from the corpus's vocabulary."""
+
+    term: str
+    # How many documents the term appears in (a lower bound).
+    documents: int
+    # The whole query with its last word completed.
+    text: str
+
+
+class SuggestedDocument(BaseModel):
+    """A document whose id or title starts with the query."""
+
+    doc_id: str
+    title: str
+    type: str
+    project_slug: str
+
+
+class SuggestResponse(BaseModel):
+    """Response body for the search suggestion endpoint."""
+
+    query: str
+    terms: list[SuggestedTerm]
+    documents: list[SuggestedDocument]
@@ -13,3 +13,22 @@ class HealthResponse(BaseModel):
     migration_ok: bool
     fts_ok: bool
     ready: bool
+
+
+class ResultCacheStats(BaseModel):
+    """One of this worker's result caches: its occupancy, bounds and lifetime counters."""
+
+    entries: int
+    size_bytes: int
+    max_entries: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    # hits / (hits + misses), 0.0 before the first lookup.
+    hit_rate: float
+    # Single-flight and the computation limit.
+    in_flight: int
+    max_concurrent: int
+    coalesced: int
+    rejected: int
@@ -1,5 +1,8 @@
 """Application configuration via environment variables."""
 
+from typing import Literal
+
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
@@ -10,6 +13,25 @@ class Settings(BaseSettings):
     port: int = 8000
     database_url: str = "sqlite+aiosqlite:///data/db/sdlc_lens.db"
     log_level: str = "INFO"
+    # SQLite performance profile, applied to every connection (see db/session.py). WAL
+    # lets GET endpoints read the last committed snapshot while a sync writes; use
+    # "delete" on a filesystem without shared-memory support, e.g. a network mount
+    # (env SDLC_LENS_SQLITE_JOURNAL_MODE).
+    sqlite_journal_mode: Literal["wal", "delete", "truncate", "persist"] = "wal"
+    # NORMAL is durable under WAL except across an OS crash or power loss, where the last
+    # commits may roll back; the corpus is re-derivable from its source by a sync.
+    sqlite_synchronous: Literal["off", "normal", "full", "extra"] = "normal"
+    # How long a connection waits on a lock before failing with "database is locked".
+    sqlite_busy_timeout_ms: int = 5000
+    # Memory-mapped I/O window; 0 disables it.
+    sqlite_mmap_size_bytes: int = 256 * 1024 * 1024
+    # Page cache per connection, in KiB.
+    sqlite_cache_size_kib: int = 64 * 1024
+    sqlite_temp_store: Literal["default", "file", "memory"] = "memory"
+    # Pooled read-only connections for GET endpoints (the writer is always exactly one).
+    sqlite_reader_pool_size: int = 4
+    # How long a write waits for the single writer connection before failing.
+    sqlite_writer_pool_timeout_seconds: float = 30.0
     # Optional allowlist base for local project sdlc_path values. When set, any
     # local sdlc_path must resolve to a location within this directory. When
     # None (default), no restriction is applied (backward compatible).
@@ -26,6 +48,56 @@ class Settings(BaseSettings):
     # Ceiling on the exponential backoff applied to a project that keeps failing its poll,
     # so an expired token cannot have us hammering GitHub every tick for ever.
     sync_poll_max_backoff_seconds: int = 3600
+    # Seconds between periodic discovery scans of allowed_project_base for new local
+    # projects. 0 (default) disables the rescan; POST /projects/discover still scans on
+    # demand (env SDLC_LENS_DISCOVERY_INTERVAL_SECONDS).
+    discovery_interval_seconds: int = 0
+    # How many newly discovered projects sync at once. Every sync writes to the same
+    # SQLite database, so more than a handful only queue on its write lock.
+    discovery_sync_concurrency: int = 4
+    # How local projects with auto_sync on are watched for changes: "auto" uses inotify,
+    # falling back to polling a tree fingerprint on network mounts and off Linux;
+    # "inotify" and "poll" force one; "off" disables local auto-sync
+    # (env SDLC_LENS_LOCAL_WATCH_MODE).
+    local_watch_mode: Literal["auto", "inotify", "poll", "off"] = "auto"
+    # Quiet period after the last change before a watched local project syncs, so a burst
+    # of edits (a git checkout) is one sync.
+    local_watch_debounce_seconds: float = 1.5
+    # Seconds between tree-fingerprint checks of local projects that cannot use inotify.
+    local_watch_poll_interval_seconds: float = 5.0
+    # Lifetime of the leader lease that elects the ONE worker (of several uvicorn workers)
+    # that runs the poller and the startup housekeeping. The leader renews it every third
+    # of this; a dead leader is replaced within it (env SDLC_LENS_LEADER_LEASE_TTL_SECONDS).
+    leader_lease_ttl_seconds: int = 30
+    # How often each worker checks the cache_generations table for changes made by other
+    # workers and drops its stale in-memory caches. 0 disables the watcher
+    # (env SDLC_LENS_CACHE_COHERENCE_INTERVAL_SECONDS).
+    cache_coherence_interval_seconds: float = 2.0
+    # Bounds of each worker's cache of computed stats, health checks and relationships
+    # (services/result_cache.py): at most this many entries and roughly this many bytes
+    # of serialised answers. 0 entries disables it
+    # (env SDLC_LENS_RESULT_CACHE_MAX_ENTRIES / SDLC_LENS_RESULT_CACHE_MAX_BYTES).
+    result_cache_max_entries: int = 1024
+    result_cache_max_bytes: int = 32 * 1024 * 1024
+    # Bounds of each worker's cache of search result pages, kept apart from the one above
+    # so that a stream of one-off queries cannot evict the dashboard's reports. 0 entries
+    # disables it (env SDLC_LENS_SEARCH_CACHE_MAX_ENTRIES / SDLC_LENS_SEARCH_CACHE_MAX_BYTES).
+    search_cache_max_entries: int = 512
+    search_cache_max_bytes: int = 16 * 1024 * 1024
+    # Roughly how many bytes the one cached suggest index may hold; a corpus whose index
+    # is larger rebuilds it per request (env SDLC_LENS_SUGGEST_CACHE_MAX_BYTES).
+    suggest_cache_max_bytes: int = 64 * 1024 * 1024
+    # Estimated Jaccard index of two documents' words (0-1) from which the health check
+    # reports them as near-duplicates - copy-pasted stories and plans
+    # (env SDLC_LENS_NEAR_DUPLICATE_THRESHOLD). 0 would pair every two documents, so it
+    # is refused at startup, as is anything over 1.
+    near_duplicate_threshold: float = Field(0.8, gt=0, le=1)
+    # How many stats / health-check / relationship computations one worker runs at once.
+    # Further requests that would need another are answered 503 with this Retry-After, so
+    # a burst of dashboards cannot starve the sync writer. 0 removes the limit
+    # (env SDLC_LENS_HEAVY_REQUEST_CONCURRENCY).
+    heavy_request_concurrency: int = 4
+    heavy_request_retry_after_seconds: int = 2
 
 
 settings = Settings()
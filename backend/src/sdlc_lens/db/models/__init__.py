@@ -1,6 +1,27 @@
 from sdlc_lens.db.models.base import Base
+from sdlc_lens.db.models.cache_generation import CacheGeneration
 from sdlc_lens.db.models.document import Document
+from sdlc_lens.db.models.document_content import DocumentContent
+from sdlc_lens.db.models.document_ref import DocumentRef
+from sdlc_lens.db.models.document_similarity import DocumentBand, DocumentSignature
 from sdlc_lens.db.models.github_connection import GitHubConnection
+from sdlc_lens.db.models.health_report import HealthReport, HealthReportFinding
+from sdlc_lens.db.models.lease import Lease
 from sdlc_lens.db.models.project import Project
+from sdlc_lens.db.models.sync_checkpoint import SyncCheckpoint
 
-__all__ = ["Base", "Document", "GitHubConnection", "Project"]
+__all__ = [
+    "Base",
+    "CacheGeneration",
+    "Document",
+    "DocumentBand",
+    "DocumentContent",
+    "DocumentRef",
+    "DocumentSignature",
+    "GitHubConnection",
+    "HealthReport",
+    "HealthReportFinding",
+    "Lease",
+    "Project",
+    "SyncCheckpoint",
+]
@@ -0,0 +1,19 @@
+"""SQLAlchemy CacheGeneration model.
+
+A monotonically increasing counter per invalidation scope. A worker that changes the
+data behind a scope bumps its counter in the same transaction; every other worker sees
+the counter move and drops the in-memory state it derived from the old data. It is the
+cross-process invalidation channel - the counter itself carries no data.
+"""
+
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from sdlc_lens.db.models.base import Base
+
+
+class CacheGeneration(Base):
+    __tablename__ = "cache_generations"
+
+    scope: Mapped[str] = mapped_column(String(100), primary_key=True)
+    generation: Mapped[int] = mapped_column(nullable=False, default=0)
@@ -2,15 +2,58 @@
 
 import datetime
 
-from sqlalchemy import ForeignKey, String, Text, UniqueConstraint, func
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import (
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    UniqueConstraint,
+    delete,
+    event,
+    exists,
+    func,
+    insert,
+    inspect,
+    select,
+)
+from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 
 from sdlc_lens.db.models.base import Base
+from sdlc_lens.db.models.document_content import DocumentContent, content_digest, deflate
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.utils.sdlc_ids import extract_ref_ids
 
 
 class Document(Base):
     __tablename__ = "documents"
-    __table_args__ = (UniqueConstraint("project_id", "file_path"),)
+    __table_args__ = (
+        UniqueConstraint("project_id", "file_path"),
+        # Access-path indexes (migration 017). Each serves named queries, and
+        # tests/test_query_plans.py fails if one of those degrades to a table scan or a
+        # temp B-tree sort - change a query or an index and that suite says which broke.
+        #
+        # Stats by type / story completion (covering), list filtered by type and sorted by
+        # status, and list sorted by type.
+        Index("ix_documents_project_type_status", "project_id", "doc_type", "status"),
+        # Stats by status (covering), list filtered by status in the default order, and
+        # list sorted by status.
+        Index("ix_documents_project_status_synced", "project_id", "status", "synced_at"),
+        # The list's default order (newest first), unfiltered and filtered by type.
+        Index("ix_documents_project_synced", "project_id", "synced_at"),
+        Index("ix_documents_project_type_synced", "project_id", "doc_type", "synced_at"),
+        # The list sorted by title, unfiltered and filtered by type.
+        Index("ix_documents_project_title", "project_id", "title"),
+        Index("ix_documents_project_type_title", "project_id", "doc_type", "title"),
+        # get_document: the detail page's (project, type, id) lookup.
+        Index("ix_documents_project_type_doc_id", "project_id", "doc_type", "doc_id"),
+        # The list sorted by status or by type, unfiltered (migration 019). The listing's
+        # order is (sort column, id) so that keyset cursors are exact, and only an index
+        # whose next column after the sort column is the implicit rowid serves that - not
+        # the wider ones above, of which these look like prefixes. Without them the page
+        # sorts through a temp B-tree (tests/test_query_plans.py::TestCursorPages).
+        Index("ix_documents_project_status", "project_id", "status"),
+        Index("ix_documents_project_type", "project_id", "doc_type"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"))
@@ -36,7 +79,17 @@ class Document(Base):
     # parsing/inference/canonicalisation logic changes; a row below the current epoch is
     # re-parsed on the next sync even if its content hash is unchanged. 0 = pre-epoch.
     parser_epoch: Mapped[int | None] = mapped_column(nullable=True, default=0)
-    content: Mapped[str] = mapped_column(Text, nullable=False)
+    # The body lives in document_contents (migration 020), keyed by this hash; read and
+    # write it through the ``content`` property below.
+    content_hash: Mapped[str | None] = mapped_column(
+        String(64), ForeignKey("document_contents.hash"), nullable=True, index=True
+    )
+    # Not loaded unless a query asks for it with joinedload(Document.stored_content): the
+    # detail page does, the listings, relationship resolution and the sync's diff - which
+    # never read a body - do not, and so never join document_contents or inflate one.
+    # Reading ``content`` on a Document loaded without it raises ("raise" rather than
+    # "noload", which would quietly read every unloaded body as empty).
+    stored_content: Mapped[DocumentContent | None] = relationship(lazy="raise", viewonly=True)
     file_path: Mapped[str] = mapped_column(Text, nullable=False)
     # sha256 of the raw bytes. Ours, not git's - used to skip a byte-unchanged file.
     file_hash: Mapped[str] = mapped_column(String(64), nullable=False)
@@ -52,3 +105,115 @@ class Document(Base):
     # file is skipped and the NULL persists forever (RFC-01KXARHK, D1).
     blob_sha: Mapped[str | None] = mapped_column(String(40), nullable=True)
     synced_at: Mapped[datetime.datetime] = mapped_column(nullable=False, server_default=func.now())
+
+    @property
+    def content(self) -> str:
+        """The markdown body (frontmatter stripped), decompressed on first read.
+
+        The stored body is loaded only by queries that ask for it (see
+        ``stored_content``); under asyncio an unloaded one cannot be fetched here, and
+        reading it then raises rather than blocking. Assigning it sets ``content_hash``,
+        and the next flush stores the body.
+        """
+        cached = self.__dict__.get("_content")
+        if cached is not None and cached[0] == self.content_hash:
+            return cached[1]
+        stored = self.stored_content
+        text = stored.text if stored is not None else ""
+        self.__dict__["_content"] = (self.content_hash, text)
+        return text
+
+    @content.setter
+    def content(self, text: str) -> None:
+        self.content_hash = content_digest(text)
+        self.__dict__["_content"] = (self.content_hash, text)
+
+    @property
+    def mentions(self) -> list[str]:
+        """The artefact ids the body mentions, normalised, first mention first.
+
+        The sync hands over the ones the parser found (services/parser.py); for a body
+        written any other way - a fixture, a backfill - they are extracted from it here,
+        once per body. Assign after ``content``: the ids are kept for the current body
+        only.
+        """
+        cached = self.__dict__.get("_mentions")
+        if cached is not None and cached[0] == self.content_hash:
+            return cached[1]
+        mentions = extract_ref_ids(self.content)
+        self.__dict__["_mentions"] = (self.content_hash, mentions)
+        return mentions
+
+    @mentions.setter
+    def mentions(self, ids: list[str] | None) -> None:
+        if ids is None:
+            self.__dict__.pop("_mentions", None)
+        else:
+            self.__dict__["_mentions"] = (self.content_hash, list(ids))
+
+
+def _hash_changed(doc: Document) -> bool:
+    return inspect(doc).attrs.content_hash.history.has_changes()
+
+
+@event.listens_for(Session, "before_flush")
+def _store_document_bodies(session: Session, flush_context, instances) -> None:
+    """Write the body of every Document this flush inserts or points at a new body.
+
+    Before the flush, so each body exists by the time the documents.content_hash foreign
+    key is checked. ``INSERT OR IGNORE``: a body already stored - unchanged, or shared
+    with another document - is left as it is.
+    """
+    bodies: dict[str, str] = {}
+    for doc in [*session.new, *session.dirty]:
+        if not isinstance(doc, Document) or doc in session.deleted:
+            continue
+        cached = doc.__dict__.get("_content")
+        if (
+            cached is not None
+            and cached[0] == doc.content_hash
+            and (doc in session.new or _hash_changed(doc))
+        ):
+            bodies[cached[0]] = cached[1]
+    if not bodies:
+        return
+    session.connection().execute(
+        insert(DocumentContent).prefix_with("OR IGNORE"),
+        [
+            {"hash": digest, "body": deflate(text), "size": len(text.encode())}
+            for digest, text in bodies.items()
+        ],
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _prune_document_bodies(session: Session, flush_context) -> None:
+    """Delete the bodies that the documents this flush deleted or re-pointed left behind.
+
+    Only those bodies, and only when no other document still references them. Deleting a
+    project removes its documents in the database (ON DELETE CASCADE), out of the ORM's
+    sight, so there every unreferenced body is swept instead.
+    """
+    released: set[str] = set()
+    sweep = False
+    for obj in session.deleted:
+        if isinstance(obj, Document):
+            # Read without loading: an expired attribute of a deleted row cannot be.
+            digest = inspect(obj).dict.get("content_hash")
+            released.add(digest)
+            sweep = sweep or "content_hash" not in inspect(obj).dict
+        elif isinstance(obj, Project):
+            sweep = True
+    for doc in session.dirty:
+        if isinstance(doc, Document) and doc not in session.deleted:
+            released.update(inspect(doc).attrs.content_hash.history.deleted)
+    released.discard(None)
+    if not released and not sweep:
+        return
+    unreferenced = ~exists(
+        select(Document.id).where(Document.content_hash == DocumentContent.hash)
+    )
+    stmt = delete(DocumentContent).where(unreferenced)
+    if not sweep:
+        stmt = stmt.where(DocumentContent.hash.in_(released))
+    session.connection().execute(stmt)
@@ -0,0 +1,126 @@
+"""SQLAlchemy DocumentContent model - document bodies, stored off-row and compressed.
+
+A document's markdown body is most of its bytes, and it used to live inline in the
+``documents`` row. Every query that walks ``documents`` - the stats group-bys, the
+listings, the relationship lookups - then dragged those bodies (and their overflow
+pages) through the page cache while reading nothing but a few short columns.
+
+Bodies now live here instead, one row per distinct body:
+
+* keyed by the sha256 of the text, so byte-identical bodies (the same file in two
+  projects, or on two branches of one repository) are stored once;
+* zlib-compressed, which markdown takes well (typically 3-4x);
+* referenced from ``documents.content_hash``; ``Document.content`` reads and writes
+  through that reference, so code that deals in Documents does not change.
+
+A body is written (``INSERT OR IGNORE``) when a flush stores a document carrying it, and
+deleted when the last document referencing it goes; see the flush listeners in
+db/models/document.py.
+
+SQL that needs the text - the FTS5 indexes, whose external content is the
+``documents_fts_source`` and ``documents_trigram_source`` views below - decompresses it
+with ``sdlc_inflate()``, a Python function registered on every connection SQLAlchemy
+opens. A raw ``sqlite3`` shell has no such function, so there a search snippet, an FTS
+rebuild or a write to ``documents`` (whose triggers maintain the trigram index) fails
+with "no such function"; everything else in the database reads as before.
+"""
+
+import hashlib
+import zlib
+
+from sqlalchemy import DDL, Engine, LargeBinary, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from sdlc_lens.db.models.base import Base
+
+# zlib's default: within a few percent of level 9 on markdown, at a fraction of the CPU.
+_COMPRESSION_LEVEL = 6
+
+
+class DocumentContent(Base):
+    __tablename__ = "document_contents"
+
+    # sha256 (hex) of the UTF-8 body - see content_digest().
+    hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    # zlib-compressed UTF-8 body.
+    body: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    # Uncompressed size in bytes, so sizes can be reported without inflating anything.
+    size: Mapped[int] = mapped_column(nullable=False)
+
+    @property
+    def text(self) -> str:
+        """The body, decompressed."""
+        return inflate(self.body)
+
+
+def content_digest(text: str) -> str:
+    """The key a body is stored under: the sha256 of its UTF-8 encoding."""
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def deflate(text: str) -> bytes:
+    """Compress a body for storage."""
+    return zlib.compress(text.encode(), _COMPRESSION_LEVEL)
+
+
+def inflate(body: bytes | None, limit: int | None = None) -> str | None:
+    """Decompress a stored body; with ``limit``, only its first ``limit`` bytes.
+
+    The limited form stops decompressing once it has ``limit`` bytes, so reading the
+    head of a large body costs the head, not the body. A multi-byte character cut in
+    half at the limit is dropped.
+    """
+    if body is None:
+        return None
+    if limit is None:
+        return zlib.decompress(body).decode()
+    return zlib.decompressobj().decompress(body, limit).decode(errors="ignore")
+
+
+@event.listens_for(Engine, "connect")
+def _register_sqlite_functions(dbapi_conn, connection_record) -> None:
+    """Make ``sdlc_inflate(body [, limit])`` available to SQL on every connection.
+
+    Registered on the Engine class, not on one engine, so the app's reader and writer
+    engines, Alembic's migration engine and the test suite's engines all have it.
+    """
+    create_function = getattr(dbapi_conn, "create_function", None)
+    if create_function is None:
+        return
+    create_function("sdlc_inflate", 1, inflate, deterministic=True)
+    create_function("sdlc_inflate", 2, inflate, deterministic=True)
+
+
+# The key tokens a document is indexed under, one per filter column of the FTS5 table
+# (see services/fts.py, whose project_key()/type_key() build the same tokens for a
+# query). The doc type is hex-encoded so that "test-spec" stays ONE token under the
+# unicode61 tokenizer instead of matching the type "test" as well.
+FTS_PROJECT_KEY_SQL = "'p' || d.project_id"
+FTS_TYPE_KEY_SQL = "'t' || lower(hex(d.doc_type))"
+
+# The FTS5 index's external content: the documents' rowids and titles with their bodies,
+# and the filter keys. FTS5 reads it to build the index ('rebuild') and to cut snippet()
+# excerpts.
+FTS_SOURCE_VIEW_NAME = "documents_fts_source"
+FTS_SOURCE_VIEW_SQL = (
+    f"CREATE VIEW IF NOT EXISTS {FTS_SOURCE_VIEW_NAME} AS "
+    "SELECT d.id AS id, d.title AS title, sdlc_inflate(c.body) AS content, "
+    f"{FTS_PROJECT_KEY_SQL} AS project_key, {FTS_TYPE_KEY_SQL} AS type_key "
+    "FROM documents d LEFT JOIN document_contents c ON c.hash = d.content_hash"
+)
+
+# The trigram index's external content (services/fts.py, migration 023): each document's
+# id, title and body, for substring matching.
+TRIGRAM_SOURCE_VIEW_NAME = "documents_trigram_source"
+TRIGRAM_SOURCE_VIEW_SQL = (
+    f"CREATE VIEW IF NOT EXISTS {TRIGRAM_SOURCE_VIEW_NAME} AS "
+    "SELECT d.id AS id, d.doc_id AS doc_id, d.title AS title, sdlc_inflate(c.body) AS content "
+    "FROM documents d LEFT JOIN document_contents c ON c.hash = d.content_hash"
+)
+
+# create_all()/drop_all() manage the views with the tables they read (Alembic does the
+# same in migrations 020, 022 and 023).
+event.listen(Base.metadata, "after_create", DDL(FTS_SOURCE_VIEW_SQL))
+event.listen(Base.metadata, "after_create", DDL(TRIGRAM_SOURCE_VIEW_SQL))
+event.listen(Base.metadata, "before_drop", DDL(f"DROP VIEW IF EXISTS {FTS_SOURCE_VIEW_NAME}"))
+event.listen(Base.metadata, "before_drop", DDL(f"DROP VIEW IF EXISTS {TRIGRAM_SOURCE_VIEW_NAME}"))
@@ -0,0 +1,99 @@
+"""SQLAlchemy DocumentRef model - the normalised reference edges between documents.
+
+A document names other documents in five ways: its ``Epic`` and ``Story`` fields, its
+``Depends on`` list, its migration ``Aliases`` and the ids mentioned in its body. The
+first four are stored on the document itself, and the lists as comma-joined text, which
+is fine for reading a document's OWN references but useless for the reverse question -
+"who depends on US0042?" - short of ``LIKE '%,US0042,%'`` over every row of the project.
+
+One row here per (document, kind, target) answers both directions through an index:
+the primary key leads with the source document, ``ix_document_refs_target`` with the
+project and target.
+
+The table is derived, never written directly. The flush listener below rebuilds a
+document's edges whenever it is inserted or any column they come from changes, in the
+same transaction, so it behaves like a trigger: every path that writes a Document (the
+sync, a test fixture, a backfill) keeps it current. Deleting a document removes its
+edges through the foreign key's ON DELETE CASCADE.
+"""
+
+from sqlalchemy import ForeignKey, Index, String, delete, event, insert, inspect
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from sdlc_lens.db.models.base import Base
+from sdlc_lens.db.models.document import Document
+from sdlc_lens.utils.sdlc_ids import reference_edges
+
+
+class DocumentRef(Base):
+    __tablename__ = "document_refs"
+    __table_args__ = (
+        # The reverse direction: the documents that reference a target, by kind.
+        Index("ix_document_refs_target", "project_id", "kind", "target_norm_id"),
+    )
+
+    # documents.id of the referencing document (not its doc_id string).
+    src_doc_id: Mapped[int] = mapped_column(
+        ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True
+    )
+    # One of utils.sdlc_ids.REF_* - "epic", "story", "depends_on", "alias", "mention".
+    kind: Mapped[str] = mapped_column(String(20), primary_key=True)
+    # The referenced id as norm_id() gives it - compared with documents.ref_id.
+    target_norm_id: Mapped[str] = mapped_column(String(60), primary_key=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"))
+    # Declared order within the kind, so a dependency list reads as it was written.
+    position: Mapped[int] = mapped_column(nullable=False, default=0)
+
+
+# The Document columns the edges are derived from.
+_SOURCE_COLUMNS = ("ref_id", "epic", "story", "depends_on", "aliases", "content_hash")
+
+
+def document_ref_rows(doc: Document) -> list[dict]:
+    """The ``document_refs`` rows for ``doc``'s current column values."""
+    return [
+        {
+            "src_doc_id": doc.id,
+            "project_id": doc.project_id,
+            "kind": kind,
+            "target_norm_id": target,
+            "position": position,
+        }
+        for kind, target, position in reference_edges(
+            ref_id=doc.ref_id,
+            epic=doc.epic,
+            story=doc.story,
+            depends_on=doc.depends_on,
+            aliases=doc.aliases,
+            mentions=doc.mentions,
+        )
+    ]
+
+
+def _edges_changed(doc: Document) -> bool:
+    state = inspect(doc)
+    return any(state.attrs[column].history.has_changes() for column in _SOURCE_COLUMNS)
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_document_refs(session: Session, flush_context) -> None:
+    """Rewrite the edges of every Document this flush inserted or re-derived.
+
+    ``after_flush`` still sees the flush's new/dirty sets and attribute history, and new
+    rows already have their ids. One DELETE and one executemany INSERT per flush.
+    """
+    docs = [obj for obj in session.new if isinstance(obj, Document)]
+    docs += [
+        obj
+        for obj in session.dirty
+        if isinstance(obj, Document) and obj not in session.deleted and _edges_changed(obj)
+    ]
+    if not docs:
+        return
+    connection = session.connection()
+    connection.execute(
+        delete(DocumentRef).where(DocumentRef.src_doc_id.in_([doc.id for doc in docs]))
+    )
+    rows = [row for doc in docs for row in document_ref_rows(doc)]
+    if rows:
+        connection.execute(insert(DocumentRef), rows)
@@ -0,0 +1,95 @@
+"""SQLAlchemy models of the similarity index - MinHash signatures and their LSH bands.
+
+"More like this" (services/similarity.py) needs, for any document, the documents of its
+project whose bodies share the most vocabulary. Comparing bodies at request time would
+read every body in the project; instead each document's body is reduced, when it is
+written, to a MinHash signature and that signature's LSH band buckets
+(utils/minhash.py). A lookup then reads the documents sharing a bucket with it - through
+``ix_document_bands_bucket`` - and compares only their signatures.
+
+Like ``document_refs`` both tables are derived, never written directly: the flush
+listener below rewrites a document's rows whenever it is inserted or its
+``content_hash`` changes, in the same transaction. A sync therefore updates the index
+for exactly the documents it changed, and a document whose body is unchanged is not
+touched. Deleting a document removes its rows through the foreign keys' ON DELETE
+CASCADE. A body with too few words to compare (utils.minhash.MIN_WORDS) has no rows.
+"""
+
+from sqlalchemy import BigInteger, ForeignKey, Index, LargeBinary, delete, event, insert, inspect
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from sdlc_lens.db.models.base import Base
+from sdlc_lens.db.models.document import Document
+from sdlc_lens.utils.minhash import band_buckets, pack, signature
+
+
+class DocumentSignature(Base):
+    __tablename__ = "document_signatures"
+
+    document_id: Mapped[int] = mapped_column(
+        ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True
+    )
+    # utils.minhash.SIGNATURE_SIZE little-endian unsigned 64-bit values.
+    signature: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+class DocumentBand(Base):
+    __tablename__ = "document_bands"
+    __table_args__ = (
+        # The documents of a project sharing a band's bucket: the LSH candidates.
+        Index("ix_document_bands_bucket", "project_id", "band", "bucket"),
+    )
+
+    document_id: Mapped[int] = mapped_column(
+        ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True
+    )
+    band: Mapped[int] = mapped_column(primary_key=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"))
+    bucket: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+
+def similarity_rows(document_id: int, project_id: int, body: str) -> tuple[list[dict], list[dict]]:
+    """The ``document_signatures`` and ``document_bands`` rows for a document's body."""
+    values = signature(body)
+    if values is None:
+        return [], []
+    signatures = [{"document_id": document_id, "signature": pack(values)}]
+    bands = [
+        {"document_id": document_id, "band": band, "project_id": project_id, "bucket": bucket}
+        for band, bucket in enumerate(band_buckets(values))
+    ]
+    return signatures, bands
+
+
+def _body_changed(doc: Document) -> bool:
+    return inspect(doc).attrs.content_hash.history.has_changes()
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_similarity_index(session: Session, flush_context) -> None:
+    """Rewrite the signature and bands of every Document this flush inserted or re-bodied.
+
+    One DELETE per table and one executemany INSERT per table per flush, as for
+    ``document_refs`` (db/models/document_ref.py).
+    """
+    docs = [obj for obj in session.new if isinstance(obj, Document)]
+    docs += [
+        obj
+        for obj in session.dirty
+        if isinstance(obj, Document) and obj not in session.deleted and _body_changed(obj)
+    ]
+    if not docs:
+        return
+    connection = session.connection()
+    ids = [doc.id for doc in docs]
+    connection.execute(delete(DocumentSignature).where(DocumentSignature.document_id.in_(ids)))
+    connection.execute(delete(DocumentBand).where(DocumentBand.document_id.in_(ids)))
+    signatures: list[dict] = []
+    bands: list[dict] = []
+    for doc in docs:
+        doc_signatures, doc_bands = similarity_rows(doc.id, doc.project_id, doc.content)
+        signatures += doc_signatures
+        bands += doc_bands
+    if signatures:
+        connection.execute(insert(DocumentSignature), signatures)
+        connection.execute(insert(DocumentBand), bands)
@@ -0,0 +1,61 @@
+"""SQLAlchemy models of the stored health report - a project's health findings, kept current.
+
+``GET /projects/{slug}/health-check`` used to load every document of the project and run
+every rule on each request. Instead the findings are computed when the documents change
+- at the end of a sync, and then only for what the sync touched
+(services/health_report.py) - and stored here, so the endpoint reads them back.
+
+``health_reports`` holds one row per project: the ``corpus_generation`` the stored
+findings are correct for, and the document count. The report is only used while that
+generation is the project's current one; a project whose documents moved any other way
+(or whose sync stopped part-way) is checked live until its next sync brings it up to
+date. ``health_findings`` holds the findings, each with the document it is about - the
+story missing a plan, the epic marked Done too early - or none for a project-level one,
+and all the documents it affects. Deleting a document removes the findings about it
+through the foreign key's ON DELETE CASCADE.
+
+STALE_DOCUMENT findings are not stored: they move with the clock rather than with the
+documents, and are worked out on read from ``ix_documents_project_synced``.
+"""
+
+from sqlalchemy import ForeignKey, Index, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from sdlc_lens.db.models.base import Base
+
+
+class HealthReport(Base):
+    __tablename__ = "health_reports"
+
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    # projects.corpus_generation as of the stored findings.
+    generation: Mapped[int] = mapped_column(nullable=False)
+    total_documents: Mapped[int] = mapped_column(nullable=False)
+
+
+class HealthReportFinding(Base):
+    __tablename__ = "health_findings"
+    __table_args__ = (
+        # Reading a project's report, and replacing its project-level findings.
+        Index("ix_health_findings_project", "project_id", "document_id"),
+        # Replacing the findings about given documents, and the cascade on deletion.
+        Index("ix_health_findings_document", "document_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"))
+    # documents.id of the document the finding is about; NULL for a project-level one.
+    document_id: Mapped[int | None] = mapped_column(
+        ForeignKey("documents.id", ondelete="CASCADE"), nullable=True
+    )
+    rule_id: Mapped[str] = mapped_column(String(40), nullable=False)
+    # Order among the findings of one rule about one document (or about the project).
+    position: Mapped[int] = mapped_column(nullable=False, default=0)
+    severity: Mapped[str] = mapped_column(String(10), nullable=False)
+    category: Mapped[str] = mapped_column(String(20), nullable=False)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    suggested_fix: Mapped[str] = mapped_column(Text, nullable=False)
+    # JSON [[documents.id, doc_id, doc_type, title], ...] - every document affected.
+    affected: Mapped[str] = mapped_column(Text, nullable=False)
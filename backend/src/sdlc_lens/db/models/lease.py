@@ -0,0 +1,24 @@
+"""SQLAlchemy Lease model.
+
+A named, time-limited claim held by one worker process. Used for leader election
+when several uvicorn workers share one database: the worker whose lease is live does
+the once-per-deployment work (the freshness poller, startup housekeeping); the others
+stand by and take over when it stops renewing.
+"""
+
+import datetime
+
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from sdlc_lens.db.models.base import Base
+
+
+class Lease(Base):
+    __tablename__ = "leases"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    # "{hostname}:{pid}:{nonce}" of the worker holding it.
+    holder: Mapped[str] = mapped_column(String(255), nullable=False)
+    # UTC. Past this instant the lease is free for anyone to take.
+    expires_at: Mapped[datetime.datetime] = mapped_column(nullable=False)
@@ -48,8 +48,9 @@ class Project(Base):
     # unrelated document happened to change. NULL = unknown: re-read the config.
     config_blob_shas: Mapped[str | None] = mapped_column(Text, nullable=True)
     last_synced_at: Mapped[datetime.datetime | None] = mapped_column(nullable=True)
-    # Per-project opt-in to background polling. Default OFF: an existing project keeps
-    # behaving exactly as it does today until the operator asks otherwise.
+    # Per-project opt-in to background syncing - the freshness poller for a GitHub project,
+    # the file watcher for a local one. Default OFF: an existing project keeps behaving
+    # exactly as it does today until the operator asks otherwise.
     auto_sync: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=false())
     # The branch head as at the last SUCCESSFUL sync. The poller syncs only when the
     # current head differs from this.
@@ -58,6 +59,17 @@ class Project(Base):
     # ever afterwards, so the failure would never be retried and the project would stay
     # silently stale while reporting nothing wrong (CR-01KXCAZJ). NULL = "assume it moved".
     last_synced_commit_sha: Mapped[str | None] = mapped_column(String(40), nullable=True)
+    # Set by DELETE /projects/{slug}/sync while a sync is running. The sync engine reads it
+    # at every checkpoint and stops cleanly at the next batch boundary; trigger_sync clears
+    # it, so a stale request can never cancel the NEXT sync.
+    sync_cancel_requested: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, server_default=false()
+    )
+    # Moves (only) when a sync or deletion changes this project's documents - see
+    # coherence.bump_corpus_generation. The validator behind the ETags of every read that
+    # is derived from the project's documents; a sync that changed nothing leaves it be,
+    # so clients keep their cached copies.
+    corpus_generation: Mapped[int] = mapped_column(nullable=False, server_default="0")
     created_at: Mapped[datetime.datetime] = mapped_column(
         nullable=False, server_default=func.now()
     )
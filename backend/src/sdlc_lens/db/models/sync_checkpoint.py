@@ -0,0 +1,42 @@
+"""SQLAlchemy SyncCheckpoint model.
+
+The durable progress record of a sync that is still in flight. A sync commits its
+document writes in batches and records, after each batch, the manifest it is working
+from and the paths it has already processed. A sync that dies part-way (a redeploy, an
+OOM, a cancellation) therefore leaves its finished work committed and this row behind,
+and the next run picks up from it instead of starting from zero.
+
+At most one per project. The row is deleted in the same commit that finishes the sync,
+so its mere presence means "the last sync did not complete".
+"""
+
+import datetime
+
+from sqlalchemy import ForeignKey, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from sdlc_lens.db.models.base import Base
+
+
+class SyncCheckpoint(Base):
+    __tablename__ = "sync_checkpoints"
+
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    # "running" while a sync owns it - and still "running" if the process died under it,
+    # which is what makes it resumable at startup. "cancelled" when an operator stopped it:
+    # the progress is kept for the next manual sync, but startup must not un-cancel it.
+    state: Mapped[str] = mapped_column(String(20), nullable=False, server_default="running")
+    # JSON {relative_path: git blob SHA} - the complete manifest the sync was working from.
+    manifest: Mapped[str] = mapped_column(Text, nullable=False, server_default="{}")
+    # JSON list of the manifest paths whose documents are already committed.
+    processed_paths: Mapped[str] = mapped_column(Text, nullable=False, server_default="[]")
+    # How the interrupted run fetched its files ("local", "tarball", "incremental").
+    fetch_path: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    started_at: Mapped[datetime.datetime] = mapped_column(
+        nullable=False, server_default=func.now()
+    )
+    updated_at: Mapped[datetime.datetime] = mapped_column(
+        nullable=False, server_default=func.now(), onupdate=func.now()
+    )
@@ -1,24 +1,118 @@
-"""Async SQLAlchemy engine and session factory."""
+"""Async SQLAlchemy engines and session factories.
+
+Two engines over the one SQLite file, because SQLite's concurrency model is "many
+readers, one writer" and the app should be shaped the same way:
+
+* the **writer** - a single connection, used by syncs, mutations and the background
+  work that writes (the lease heartbeat, a poll that records a change). SQLite admits
+  one writer at a time whatever we do; a one-connection pool makes the contenders queue
+  in-process, in order, instead of spinning on SQLITE_BUSY. That queue is why nothing
+  may hold the writer longer than its writes take: a session that has written keeps
+  the connection until it commits, so network fetches happen outside writer
+  transactions.
+* the **reader** - a pool of ``query_only`` connections, used by the GET endpoints and
+  by the background work that only reads (the coherence watcher in every worker, a
+  follower's look at the leader lease, the poller's sweep).
+
+Under the default rollback journal the split would buy nothing: a writing transaction
+locks readers out, so a dashboard froze for as long as a sync batch was being written.
+The performance profile below therefore puts the database in WAL mode, where readers
+read the last committed snapshot while the writer carries on, and tunes the rest of the
+connection (``synchronous``, ``busy_timeout``, ``mmap_size``, ``cache_size``,
+``temp_store``). Every knob is a setting; see config.py.
+
+An in-memory database is private to its connection, so there the reader is simply the
+writer.
+"""
 
 from collections.abc import AsyncGenerator
 
 from sqlalchemy import event
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from sdlc_lens.config import settings
 
-engine = create_async_engine(settings.database_url, echo=False)
-async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
 
+def _is_memory_database(url: str) -> bool:
+    database = make_url(url).database
+    return not database or database == ":memory:" or "mode=memory" in url
+
+
+def connection_pragmas(*, reader: bool) -> list[str]:
+    """The PRAGMAs every new connection runs, in order."""
+    pragmas = [
+        "PRAGMA foreign_keys=ON",
+        f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}",
+        f"PRAGMA synchronous={settings.sqlite_synchronous.upper()}",
+        # Negative = KiB rather than pages, so the budget does not depend on page size.
+        f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kib)}",
+        f"PRAGMA mmap_size={int(settings.sqlite_mmap_size_bytes)}",
+        f"PRAGMA temp_store={settings.sqlite_temp_store.upper()}",
+    ]
+    if reader:
+        # A GET that tried to write would be a bug; make it a loud one.
+        pragmas.append("PRAGMA query_only=ON")
+    else:
+        # Persistent in the database file; setting it again on each connect is a no-op.
+        pragmas.insert(1, f"PRAGMA journal_mode={settings.sqlite_journal_mode.upper()}")
+    return pragmas
+
+
+def install_pragmas(engine: AsyncEngine, *, reader: bool) -> None:
+    """Run :func:`connection_pragmas` on every connection ``engine`` opens."""
+    pragmas = connection_pragmas(reader=reader)
 
-@event.listens_for(engine.sync_engine, "connect")
-def _set_sqlite_pragma(dbapi_conn, connection_record):
-    cursor = dbapi_conn.cursor()
-    cursor.execute("PRAGMA foreign_keys=ON")
-    cursor.close()
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def create_engines(url: str) -> tuple[AsyncEngine, AsyncEngine]:
+    """The (writer, reader) engine pair for ``url``."""
+    if _is_memory_database(url):
+        writer = create_async_engine(url, echo=False)
+        install_pragmas(writer, reader=False)
+        return writer, writer
+
+    writer = create_async_engine(
+        url,
+        echo=False,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.sqlite_writer_pool_timeout_seconds,
+    )
+    install_pragmas(writer, reader=False)
+    reader = create_async_engine(
+        url,
+        echo=False,
+        pool_size=settings.sqlite_reader_pool_size,
+        max_overflow=settings.sqlite_reader_pool_size,
+    )
+    install_pragmas(reader, reader=True)
+    return writer, reader
+
+
+engine, read_engine = create_engines(settings.database_url)
+async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
+read_session_factory = async_sessionmaker(read_engine, expire_on_commit=False)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency that yields an async database session."""
+    """Dependency that yields an async database session on the writer."""
     async with async_session_factory() as session:
         yield session
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency that yields a read-only session, for endpoints that never write."""
+    async with read_session_factory() as session:
+        yield session
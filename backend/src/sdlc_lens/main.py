@@ -1,5 +1,7 @@
 """FastAPI application factory."""
 
+import asyncio
+import datetime
 import logging
 import sys
 from collections.abc import AsyncGenerator
@@ -17,7 +19,8 @@ from sdlc_lens.api.routes.search import router as search_router
 from sdlc_lens.api.routes.stats import router as stats_router
 from sdlc_lens.api.routes.system import router as system_router
 from sdlc_lens.config import settings
-from sdlc_lens.db.session import async_session_factory
+from sdlc_lens.db.session import async_session_factory, read_session_factory
+from sdlc_lens.services.result_cache import OverloadedError
 from sdlc_lens.version import get_version
 
 logger = logging.getLogger(__name__)
@@ -106,30 +109,84 @@ def _warn_if_tokens_are_plaintext() -> None:
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan - startup and shutdown."""
-    from sdlc_lens.services.poller import reset_stuck_syncing, start_poller, stop_poller
+    from sdlc_lens.services.coherence import start_coherence_watcher, stop_coherence_watcher
+    from sdlc_lens.services.discovery import start_discovery
+    from sdlc_lens.services.leader import start_leader_election, stop_leader_election
+    from sdlc_lens.services.poller import (
+        reset_stuck_syncing,
+        resume_interrupted_syncs,
+        start_poller,
+        stop_poller,
+    )
+    from sdlc_lens.services.watcher import start_local_watcher
 
     _warn_if_tokens_are_plaintext()
 
-    # A project left in "syncing" by a hard stop (a container redeploy, an OOM) is locked
-    # out for ever: trigger_sync refuses it and nothing else resets it. A "syncing" status
-    # at startup cannot be real - no sync survived the process running it - so clear it.
-    #
-    # Best-effort by design. This is housekeeping, and housekeeping must never stop the app
-    # from BOOTING: a database that is not ready yet is a reason to log and carry on, not a
-    # reason to take the whole service down.
-    try:
-        await reset_stuck_syncing(app.state.session_factory)
-    except Exception:
-        logger.exception("Could not reset stuck 'syncing' projects at startup; continuing")
+    # Naive UTC, as SQLite stores it: what the housekeeping below tells a sync left by a
+    # previous process from one started since.
+    booted_at = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+    session_factory = app.state.session_factory
+    # Background work that only reads goes to the reader pool, so that the single writer
+    # connection (db/session.py) is left to the work that writes.
+    read_factory = app.state.read_session_factory
+    resumed: list[asyncio.Task] = []
+
+    async def _housekeeping() -> None:
+        # A project left in "syncing" by a hard stop (a container redeploy, an OOM) is
+        # locked out for ever: trigger_sync refuses it and nothing else resets it. A
+        # "syncing" status at startup cannot be real - no sync survived the process running
+        # it - so clear it.
+        #
+        # Run by the elected leader alone: under several uvicorn workers, one worker's
+        # startup is not its peers', and they may be mid-sync. And run once elected,
+        # while the app is already serving, so a sync started since boot is left alone.
+        #
+        # Best-effort by design. This is housekeeping, and housekeeping must never stop the
+        # app from BOOTING: a database that is not ready yet is a reason to log and carry
+        # on, not a reason to take the whole service down.
+        try:
+            await reset_stuck_syncing(session_factory, started_before=booted_at)
+        except Exception:
+            logger.exception("Could not reset stuck 'syncing' projects at startup; continuing")
+
+        # Pick the syncs that reset just cleared back up from their checkpoints, rather than
+        # leaving them for someone to notice and press Sync. Best-effort for the same reason.
+        try:
+            resumed.extend(await resume_interrupted_syncs(session_factory))
+        except Exception:
+            logger.exception("Could not resume interrupted syncs at startup; continuing")
+
+    # Leader election: of all the workers sharing this database, exactly one runs the
+    # housekeeping above and the poller below.
+    lease, election = start_leader_election(
+        session_factory, on_elected=_housekeeping, read_factory=read_factory
+    )
 
     # The freshness poller (CR-01KXCAZJ). Returns None when disabled
     # (sync_poll_interval_seconds=0), in which case no task exists at all.
-    poller = start_poller(app.state.session_factory)
+    poller = start_poller(session_factory, lease, read_factory=read_factory)
+    # Periodic discovery of new local projects, also leader-only. None when disabled.
+    discovery = start_discovery(session_factory, lease)
+    # Auto-sync for local projects, also leader-only. None when local_watch_mode="off".
+    watcher = start_local_watcher(session_factory, lease)
+    # Every worker watches for corpus changes made by the others.
+    coherence = start_coherence_watcher(read_factory)
     try:
         yield
     finally:
         # Cancel AND await, so shutdown never leaves an orphaned task behind.
         await stop_poller(poller)
+        background = [task for task in (discovery, watcher) if task is not None]
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        await stop_coherence_watcher(coherence)
+        # A resumed sync cut short here keeps its checkpoint and resumes at the next start.
+        for task in resumed:
+            task.cancel()
+        await asyncio.gather(*resumed, return_exceptions=True)
+        # Last, so the lease is handed to a peer only once this worker has stopped working.
+        await stop_leader_election(lease, election)
 
 
 def create_app() -> FastAPI:
@@ -141,6 +198,7 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
     app.state.session_factory = async_session_factory
+    app.state.read_session_factory = read_session_factory
 
     @app.exception_handler(RequestValidationError)
     async def _validation_error_handler(
@@ -157,6 +215,15 @@ def create_app() -> FastAPI:
             },
         )
 
+    @app.exception_handler(OverloadedError)
+    async def _overloaded_handler(request: Request, exc: OverloadedError) -> JSONResponse:
+        """Shed load past the computation limit: 503 with a hint when to come back."""
+        return JSONResponse(
+            status_code=503,
+            headers={"Retry-After": str(exc.retry_after)},
+            content={"error": {"code": "OVERLOADED", "message": exc.message}},
+        )
+
     @app.exception_handler(Exception)
     async def _unhandled_error_handler(request: Request, exc: Exception) -> JSONResponse:
         """Return unexpected errors as a canonical 500 without leaking detail."""
@@ -0,0 +1,151 @@
+"""Cross-worker cache invalidation through generation counters.
+
+Each uvicorn worker keeps its own memory. A cache one worker builds from the corpus is
+invisible to - and not invalidated by - a sync that finishes in another worker, so
+without a channel between them the workers would serve different answers to the same
+question until each happened to expire its own copy.
+
+The channel is the ``cache_generations`` table: one monotonically increasing counter
+per scope. Whoever changes the data behind a scope calls :func:`bump_generation` inside
+the SAME transaction, so the counter moves exactly when the data does and never for a
+rolled-back write. Every worker runs :func:`start_coherence_watcher`, which reads the
+(tiny) table on a short interval and, for each scope whose counter moved, calls the
+invalidation callbacks registered with :func:`on_invalidate` in that process. The check
+only reads, so the app runs it on the reader pool: a watcher in every worker polling
+every couple of seconds must not queue on the single writer connection.
+
+Two ways to consume it:
+
+* key a cache on the generation itself (:func:`read_generation`) - it can then never
+  serve an entry built from older data, with no timing window at all; or
+* register a callback and be cleared within one watcher interval of a change anywhere.
+
+The worker that made the change does not wait for its own watcher: it calls
+:func:`invalidate_local` after committing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.sqlite import insert
+
+from sdlc_lens.config import settings
+from sdlc_lens.db.models.cache_generation import CacheGeneration
+from sdlc_lens.db.models.project import Project
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# Moves whenever any project's documents change - a sync, a deletion.
+CORPUS_SCOPE = "corpus"
+
+# Process-local: the callbacks to run per scope, and the generation last acted on.
+_listeners: dict[str, list[Callable[[], None]]] = {}
+_seen: dict[str, int] = {}
+_baselined = False
+
+
+def on_invalidate(scope: str, callback: Callable[[], None]) -> None:
+    """Run ``callback`` in this process whenever ``scope``'s generation moves."""
+    _listeners.setdefault(scope, []).append(callback)
+
+
+def invalidate_local(scope: str) -> None:
+    """Run this process's callbacks for ``scope`` now. A callback's failure is logged only."""
+    for callback in _listeners.get(scope, ()):
+        try:
+            callback()
+        except Exception:
+            logger.exception("Cache invalidation callback for '%s' failed", scope)
+
+
+async def bump_generation(session: AsyncSession, scope: str = CORPUS_SCOPE) -> None:
+    """Advance ``scope``'s counter in the caller's transaction. Does not commit."""
+    stmt = insert(CacheGeneration).values(scope=scope, generation=1)
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["scope"],
+            set_={"generation": CacheGeneration.generation + 1},
+        )
+    )
+
+
+async def bump_corpus_generation(session: AsyncSession, project_id: int) -> None:
+    """Record, in the caller's transaction, that ``project_id``'s documents changed.
+
+    Advances the project's own ``corpus_generation`` and the global corpus scope, which
+    the cross-project reads (search, aggregate stats) key on. Does not commit.
+    """
+    await session.execute(
+        update(Project)
+        .where(Project.id == project_id)
+        .values(corpus_generation=Project.corpus_generation + 1)
+    )
+    await bump_generation(session, CORPUS_SCOPE)
+
+
+async def read_generation(session: AsyncSession, scope: str = CORPUS_SCOPE) -> int:
+    """The current generation of ``scope``; 0 if it has never moved."""
+    value = await session.scalar(
+        select(CacheGeneration.generation).where(CacheGeneration.scope == scope)
+    )
+    return value or 0
+
+
+async def check_generations(session_factory: async_sessionmaker[AsyncSession]) -> list[str]:
+    """Invalidate every local cache whose scope moved since the last check.
+
+    Returns the scopes that moved. The first check only records a baseline: a cache
+    cannot predate the process that built it, so there is nothing stale to drop yet.
+    """
+    global _baselined
+    async with session_factory() as session:
+        rows = (
+            await session.execute(select(CacheGeneration.scope, CacheGeneration.generation))
+        ).all()
+    moved: list[str] = []
+    for scope, generation in rows:
+        # After the baseline, a scope seen for the first time has moved from its implicit 0.
+        previous = _seen.get(scope, 0 if _baselined else generation)
+        _seen[scope] = generation
+        if previous != generation:
+            moved.append(scope)
+            invalidate_local(scope)
+    _baselined = True
+    return moved
+
+
+async def _watch_loop(session_factory: async_sessionmaker[AsyncSession], interval: float) -> None:
+    while True:
+        try:
+            await check_generations(session_factory)
+        except Exception:
+            # A locked or unmigrated database. Caches may run one interval stale; that is
+            # all. The watcher must outlive it.
+            logger.exception("Cache coherence check failed; retrying")
+        await asyncio.sleep(interval)
+
+
+def start_coherence_watcher(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> asyncio.Task | None:
+    """Start this worker's watcher, or return None when disabled (interval 0)."""
+    interval = settings.cache_coherence_interval_seconds
+    if interval <= 0:
+        return None
+    return asyncio.create_task(_watch_loop(session_factory, interval), name="sdlc-lens-coherence")
+
+
+async def stop_coherence_watcher(task: asyncio.Task | None) -> None:
+    if task is None:
+        return
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
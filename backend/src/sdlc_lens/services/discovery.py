@@ -0,0 +1,231 @@
+"""Discover and register the local projects under ``allowed_project_base``.
+
+``allowed_project_base`` already says where the local projects live, yet each one had
+to be registered by hand and then synced by hand, one at a time. With a couple of
+hundred repositories mounted under the base, that is hours of clicking and hundreds of
+serial syncs.
+
+A discovery scan walks the base for ``sdlc-studio`` directories, registers each new one
+through :func:`create_project` - the same validation and slug rules as the API - and
+syncs the new registrations through the ordinary ``trigger_sync`` / ``run_sync_task``
+path, a bounded number at a time. It can be run on demand (``POST /projects/discover``)
+or on a timer (``SDLC_LENS_DISCOVERY_INTERVAL_SECONDS``), by the elected leader only.
+
+The walk is the expensive part on a large mount, so it is shaped for that: ``os.scandir``
+(one syscall per directory, with the entry type already known), no symlinks followed
+(no loops, nothing outside the base), the sync walker's ``_EXCLUDED_DIRS`` and hidden
+directories pruned before they are entered, and no descent into an ``sdlc-studio``
+directory once found - its contents are the sync's business, not discovery's.
+
+Discovery only ever ADDS. A project whose directory disappears is left registered: a
+missing mount must not read as "delete two hundred projects".
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from sqlalchemy import select
+
+from sdlc_lens.config import settings
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services.project import (
+    EmptySlugError,
+    PathNotFoundError,
+    ProjectNotFoundError,
+    SlugConflictError,
+    create_project,
+)
+from sdlc_lens.services.sync import SyncInProgressError, run_sync_task, trigger_sync
+from sdlc_lens.services.sync_engine import _EXCLUDED_DIRS
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from sdlc_lens.services.leader import LeaderLease
+
+logger = logging.getLogger(__name__)
+
+# The directory name that marks a project root's SDLC documents.
+SDLC_DIR_NAME = "sdlc-studio"
+
+
+class DiscoveryNotConfiguredError(Exception):
+    """Raised when a discovery scan is requested with no allowed_project_base set."""
+
+    def __init__(
+        self,
+        message: str = "Project discovery needs SDLC_LENS_ALLOWED_PROJECT_BASE to be set",
+    ):
+        self.message = message
+        super().__init__(self.message)
+
+
+@dataclass
+class DiscoveryResult:
+    """What one discovery scan found and did."""
+
+    found: int = 0
+    already_registered: int = 0
+    registered: list[str] = field(default_factory=list)
+    # (sdlc_path, reason) for each directory that could not be registered.
+    skipped: list[tuple[str, str]] = field(default_factory=list)
+
+
+def find_sdlc_dirs(base: Path) -> list[Path]:
+    """Every ``sdlc-studio`` directory under ``base``, resolved and sorted.
+
+    Iterative, so depth is bounded by memory rather than the recursion limit. An
+    unreadable directory is skipped with a log line; one bad mount must not end the scan.
+    """
+    found: list[Path] = []
+    stack = [str(base)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    if entry.name == SDLC_DIR_NAME:
+                        found.append(Path(entry.path).resolve())
+                    elif entry.name not in _EXCLUDED_DIRS and not entry.name.startswith("."):
+                        stack.append(entry.path)
+        except OSError as exc:
+            logger.warning("Discovery could not read '%s': %s", current, exc)
+    return sorted(found)
+
+
+def _project_names(base: Path, sdlc_dir: Path) -> list[str]:
+    """Candidate names for the project owning ``sdlc_dir``, most natural first.
+
+    The repository directory's own name first. Two repositories can share one under
+    different parents (``team-a/api``, ``team-b/api``), so the path relative to the base
+    is the fallback, and it slugs to something that still says where the project lives.
+    """
+    repo = sdlc_dir.parent
+    names = [repo.name]
+    relative = repo.relative_to(base) if repo.is_relative_to(base) else None
+    if relative is not None and len(relative.parts) > 1:
+        names.append(" / ".join(relative.parts))
+    return names
+
+
+async def _register(
+    session: AsyncSession, base: Path, sdlc_dir: Path, result: DiscoveryResult
+) -> None:
+    for name in _project_names(base, sdlc_dir):
+        try:
+            project = await create_project(session, name, str(sdlc_dir))
+        except SlugConflictError:
+            continue
+        except (PathNotFoundError, EmptySlugError) as exc:
+            result.skipped.append((str(sdlc_dir), exc.message))
+            return
+        result.registered.append(project.slug)
+        logger.info("Discovered and registered '%s' at %s", project.slug, sdlc_dir)
+        return
+    result.skipped.append((str(sdlc_dir), "Every candidate project name is already taken"))
+
+
+async def discover_projects(session: AsyncSession) -> DiscoveryResult:
+    """Register every not-yet-registered ``sdlc-studio`` directory under the base.
+
+    Registration only; call :func:`sync_discovered` with ``result.registered`` to sync.
+
+    Raises:
+        DiscoveryNotConfiguredError: If ``allowed_project_base`` is not set.
+    """
+    if settings.allowed_project_base is None:
+        raise DiscoveryNotConfiguredError
+    base = Path(settings.allowed_project_base).resolve()
+
+    # The walk is blocking I/O over a possibly huge tree; keep it off the event loop.
+    sdlc_dirs = await asyncio.to_thread(find_sdlc_dirs, base)
+
+    rows = await session.execute(
+        select(Project.sdlc_path).where(
+            Project.source_type == "local", Project.sdlc_path.is_not(None)
+        )
+    )
+    known = {str(Path(p).resolve()) for p in rows.scalars().all()}
+
+    result = DiscoveryResult(found=len(sdlc_dirs))
+    for sdlc_dir in sdlc_dirs:
+        if str(sdlc_dir) in known:
+            result.already_registered += 1
+            continue
+        await _register(session, base, sdlc_dir, result)
+    return result
+
+
+async def sync_discovered(
+    slugs: list[str],
+    session_factory: async_sessionmaker[AsyncSession],
+    concurrency: int | None = None,
+) -> None:
+    """Sync ``slugs`` through the ordinary sync path, at most ``concurrency`` at a time.
+
+    Bounded because every sync writes to the one SQLite database: past a handful, more
+    parallel syncs only queue on its write lock while holding a file walk's worth of
+    memory each. A project already syncing is left to the sync that owns it.
+    """
+    limit = asyncio.Semaphore(max(1, concurrency or settings.discovery_sync_concurrency))
+
+    async def _one(slug: str) -> None:
+        async with limit:
+            async with session_factory() as session:
+                try:
+                    await trigger_sync(session, slug)
+                except (SyncInProgressError, ProjectNotFoundError):
+                    return
+            await run_sync_task(slug, session_factory)
+
+    await asyncio.gather(*(_one(slug) for slug in slugs))
+
+
+async def _discovery_loop(
+    session_factory: async_sessionmaker[AsyncSession],
+    interval: int,
+    lease: LeaderLease | None = None,
+) -> None:
+    """Rescan on a timer. Never exits except by cancellation."""
+    logger.info("Project discovery started (interval=%ds)", interval)
+    try:
+        while True:
+            await asyncio.sleep(interval * (1 + random.uniform(0, 0.1)))  # noqa: S311
+            if lease is not None and not lease.held:
+                continue
+            try:
+                async with session_factory() as session:
+                    result = await discover_projects(session)
+                if result.registered:
+                    await sync_discovered(result.registered, session_factory)
+            except Exception:
+                logger.exception("Discovery scan failed; discovery continues")
+    except asyncio.CancelledError:
+        logger.info("Project discovery stopped")
+        raise
+
+
+def start_discovery(
+    session_factory: async_sessionmaker[AsyncSession],
+    lease: LeaderLease | None = None,
+) -> asyncio.Task | None:
+    """Start periodic discovery, or return None when it is off.
+
+    Off unless both ``discovery_interval_seconds`` and ``allowed_project_base`` are set:
+    there is nothing to scan without a base.
+    """
+    interval = settings.discovery_interval_seconds
+    if interval <= 0 or settings.allowed_project_base is None:
+        return None
+    return asyncio.create_task(
+        _discovery_loop(session_factory, interval, lease), name="sdlc-lens-discovery"
+    )
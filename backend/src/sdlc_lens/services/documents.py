@@ -1,13 +1,101 @@
 """Document service - business logic for document queries."""
 
-from sqlalchemy import func, or_, select
+import datetime
+from collections.abc import Collection, Sequence
+from dataclasses import dataclass, field
+from types import NoneType
+from typing import NamedTuple
+
+from sqlalchemy import Row, and_, case, func, null, or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from sdlc_lens.db.models.document import Document
-from sdlc_lens.utils.sdlc_ids import id_head, norm_id
+from sdlc_lens.db.models.document_content import DocumentContent
+from sdlc_lens.db.models.document_ref import DocumentRef
+from sdlc_lens.utils.pagination import decode_cursor, encode_cursor, query_fingerprint
+from sdlc_lens.utils.sdlc_ids import (
+    REF_ALIAS,
+    REF_DEPENDS_ON,
+    REF_EPIC,
+    REF_MENTION,
+    id_head,
+    norm_id,
+)
+
+
+class DocumentSummary(NamedTuple):
+    """A document as the listing shows it: every column except the heavy ones.
+
+    ``content`` (the whole markdown body) and ``metadata_json`` are what make a document
+    row big, and a listing shows neither; selecting these columns alone keeps a
+    5k-document listing from dragging every body through SQLite and into Python.
+    """
 
+    id: int
+    doc_id: str | None
+    doc_type: str | None
+    title: str | None
+    status: str | None
+    owner: str | None
+    priority: str | None
+    story_points: int | None
+    epic: str | None
+    story: str | None
+    synced_at: datetime.datetime | None
+
+
+# Listing field (as the API names it) -> column. The API's ``fields=`` selects from these.
+LISTING_FIELDS = {
+    "doc_id": Document.doc_id,
+    "type": Document.doc_type,
+    "title": Document.title,
+    "status": Document.status,
+    "owner": Document.owner,
+    "priority": Document.priority,
+    "story_points": Document.story_points,
+    "epic": Document.epic,
+    "story": Document.story,
+    "updated_at": Document.synced_at,
+}
+
+_SORT_COLUMNS = {
+    "title": Document.title,
+    "type": Document.doc_type,
+    "status": Document.status,
+    "updated_at": Document.synced_at,
+}
+
+
+@dataclass
+class DocumentPage:
+    """One page of a document listing."""
+
+    items: list[DocumentSummary]
+    # None when the caller opted out of counting.
+    total: int | None
+    # Opaque cursor for the page after this one; None on the last page.
+    next_cursor: str | None = None
+
+
+def _after_key(col, descending: bool, value, last_id: int):
+    """The keyset predicate for "rows after (value, last_id)" in the listing's order.
+
+    A row-value comparison, which SQLite turns into an index seek. Only ``status`` is
+    nullable, and SQLite sorts NULL first ascending and last descending; the NULL
+    branches keep a cursor that lands on or crosses that boundary exact.
+    """
+    key = tuple_(col, Document.id)
+    if value is None:
+        if descending:
+            return and_(col.is_(None), Document.id < last_id)
+        return or_(and_(col.is_(None), Document.id > last_id), col.is_not(None))
+    if descending:
+        return or_(key < tuple_(value, last_id), col.is_(None))
+    return key > tuple_(value, last_id)
 
-async def list_documents(
+
+async def list_documents_page(
     session: AsyncSession,
     project_id: int,
     *,
@@ -17,57 +105,188 @@ async def list_documents(
     order: str = "desc",
     page: int = 1,
     per_page: int = 50,
-) -> tuple[list[Document], int]:
+    cursor: str | None = None,
+    with_total: bool = True,
+    fields: Collection[str] | None = None,
+) -> DocumentPage:
     """List documents for a project with filtering, sorting, and pagination.
 
-    Returns a tuple of (documents, total_count).
-    """
-    # Column mapping for sort
-    sort_columns = {
-        "title": Document.title,
-        "type": Document.doc_type,
-        "status": Document.status,
-        "updated_at": Document.synced_at,
-    }
+    Two ways to page. ``cursor`` (keyset): the rows after the last row of the page that
+    issued it, ordered by (sort column, id) - one index seek however deep the page.
+    ``page`` (offset): kept for existing clients; it gets slower the deeper it goes.
+    Either way the result carries a ``next_cursor``, so an offset client can switch to
+    cursors from its first page. ``with_total=False`` skips the COUNT, which otherwise
+    costs every page a walk of the whole filtered set.
 
-    base = select(Document).where(Document.project_id == project_id)
+    Items are :class:`DocumentSummary` rows, never full documents. ``fields`` (names
+    from :data:`LISTING_FIELDS`) narrows the columns read further; the others come back
+    None.
 
+    Raises:
+        InvalidCursorError: If ``cursor`` is malformed or was issued for a different
+            sort, order or filter.
+    """
+    conditions = [Document.project_id == project_id]
     if doc_type is not None:
-        base = base.where(Document.doc_type == doc_type)
+        conditions.append(Document.doc_type == doc_type)
     if status is not None:
         if status == "none":
-            base = base.where(Document.status.is_(None))
+            conditions.append(Document.status.is_(None))
         else:
-            base = base.where(Document.status == status)
+            conditions.append(Document.status == status)
+
+    total = None
+    if with_total:
+        count_stmt = select(func.count()).select_from(Document).where(*conditions)
+        total = (await session.execute(count_stmt)).scalar_one()
+
+    # Sort, with the id as tie-breaker so the order - and so every cursor - is total.
+    sort = sort if sort in _SORT_COLUMNS else "updated_at"
+    col = _SORT_COLUMNS[sort]
+    descending = order != "asc"
+
+    # The id and the sort column always: the cursor is made of them.
+    wanted = LISTING_FIELDS if fields is None else {f: LISTING_FIELDS[f] for f in fields}
+    columns = {"id": Document.id, col.key: col}
+    columns.update({column.key: column for column in wanted.values()})
+    base = select(*columns.values()).where(*conditions)
+    if descending:
+        base = base.order_by(col.desc(), Document.id.desc())
+    else:
+        base = base.order_by(col.asc(), Document.id.asc())
 
-    # Count query
-    count_stmt = select(func.count()).select_from(base.subquery())
-    total = (await session.execute(count_stmt)).scalar_one()
+    fingerprint = query_fingerprint("documents", project_id, doc_type, status, sort, descending)
+    if cursor:  # an empty one is none: the first page
+        value_types = (datetime.datetime, NoneType) if sort == "updated_at" else (str, NoneType)
+        value, last_id = decode_cursor(cursor, fingerprint, (value_types, int))
+        base = base.where(_after_key(col, descending, value, last_id))
+    else:
+        base = base.offset((page - 1) * per_page)
 
-    # Sort
-    col = sort_columns.get(sort, Document.synced_at)
-    base = base.order_by(col.asc()) if order == "asc" else base.order_by(col.desc())
+    # One row more than the page, to learn whether there is a next page without a count.
+    rows = (await session.execute(base.limit(per_page + 1))).mappings().all()
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        value = rows[-1][col.key]
+        if isinstance(value, datetime.datetime):
+            value = value.isoformat()
+        next_cursor = encode_cursor(fingerprint, [value, rows[-1]["id"]])
 
-    # Pagination
-    offset = (page - 1) * per_page
-    base = base.offset(offset).limit(per_page)
+    items = [
+        DocumentSummary(**{name: row.get(name) for name in DocumentSummary._fields})
+        for row in rows
+    ]
+    return DocumentPage(items=items, total=total, next_cursor=next_cursor)
 
-    result = await session.execute(base)
-    documents = list(result.scalars().all())
 
-    return documents, total
+async def list_documents(
+    session: AsyncSession,
+    project_id: int,
+    *,
+    doc_type: str | None = None,
+    status: str | None = None,
+    sort: str = "updated_at",
+    order: str = "desc",
+    page: int = 1,
+    per_page: int = 50,
+) -> tuple[list[DocumentSummary], int]:
+    """List documents for a project with filtering, sorting, and offset pagination.
+
+    Returns a tuple of (documents, total_count). See :func:`list_documents_page` for
+    cursor paging.
+    """
+    result = await list_documents_page(
+        session,
+        project_id,
+        doc_type=doc_type,
+        status=status,
+        sort=sort,
+        order=order,
+        page=page,
+        per_page=per_page,
+    )
+    return result.items, result.total
 
 
 async def get_all_documents(
     session: AsyncSession,
     project_id: int,
 ) -> list[Document]:
-    """Fetch all documents for a project (no pagination)."""
-    stmt = select(Document).where(Document.project_id == project_id)
+    """Fetch all documents for a project (no pagination), bodies included."""
+    stmt = (
+        select(Document)
+        .where(Document.project_id == project_id)
+        .options(joinedload(Document.stored_content))
+    )
     result = await session.execute(stmt)
     return list(result.scalars().all())
 
 
+# How much of a document's body the health check reads, unless it needs all of it.
+HEALTH_CHECK_CONTENT_CHARS = 4096
+
+
+async def get_health_check_documents(
+    session: AsyncSession,
+    project_id: int,
+    *,
+    ids: Collection[int] | None = None,
+    content: bool = True,
+    synced_before: datetime.datetime | None = None,
+) -> list[Row]:
+    """Every document of a project, shaped for the health check and as light as that allows.
+
+    The rules read the body twice: "is it (nearly) empty?" for every document, and "is
+    there an **Epic:** label in it?" for the stories and test-specs with no ``epic``
+    column. So ``content`` is the whole body only for those; everywhere else it is the
+    first ``HEALTH_CHECK_CONTENT_CHARS`` bytes - inflated only that far - which answers
+    "fewer than 50 after stripping?" exactly for any real document. ``metadata_json`` is
+    not read at all.
+
+    ``ids`` narrows it to those documents, ``synced_before`` to those last synced before
+    then (through ``ix_documents_project_synced``). With ``content=False`` the rows have
+    no ``content`` and no body is read: enough for the rules' view of the rest of the
+    project when only some documents are re-checked (health_check.recheck_documents).
+
+    Rows, not Documents: a Document holding a truncated body is a write waiting to lose
+    data.
+    """
+    columns = [
+        Document.id,
+        Document.doc_id,
+        Document.doc_type,
+        Document.title,
+        Document.status,
+        Document.owner,
+        Document.priority,
+        Document.story_points,
+        Document.epic,
+        Document.story,
+        Document.ref_id,
+        Document.depends_on,
+        Document.aliases,
+        Document.file_path,
+        Document.synced_at,
+    ]
+    if content:
+        needs_body = and_(Document.epic.is_(None), Document.doc_type.in_(("story", "test-spec")))
+        body = case(
+            (needs_body, func.sdlc_inflate(DocumentContent.body)),
+            else_=func.sdlc_inflate(DocumentContent.body, HEALTH_CHECK_CONTENT_CHARS),
+        )
+        columns.append(body.label("content"))
+    stmt = select(*columns).where(Document.project_id == project_id)
+    if ids is not None:
+        stmt = stmt.where(Document.id.in_(ids))
+    if synced_before is not None:
+        stmt = stmt.where(Document.synced_at < synced_before)
+    if content:
+        stmt = stmt.outerjoin(DocumentContent, DocumentContent.hash == Document.content_hash)
+    result = await session.execute(stmt)
+    return list(result.all())
+
+
 class DocumentNotFoundError(Exception):
     """Raised when a document is not found."""
 
@@ -81,8 +300,10 @@ async def get_document(
     project_id: int,
     doc_type: str,
     doc_id: str,
+    *,
+    content: bool = False,
 ) -> Document:
-    """Get a single document by type and doc_id.
+    """Get a single document by type and doc_id; with ``content``, its body too.
 
     Raises:
         DocumentNotFoundError: If no matching document exists.
@@ -92,6 +313,8 @@ async def get_document(
         Document.doc_type == doc_type,
         Document.doc_id == doc_id,
     )
+    if content:
+        stmt = stmt.options(joinedload(Document.stored_content))
     result = await session.execute(stmt)
     doc = result.scalar_one_or_none()
     if doc is None:
@@ -104,201 +327,274 @@ def _doc_ref(doc: Document) -> str | None:
     return doc.ref_id or norm_id(id_head(doc.doc_id))
 
 
-async def _find_doc_by_clean_id(
-    session: AsyncSession,
-    project_id: int,
-    ref: str | None,
-) -> Document | None:
-    """Find a document by any reference form, resolved through the normalised id.
+def _split_ref_list(value: str | None) -> list[str]:
+    """Split a stored comma-joined normalised id list into individual ids."""
+    if not value:
+        return []
+    return [part for part in value.split(",") if part]
 
-    Matches on the document's ``ref_id`` (so ``CR-0003`` / ``CR0003`` / ``[[CR-0496]]``
-    / a v3 ULID all resolve), then falls back to a migration ``Aliases`` match so an
-    old sequential-id reference finds the renumbered document.
+
+def _declared_dependencies(doc: Document) -> list[str]:
+    """The ids ``doc`` declares a `Depends on` upon, normalised, deduped, in order."""
+    dep_ids: list[str] = []
+    for dep in _split_ref_list(doc.depends_on):
+        normed = norm_id(dep)
+        if normed and normed not in dep_ids:
+            dep_ids.append(normed)
+    return dep_ids
+
+
+def _alias_sources(project_id: int, targets):
+    """The ids of the documents listing any of ``targets`` among their ``Aliases``.
+
+    An indexed lookup on ``document_refs`` - where the comma-joined ``aliases`` column
+    could only be searched with ``LIKE '%,id,%'``, a scan of the whole project.
+    ``targets`` is a list of ids or a subquery yielding them.
     """
-    normed = norm_id(ref)
-    if not normed:
-        return None
-    stmt = (
-        select(Document)
-        .where(
-            Document.project_id == project_id,
-            or_(
-                Document.ref_id == normed,
-                Document.aliases == normed,
-                Document.aliases.like(f"{normed},%"),
-                Document.aliases.like(f"%,{normed},%"),
-                Document.aliases.like(f"%,{normed}"),
-            ),
-        )
-        .limit(1)
+    return select(DocumentRef.src_doc_id).where(
+        DocumentRef.project_id == project_id,
+        DocumentRef.kind == REF_ALIAS,
+        DocumentRef.target_norm_id.in_(targets),
     )
-    result = await session.execute(stmt)
-    return result.scalar_one_or_none()
 
 
-async def get_related_documents(
-    session: AsyncSession,
-    project_id: int,
-    doc: Document,
-) -> tuple[list[Document], list[Document], list[Document], list[Document]]:
-    """Get parents, children, dependencies, and dependents for a document.
+def _mention_targets(doc: Document) -> set[str]:
+    """The ids a body mention of ``doc`` may use: its own, and any it was known by before."""
+    targets = set(_split_ref_list(doc.aliases))
+    ref = _doc_ref(doc)
+    if ref:
+        targets.add(ref)
+    return targets
 
-    ``parents`` are ordered nearest ancestor first. ``depends_on`` are the documents
-    this one declares a dependency on; ``dependents`` declare a dependency on this one.
-    """
-    parents = await _get_parent_chain(session, project_id, doc)
-    children = await _get_children(session, project_id, doc)
-    depends_on = await _get_dependencies(session, project_id, doc)
-    dependents = await _get_dependents(session, project_id, doc)
-    return parents, children, depends_on, dependents
 
+def _matching(project_id: int, targets):
+    """A predicate for the documents any of ``targets`` resolve to: ref_id, then alias."""
+    return or_(
+        Document.ref_id.in_(targets),
+        Document.id.in_(_alias_sources(project_id, targets)),
+    )
 
-async def _get_parent_chain(
-    session: AsyncSession,
-    project_id: int,
-    doc: Document,
-) -> list[Document]:
-    """Walk up the hierarchy using epic/story columns."""
-    parents: list[Document] = []
 
-    if doc.story:
-        story_doc = await _find_doc_by_clean_id(session, project_id, doc.story)
-        if story_doc and story_doc.id != doc.id:
-            parents.append(story_doc)
-            if story_doc.epic:
-                epic_doc = await _find_doc_by_clean_id(session, project_id, story_doc.epic)
-                if epic_doc and epic_doc.id not in {doc.id, story_doc.id}:
-                    parents.append(epic_doc)
-    elif doc.epic:
-        epic_doc = await _find_doc_by_clean_id(session, project_id, doc.epic)
-        if epic_doc and epic_doc.id != doc.id:
-            parents.append(epic_doc)
+@dataclass
+class RelatedDocuments:
+    """One document's relationships, as the relationships endpoint presents them."""
 
-    return parents
+    # Nearest ancestor first: the story, then its epic.
+    parents: list[Document] = field(default_factory=list)
+    children: list[Document] = field(default_factory=list)
+    # The documents this one declares a `Depends on` upon, in declared order.
+    depends_on: list[Document] = field(default_factory=list)
+    # The documents declaring a `Depends on` upon this one.
+    dependents: list[Document] = field(default_factory=list)
+    # The documents whose body mentions this one ("what links here").
+    mentioned_by: list[Document] = field(default_factory=list)
 
 
-async def _get_children(
+async def _fetch_candidates(
     session: AsyncSession,
     project_id: int,
-    doc: Document,
-) -> list[Document]:
-    """Find documents that reference this doc as their parent (by normalised id)."""
-    ref = _doc_ref(doc)
-    if not ref:
-        return []
-
-    if doc.doc_type == "epic":
-        stmt = (
-            select(Document)
-            .where(
-                Document.project_id == project_id,
-                Document.epic == ref,
-                Document.story.is_(None),
-                Document.id != doc.id,  # a doc naming its own id is not its own child
-            )
-            .order_by(Document.doc_type, Document.doc_id)
+    docs: Sequence[Document],
+) -> list[tuple[Document, str | None]]:
+    """Every document any of ``docs`` could be related to, in ONE query.
+
+    The union of: what the documents name (epic, story, dependencies) by ref_id or
+    alias; the epic of any story they name - the parent chain's second hop, resolved
+    inside the query through that story's ``epic`` edge rather than by a second round
+    trip; their children by ``epic`` / ``story`` column; their dependents by the
+    reverse ``depends_on`` edge; and the documents mentioning them by the reverse
+    ``mention`` edge. It is a superset: the caller applies the exact rules.
+
+    Each candidate comes with the comma-joined ids of ``docs`` its body mentions, read
+    from its ``mention`` edges in the same statement, or None.
+    """
+    named: set[str] = set()
+    stories: set[str] = set()
+    epic_refs: set[str] = set()
+    story_refs: set[str] = set()
+    own_refs: set[str] = set()
+    mentioned: set[str] = set()
+    for doc in docs:
+        mentioned.update(_mention_targets(doc))
+        if doc.story:
+            stories.add(norm_id(doc.story))
+        elif doc.epic:
+            named.add(norm_id(doc.epic))
+        named.update(_declared_dependencies(doc))
+        ref = _doc_ref(doc)
+        if ref:
+            own_refs.add(ref)
+            if doc.doc_type == "epic":
+                epic_refs.add(ref)
+            elif doc.doc_type == "story":
+                story_refs.add(ref)
+    stories.discard(None)
+    named.discard(None)
+
+    conditions = []
+    if named:
+        conditions.append(_matching(project_id, list(named)))
+    if stories:
+        conditions.append(_matching(project_id, list(stories)))
+        # The epics of those stories: every epic edge of every document they resolve to.
+        story_docs = select(Document.id).where(
+            Document.project_id == project_id, _matching(project_id, list(stories))
+        )
+        grandparents = select(DocumentRef.target_norm_id).where(
+            DocumentRef.kind == REF_EPIC, DocumentRef.src_doc_id.in_(story_docs)
         )
-    elif doc.doc_type == "story":
-        stmt = (
-            select(Document)
+        conditions.append(_matching(project_id, grandparents))
+    if epic_refs:
+        conditions.append(Document.epic.in_(epic_refs))
+    if story_refs:
+        conditions.append(Document.story.in_(story_refs))
+    if own_refs:
+        dependents = select(DocumentRef.src_doc_id).where(
+            DocumentRef.project_id == project_id,
+            DocumentRef.kind == REF_DEPENDS_ON,
+            DocumentRef.target_norm_id.in_(own_refs),
+        )
+        conditions.append(Document.id.in_(dependents))
+    mentions = null()
+    if mentioned:
+        mentioners = select(DocumentRef.src_doc_id).where(
+            DocumentRef.project_id == project_id,
+            DocumentRef.kind == REF_MENTION,
+            DocumentRef.target_norm_id.in_(mentioned),
+        )
+        conditions.append(Document.id.in_(mentioners))
+        # Which of those ids the candidate mentions: its own edges, by primary key.
+        mentions = (
+            select(func.group_concat(DocumentRef.target_norm_id))
             .where(
-                Document.project_id == project_id,
-                Document.story == ref,
-                Document.id != doc.id,
+                DocumentRef.src_doc_id == Document.id,
+                DocumentRef.kind == REF_MENTION,
+                DocumentRef.target_norm_id.in_(mentioned),
             )
-            .order_by(Document.doc_type, Document.doc_id)
+            .scalar_subquery()
         )
-    else:
+    if not conditions:
         return []
 
+    stmt = (
+        select(Document, mentions.label("mentions"))
+        .where(Document.project_id == project_id, or_(*conditions))
+        .order_by(Document.id)
+    )
     result = await session.execute(stmt)
-    return list(result.scalars().all())
+    return [(doc, mentions) for doc, mentions in result]
 
 
-def _split_ref_list(value: str | None) -> list[str]:
-    """Split a stored comma-joined normalised id list into individual ids."""
-    if not value:
-        return []
-    return [part for part in value.split(",") if part]
+class _Candidates:
+    """The fetched candidates, indexed the ways the relationship rules look them up."""
 
+    def __init__(self, rows: list[tuple[Document, str | None]]):
+        self.all = [doc for doc, _ in rows]
+        # Candidate id -> the asked-about ids its body mentions.
+        self.mentions = {doc.id: set(_split_ref_list(ids)) for doc, ids in rows if ids}
+        self.by_ref: dict[str, list[Document]] = {}
+        self.by_alias: dict[str, list[Document]] = {}
+        for doc in self.all:
+            if doc.ref_id:
+                self.by_ref.setdefault(doc.ref_id, []).append(doc)
+            for alias in _split_ref_list(doc.aliases):
+                self.by_alias.setdefault(alias, []).append(doc)
 
-async def _get_dependencies(
-    session: AsyncSession,
-    project_id: int,
-    doc: Document,
-) -> list[Document]:
-    """Documents this one declares a `Depends on` dependency upon.
+    def resolve(self, ref: str | None) -> Document | None:
+        """The document ``ref`` names, by any id form: ref_id first, then an alias."""
+        normed = norm_id(ref)
+        if not normed:
+            return None
+        matches = self.by_ref.get(normed) or self.by_alias.get(normed)
+        return matches[0] if matches else None
 
-    Resolves every declared id in a single query - a ``ref_id`` match plus a
-    supplementary ``aliases`` match so an old sequential id still finds its
-    renumbered document - then reorders the results to the declared order,
-    dedupes, and excludes the document itself.
-    """
-    dep_ids: list[str] = []
-    for dep in _split_ref_list(doc.depends_on):
-        normed = norm_id(dep)
-        if normed and normed not in dep_ids:
-            dep_ids.append(normed)
-    if not dep_ids:
-        return []
+    def matches(self, dep_id: str) -> list[Document]:
+        return self.by_ref.get(dep_id, []) + self.by_alias.get(dep_id, [])
 
-    conditions = [Document.ref_id.in_(dep_ids)]
-    for dep_id in dep_ids:
-        conditions.extend(
-            (
-                Document.aliases == dep_id,
-                Document.aliases.like(f"{dep_id},%"),
-                Document.aliases.like(f"%,{dep_id},%"),
-                Document.aliases.like(f"%,{dep_id}"),
-            )
-        )
 
-    stmt = select(Document).where(
-        Document.project_id == project_id,
-        Document.id != doc.id,  # a doc naming its own id is not its own dependency
-        or_(*conditions),
-    )
-    result = await session.execute(stmt)
-    candidates = list(result.scalars().all())
+def _by_type_and_id(docs: list[Document]) -> list[Document]:
+    return sorted(docs, key=lambda d: (d.doc_type, d.doc_id))
 
-    # Reorder to the declared dependency order, deduping so each target appears
-    # once even when named twice or reachable by both its ref_id and an alias.
-    results: list[Document] = []
+
+def _assemble(doc: Document, found: _Candidates) -> RelatedDocuments:
+    related = RelatedDocuments()
+
+    # Parents: walk up the hierarchy using the epic/story columns.
+    if doc.story:
+        story_doc = found.resolve(doc.story)
+        if story_doc and story_doc.id != doc.id:
+            related.parents.append(story_doc)
+            if story_doc.epic:
+                epic_doc = found.resolve(story_doc.epic)
+                if epic_doc and epic_doc.id not in {doc.id, story_doc.id}:
+                    related.parents.append(epic_doc)
+    elif doc.epic:
+        epic_doc = found.resolve(doc.epic)
+        if epic_doc and epic_doc.id != doc.id:
+            related.parents.append(epic_doc)
+
+    ref = _doc_ref(doc)
+    if ref:
+        # Children: documents naming this one as their parent. A doc naming its own id
+        # is not its own child.
+        if doc.doc_type == "epic":
+            children = [
+                c for c in found.all if c.epic == ref and c.story is None and c.id != doc.id
+            ]
+        elif doc.doc_type == "story":
+            children = [c for c in found.all if c.story == ref and c.id != doc.id]
+        else:
+            children = []
+        related.children = _by_type_and_id(children)
+
+        # Dependents: documents declaring a dependency on this one.
+        related.dependents = _by_type_and_id(
+            [c for c in found.all if c.id != doc.id and ref in _split_ref_list(c.depends_on)]
+        )
+
+    # Dependencies, in declared order, each target once even when named twice or
+    # reachable by both its ref_id and an alias; a doc naming its own id is not its own
+    # dependency.
     seen: set[int] = set()
-    for dep_id in dep_ids:
-        for target in candidates:
-            if target.id in seen:
-                continue
-            aliases = set(_split_ref_list(target.aliases))
-            if target.ref_id == dep_id or dep_id in aliases:
+    for dep_id in _declared_dependencies(doc):
+        for target in found.matches(dep_id):
+            if target.id != doc.id and target.id not in seen:
                 seen.add(target.id)
-                results.append(target)
+                related.depends_on.append(target)
                 break
-    return results
+
+    # Mentioned by: documents whose body names this one by any of its ids.
+    targets = _mention_targets(doc)
+    related.mentioned_by = _by_type_and_id(
+        [c for c in found.all if c.id != doc.id and found.mentions.get(c.id, set()) & targets]
+    )
+    return related
+
+
+async def resolve_relationships(
+    session: AsyncSession,
+    project_id: int,
+    docs: Sequence[Document],
+) -> dict[int, RelatedDocuments]:
+    """Parents, children, dependencies, dependents and mentions for many documents at once.
+
+    One query however many documents are asked about - for tree and graph views, which
+    would otherwise pay a round trip per document per relationship. Keyed by
+    ``Document.id``.
+    """
+    found = _Candidates(await _fetch_candidates(session, project_id, docs))
+    return {doc.id: _assemble(doc, found) for doc in docs}
 
 
-async def _get_dependents(
+async def get_related_documents(
     session: AsyncSession,
     project_id: int,
     doc: Document,
-) -> list[Document]:
-    """Documents that declare a `Depends on` dependency upon this one."""
-    ref = _doc_ref(doc)
-    if not ref:
-        return []
-    stmt = (
-        select(Document)
-        .where(
-            Document.project_id == project_id,
-            Document.id != doc.id,
-            or_(
-                Document.depends_on == ref,
-                Document.depends_on.like(f"{ref},%"),
-                Document.depends_on.like(f"%,{ref},%"),
-                Document.depends_on.like(f"%,{ref}"),
-            ),
-        )
-        .order_by(Document.doc_type, Document.doc_id)
-    )
-    result = await session.execute(stmt)
-    return list(result.scalars().all())
+) -> tuple[list[Document], list[Document], list[Document], list[Document]]:
+    """Get parents, children, dependencies, and dependents for a document.
+
+    ``parents`` are ordered nearest ancestor first. ``depends_on`` are the documents
+    this one declares a dependency on; ``dependents`` declare a dependency on this one.
+    Resolved in a single query; see :func:`resolve_relationships`.
+    """
+    related = (await resolve_relationships(session, project_id, [doc]))[doc.id]
+    return related.parents, related.children, related.depends_on, related.dependents
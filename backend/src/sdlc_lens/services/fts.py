@@ -6,17 +6,158 @@ from typing import TYPE_CHECKING
 
 from sqlalchemy import text
 
+from sdlc_lens.db.models.document_content import (
+    FTS_PROJECT_KEY_SQL,
+    FTS_SOURCE_VIEW_NAME,
+    FTS_TYPE_KEY_SQL,
+    TRIGRAM_SOURCE_VIEW_NAME,
+)
+
 if TYPE_CHECKING:
+    from collections.abc import Collection
+
     from sqlalchemy.ext.asyncio import AsyncSession
 
-# DDL for creating the FTS5 virtual table (external content mode).
+# DDL for creating the FTS5 virtual table (external content mode). The content table is
+# the documents_fts_source view, which joins each document to its decompressed body
+# (db/models/document_content.py); the view is created with the schema.
+#
+# project_key and type_key are filter columns: each holds a single token naming the
+# document's project or type. A search scoped to a project or type ANDs that token into
+# its MATCH expression (see text_match()), so FTS5 intersects posting lists and only
+# the documents in scope are ever ranked - instead of ranking every match in the corpus
+# and joining documents and projects to discard most of them. (UNINDEXED columns would
+# not do: on an external-content table, FTS5 reads an UNINDEXED value back from the
+# content view row by row, after the match.) They take no part in the ranking; see
+# BM25_RANK.
 FTS5_CREATE_SQL = (
     "CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5("
-    "title, content, "
-    "content=documents, content_rowid=id, "
+    "title, content, project_key, type_key, "
+    f"content={FTS_SOURCE_VIEW_NAME}, content_rowid=id, "
     "tokenize=\"unicode61 tokenchars '_'\")"
 )
 
+# bm25() with per-column weights: title and content count, the filter keys do not.
+BM25_RANK = "bm25(documents_fts, 1.0, 1.0, 0.0, 0.0)"
+
+# The word index's vocabulary, one row per (term, column) with the number of documents
+# and occurrences - what search suggestions complete terms from (services/suggest.py).
+FTS5_VOCAB_CREATE_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts_vocab USING fts5vocab(documents_fts, 'col')"
+)
+
+
+def project_key(project_id: int) -> str:
+    """The token a project's documents are indexed under (matches FTS_PROJECT_KEY_SQL)."""
+    return f"p{project_id}"
+
+
+def type_key(doc_type: str) -> str:
+    """The token a document type is indexed under (matches FTS_TYPE_KEY_SQL)."""
+    return "t" + doc_type.encode().hex()
+
+
+def _any_key(column: str, keys: list[str]) -> str:
+    if len(keys) == 1:
+        return f"{column} : {keys[0]}"
+    return f"{column} : ({' OR '.join(keys)})"
+
+
+def text_match(
+    phrase: str | None,
+    *,
+    project_id: int | Collection[int] | None = None,
+    doc_type: str | Collection[str] | None = None,
+) -> str:
+    """An FTS5 MATCH expression: ``phrase`` in the text columns, within the given scope.
+
+    ``phrase`` must already be a quoted FTS5 phrase, or an FTS5 expression in
+    parentheses (services/search_query.py). It is confined to title and content so that
+    a query such as "p12" cannot match a filter key. The scope may name several
+    projects or types, any one of which a match must be in. With no ``phrase`` it
+    matches every document in the scope, which must then be given.
+    """
+    terms = [f"{{title content}} : {phrase}"] if phrase is not None else []
+    if project_id is not None:
+        ids = [project_id] if isinstance(project_id, int) else sorted(project_id)
+        terms.append(_any_key("project_key", [project_key(i) for i in ids]))
+    if doc_type is not None:
+        types = [doc_type] if isinstance(doc_type, str) else sorted(doc_type)
+        terms.append(_any_key("type_key", [type_key(t) for t in types]))
+    if not terms:
+        raise ValueError("a match with no phrase needs a project or type scope")
+    return " AND ".join(terms)
+
+
+# A second index, for substrings. The word index above only matches whole unicode61
+# tokens, so the middle of a word - or the head of an id, "US00" or "01KX8B" of
+# "US0042" or "01KX8BQ7..." - finds nothing there. The trigram tokenizer indexes every
+# three-character sequence of doc_id, title and body instead, and a quoted phrase then
+# matches any substring of at least three characters, case-insensitively. It is several
+# times the size of the word index, so it is only searched for queries that need it
+# (see services/search.py).
+#
+# Unlike the word index, which a sync rebuilds wholesale, it is maintained row by row,
+# in the same transaction as the write: triggers on documents remove a row's old entry
+# and index its new one. They fire for every write path - ORM flushes, bulk SQL and the
+# cascade that deletes a project's documents. A row's old body is still stored when its
+# trigger runs; the flush listeners in db/models/document.py prune bodies only after
+# the flush.
+TRIGRAM_TABLE = "documents_trigram"
+TRIGRAM_CREATE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TRIGRAM_TABLE} USING fts5("
+    "doc_id, title, content, "
+    f"content={TRIGRAM_SOURCE_VIEW_NAME}, content_rowid=id, "
+    'tokenize="trigram")'
+)
+
+# The shortest substring the trigram index can match; a shorter phrase matches nothing.
+TRIGRAM_MIN_LENGTH = 3
+
+_TRIGRAM_INDEX_NEW = (
+    f"INSERT INTO {TRIGRAM_TABLE}(rowid, doc_id, title, content) "
+    f"SELECT id, doc_id, title, content FROM {TRIGRAM_SOURCE_VIEW_NAME} WHERE id = new.id;"
+)
+_TRIGRAM_REMOVE_OLD = (
+    f"INSERT INTO {TRIGRAM_TABLE}({TRIGRAM_TABLE}, rowid, doc_id, title, content) "
+    "VALUES ('delete', old.id, old.doc_id, old.title, "
+    "sdlc_inflate((SELECT body FROM document_contents WHERE hash = old.content_hash)));"
+)
+TRIGRAM_TRIGGERS_SQL = (
+    "CREATE TRIGGER IF NOT EXISTS documents_trigram_ai AFTER INSERT ON documents "
+    f"BEGIN {_TRIGRAM_INDEX_NEW} END",
+    "CREATE TRIGGER IF NOT EXISTS documents_trigram_ad AFTER DELETE ON documents "
+    f"BEGIN {_TRIGRAM_REMOVE_OLD} END",
+    "CREATE TRIGGER IF NOT EXISTS documents_trigram_au "
+    "AFTER UPDATE OF doc_id, title, content_hash ON documents "
+    f"BEGIN {_TRIGRAM_REMOVE_OLD} {_TRIGRAM_INDEX_NEW} END",
+)
+
+
+def trigram_match(phrase: str) -> str:
+    """An FTS5 MATCH expression for the trigram index: ``phrase`` as a substring.
+
+    ``phrase`` must already be a quoted FTS5 phrase. The trigram index has no filter
+    keys - a key token would match as a substring of another ("p1" of "p12") - so a
+    scope is applied by joining ``documents``.
+    """
+    return f"{{doc_id title content}} : {phrase}"
+
+
+async def trigram_create(session: AsyncSession) -> None:
+    """Create the trigram index and the triggers that maintain it, and fill it."""
+    await session.execute(text(TRIGRAM_CREATE_SQL))
+    for statement in TRIGRAM_TRIGGERS_SQL:
+        await session.execute(text(statement))
+    await session.execute(text(f"INSERT INTO {TRIGRAM_TABLE}({TRIGRAM_TABLE}) VALUES('rebuild')"))
+
+
+# The filter keys of an indexed row come from its documents row, so the helpers below
+# must run while that row exists: before deleting it, after inserting it.
+_KEYS_FROM_DOCUMENT = (
+    f"SELECT {FTS_PROJECT_KEY_SQL}, {FTS_TYPE_KEY_SQL} FROM documents d WHERE d.id = :rowid"
+)
+
 
 async def fts_insert(
     session: AsyncSession,
@@ -26,7 +167,10 @@ async def fts_insert(
 ) -> None:
     """Insert a document into the FTS5 index."""
     await session.execute(
-        text("INSERT INTO documents_fts(rowid, title, content) VALUES (:rowid, :title, :content)"),
+        text(
+            "INSERT INTO documents_fts(rowid, title, content, project_key, type_key) "
+            f"SELECT :rowid, :title, :content, keys.* FROM ({_KEYS_FROM_DOCUMENT}) keys"
+        ),
         {"rowid": rowid, "title": title, "content": content},
     )
 
@@ -54,8 +198,9 @@ async def fts_delete(
     """Delete a document from the FTS5 index."""
     await session.execute(
         text(
-            "INSERT INTO documents_fts(documents_fts, rowid, title, content) "
-            "VALUES('delete', :rowid, :title, :content)"
+            "INSERT INTO documents_fts(documents_fts, rowid, title, content, project_key, "
+            "type_key) "
+            f"SELECT 'delete', :rowid, :title, :content, keys.* FROM ({_KEYS_FROM_DOCUMENT}) keys"
         ),
         {"rowid": rowid, "title": title, "content": content},
     )
@@ -7,15 +7,19 @@ human review and AI agent consumption.
 
 from __future__ import annotations
 
+import copy
 import datetime
 import re
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 
 from sdlc_lens.utils import sdlc_ids, sdlc_status
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from sdlc_lens.db.models.document import Document
+    from sdlc_lens.services.similarity import NearDuplicateCluster
 
 # ---------------------------------------------------------------------------
 # Status vocabulary (schema-v3)
@@ -93,6 +97,8 @@ class AffectedDocument:
     doc_id: str
     doc_type: str
     title: str
+    # documents.id, which the stored report (services/health_report.py) keys findings on.
+    document_id: int | None = None
 
 
 @dataclass(frozen=True)
@@ -121,12 +127,110 @@ class HealthCheckResult:
 
 def _affected(doc: Document) -> AffectedDocument:
     """Build an AffectedDocument from a Document model."""
-    return AffectedDocument(doc_id=doc.doc_id, doc_type=doc.doc_type, title=doc.title)
+    return AffectedDocument(
+        doc_id=doc.doc_id, doc_type=doc.doc_type, title=doc.title, document_id=doc.id
+    )
+
 
+class _RuleContext:
+    """The project's documents, indexed once per run the ways the rules look them up.
 
-def _build_key_set(docs: list[Document]) -> set[str]:
-    """Build a set of normalised doc_id keys for fast lookup."""
-    return {_doc_key(d.doc_id) for d in docs}
+    Every rule used to take the bare document list and build its own lookups: the
+    stories of each type filtered out of the whole list rule after rule, the set of
+    document keys rebuilt by each rule that resolves a reference, the stories of a Done
+    epic found by scanning every story for every epic (quadratic) and the same status
+    strings canonicalised again for each rule that asks whether they are terminal. Here
+    each of those is computed once, in one pass over the documents, and shared; each
+    rule is then one pass over the documents it is about.
+
+    Those are the ``subjects``: every document for a full run, and for an incremental
+    one (:func:`recheck_documents`) only the documents whose findings may have changed,
+    set through :meth:`focus`. The indexes always cover the whole project, so a rule
+    judges a subject against the same evidence either way.
+
+    Lists keep the documents' order, so findings come out in the same order as before.
+    """
+
+    def __init__(self, docs: Sequence[Document]):
+        self.docs = docs
+        self.by_type: dict[str, list[Document]] = {}
+        self.by_doc_id: dict[str, list[Document]] = {}
+        # Every document's normalised id key: what a reference must resolve to.
+        self.keys: set[str] = set()
+        # Stories by the key of the epic they name, and every other document by the key
+        # of the story it names: the children of a parent.
+        self.stories_by_epic: dict[str, list[Document]] = {}
+        self.by_story: dict[str, list[Document]] = {}
+        self._doc_keys: dict[str, str] = {}
+        self._ref_keys: dict[str, str | None] = {}
+        self._terminal: dict[tuple[str | None, str | None], bool] = {}
+        self._canonical: dict[tuple[str | None, str | None], str | None] = {}
+        for doc in docs:
+            self.by_type.setdefault(doc.doc_type, []).append(doc)
+            self.by_doc_id.setdefault(doc.doc_id, []).append(doc)
+            self.keys.add(self.doc_key(doc))
+            if doc.doc_type == "story":
+                if doc.epic:
+                    self.stories_by_epic.setdefault(self.ref_key(doc.epic), []).append(doc)
+            elif doc.story:
+                self.by_story.setdefault(self.ref_key(doc.story), []).append(doc)
+        self._set_subjects(docs, self.by_type)
+
+    def _set_subjects(
+        self, subjects: Sequence[Document], by_type: dict[str, list[Document]]
+    ) -> None:
+        self.subjects = subjects
+        self._subjects_by_type = by_type
+        # The subject stories still in play: not archived and not in a terminal status.
+        self.open_stories = [
+            d
+            for d in self.subjects_of_type("story")
+            if not _is_archive(d) and not self.is_terminal("story", d.status)
+        ]
+
+    def focus(self, subjects: Sequence[Document]) -> _RuleContext:
+        """The same indexes, with the rules reporting on ``subjects`` only."""
+        view = copy.copy(self)
+        by_type: dict[str, list[Document]] = {}
+        for doc in subjects:
+            by_type.setdefault(doc.doc_type, []).append(doc)
+        view._set_subjects(subjects, by_type)
+        return view
+
+    def subjects_of_type(self, doc_type: str) -> list[Document]:
+        return self._subjects_by_type.get(doc_type, [])
+
+    def of_type(self, doc_type: str) -> list[Document]:
+        return self.by_type.get(doc_type, [])
+
+    def doc_key(self, doc: Document | PreviousVersion) -> str:
+        """:func:`_doc_key` of the document's id, memoised."""
+        key = self._doc_keys.get(doc.doc_id)
+        if key is None:
+            key = self._doc_keys[doc.doc_id] = _doc_key(doc.doc_id)
+        return key
+
+    def ref_key(self, value: str | None) -> str | None:
+        """:func:`_ref_key` of a reference, memoised."""
+        if not value:
+            return None
+        if value not in self._ref_keys:
+            self._ref_keys[value] = _ref_key(value)
+        return self._ref_keys[value]
+
+    def is_terminal(self, doc_type: str | None, status: str | None) -> bool:
+        """``sdlc_status.is_terminal``, memoised: a project has few distinct statuses."""
+        key = (doc_type, status)
+        if key not in self._terminal:
+            self._terminal[key] = sdlc_status.is_terminal(doc_type, status)
+        return self._terminal[key]
+
+    def canonical_status(self, status: str | None, doc_type: str | None) -> str | None:
+        """``sdlc_status.canonical_status``, memoised."""
+        key = (status, doc_type)
+        if key not in self._canonical:
+            self._canonical[key] = sdlc_status.canonical_status(status, doc_type)
+        return self._canonical[key]
 
 
 # ---------------------------------------------------------------------------
@@ -134,10 +238,9 @@ def _build_key_set(docs: list[Document]) -> set[str]:
 # ---------------------------------------------------------------------------
 
 
-def _check_missing_prd(docs: list[Document]) -> list[HealthFinding]:
+def _check_missing_prd(ctx: _RuleContext) -> list[HealthFinding]:
     """MISSING_PRD: project has no PRD document."""
-    prd_docs = [d for d in docs if d.doc_type == "prd"]
-    if not prd_docs and docs:
+    if not ctx.of_type("prd") and ctx.docs:
         return [
             HealthFinding(
                 rule_id="MISSING_PRD",
@@ -153,10 +256,9 @@ def _check_missing_prd(docs: list[Document]) -> list[HealthFinding]:
     return []
 
 
-def _check_missing_trd(docs: list[Document]) -> list[HealthFinding]:
+def _check_missing_trd(ctx: _RuleContext) -> list[HealthFinding]:
     """MISSING_TRD: project has no TRD document."""
-    trd_docs = [d for d in docs if d.doc_type == "trd"]
-    if not trd_docs and docs:
+    if not ctx.of_type("trd") and ctx.docs:
         return [
             HealthFinding(
                 rule_id="MISSING_TRD",
@@ -172,26 +274,16 @@ def _check_missing_trd(docs: list[Document]) -> list[HealthFinding]:
     return []
 
 
-def _check_missing_plan(docs: list[Document]) -> list[HealthFinding]:
+def _check_missing_plan(ctx: _RuleContext) -> list[HealthFinding]:
     """MISSING_PLAN: story has no associated plan.
 
     Skips inactive stories (Done, Complete, Won't Implement) since plans
     are pre-implementation artefacts with no retroactive value.
     """
-    stories = [
-        d
-        for d in docs
-        if d.doc_type == "story"
-        and not _is_archive(d)
-        and not sdlc_status.is_terminal("story", d.status)
-    ]
-    plans = [d for d in docs if d.doc_type == "plan"]
-    plan_stories = {_ref_key(p.story) for p in plans if p.story}
-
     findings = []
-    for story in stories:
-        story_pfx = _doc_key(story.doc_id)
-        if story_pfx not in plan_stories:
+    for story in ctx.open_stories:
+        children = ctx.by_story.get(ctx.doc_key(story), [])
+        if not any(d.doc_type == "plan" for d in children):
             findings.append(
                 HealthFinding(
                     rule_id="MISSING_PLAN",
@@ -208,34 +300,23 @@ def _check_missing_plan(docs: list[Document]) -> list[HealthFinding]:
     return findings
 
 
-def _check_missing_test_spec(docs: list[Document]) -> list[HealthFinding]:
+def _check_missing_test_spec(ctx: _RuleContext) -> list[HealthFinding]:
     """MISSING_TEST_SPEC: story has no associated test-spec.
 
     Skips inactive stories and stories whose epic has an epic-scoped
     test-spec (covering multiple stories by design).
     """
-    stories = [
-        d
-        for d in docs
-        if d.doc_type == "story"
-        and not _is_archive(d)
-        and not sdlc_status.is_terminal("story", d.status)
-    ]
-    test_specs = [d for d in docs if d.doc_type == "test-spec"]
-    tested_stories = {_ref_key(ts.story) for ts in test_specs if ts.story}
-
     # Build set of epics covered by epic-scoped test-specs
-    epics_with_specs: set[str] = set()
-    for ts in test_specs:
-        if not ts.story and ts.epic:
-            epics_with_specs.add(_ref_key(ts.epic))
+    epics_with_specs = {
+        ctx.ref_key(ts.epic) for ts in ctx.of_type("test-spec") if not ts.story and ts.epic
+    }
 
     findings = []
-    for story in stories:
-        story_pfx = _doc_key(story.doc_id)
-        if story_pfx not in tested_stories:
+    for story in ctx.open_stories:
+        children = ctx.by_story.get(ctx.doc_key(story), [])
+        if not any(d.doc_type == "test-spec" for d in children):
             # Skip if the story's epic has an epic-scoped test-spec
-            if story.epic and _ref_key(story.epic) in epics_with_specs:
+            if story.epic and ctx.ref_key(story.epic) in epics_with_specs:
                 continue
             findings.append(
                 HealthFinding(
@@ -253,16 +334,13 @@ def _check_missing_test_spec(docs: list[Document]) -> list[HealthFinding]:
     return findings
 
 
-def _check_epic_no_stories(docs: list[Document]) -> list[HealthFinding]:
+def _check_epic_no_stories(ctx: _RuleContext) -> list[HealthFinding]:
     """EPIC_NO_STORIES: epic has zero child stories."""
-    epics = [d for d in docs if d.doc_type == "epic" and not _is_review_doc(d)]
-    stories = [d for d in docs if d.doc_type == "story"]
-    epics_with_stories = {_ref_key(s.epic) for s in stories if s.epic}
-
     findings = []
-    for epic in epics:
-        epic_pfx = _doc_key(epic.doc_id)
-        if epic_pfx not in epics_with_stories:
+    for epic in ctx.subjects_of_type("epic"):
+        if _is_review_doc(epic):
+            continue
+        if ctx.doc_key(epic) not in ctx.stories_by_epic:
             findings.append(
                 HealthFinding(
                     rule_id="EPIC_NO_STORIES",
@@ -284,11 +362,12 @@ def _check_epic_no_stories(docs: list[Document]) -> list[HealthFinding]:
 # ---------------------------------------------------------------------------
 
 
-def _check_story_no_epic(docs: list[Document]) -> list[HealthFinding]:
+def _check_story_no_epic(ctx: _RuleContext) -> list[HealthFinding]:
     """STORY_NO_EPIC: story has no epic reference."""
-    stories = [d for d in docs if d.doc_type == "story" and not _is_archive(d)]
     findings = []
-    for story in stories:
+    for story in ctx.subjects_of_type("story"):
+        if _is_archive(story):
+            continue
         if not story.epic and not _has_epic_in_content(story):
             findings.append(
                 HealthFinding(
@@ -306,11 +385,10 @@ def _check_story_no_epic(docs: list[Document]) -> list[HealthFinding]:
     return findings
 
 
-def _check_plan_no_story(docs: list[Document]) -> list[HealthFinding]:
+def _check_plan_no_story(ctx: _RuleContext) -> list[HealthFinding]:
     """PLAN_NO_STORY: plan has no story reference."""
-    plans = [d for d in docs if d.doc_type == "plan"]
     findings = []
-    for plan in plans:
+    for plan in ctx.subjects_of_type("plan"):
         if not plan.story:
             findings.append(
                 HealthFinding(
@@ -327,15 +405,14 @@ def _check_plan_no_story(docs: list[Document]) -> list[HealthFinding]:
     return findings
 
 
-def _check_test_spec_no_story(docs: list[Document]) -> list[HealthFinding]:
+def _check_test_spec_no_story(ctx: _RuleContext) -> list[HealthFinding]:
     """TEST_SPEC_NO_STORY: test-spec has no story reference.
 
     Skips epic-scoped test-specs that reference an epic instead of a
     single story (they cover multiple stories by design).
     """
-    test_specs = [d for d in docs if d.doc_type == "test-spec"]
     findings = []
-    for ts in test_specs:
+    for ts in ctx.subjects_of_type("test-spec"):
         if not ts.story:
             # Skip if the test-spec is epic-scoped (has an epic reference)
             if ts.epic or _has_epic_in_content(ts):
@@ -356,17 +433,16 @@ def _check_test_spec_no_story(docs: list[Document]) -> list[HealthFinding]:
     return findings
 
 
-def _check_orphan_reference(docs: list[Document]) -> list[HealthFinding]:
+def _check_orphan_reference(ctx: _RuleContext) -> list[HealthFinding]:
     """ORPHAN_REFERENCE: document references non-existent parent."""
-    prefixes = _build_key_set(docs)
     findings = []
 
-    for doc in docs:
+    for doc in ctx.subjects:
         # Records reference other docs informally - do not treat as broken links.
         if _is_record(doc):
             continue
         # Check epic references (resolved via normalised id key)
-        if doc.epic and _ref_key(doc.epic) not in prefixes:
+        if doc.epic and ctx.ref_key(doc.epic) not in ctx.keys:
             findings.append(
                 HealthFinding(
                     rule_id="ORPHAN_REFERENCE",
@@ -381,7 +457,7 @@ def _check_orphan_reference(docs: list[Document]) -> list[HealthFinding]:
                 )
             )
         # Check story references (resolved via normalised id key)
-        if doc.story and _ref_key(doc.story) not in prefixes:
+        if doc.story and ctx.ref_key(doc.story) not in ctx.keys:
             findings.append(
                 HealthFinding(
                     rule_id="ORPHAN_REFERENCE",
@@ -401,21 +477,17 @@ def _check_orphan_reference(docs: list[Document]) -> list[HealthFinding]:
     return findings
 
 
-def _check_status_mismatch(docs: list[Document]) -> list[HealthFinding]:
+def _check_status_mismatch(ctx: _RuleContext) -> list[HealthFinding]:
     """STATUS_MISMATCH: epic marked Done but has non-Done children.
 
     Treats Won't Implement as a terminal status (not incomplete).
     """
-    epics = [d for d in docs if d.doc_type == "epic"]
-    stories = [d for d in docs if d.doc_type == "story"]
-
     findings = []
-    for epic in epics:
-        if not sdlc_status.is_terminal("epic", epic.status):
+    for epic in ctx.subjects_of_type("epic"):
+        if not ctx.is_terminal("epic", epic.status):
             continue
-        epic_pfx = _doc_key(epic.doc_id)
-        child_stories = [s for s in stories if _ref_key(s.epic) == epic_pfx]
-        incomplete = [s for s in child_stories if not sdlc_status.is_terminal("story", s.status)]
+        child_stories = ctx.stories_by_epic.get(ctx.doc_key(epic), [])
+        incomplete = [s for s in child_stories if not ctx.is_terminal("story", s.status)]
         if incomplete:
             findings.append(
                 HealthFinding(
@@ -436,7 +508,7 @@ def _check_status_mismatch(docs: list[Document]) -> list[HealthFinding]:
     return findings
 
 
-def _check_stale_artefact_status(docs: list[Document]) -> list[HealthFinding]:
+def _check_stale_artefact_status(ctx: _RuleContext) -> list[HealthFinding]:
     """STALE_ARTEFACT_STATUS: document not completed but parent story is Done.
 
     Flags plans, test-specs, workflows, and other artefacts that reference
@@ -444,19 +516,19 @@ def _check_stale_artefact_status(docs: list[Document]) -> list[HealthFinding]:
     """
     # Build lookup of story key -> status
     story_status: dict[str, str] = {}
-    for d in docs:
-        if d.doc_type == "story" and d.status:
-            story_status[_doc_key(d.doc_id)] = d.status
+    for d in ctx.of_type("story"):
+        if d.status:
+            story_status[ctx.doc_key(d)] = d.status
 
     # Check non-story documents that reference a story
     findings = []
-    for doc in docs:
+    for doc in ctx.subjects:
         if doc.doc_type == "story" or _is_record(doc) or not doc.story:
             continue
-        if sdlc_status.is_terminal(doc.doc_type, doc.status):
+        if ctx.is_terminal(doc.doc_type, doc.status):
             continue
-        parent_status = story_status.get(_ref_key(doc.story))
-        if parent_status and sdlc_status.is_terminal("story", parent_status):
+        parent_status = story_status.get(ctx.ref_key(doc.story))
+        if parent_status and ctx.is_terminal("story", parent_status):
             findings.append(
                 HealthFinding(
                     rule_id="STALE_ARTEFACT_STATUS",
@@ -475,17 +547,17 @@ def _check_stale_artefact_status(docs: list[Document]) -> list[HealthFinding]:
     return findings
 
 
-def _check_untriaged_inbox(docs: list[Document]) -> list[HealthFinding]:
+def _check_untriaged_inbox(ctx: _RuleContext) -> list[HealthFinding]:
     """UNTRIAGED_INBOX: bug/CR/RFC still sitting in the inbox with no triage.
 
     Schema-v3 lands new findings with status ``inbox``. Terminal artefacts
     (Fixed bug, Complete CR) are not flagged.
     """
     findings = []
-    for doc in docs:
+    for doc in ctx.subjects:
         if doc.doc_type not in _INBOX_TYPES:
             continue
-        norm = sdlc_status.canonical_status(doc.status, doc.doc_type)
+        norm = ctx.canonical_status(doc.status, doc.doc_type)
         if norm and norm.lower() == _INBOX_STATUS:
             findings.append(
                 HealthFinding(
@@ -519,14 +591,14 @@ def _is_project_level(doc: Document) -> bool:
     return doc.doc_type in _PROJECT_LEVEL_TYPES or doc.doc_id in _PROJECT_LEVEL_DOC_IDS
 
 
-def _check_missing_status(docs: list[Document]) -> list[HealthFinding]:
+def _check_missing_status(ctx: _RuleContext) -> list[HealthFinding]:
     """MISSING_STATUS: document has no status set.
 
     Skips project-level reference documents (PRD, TRD, TSD, etc.) which
     evolve continuously and don't follow the Draft→Done lifecycle.
     """
     findings = []
-    for doc in docs:
+    for doc in ctx.subjects:
         if _is_project_level(doc) or _is_record(doc):
             continue
         if not doc.status:
@@ -546,11 +618,11 @@ def _check_missing_status(docs: list[Document]) -> list[HealthFinding]:
     return findings
 
 
-def _check_missing_owner(docs: list[Document]) -> list[HealthFinding]:
+def _check_missing_owner(ctx: _RuleContext) -> list[HealthFinding]:
     """MISSING_OWNER: story/epic has no owner assigned."""
     applicable = [
         d
-        for d in docs
+        for d in ctx.subjects
         if d.doc_type in ("story", "epic") and not _is_archive(d) and not _is_review_doc(d)
     ]
     findings = []
@@ -571,21 +643,14 @@ def _check_missing_owner(docs: list[Document]) -> list[HealthFinding]:
     return findings
 
 
-def _check_missing_priority(docs: list[Document]) -> list[HealthFinding]:
+def _check_missing_priority(ctx: _RuleContext) -> list[HealthFinding]:
     """MISSING_PRIORITY: story has no priority set.
 
     Skips inactive stories since priority is a planning field with
     no value on completed work.
     """
-    stories = [
-        d
-        for d in docs
-        if d.doc_type == "story"
-        and not _is_archive(d)
-        and not sdlc_status.is_terminal("story", d.status)
-    ]
     findings = []
-    for story in stories:
+    for story in ctx.open_stories:
         if not story.priority:
             findings.append(
                 HealthFinding(
@@ -602,20 +667,13 @@ def _check_missing_priority(docs: list[Document]) -> list[HealthFinding]:
     return findings
 
 
-def _check_missing_story_points(docs: list[Document]) -> list[HealthFinding]:
+def _check_missing_story_points(ctx: _RuleContext) -> list[HealthFinding]:
     """MISSING_STORY_POINTS: story has no story points.
 
     Skips inactive stories since story points are a planning field.
     """
-    stories = [
-        d
-        for d in docs
-        if d.doc_type == "story"
-        and not _is_archive(d)
-        and not sdlc_status.is_terminal("story", d.status)
-    ]
     findings = []
-    for story in stories:
+    for story in ctx.open_stories:
         if story.story_points is None:
             findings.append(
                 HealthFinding(
@@ -638,24 +696,23 @@ def _check_missing_story_points(docs: list[Document]) -> list[HealthFinding]:
 # ---------------------------------------------------------------------------
 
 
-def _check_duplicate_doc_id(docs: list[Document]) -> list[HealthFinding]:
-    """DUPLICATE_DOC_ID: multiple documents share the same doc_id prefix."""
-    seen: dict[str, list[Document]] = {}
-    for doc in docs:
-        # Use full doc_id as key (duplicates come from same doc_id on different types)
-        key = doc.doc_id
-        seen.setdefault(key, []).append(doc)
+def _check_duplicate_doc_id(ctx: _RuleContext) -> list[HealthFinding]:
+    """DUPLICATE_DOC_ID: multiple documents share the same doc_id prefix.
 
+    Reported once per group, about its first document.
+    """
     findings = []
-    for doc_id, group in seen.items():
-        if len(group) > 1:
+    for doc in ctx.subjects:
+        # Use full doc_id as key (duplicates come from same doc_id on different types)
+        group = ctx.by_doc_id[doc.doc_id]
+        if len(group) > 1 and group[0] is doc:
             findings.append(
                 HealthFinding(
                     rule_id="DUPLICATE_DOC_ID",
                     severity="critical",
                     category="integrity",
                     message=(
-                        f"Multiple documents share doc_id '{doc_id}': "
+                        f"Multiple documents share doc_id '{doc.doc_id}': "
                         f"{', '.join(d.doc_type for d in group)}."
                     ),
                     affected_documents=[_affected(d) for d in group],
@@ -668,10 +725,10 @@ def _check_duplicate_doc_id(docs: list[Document]) -> list[HealthFinding]:
     return findings
 
 
-def _check_empty_content(docs: list[Document]) -> list[HealthFinding]:
+def _check_empty_content(ctx: _RuleContext) -> list[HealthFinding]:
     """EMPTY_CONTENT: document has no meaningful content."""
     findings = []
-    for doc in docs:
+    for doc in ctx.subjects:
         stripped = doc.content.strip() if doc.content else ""
         # Consider content empty if it's just a heading or less than 50 chars
         if len(stripped) < 50:
@@ -691,17 +748,21 @@ def _check_empty_content(docs: list[Document]) -> list[HealthFinding]:
     return findings
 
 
+# How long a document may go unsynced before STALE_DOCUMENT reports it.
+STALE_AFTER = datetime.timedelta(days=30)
+
+
 def _check_stale_document(
-    docs: list[Document],
+    ctx: _RuleContext,
     now: datetime.datetime | None = None,
 ) -> list[HealthFinding]:
     """STALE_DOCUMENT: document not synced in 30+ days."""
     if now is None:
         now = datetime.datetime.now(tz=datetime.UTC)
 
-    threshold = now - datetime.timedelta(days=30)
+    threshold = now - STALE_AFTER
     findings = []
-    for doc in docs:
+    for doc in ctx.subjects:
         synced = doc.synced_at
         # Make offset-aware if naive
         if synced.tzinfo is None:
@@ -725,6 +786,43 @@ def _check_stale_document(
     return findings
 
 
+def _check_near_duplicate(
+    ctx: _RuleContext,
+    clusters: Sequence[NearDuplicateCluster],
+) -> list[HealthFinding]:
+    """NEAR_DUPLICATE: documents whose bodies are (nearly) the same - copy-paste.
+
+    The clusters come from the similarity index (services/similarity.py); here they are
+    only matched to the documents. Archive files are left out, and a cluster with fewer
+    than two documents left is not a finding.
+    """
+    by_id = {doc.id: doc for doc in ctx.docs if not _is_archive(doc)}
+    findings = []
+    for cluster in clusters:
+        group = [by_id[i] for i in cluster.document_ids if i in by_id]
+        if len(group) < 2:
+            continue
+        findings.append(
+            HealthFinding(
+                rule_id="NEAR_DUPLICATE",
+                severity="medium",
+                category="quality",
+                message=(
+                    f"{len(group)} documents are near-duplicates, sharing at least "
+                    f"{cluster.similarity:.0%} of their words: "
+                    f"{', '.join(d.doc_id for d in group)}."
+                ),
+                affected_documents=[_affected(d) for d in group],
+                suggested_fix=(
+                    "Check whether these were copied from one another, and rewrite or "
+                    "merge them so each describes its own work. "
+                    f"Affected: {', '.join(d.file_path for d in group)}."
+                ),
+            )
+        )
+    return findings
+
+
 # ---------------------------------------------------------------------------
 # All rules in execution order
 # ---------------------------------------------------------------------------
@@ -754,6 +852,51 @@ _ALL_RULES = [
     _check_empty_content,
 ]
 
+# The rules by footprint: which documents' findings a change to one document can alter.
+#
+# A per-document rule judges a document by its own fields alone, so only the documents
+# that changed need judging again. A parent/child rule also reads the documents related
+# to it by id - a story's plans and test-specs, an epic's stories, the target of a
+# reference, the namesakes of a doc_id - so the documents sharing a key with a changed
+# one (see :func:`_neighbourhood`) are judged again too. A project-level rule is about
+# the project as a whole and is re-run every time. Every finding of the first two kinds
+# is about its first affected document, the one the rule was judging.
+_DOCUMENT_RULES = {
+    _check_story_no_epic: "STORY_NO_EPIC",
+    _check_plan_no_story: "PLAN_NO_STORY",
+    _check_test_spec_no_story: "TEST_SPEC_NO_STORY",
+    _check_untriaged_inbox: "UNTRIAGED_INBOX",
+    _check_missing_status: "MISSING_STATUS",
+    _check_missing_owner: "MISSING_OWNER",
+    _check_missing_priority: "MISSING_PRIORITY",
+    _check_missing_story_points: "MISSING_STORY_POINTS",
+    _check_empty_content: "EMPTY_CONTENT",
+}
+_RELATIONSHIP_RULES = {
+    _check_missing_plan: "MISSING_PLAN",
+    _check_missing_test_spec: "MISSING_TEST_SPEC",
+    _check_epic_no_stories: "EPIC_NO_STORIES",
+    _check_orphan_reference: "ORPHAN_REFERENCE",
+    _check_status_mismatch: "STATUS_MISMATCH",
+    _check_stale_artefact_status: "STALE_ARTEFACT_STATUS",
+    _check_duplicate_doc_id: "DUPLICATE_DOC_ID",
+}
+_PROJECT_RULES = {
+    _check_missing_prd: "MISSING_PRD",
+    _check_missing_trd: "MISSING_TRD",
+}
+
+DOCUMENT_RULE_IDS = frozenset(_DOCUMENT_RULES.values())
+RELATIONSHIP_RULE_IDS = frozenset(_RELATIONSHIP_RULES.values())
+
+# Every rule id in report order. STALE_DOCUMENT moves with the clock rather than with
+# the documents, and NEAR_DUPLICATE is found in the similarity index; both come last.
+RULE_ORDER = (
+    *({**_DOCUMENT_RULES, **_RELATIONSHIP_RULES, **_PROJECT_RULES}[rule] for rule in _ALL_RULES),
+    "STALE_DOCUMENT",
+    "NEAR_DUPLICATE",
+)
+
 
 _SEVERITY_WEIGHTS = {
     "critical": 15,
@@ -767,20 +910,37 @@ def run_health_check(
     documents: list[Document],
     project_slug: str,
     now: datetime.datetime | None = None,
+    near_duplicates: Sequence[NearDuplicateCluster] = (),
 ) -> HealthCheckResult:
     """Run all health check rules against a list of documents.
 
     Pure function - no database access. Pass the full document list
-    for the project.
+    for the project, and its near-duplicate clusters as found in the
+    similarity index (services.similarity.near_duplicate_clusters).
     """
     findings: list[HealthFinding] = []
 
+    # Indexed once, shared by every rule.
+    ctx = _RuleContext(documents)
     for rule_fn in _ALL_RULES:
-        findings.extend(rule_fn(documents))
+        findings.extend(rule_fn(ctx))
 
     # Stale document check needs timestamp
-    findings.extend(_check_stale_document(documents, now=now))
+    findings.extend(_check_stale_document(ctx, now=now))
+
+    # Near-duplicates are found in the similarity index, not in the document list
+    findings.extend(_check_near_duplicate(ctx, near_duplicates))
+
+    return health_check_result(findings, project_slug, len(documents), now=now)
 
+
+def health_check_result(
+    findings: list[HealthFinding],
+    project_slug: str,
+    total_documents: int,
+    now: datetime.datetime | None = None,
+) -> HealthCheckResult:
+    """The result for a project's findings: the severity summary and the score."""
     # Build severity summary
     summary = {"critical": 0, "high": 0, "medium": 0, "low": 0}
     for finding in findings:
@@ -795,8 +955,116 @@ def run_health_check(
     return HealthCheckResult(
         project_slug=project_slug,
         checked_at=check_time.isoformat(),
-        total_documents=len(documents),
+        total_documents=total_documents,
         findings=findings,
         summary=summary,
         score=score,
     )
+
+
+def stale_document_findings(
+    documents: Sequence[Document], now: datetime.datetime | None = None
+) -> list[HealthFinding]:
+    """The STALE_DOCUMENT findings among ``documents``.
+
+    Pass only the documents synced before the cut-off, or near it: the rule needs no
+    other document, and the stored report asks the database for just those.
+    """
+    return _check_stale_document(_RuleContext(documents), now=now)
+
+
+# ---------------------------------------------------------------------------
+# Incremental re-check
+# ---------------------------------------------------------------------------
+
+
+class PreviousVersion(NamedTuple):
+    """The id fields of a document as they were before a sync rewrote or deleted it."""
+
+    doc_id: str
+    epic: str | None
+    story: str | None
+
+
+@dataclass
+class Recheck:
+    """The findings of an incremental re-check, and which stored findings they replace.
+
+    Each finding is paired with the id of the document it is about, or ``None`` for a
+    project-level one. They replace the stored findings of the ``DOCUMENT_RULE_IDS``
+    about ``changed_ids``, those of the ``RELATIONSHIP_RULE_IDS`` about
+    ``neighbour_ids``, and every project-level finding.
+    """
+
+    findings: list[tuple[int | None, HealthFinding]]
+    changed_ids: set[int]
+    neighbour_ids: set[int]
+
+
+def _neighbourhood(
+    ctx: _RuleContext, changed_ids: set[int], previous: Sequence[PreviousVersion]
+) -> list[Document]:
+    """The documents whose parent/child findings a change to ``changed_ids`` can alter.
+
+    A parent/child rule only ever relates documents through an id: a document's own
+    key, the keys its ``epic`` and ``story`` name, or its doc_id. So a changed document
+    - as it is now, and as it was (``previous``) - can only affect the documents that
+    share one of those with it, and they are found here in one pass over the index.
+    """
+    versions = [*(d for d in ctx.docs if d.id in changed_ids), *previous]
+    keys: set[str | None] = set()
+    doc_ids: set[str] = set()
+    for version in versions:
+        keys.update((ctx.doc_key(version), ctx.ref_key(version.epic), ctx.ref_key(version.story)))
+        doc_ids.add(version.doc_id)
+    keys.discard(None)
+    return [
+        d
+        for d in ctx.docs
+        if d.id in changed_ids
+        or d.doc_id in doc_ids
+        or ctx.doc_key(d) in keys
+        or ctx.ref_key(d.epic) in keys
+        or ctx.ref_key(d.story) in keys
+    ]
+
+
+def recheck_documents(
+    documents: Sequence[Document],
+    changed: Sequence[Document],
+    previous: Sequence[PreviousVersion] = (),
+    near_duplicates: Sequence[NearDuplicateCluster] = (),
+) -> Recheck:
+    """Re-run the rules over what a change to some of a project's documents can affect.
+
+    ``documents`` is every document of the project as it is now; the rules read no
+    ``content`` from them, so it need not be loaded. ``changed`` are the ones written
+    since the findings being updated were computed, with their content, and
+    ``previous`` the versions they replaced and those of the documents deleted. Pass
+    every document as ``changed`` for a full check - with the near-duplicate clusters,
+    it yields what :func:`run_health_check` does less STALE_DOCUMENT, which moves with
+    the clock rather than with the documents.
+
+    Pure function, like :func:`run_health_check`.
+    """
+    ctx = _RuleContext(documents)
+    changed_ids = {doc.id for doc in changed}
+    neighbours = _neighbourhood(ctx, changed_ids, previous)
+    by_footprint = {
+        **dict.fromkeys(_DOCUMENT_RULES, ctx.focus(changed)),
+        **dict.fromkeys(_RELATIONSHIP_RULES, ctx.focus(neighbours)),
+        **dict.fromkeys(_PROJECT_RULES, ctx),
+    }
+    findings: list[tuple[int | None, HealthFinding]] = []
+    for rule_fn in _ALL_RULES:
+        project_level = rule_fn in _PROJECT_RULES
+        findings.extend(
+            (None if project_level else finding.affected_documents[0].document_id, finding)
+            for finding in rule_fn(by_footprint[rule_fn])
+        )
+    findings.extend((None, finding) for finding in _check_near_duplicate(ctx, near_duplicates))
+    return Recheck(
+        findings=findings,
+        changed_ids=changed_ids,
+        neighbour_ids={doc.id for doc in neighbours},
+    )
@@ -0,0 +1,247 @@
+"""The stored health report: a project's health findings, kept current by its syncs.
+
+``GET /projects/{slug}/health-check`` reads the findings stored in ``health_findings``
+(db/models/health_report.py) instead of loading the project and running every rule, so
+it costs what the report is long rather than what the project is large. A sync brings
+them up to date before it finishes (:func:`refresh_health_report`), and re-checks only
+what it changed: the rules are sorted by the documents a change can reach
+(services.health_check.recheck_documents), so a sync that rewrote three stories judges
+those three by the per-document rules, their parents, children and namesakes by the
+parent/child rules, and the project by the project-level ones - near-duplicates
+included - while every other stored finding stands.
+
+The report is trusted only while its ``generation`` is the project's
+``corpus_generation``. Anything else that moves the documents - a sync stopped part-way,
+a fixture, a test - leaves it behind, and the endpoint runs the rules live (as it always
+did) until the next sync rebuilds it in full.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+from dataclasses import dataclass, field
+from operator import attrgetter, itemgetter
+from typing import TYPE_CHECKING
+
+from sqlalchemy import delete, insert, select
+
+from sdlc_lens.config import settings
+from sdlc_lens.db.models.health_report import HealthReport, HealthReportFinding
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services.documents import get_health_check_documents
+from sdlc_lens.services.health_check import (
+    DOCUMENT_RULE_IDS,
+    RELATIONSHIP_RULE_IDS,
+    RULE_ORDER,
+    STALE_AFTER,
+    AffectedDocument,
+    HealthCheckResult,
+    HealthFinding,
+    PreviousVersion,
+    health_check_result,
+    recheck_documents,
+    run_health_check,
+    stale_document_findings,
+)
+from sdlc_lens.services.similarity import near_duplicate_clusters
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Ids per IN (...) list, well inside SQLite's bound-parameter limit.
+_ID_BATCH = 500
+
+_RULE_RANK = {rule_id: rank for rank, rule_id in enumerate(RULE_ORDER)}
+
+
+@dataclass
+class DocumentChanges:
+    """What a sync wrote and deleted, for :func:`refresh_health_report`.
+
+    ``document_ids`` are the documents it added or rewrote; ``previous`` the versions of
+    the ones it rewrote or deleted as they were before.
+    """
+
+    document_ids: set[int] = field(default_factory=set)
+    previous: list[PreviousVersion] = field(default_factory=list)
+
+
+def _batches(ids: set[int]) -> Iterator[list[int]]:
+    ordered = sorted(ids)
+    for start in range(0, len(ordered), _ID_BATCH):
+        yield ordered[start : start + _ID_BATCH]
+
+
+async def _current_report(session: AsyncSession, project_id: int) -> HealthReport | None:
+    report = await session.get(HealthReport, project_id)
+    generation = await session.scalar(
+        select(Project.corpus_generation).where(Project.id == project_id)
+    )
+    return report if report is not None and report.generation == generation else None
+
+
+async def health_report_is_current(session: AsyncSession, project_id: int) -> bool:
+    """Does the project's stored report describe its documents as they are now?
+
+    A sync asks before it writes anything: only then are its own changes the whole
+    difference between the report and the documents.
+    """
+    return await _current_report(session, project_id) is not None
+
+
+async def refresh_health_report(
+    session: AsyncSession, project_id: int, changes: DocumentChanges | None = None
+) -> None:
+    """Bring the project's stored report up to date with its documents. Does not commit.
+
+    With ``changes`` - everything written and deleted since the report was last
+    current - only the findings those can affect are recomputed and replaced. Without
+    them, or when they touch half the project or more (where re-checking the
+    neighbourhood costs what checking everything does), the report is rebuilt.
+    """
+    report = await session.get(HealthReport, project_id)
+    documents: Sequence = ()
+    if changes is not None and report is not None:
+        documents = sorted(
+            await get_health_check_documents(session, project_id, content=False),
+            key=attrgetter("id"),
+        )
+        if 2 * len(changes.document_ids) >= len(documents):
+            changes = None
+    recheck = None
+    if changes is None:
+        documents = sorted(
+            await get_health_check_documents(session, project_id), key=attrgetter("id")
+        )
+        clusters = await near_duplicate_clusters(
+            session, project_id, threshold=settings.near_duplicate_threshold
+        )
+        recheck = recheck_documents(documents, documents, near_duplicates=clusters)
+        await session.execute(
+            delete(HealthReportFinding).where(HealthReportFinding.project_id == project_id)
+        )
+        if report is None:
+            report = HealthReport(project_id=project_id, generation=0, total_documents=0)
+            session.add(report)
+    elif changes.document_ids or changes.previous:
+        changed = []
+        for batch in _batches(changes.document_ids):
+            changed += await get_health_check_documents(session, project_id, ids=batch)
+        changed.sort(key=attrgetter("id"))
+        clusters = await near_duplicate_clusters(
+            session, project_id, threshold=settings.near_duplicate_threshold
+        )
+        recheck = recheck_documents(documents, changed, changes.previous, clusters)
+        # The findings about deleted documents went with them (ON DELETE CASCADE).
+        await session.execute(
+            delete(HealthReportFinding).where(
+                HealthReportFinding.project_id == project_id,
+                HealthReportFinding.document_id.is_(None),
+            )
+        )
+        for rule_ids, ids in (
+            (DOCUMENT_RULE_IDS, recheck.changed_ids),
+            (RELATIONSHIP_RULE_IDS, recheck.neighbour_ids),
+        ):
+            for batch in _batches(ids):
+                await session.execute(
+                    delete(HealthReportFinding).where(
+                        HealthReportFinding.document_id.in_(batch),
+                        HealthReportFinding.rule_id.in_(rule_ids),
+                    )
+                )
+    if recheck is not None and recheck.findings:
+        await session.execute(
+            insert(HealthReportFinding),
+            [
+                {
+                    "project_id": project_id,
+                    "document_id": document_id,
+                    "rule_id": finding.rule_id,
+                    "position": position,
+                    "severity": finding.severity,
+                    "category": finding.category,
+                    "message": finding.message,
+                    "suggested_fix": finding.suggested_fix,
+                    "affected": json.dumps(
+                        [
+                            [a.document_id, a.doc_id, a.doc_type, a.title]
+                            for a in finding.affected_documents
+                        ]
+                    ),
+                }
+                for position, (document_id, finding) in enumerate(recheck.findings)
+            ],
+        )
+    report.generation = await session.scalar(
+        select(Project.corpus_generation).where(Project.id == project_id)
+    )
+    report.total_documents = len(documents)
+
+
+def _stored_finding(row: HealthReportFinding) -> HealthFinding:
+    return HealthFinding(
+        rule_id=row.rule_id,
+        severity=row.severity,
+        category=row.category,
+        message=row.message,
+        affected_documents=[
+            AffectedDocument(doc_id=doc_id, doc_type=doc_type, title=title, document_id=id_)
+            for id_, doc_id, doc_type, title in json.loads(row.affected)
+        ],
+        suggested_fix=row.suggested_fix,
+    )
+
+
+async def read_health_report(
+    session: AsyncSession,
+    project_id: int,
+    project_slug: str,
+    now: datetime.datetime | None = None,
+) -> HealthCheckResult | None:
+    """The project's health check from its stored report; ``None`` if that is out of date.
+
+    The stored findings, in report order, with the STALE_DOCUMENT ones worked out for
+    ``now``: only the documents synced before the cut-off are read, through
+    ``ix_documents_project_synced`` - with a day's slack, so that a timestamp stored with
+    an offset is still judged by the rule itself.
+    """
+    report = await _current_report(session, project_id)
+    if report is None:
+        return None
+    now = now or datetime.datetime.now(tz=datetime.UTC)
+    rows = (
+        await session.scalars(
+            select(HealthReportFinding).where(HealthReportFinding.project_id == project_id)
+        )
+    ).all()
+    keyed = [
+        ((_RULE_RANK[row.rule_id], row.document_id or 0, row.position), _stored_finding(row))
+        for row in rows
+    ]
+    cutoff = now - STALE_AFTER + datetime.timedelta(days=1)
+    candidates = await get_health_check_documents(
+        session, project_id, content=False, synced_before=cutoff.replace(tzinfo=None)
+    )
+    stale = stale_document_findings(sorted(candidates, key=attrgetter("id")), now=now)
+    stale_rank = _RULE_RANK["STALE_DOCUMENT"]
+    keyed += [((stale_rank, 0, position), finding) for position, finding in enumerate(stale)]
+    findings = [finding for _, finding in sorted(keyed, key=itemgetter(0))]
+    return health_check_result(findings, project_slug, report.total_documents, now=now)
+
+
+async def check_project_health(
+    session: AsyncSession, project_id: int, project_slug: str
+) -> HealthCheckResult:
+    """The project's health check: from the stored report if current, else run live."""
+    result = await read_health_report(session, project_id, project_slug)
+    if result is not None:
+        return result
+    documents = await get_health_check_documents(session, project_id)
+    clusters = await near_duplicate_clusters(
+        session, project_id, threshold=settings.near_duplicate_threshold
+    )
+    return run_health_check(documents, project_slug=project_slug, near_duplicates=clusters)
@@ -0,0 +1,210 @@
+"""Lease-based leader election between worker processes sharing one database.
+
+Run uvicorn with ``--workers 4`` and the app's lifespan runs four times. Everything it
+starts, it starts four times: four freshness pollers asking GitHub the same question on
+the same timer, four copies of the startup housekeeping racing each other. Exactly one
+worker should do that work, and another must take over when that one dies.
+
+So the workers hold an election through a row in ``leases``. The leader's heartbeat
+renews it every third of its TTL; every other worker's heartbeat tries to take it and
+fails while it is live. A leader that is SIGKILLed or OOMs stops renewing, the lease
+expires, and the next heartbeat anywhere takes it over. A leader that shuts down cleanly
+releases it so the hand-over is immediate.
+
+Both acquisition and renewal are one conditional UPDATE (or an INSERT that loses
+cleanly to a concurrent one). SQLite serialises writers, so two workers can never both
+believe their write won - the same guard ``trigger_sync`` relies on.
+
+Only the leader needs the writer to stay leader. With a ``read_factory`` (the reader
+pool, db/session.py) a follower first looks at the lease there, and goes to the single
+writer connection only when the lease is free or expired - so N-1 workers' heartbeats
+never queue behind a sync's flush for a write that would change nothing.
+
+Leadership is ADVISORY, not a mutex. A leader whose heartbeat stalls past the TTL has
+lost the lease without being told. :attr:`LeaderLease.held` therefore answers from the
+expiry the leader last wrote rather than from "I won an election once", and callers check
+it before each unit of work. Anything that must never run twice still needs its own guard
+(``trigger_sync`` has one); the election only stops the waste.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+import os
+import socket
+import uuid
+from typing import TYPE_CHECKING
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.sqlite import insert
+
+from sdlc_lens.config import settings
+from sdlc_lens.db.models.lease import Lease
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# The lease the poller and the startup housekeeping run under.
+LEADER_LEASE = "leader"
+
+
+def _utcnow() -> datetime.datetime:
+    # Naive UTC, to compare like-for-like with what SQLite hands back.
+    return datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+
+
+def _holder_id() -> str:
+    # The nonce distinguishes a restarted process that happens to reuse a PID.
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaderLease:
+    """This process's view of one named lease."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        name: str = LEADER_LEASE,
+        ttl_seconds: int | None = None,
+        read_factory: async_sessionmaker[AsyncSession] | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.read_factory = read_factory
+        self.name = name
+        self.ttl = datetime.timedelta(
+            seconds=ttl_seconds if ttl_seconds is not None else settings.leader_lease_ttl_seconds
+        )
+        self.holder = _holder_id()
+        self._expires_at: datetime.datetime | None = None
+
+    @property
+    def held(self) -> bool:
+        """True while this process holds a lease that has not yet expired."""
+        return self._expires_at is not None and _utcnow() < self._expires_at
+
+    async def acquire(self) -> bool:
+        """Take the lease if it is free or expired, renew it if already ours.
+
+        Returns whether this process holds it afterwards. A database error propagates:
+        the caller decides whether that is fatal (it never is for the heartbeat).
+        """
+        now = _utcnow()
+        if self.read_factory is not None and not await self._may_take(now):
+            self._expires_at = None
+            return False
+        expires = now + self.ttl
+        async with self.session_factory() as session:
+            taken = await session.execute(
+                update(Lease)
+                .where(
+                    Lease.name == self.name,
+                    (Lease.holder == self.holder) | (Lease.expires_at < now),
+                )
+                .values(holder=self.holder, expires_at=expires)
+            )
+            won = taken.rowcount == 1
+            if not won:
+                # No row yet, or a live one held by somebody else. The INSERT settles
+                # which: it only lands when the row does not exist.
+                inserted = await session.execute(
+                    insert(Lease)
+                    .values(name=self.name, holder=self.holder, expires_at=expires)
+                    .on_conflict_do_nothing(index_elements=["name"])
+                )
+                won = inserted.rowcount == 1
+            await session.commit()
+        self._expires_at = expires if won else None
+        return won
+
+    async def _may_take(self, now: datetime.datetime) -> bool:
+        """Is the lease ours, free or expired, as the reader last saw it committed?
+
+        A stale snapshot only costs a beat: a lease that has just expired is taken on
+        the next one, and one that has just been taken still loses the UPDATE below.
+        """
+        async with self.read_factory() as session:
+            row = (
+                await session.execute(
+                    select(Lease.holder, Lease.expires_at).where(Lease.name == self.name)
+                )
+            ).first()
+        return row is None or row.holder == self.holder or row.expires_at < now
+
+    async def release(self) -> None:
+        """Give the lease up now rather than letting it run out. A no-op if not ours."""
+        self._expires_at = None
+        async with self.session_factory() as session:
+            await session.execute(
+                delete(Lease).where(Lease.name == self.name, Lease.holder == self.holder)
+            )
+            await session.commit()
+
+
+async def _heartbeat(
+    lease: LeaderLease,
+    on_elected: Callable[[], Awaitable[None]] | None,
+) -> None:
+    """Keep trying to hold ``lease`` for ever. Never exits except by cancellation.
+
+    ``on_elected`` runs once, the first time this process becomes leader - provided that
+    happens within two TTLs of starting. That window covers a fresh boot, including one
+    that has to wait out the lease a SIGKILLed predecessor never released. A worker that
+    takes over LATER is taking over from a leader that died while the others lived on,
+    and the startup housekeeping (resetting "syncing" projects) would trample the live
+    syncs those others are running.
+    """
+    started = _utcnow()
+    interval = max(1.0, lease.ttl.total_seconds() / 3)
+    was_leader = False
+    elected_once = False
+    while True:
+        try:
+            leader = await lease.acquire()
+        except Exception:
+            # An unmigrated or locked database. Not leader this beat; try again next.
+            logger.exception("Could not renew the '%s' lease; retrying", lease.name)
+            leader = False
+        if leader != was_leader:
+            logger.info(
+                "This worker %s the '%s' lease (%s)",
+                "acquired" if leader else "lost",
+                lease.name,
+                lease.holder,
+            )
+            was_leader = leader
+        if leader and not elected_once:
+            elected_once = True
+            if on_elected is not None and _utcnow() - started < 2 * lease.ttl:
+                try:
+                    await on_elected()
+                except Exception:
+                    logger.exception("Leader start-up work failed; continuing")
+        await asyncio.sleep(interval)
+
+
+def start_leader_election(
+    session_factory: async_sessionmaker[AsyncSession],
+    on_elected: Callable[[], Awaitable[None]] | None = None,
+    read_factory: async_sessionmaker[AsyncSession] | None = None,
+) -> tuple[LeaderLease, asyncio.Task]:
+    """Start this process's heartbeat for the leader lease."""
+    lease = LeaderLease(session_factory, read_factory=read_factory)
+    task = asyncio.create_task(_heartbeat(lease, on_elected), name="sdlc-lens-leader")
+    return lease, task
+
+
+async def stop_leader_election(lease: LeaderLease, task: asyncio.Task) -> None:
+    """Stop the heartbeat and hand the lease back, so a peer takes over at once."""
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    try:
+        await lease.release()
+    except Exception:
+        # It expires on its own within one TTL.
+        logger.exception("Could not release the '%s' lease at shutdown", lease.name)
@@ -5,6 +5,8 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass, field
 
+from sdlc_lens.utils.sdlc_ids import extract_ref_ids
+
 # Regex: matches "> **Key:** Value" - the colon may be inside or outside bold
 _KV_PATTERN = re.compile(r"^>\s+\*\*(.+?)\*\*:?\s*(.*?)\s*$")
 
@@ -56,6 +58,9 @@ class ParseResult:
     title: str | None = None
     metadata: dict[str, str | int | None] = field(default_factory=dict)
     body: str = ""
+    # Every artefact id the body mentions, normalised, first mention first. Found here,
+    # while the body is in hand, so that nothing downstream scans it for them again.
+    mentions: list[str] = field(default_factory=list)
 
 
 def parse_document(content: str) -> ParseResult:
@@ -68,7 +73,8 @@ def parse_document(content: str) -> ParseResult:
         content: Raw markdown text.
 
     Returns:
-        ParseResult with title, metadata dict, and body content.
+        ParseResult with title, metadata dict, body content and the ids
+        the body mentions.
     """
     # Normalise line endings
     content = content.replace("\r\n", "\n")
@@ -183,4 +189,4 @@ def parse_document(content: str) -> ParseResult:
     body_lines = lines[frontmatter_end:]
     body = "\n".join(body_lines)
 
-    return ParseResult(title=title, metadata=metadata, body=body)
+    return ParseResult(title=title, metadata=metadata, body=body, mentions=extract_ref_ids(body))
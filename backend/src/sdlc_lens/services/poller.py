@@ -27,6 +27,11 @@ This is a SCHEDULER, not a second sync path. It reuses `trigger_sync()` (whose a
 `UPDATE ... WHERE sync_status != 'syncing'` already closes the double-sync race) and
 `run_sync_task()` (which already guarantees a project is never left stuck in "syncing").
 If this module grows its own copy of either, that is a defect.
+
+With a ``read_factory`` (the reader pool, db/session.py) the sweep's reads - which
+projects are due, what one was last synced at - go there, and a poll touches the single
+writer connection only to record a change: a sweep in which nothing moved writes
+nothing and waits on no sync's flush.
 """
 
 from __future__ import annotations
@@ -37,17 +42,22 @@ import logging
 import random
 from typing import TYPE_CHECKING
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 
 from sdlc_lens.config import settings
 from sdlc_lens.db.models.project import Project
+from sdlc_lens.db.models.sync_checkpoint import SyncCheckpoint
 from sdlc_lens.services.project import ProjectNotFoundError
 from sdlc_lens.services.sync import SyncInProgressError, run_sync_task, trigger_sync
 from sdlc_lens.services.sync_engine import resolve_sync_token
 
 if TYPE_CHECKING:
+    import datetime
+
     from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+    from sdlc_lens.services.leader import LeaderLease
+
 logger = logging.getLogger(__name__)
 
 # How much random jitter to apply to a project's poll, as a fraction of the interval. N
@@ -74,13 +84,15 @@ class PollResult:
 async def poll_project(
     slug: str,
     session_factory: async_sessionmaker[AsyncSession],
+    read_factory: async_sessionmaker[AsyncSession] | None = None,
 ) -> str:
     """Poll one project. Returns a :class:`PollResult` value.
 
     Raises nothing: a failure here is recorded on the project and reported, never allowed
     to escape into the loop that called us.
     """
-    async with session_factory() as session:
+    read_factory = read_factory or session_factory
+    async with read_factory() as session:
         project = (
             await session.execute(select(Project).where(Project.slug == slug))
         ).scalar_one_or_none()
@@ -95,6 +107,7 @@ async def poll_project(
         branch = project.repo_branch or "main"
         repo_url = project.repo_url
         stored_sha = project.last_synced_commit_sha
+        sync_status, sync_error = project.sync_status, project.sync_error
 
     # The one cheap question: has this branch moved? Outside the session - a network call
     # should never hold a DB connection open.
@@ -126,7 +139,8 @@ async def poll_project(
         # head call leaves a perfectly healthy, fully-synced project reporting an error for
         # ever - until the branch happens to move again, which for a finished project may
         # be never.
-        await _clear_stale_poll_error(slug, session_factory)
+        if _is_poll_error(sync_status, sync_error):
+            await _clear_stale_poll_error(slug, session_factory)
         return PollResult.UNCHANGED
 
     # The branch moved. Hand off to the ordinary sync path.
@@ -190,6 +204,11 @@ async def poll_project(
     return PollResult.SYNC_FAILED
 
 
+def _is_poll_error(sync_status: str | None, sync_error: str | None) -> bool:
+    """Is the project's error one a poll recorded, which a later good poll may clear?"""
+    return sync_status == "error" and (sync_error or "").startswith(_POLL_ERROR_PREFIX)
+
+
 async def _clear_stale_poll_error(
     slug: str,
     session_factory: async_sessionmaker[AsyncSession],
@@ -210,9 +229,7 @@ async def _clear_stale_poll_error(
         ).scalar_one_or_none()
         if project is None:
             return
-        if project.sync_status == "error" and (project.sync_error or "").startswith(
-            _POLL_ERROR_PREFIX
-        ):
+        if _is_poll_error(project.sync_status, project.sync_error):
             project.sync_status = "synced"
             project.sync_error = None
             await session.commit()
@@ -234,6 +251,7 @@ async def _due_projects(session_factory: async_sessionmaker[AsyncSession]) -> li
 async def poll_once(
     session_factory: async_sessionmaker[AsyncSession],
     backoff: dict[str, int] | None = None,
+    read_factory: async_sessionmaker[AsyncSession] | None = None,
 ) -> dict[str, str]:
     """One sweep over every auto-sync project. Returns {slug: PollResult}.
 
@@ -244,7 +262,7 @@ async def poll_once(
     backoff = backoff if backoff is not None else {}
     results: dict[str, str] = {}
 
-    for slug in await _due_projects(session_factory):
+    for slug in await _due_projects(read_factory or session_factory):
         # Exponential backoff: a project failing every tick (an expired token, say) is
         # skipped for a growing number of ticks rather than hammering GitHub for ever.
         if backoff.get(slug, 0) > 0:
@@ -253,7 +271,7 @@ async def poll_once(
             continue
 
         try:
-            outcome = await poll_project(slug, session_factory)
+            outcome = await poll_project(slug, session_factory, read_factory)
         except Exception:
             # Belt and braces. poll_project is written not to raise, but this loop must
             # survive it doing so anyway - the cost of being wrong here is that freshness
@@ -286,16 +304,28 @@ async def poll_once(
     return results
 
 
-async def _poll_loop(session_factory: async_sessionmaker[AsyncSession], interval: int) -> None:
-    """The unattended loop. Never exits except by cancellation."""
+async def _poll_loop(
+    session_factory: async_sessionmaker[AsyncSession],
+    interval: int,
+    lease: LeaderLease | None = None,
+    read_factory: async_sessionmaker[AsyncSession] | None = None,
+) -> None:
+    """The unattended loop. Never exits except by cancellation.
+
+    Every worker runs this loop, but with a ``lease`` only the worker currently holding it
+    sweeps; the others tick idly, ready for the lease to fall to them if the leader dies.
+    """
     backoff: dict[str, int] = {}
     logger.info("Freshness poller started (interval=%ds)", interval)
     try:
         while True:
             # Jitter so N lenses (or N projects) do not stampede GitHub on the same second.
             await asyncio.sleep(interval * (1 + random.uniform(0, _JITTER_FRACTION)))  # noqa: S311
+            if lease is not None and not lease.held:
+                logger.debug("Not the leader; leaving this sweep to the worker that is")
+                continue
             try:
-                await poll_once(session_factory, backoff)
+                await poll_once(session_factory, backoff, read_factory)
             except Exception:
                 # The loop must outlive ANY failure. If it dies, freshness stops for every
                 # project and nothing says so.
@@ -305,17 +335,26 @@ async def _poll_loop(session_factory: async_sessionmaker[AsyncSession], interval
         raise
 
 
-def start_poller(session_factory: async_sessionmaker[AsyncSession]) -> asyncio.Task | None:
+def start_poller(
+    session_factory: async_sessionmaker[AsyncSession],
+    lease: LeaderLease | None = None,
+    read_factory: async_sessionmaker[AsyncSession] | None = None,
+) -> asyncio.Task | None:
     """Start the poller, or return None when it is disabled.
 
     `interval = 0` creates NO TASK AT ALL. The feature is genuinely off rather than idling
     - a disabled poller should cost nothing and be visibly absent, not merely quiet.
+
+    Pass the process's leader ``lease`` when several workers share the database, so that
+    exactly one of them polls.
     """
     interval = settings.sync_poll_interval_seconds
     if interval <= 0:
         logger.info("Freshness poller disabled (sync_poll_interval_seconds=%s)", interval)
         return None
-    return asyncio.create_task(_poll_loop(session_factory, interval), name="sdlc-lens-poller")
+    return asyncio.create_task(
+        _poll_loop(session_factory, interval, lease, read_factory), name="sdlc-lens-poller"
+    )
 
 
 async def stop_poller(task: asyncio.Task | None, grace_seconds: float = 10.0) -> None:
@@ -345,7 +384,10 @@ async def _await_quietly(task: asyncio.Task) -> None:
         await task
 
 
-async def reset_stuck_syncing(session_factory: async_sessionmaker[AsyncSession]) -> int:
+async def reset_stuck_syncing(
+    session_factory: async_sessionmaker[AsyncSession],
+    started_before: datetime.datetime | None = None,
+) -> int:
     """Unstick any project left mid-sync by a hard stop. Returns how many were freed.
 
     `trigger_sync` refuses a project whose status is already "syncing" - the atomic guard
@@ -355,20 +397,30 @@ async def reset_stuck_syncing(session_factory: async_sessionmaker[AsyncSession])
     409s, and only DB surgery recovers it.
 
     A "syncing" status at STARTUP cannot be genuine - no sync can have survived the
-    process that was running it. So clear it, loudly.
+    process that was running it. So clear it, loudly. Its checkpoint, if it reached one,
+    is left alone: :func:`resume_interrupted_syncs` picks it up from there.
+
+    With several workers, "startup" is one worker's startup while its peers may be mid-sync,
+    so only the elected leader runs this, and only as it first takes the lease at boot.
+
+    The leader takes the lease in the background, after the app is already serving, so a
+    sync triggered in between is genuine. ``started_before`` (naive UTC, the boot time)
+    spares it: only a project whose "syncing" status was written before then is reset.
+    Both sides are compared at SQLite's one-second resolution, so a sync started in the
+    boot's own second counts as this boot's.
     """
+    query = select(Project).where(Project.sync_status == "syncing")
+    if started_before is not None:
+        query = query.where(func.datetime(Project.updated_at) < func.datetime(started_before))
     async with session_factory() as session:
-        stuck = (
-            (await session.execute(select(Project).where(Project.sync_status == "syncing")))
-            .scalars()
-            .all()
-        )
+        stuck = (await session.execute(query)).scalars().all()
         for project in stuck:
             logger.warning(
                 "Project '%s' was left mid-sync by a hard stop; clearing it so it can sync again",
                 project.slug,
             )
             project.sync_status = "error"
+            project.sync_cancel_requested = False
             project.sync_error = (
                 "The previous sync was interrupted before it finished (the app stopped). "
                 "No documents were lost; sync again to bring it up to date."
@@ -376,3 +428,41 @@ async def reset_stuck_syncing(session_factory: async_sessionmaker[AsyncSession])
         if stuck:
             await session.commit()
         return len(stuck)
+
+
+async def resume_interrupted_syncs(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> list[asyncio.Task]:
+    """Restart, from its checkpoint, every sync a stopped process left unfinished.
+
+    A "running" checkpoint at startup belongs to a sync that died with its process - a
+    redeploy, an OOM - since none survives it. Run after :func:`reset_stuck_syncing`, so
+    the projects are free to trigger. A "cancelled" checkpoint is NOT resumed: the
+    operator stopped that sync, and a restart must not quietly start it again.
+
+    Goes through ``trigger_sync`` / ``run_sync_task`` like every other sync. Returns the
+    tasks so shutdown can cancel them - which leaves their checkpoints "running" again, to
+    be resumed at the next start.
+    """
+    async with session_factory() as session:
+        rows = await session.execute(
+            select(Project.slug)
+            .join(SyncCheckpoint, SyncCheckpoint.project_id == Project.id)
+            .where(SyncCheckpoint.state == "running")
+        )
+        slugs = list(rows.scalars().all())
+
+    tasks: list[asyncio.Task] = []
+    for slug in slugs:
+        async with session_factory() as session:
+            try:
+                await trigger_sync(session, slug)
+            except (SyncInProgressError, ProjectNotFoundError):
+                continue
+        logger.info("Resuming the interrupted sync of '%s' from its checkpoint", slug)
+        tasks.append(
+            asyncio.create_task(
+                run_sync_task(slug, session_factory), name=f"sdlc-lens-resume-{slug}"
+            )
+        )
+    return tasks
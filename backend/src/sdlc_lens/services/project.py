@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sdlc_lens.config import settings
 from sdlc_lens.db.models.document import Document
 from sdlc_lens.db.models.project import Project
+from sdlc_lens.services.coherence import CORPUS_SCOPE, bump_generation, invalidate_local
 from sdlc_lens.utils.crypto import encrypt_token
 from sdlc_lens.utils.slug import generate_slug
 
@@ -294,4 +295,7 @@ async def delete_project(session: AsyncSession, slug: str) -> None:
     """
     project = await get_project_by_slug(session, slug)
     await session.delete(project)
+    # Its documents leave the corpus with it.
+    await bump_generation(session, CORPUS_SCOPE)
     await session.commit()
+    invalidate_local(CORPUS_SCOPE)
@@ -0,0 +1,250 @@
+"""A bounded in-process cache for the answers of the expensive read endpoints.
+
+Project stats, aggregate stats, the health check and a document's relationships are
+each several SQL aggregations (the health check also reads every body it inspects), and
+the dashboard asks for all of them on every load - while the data behind them changes
+only when a sync commits. This cache keeps the finished answers.
+
+Entries are never invalidated; they cannot go stale. A key names exactly what its answer
+was computed from - the endpoint, its parameters and the corpus generation the route
+read in its own transaction (the same parts its ETag is made of, see
+:mod:`sdlc_lens.api.conditional`). A sync that changes a project moves that generation,
+so later requests ask for a different key, and the superseded entries age out of the
+LRU order. Because the generation is read from the database, this holds across uvicorn
+workers too, with no coherence window.
+
+The cache is bounded twice: by entry count and by an estimate of the bytes the entries
+hold, whichever fills first; the least recently used entries are evicted. Hit, miss and
+eviction counters, and the hit rate, are exposed for ``GET /api/v1/system/cache``.
+
+Misses are single-flight. When the dashboard is opened by a room full of people at
+once, the same health check is asked for many times before the first answer exists;
+the first request computes it and every concurrent request for the same key awaits that
+one computation instead of starting its own. The number of computations running at
+once is also capped (``heavy_request_concurrency``): past it, a miss that would start
+yet another one fails fast with :class:`OverloadedError`, which the API answers with
+503 and ``Retry-After``, rather than queueing work that competes with the sync writer
+for the database. Hits and coalesced waits never count against the cap.
+
+Values are shared between requests, so callers must treat them as read-only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel
+
+from sdlc_lens.config import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class OverloadedError(Exception):
+    """Raised when a result must be computed but every computation slot is busy."""
+
+    def __init__(
+        self,
+        message: str = "Server is busy computing other reports; retry shortly",
+        retry_after: int = 1,
+    ):
+        self.message = message
+        self.retry_after = retry_after
+        super().__init__(self.message)
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate bytes held by ``value``: its serialised length.
+
+    Exact accounting of Python object graphs is expensive and still approximate; the
+    serialised form is proportional to it and costs one dump per miss. A value that
+    counts its own bytes as it is built (an ``int`` ``size_bytes`` attribute, as
+    :class:`~sdlc_lens.services.suggest.SuggestIndex` has) is taken at its word.
+    """
+    size = getattr(value, "size_bytes", None)
+    if isinstance(size, int):
+        return size
+    if isinstance(value, BaseModel):
+        return len(value.model_dump_json())
+    return len(repr(value))
+
+
+class ResultCache:
+    """An LRU mapping bounded by entry count and by estimated bytes.
+
+    A bound of 0 entries disables caching: every lookup is a miss and nothing is kept
+    (concurrent misses are still coalesced). ``max_concurrent`` caps the computations
+    :meth:`get_or_compute` runs at once; 0 leaves them unlimited.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        max_concurrent: int = 0,
+        retry_after_seconds: int = 1,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_concurrent = max_concurrent
+        self.retry_after_seconds = retry_after_seconds
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        # The computation under way per key, which concurrent misses wait on.
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0
+        self.rejected = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    @property
+    def hit_rate(self) -> float:
+        """Hits per lookup over the cache's lifetime; 0.0 before the first."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """``(True, value)`` on a hit, refreshing its recency; ``(False, None)`` otherwise."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store ``value``, evicting least recently used entries to stay within bounds.
+
+        A value larger than the whole byte budget is not stored at all: it would only
+        flush every other entry and then be evicted by the next insertion.
+        """
+        if self.max_entries <= 0:
+            return
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            logger.warning(
+                "Not caching %r: about %d bytes, over the cache's budget of %d",
+                key,
+                size,
+                self.max_bytes,
+            )
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous[1]
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+            self.evictions += 1
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """The cached value for ``key``, computing and storing it on a miss.
+
+        A miss while another request is computing the same key waits for that result -
+        or for its exception, which is raised to every waiter and not cached.
+
+        Raises:
+            OverloadedError: If this miss would start a computation while
+                ``max_concurrent`` are already running.
+        """
+        hit, value = self.get(key)
+        if hit:
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            try:
+                # Shielded: one waiter going away must not cancel everyone's result.
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The request computing it was cancelled, not this one: take over.
+                return await self.get_or_compute(key, compute)
+
+        if self.max_concurrent and len(self._inflight) >= self.max_concurrent:
+            self.rejected += 1
+            raise OverloadedError(retry_after=self.retry_after_seconds)
+
+        future = asyncio.get_running_loop().create_future()
+        # Retrieve the outcome even when nobody waited, so a failure is not also
+        # logged as "exception was never retrieved".
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            self.put(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    def clear(self) -> None:
+        """Drop every entry. The counters keep counting."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "in_flight": len(self._inflight),
+            "max_concurrent": self.max_concurrent,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+# The process's cache, shared by every route that reads through it.
+result_cache = ResultCache(
+    max_entries=settings.result_cache_max_entries,
+    max_bytes=settings.result_cache_max_bytes,
+    max_concurrent=settings.heavy_request_concurrency,
+    retry_after_seconds=settings.heavy_request_retry_after_seconds,
+)
+
+# Search result pages (GET /api/v1/search), under the same kind of key: the corpus ETag
+# and the search's parameters. Searches are many and mostly one-off, so they get their
+# own, smaller budget rather than competing with the reports above for the shared one;
+# and they are not subject to the computation limit, which they never were.
+search_cache = ResultCache(
+    max_entries=settings.search_cache_max_entries,
+    max_bytes=settings.search_cache_max_bytes,
+)
+
+# The suggest index (services/suggest.py), keyed by the corpus generation. One entry:
+# only the index for the current documents is ever asked for, so a new one replaces the
+# last instead of sitting in the shared cache's LRU order next to the reports. An index
+# over the byte budget is not kept - each keystroke then rebuilds it - and is logged.
+suggest_cache = ResultCache(max_entries=1, max_bytes=settings.suggest_cache_max_bytes)
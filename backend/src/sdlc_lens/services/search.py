@@ -2,9 +2,28 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Literal
 
-from sqlalchemy import text
+from sqlalchemy import select, text
+
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services.fts import (
+    BM25_RANK,
+    TRIGRAM_MIN_LENGTH,
+    TRIGRAM_TABLE,
+    text_match,
+    trigram_match,
+)
+from sdlc_lens.services.search_query import ParsedQuery, parse_query
+from sdlc_lens.utils.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    query_fingerprint,
+)
+from sdlc_lens.utils.sdlc_status import canonical_status
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
@@ -21,102 +40,227 @@ def _escape_fts_query(query: str) -> str:
     return f'"{escaped}"'
 
 
-async def search_documents(
-    session: AsyncSession,
-    *,
-    query: str,
-    project_slug: str | None = None,
-    doc_type: str | None = None,
-    page: int = 1,
-    per_page: int = 20,
-) -> dict[str, Any]:
-    """Search documents using FTS5 full-text index.
+def normalise_query(query: str) -> str:
+    """``query`` with its whitespace trimmed and each run of it collapsed to one space.
 
-    Parameters
-    ----------
-    session : AsyncSession
-        Database session.
-    query : str
-        Search query string.
-    project_slug : str | None
-        Filter results to a specific project.
-    doc_type : str | None
-        Filter results to a specific document type.
-    page : int
-        Page number (1-indexed).
-    per_page : int
-        Number of results per page.
+    Neither index tells the two apart - the word index does not see whitespace, and a
+    doubled space is not what anyone searches for a substring of - so searches that
+    differ only in it share one cache entry (api/routes/search.py) and one cursor.
+    Case is kept: AND, OR and NOT are operators only in capitals (services/search_query.py).
+    """
+    return " ".join(query.split())
 
-    Returns
-    -------
-    dict
-        Dictionary with items, total, query, page, and per_page.
+
+@dataclass(frozen=True)
+class _Index:
+    """One of the two FTS5 indexes a search can run against (see services/fts.py)."""
+
+    table: str
+    # The ORDER BY key, most relevant first; with the document id, the cursor's keyset.
+    rank: str
+    # The relevance the API reports, higher for better matches.
+    score: str
+    # The column snippet() cuts its excerpt from: the body.
+    snippet_column: int
+
+
+_WORDS = _Index("documents_fts", BM25_RANK, f"-{BM25_RANK}", 1)
+
+# Substring matches are ranked by where the substring is - the id, else the title, else
+# only the body - rather than by bm25(). A common fragment matches thousands of
+# documents, and bm25() over a trigram phrase reads every match's positions again: on
+# 30k documents it more than doubled the cost of a page (benchmarks/
+# bench_trigram_index.py), for an ordering that says little about a substring anyway.
+_SUBSTRING_TIER = (
+    "(CASE WHEN d.doc_id LIKE :pattern ESCAPE '\\' THEN 0 "
+    "WHEN d.title LIKE :pattern ESCAPE '\\' THEN 1 ELSE 2 END)"
+)
+_SUBSTRING = _Index(TRIGRAM_TABLE, _SUBSTRING_TIER, f"3 - {_SUBSTRING_TIER}", 2)
+
+# A search cursor's key: the rank (bm25 or substring tier) and the document id.
+_CURSOR_KEY = ((int, float), int)
+
+
+def _like_pattern(query: str) -> str:
+    """``%query%`` for LIKE, with LIKE's wildcards in the query escaped."""
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+# One term with a digit in it - "US00", "01KX8B", "EP0003-" - is taken for a fragment of
+# an artefact id, which the word index cannot find unless it happens to be the whole id.
+_ID_FRAGMENT = re.compile(r"^(?=\S*\d)\S+$")
+
+
+def _looks_like_id_fragment(query: str) -> bool:
+    return len(query) >= TRIGRAM_MIN_LENGTH and _ID_FRAGMENT.match(query) is not None
+
+
+def _cursor_is_for(cursor: str, fingerprint: str) -> bool:
+    try:
+        decode_cursor(cursor, fingerprint, _CURSOR_KEY)
+    except InvalidCursorError:
+        return False
+    return True
+
+
+def _column_filters(parsed: ParsedQuery) -> tuple[str, dict[str, Any]]:
+    """SQL predicates for a parsed query's status and owner filters, and their parameters.
+
+    Neither is in the word index, so they filter its matches in the join. Both compare
+    case-insensitively, and a status is first reduced to its canonical token the way a
+    synced one is (utils/sdlc_status.py), so status:"in progress" finds "In Progress".
     """
-    fts_query = _escape_fts_query(query)
-    offset = (page - 1) * per_page
+    sql = ""
+    params: dict[str, Any] = {}
+    for column in ("status", "owner"):
+        values = parsed.filters.get(column)
+        if not values:
+            continue
+        if column == "status":
+            values = tuple(canonical_status(value) or value for value in values)
+        names = [f"{column}_{i}" for i in range(len(values))]
+        placeholders = ", ".join(f":{name}" for name in names)
+        sql += f" AND d.{column} COLLATE NOCASE IN ({placeholders})"
+        params.update(zip(names, values, strict=True))
+    return sql, params
 
-    # Build WHERE clause fragments
-    where_clauses = ["documents_fts MATCH :query"]
-    params: dict[str, Any] = {"query": fts_query}
 
-    if project_slug is not None:
-        where_clauses.append("p.slug = :project_slug")
-        params["project_slug"] = project_slug
+async def _totals(
+    session: AsyncSession, from_sql: str, where_sql: str, params: dict[str, Any]
+) -> tuple[int, dict[str, Any]]:
+    """The number of matches and their facet counts, from one pass over the matches.
 
-    if doc_type is not None:
-        where_clauses.append("d.doc_type = :doc_type")
-        params["doc_type"] = doc_type
+    One GROUP BY over (project, type, status) gives all three facets, and the total is
+    the sum of its groups - so asking for the facets makes the plain COUNT unnecessary.
+    """
+    rows = await session.execute(
+        text(
+            f"SELECT p.slug, d.doc_type, d.status, COUNT(*) {from_sql} "
+            f"WHERE {where_sql} "
+            "GROUP BY p.slug, d.doc_type, d.status"
+        ),
+        params,
+    )
+    total = 0
+    by_project: dict[str, int] = {}
+    by_type: dict[str, int] = {}
+    by_status: dict[str, int] = {}
+    for slug, doc_type, status, count in rows:
+        total += count
+        by_project[slug] = by_project.get(slug, 0) + count
+        by_type[doc_type] = by_type.get(doc_type, 0) + count
+        # The same key for "no status" as the stats endpoints use.
+        status_key = status if status is not None else "null"
+        by_status[status_key] = by_status.get(status_key, 0) + count
+    return total, {"by_project": by_project, "by_type": by_type, "by_status": by_status}
 
-    where_sql = " AND ".join(where_clauses)
 
-    # Count total matches
-    count_sql = text(
-        "SELECT COUNT(*) "
-        "FROM documents_fts "
-        "JOIN documents d ON documents_fts.rowid = d.id "
-        "JOIN projects p ON d.project_id = p.id "
-        f"WHERE {where_sql}"
+async def _has_matches(
+    session: AsyncSession,
+    index: _Index,
+    where_sql: str,
+    params: dict[str, Any],
+    *,
+    count_joins: bool,
+) -> bool:
+    """Does ``where_sql`` match anything in ``index`` at all, on any page?"""
+    from_sql = (
+        f"FROM {index.table} JOIN documents d ON {index.table}.rowid = d.id "
+        "JOIN projects p ON d.project_id = p.id"
+        if count_joins
+        else f"FROM {index.table}"
     )
-    count_result = await session.execute(count_sql, params)
-    total = count_result.scalar_one()
-
-    if total == 0:
-        return {
-            "items": [],
-            "total": 0,
-            "query": query,
-            "page": page,
-            "per_page": per_page,
-        }
+    row = await session.execute(text(f"SELECT 1 {from_sql} WHERE {where_sql} LIMIT 1"), params)
+    return row.first() is not None
+
+
+async def _search_index(
+    session: AsyncSession,
+    index: _Index,
+    *,
+    where_sql: str,
+    params: dict[str, Any],
+    count_joins: bool,
+    fingerprint: str,
+    page: int,
+    per_page: int,
+    cursor: str | None,
+    with_total: bool,
+    with_facets: bool,
+) -> dict[str, Any]:
+    """One page of matches of ``where_sql`` in ``index``, with its total and facets.
+
+    ``where_sql`` may refer to ``d`` (documents) and ``p`` (projects); ``count_joins``
+    says whether it does, which a plain COUNT then has to join too.
+    """
+    joined = (
+        f"FROM {index.table} "
+        f"JOIN documents d ON {index.table}.rowid = d.id "
+        "JOIN projects p ON d.project_id = p.id"
+    )
+
+    total = None
+    facets = None
+    if with_facets:
+        counted, facets = await _totals(session, joined, where_sql, params)
+        if counted == 0:
+            return {"items": [], "total": 0 if with_total else None, "facets": facets}
+        total = counted if with_total else None
+    elif with_total:
+        # Answered from the index alone when the filter allows, with no join.
+        from_sql = joined if count_joins else f"FROM {index.table}"
+        total = (
+            await session.execute(text(f"SELECT COUNT(*) {from_sql} WHERE {where_sql}"), params)
+        ).scalar_one()
+        if total == 0:
+            return {"items": [], "total": 0, "facets": None}
+
+    params = dict(params)
+    if cursor is not None:
+        after_rank, after_id = decode_cursor(cursor, fingerprint, _CURSOR_KEY)
+        where_sql += f" AND ({index.rank}, d.id) > (:after_rank, :after_id)"
+        params["after_rank"] = after_rank
+        params["after_id"] = after_id
+        offset = 0
+    else:
+        offset = (page - 1) * per_page
 
     # Fetch paginated results with BM25 ranking and snippets
     # Note: bm25() returns negative values; more negative = more relevant.
     # ORDER BY rank ASC puts the most relevant first.
     # We negate the value in the SELECT so the API returns positive scores
-    # (higher = more relevant).
+    # (higher = more relevant). The raw rank and the id are selected too: they are the
+    # keyset the next page's cursor continues from.
     search_sql = text(
         "SELECT "
+        "  d.id, "
+        f"  {index.rank} AS rank, "
         "  d.doc_id, "
         "  d.doc_type, "
         "  d.title, "
         "  p.slug AS project_slug, "
         "  p.name AS project_name, "
         "  d.status, "
-        "  snippet(documents_fts, 1, '<mark>', '</mark>', '...', 32) AS snippet, "
-        "  -bm25(documents_fts) AS score "
-        "FROM documents_fts "
-        "JOIN documents d ON documents_fts.rowid = d.id "
-        "JOIN projects p ON d.project_id = p.id "
+        f"  snippet({index.table}, {index.snippet_column}, '<mark>', '</mark>', '...', 32) "
+        "AS snippet, "
+        f"  {index.score} AS score "
+        f"{joined} "
         f"WHERE {where_sql} "
-        "ORDER BY bm25(documents_fts) "
+        f"ORDER BY {index.rank}, d.id "
         "LIMIT :limit OFFSET :offset"
     )
 
-    params["limit"] = per_page
+    # One row more than the page, to learn whether there is a next page.
+    params["limit"] = per_page + 1
     params["offset"] = offset
 
     result = await session.execute(search_sql, params)
     rows = result.mappings().all()
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_cursor = encode_cursor(fingerprint, [rows[-1]["rank"], rows[-1]["id"]])
 
     items = [
         {
@@ -131,11 +275,214 @@ async def search_documents(
         }
         for row in rows
     ]
+    return {"items": items, "total": total, "facets": facets, "next_cursor": next_cursor}
+
 
-    return {
-        "items": items,
-        "total": total,
+async def search_documents(
+    session: AsyncSession,
+    *,
+    query: str,
+    project_slug: str | None = None,
+    doc_type: str | None = None,
+    page: int = 1,
+    per_page: int = 20,
+    cursor: str | None = None,
+    with_total: bool = True,
+    with_facets: bool = True,
+    mode: Literal["auto", "words", "substring"] = "auto",
+) -> dict[str, Any]:
+    """Search documents using FTS5 full-text index.
+
+    Results are ordered by (bm25 rank, document id). ``cursor`` - a previous result's
+    ``next_cursor`` - continues after the last result it saw instead of skipping
+    ``(page - 1) * per_page`` ranked rows; ``with_total=False`` skips the COUNT.
+    ``with_facets`` adds the matches' counts by project, type and status, for filter
+    chips; the total then comes from the same pass.
+
+    Two statements at most: the matches' facets and total - one GROUP BY pass - or the
+    total alone, the index-only ``COUNT(*)``; then the ranked page with its snippets.
+    Folding the first into the second is possible - ``COUNT(*) OVER ()``, or a GROUP BY,
+    over a materialised CTE of the bm25()-ranked matches (snippet() cannot sit under a
+    window function, and SQLite 3.40 refuses even bm25() there unless the CTE is
+    materialised) - but measures slower, not faster: walking the index is the cheap
+    part, scoring and joining every match the dear one, and a single pass still does
+    both and then materialises the lot (benchmarks/bench_search_passes.py).
+
+    ``mode`` picks the index. "words" matches whole words (the word index);
+    "substring" matches the query anywhere in an id, title or body, at least three
+    characters of it (the trigram index), and scores a match 3, 2 or 1 by whether the
+    id, the title or only the body contains it. "auto" searches by substring for what looks
+    like an id fragment, otherwise by words - and by substring after all when the words
+    match nothing, which is what a query for the middle of a word does. The response's
+    ``mode`` says which answered; a cursor continues in the mode that issued it.
+
+    By words, a query may use the syntax of services/search_query.py: phrases, prefixes,
+    AND / OR / NOT, grouping, title: scoping and type:, status:, owner: and project:
+    filters, which narrow ``project_slug`` and ``doc_type`` further rather than replace
+    them; a query of filters alone lists every document they allow. A query that does
+    not parse is one literal phrase, as every query used to be.
+    Only a query of plain words falls back to a substring search; one using the syntax
+    means what it says.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Database session.
+    query : str
+        Search query string.
+    project_slug : str | None
+        Filter results to a specific project.
+    doc_type : str | None
+        Filter results to a specific document type.
+    page : int
+        Page number (1-indexed).
+    per_page : int
+        Number of results per page.
+    cursor : str | None
+        Keyset cursor from a previous page; takes precedence over ``page``.
+    with_total : bool
+        Whether to count every match (``total`` is None when not).
+    with_facets : bool
+        Whether to count the matches per project, type and status (``facets`` is None
+        when not).
+    mode : str
+        "auto", "words" or "substring" - see above.
+
+    Returns
+    -------
+    dict
+        Dictionary with items, total, facets, mode, query, page, per_page and
+        next_cursor.
+
+    Raises
+    ------
+    InvalidCursorError
+        If ``cursor`` is malformed or was issued for a different search.
+    """
+    # An empty ``cursor=`` is no cursor: the first page.
+    cursor = cursor or None
+    fingerprints = {
+        "words": query_fingerprint("search", query, project_slug, doc_type),
+        "substring": query_fingerprint("search", query, project_slug, doc_type, "substring"),
+    }
+    # The grammar is for the word index; a substring search takes the query as typed.
+    parsed = parse_query(query) if mode != "substring" else None
+    if mode == "auto":
+        substring_cursor = cursor is not None and _cursor_is_for(cursor, fingerprints["substring"])
+        if substring_cursor or (parsed is None and _looks_like_id_fragment(query)):
+            resolved = "substring"
+        else:
+            resolved = "words"
+    else:
+        resolved = mode
+
+    response = {
+        "items": [],
+        "total": 0 if with_total else None,
+        "facets": {"by_project": {}, "by_type": {}, "by_status": {}} if with_facets else None,
+        "mode": resolved,
         "query": query,
         "page": page,
         "per_page": per_page,
+        "next_cursor": None,
+    }
+
+    project_id = None
+    if project_slug is not None:
+        project_id = await session.scalar(select(Project.id).where(Project.slug == project_slug))
+        if project_id is None:
+            return response
+
+    phrase = _escape_fts_query(query)
+    paging = {
+        "page": page,
+        "per_page": per_page,
+        "cursor": cursor,
+        "with_total": with_total,
+        "with_facets": with_facets,
     }
+
+    params: dict[str, Any]
+    if resolved == "words":
+        # The scope goes into the MATCH expression itself (see services/fts.py), so FTS5
+        # only ever produces - and ranks - the documents in it.
+        where_sql = "documents_fts MATCH :query"
+        if parsed is None:
+            params = {"query": text_match(phrase, project_id=project_id, doc_type=doc_type)}
+            count_joins = False
+        else:
+            projects: int | set[int] | None = project_id
+            if "project" in parsed.filters:
+                rows = await session.execute(
+                    select(Project.id).where(Project.slug.in_(parsed.filters["project"]))
+                )
+                projects = set(rows.scalars())
+                if project_id is not None:
+                    projects &= {project_id}
+                if not projects:
+                    return response
+            types: str | set[str] | None = doc_type
+            if "type" in parsed.filters:
+                types = {value.lower() for value in parsed.filters["type"]}
+                if doc_type is not None:
+                    types &= {doc_type}
+                if not types:
+                    return response
+            if parsed.match is None and projects is None and types is None:
+                # Filters alone, none of them in the index: every project's key, so
+                # that the MATCH is every document.
+                projects = set(await session.scalars(select(Project.id)))
+                if not projects:
+                    return response
+            predicates, params = _column_filters(parsed)
+            where_sql += predicates
+            params["query"] = text_match(parsed.match, project_id=projects, doc_type=types)
+            count_joins = bool(predicates)
+        found = await _search_index(
+            session,
+            _WORDS,
+            where_sql=where_sql,
+            params=params,
+            count_joins=count_joins,
+            fingerprint=fingerprints["words"],
+            **paging,
+        )
+        fallback = mode == "auto" and (parsed is None or parsed.bare)
+        if found["items"] or not fallback:
+            return {**response, **found}
+        # The fallback is decided by the query, not the page: an empty page past the
+        # first is a substring result being paged by offset only if the words match
+        # nothing at all - otherwise it is just past the end of the word matches.
+        if cursor is not None or page > 1:
+            if found["total"] is not None:
+                matched = found["total"] > 0
+            else:
+                matched = await _has_matches(
+                    session, _WORDS, where_sql, params, count_joins=count_joins
+                )
+            if matched:
+                return {**response, **found}
+        resolved = "substring"
+
+    if len(query) < TRIGRAM_MIN_LENGTH:
+        return {**response, "mode": resolved}
+
+    # The trigram index has no filter keys; its matches are scoped by the join.
+    where_sql = f"{TRIGRAM_TABLE} MATCH :query"
+    params = {"query": trigram_match(phrase), "pattern": _like_pattern(query)}
+    if project_id is not None:
+        where_sql += " AND d.project_id = :project_id"
+        params["project_id"] = project_id
+    if doc_type is not None:
+        where_sql += " AND d.doc_type = :doc_type"
+        params["doc_type"] = doc_type
+    found = await _search_index(
+        session,
+        _SUBSTRING,
+        where_sql=where_sql,
+        params=params,
+        count_joins=project_id is not None or doc_type is not None,
+        fingerprint=fingerprints["substring"],
+        **paging,
+    )
+    return {**response, **found, "mode": resolved}
@@ -0,0 +1,266 @@
+"""Structured search queries: a small grammar compiled to an FTS5 MATCH expression.
+
+A search used to be one literal phrase: the whole input, quoted. The grammar below lets
+a query combine terms and narrow itself, and compiles it into a MATCH expression over
+the text columns plus filters for the search service to apply - never by pasting user
+text into SQL. Every term is re-quoted as an FTS5 string, so no input can reach an FTS5
+operator or column the grammar does not offer.
+
+    auth login         both words (AND is implied between terms)
+    "token rotation"   the phrase
+    auth*              a word starting with "auth"
+    a OR b, a AND b    either / both (uppercase; OR binds looser than AND)
+    -legacy, NOT x     without it (needs something positive to subtract from)
+    ( ... )            grouping
+    title:word         in the title only - also title:"a phrase", title:auth*,
+                       title:(a OR b)
+    type:story  status:draft  owner:alice  project:my-project
+                       filters, given at the top level only: they must hold for every
+                       result. Repeat one to allow several values; quote a value with
+                       spaces (status:"in progress"). Status and owner compare
+                       case-insensitively. A query of filters alone matches every
+                       document they allow.
+
+Input that does not parse - an unclosed quote or parenthesis, a dangling operator, a
+filter inside a group or an OR, a query of only exclusions - yields None, and the caller
+searches for it literally, as before.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+
+FILTER_FIELDS = ("type", "status", "owner", "project")
+_FIELD = re.compile(r"^(title|type|status|owner|project):(.*)$", re.DOTALL)
+_OPERATORS = ("AND", "OR", "NOT")
+# A term with no letter or digit in it - a stray "-" or "&" - is no token to the word
+# index, and an empty FTS5 phrase matches nothing; such terms are left out, as the
+# tokenizer leaves them out of a literal search.
+_HAS_TOKEN = re.compile(r"\w")
+
+
+class _QuerySyntaxError(Exception):
+    """The query does not follow the grammar."""
+
+
+@dataclass(frozen=True)
+class ParsedQuery:
+    """A query compiled from the grammar."""
+
+    # FTS5 expression, parenthesised, to be confined to the text columns by the caller;
+    # None for a query of filters alone, which matches every document in their scope.
+    match: str | None
+    # Filter field -> the values any one of which a result must have.
+    filters: dict[str, tuple[str, ...]] = field(default_factory=dict)
+    # True when the query was nothing but plain words - no operator, phrase, prefix,
+    # scope or filter - so searching for it as a substring instead still means the same.
+    bare: bool = False
+
+
+def _quote(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _tokenize(query: str) -> list[tuple[str, str]]:
+    """Split ``query`` into (kind, text) tokens.
+
+    Kinds: "(" and ")", "-" (a leading minus), "op" (AND / OR / NOT), "phrase" (the
+    text between double quotes), "word" (anything else up to whitespace, a parenthesis
+    or a quote) and "field" (``name:`` before a value).
+    """
+    tokens: list[tuple[str, str]] = []
+    i = 0
+    while i < len(query):
+        c = query[i]
+        if c.isspace():
+            i += 1
+        elif c in "()":
+            tokens.append((c, c))
+            i += 1
+        elif c == '"':
+            end = query.find('"', i + 1)
+            if end == -1:
+                raise _QuerySyntaxError
+            tokens.append(("phrase", query[i + 1 : end]))
+            i = end + 1
+        elif c == "-" and i + 1 < len(query) and not query[i + 1].isspace():
+            tokens.append(("-", c))
+            i += 1
+        else:
+            end = i
+            while end < len(query) and not query[end].isspace() and query[end] not in '()"':
+                end += 1
+            word = query[i:end]
+            i = end
+            named = _FIELD.match(word)
+            if named is not None:
+                # A filter's value follows its colon directly: "status: x" is malformed,
+                # not a filter on x.
+                if (
+                    named.group(1) in FILTER_FIELDS
+                    and not named.group(2)
+                    and not query.startswith('"', i)
+                ):
+                    raise _QuerySyntaxError
+                tokens.append(("field", named.group(1)))
+                if named.group(2):
+                    tokens.append(("word", named.group(2)))
+            elif word in _OPERATORS:
+                tokens.append(("op", word))
+            else:
+                tokens.append(("word", word))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens: list[tuple[str, str]]) -> None:
+        self.tokens = tokens
+        self.position = 0
+        self.filters: dict[str, list[str]] = {}
+        self.syntax = False
+
+    def peek(self) -> tuple[str, str] | None:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def take(self) -> tuple[str, str]:
+        token = self.peek()
+        if token is None:
+            raise _QuerySyntaxError
+        self.position += 1
+        return token
+
+    def _filter_count(self) -> int:
+        return sum(len(values) for values in self.filters.values())
+
+    def parse_or(self, depth: int) -> str | None:
+        before = self._filter_count()
+        branches = [self.parse_and(depth)]
+        while self.peek() == ("op", "OR"):
+            self.take()
+            self.syntax = True
+            branches.append(self.parse_and(depth))
+        if len(branches) == 1:
+            return branches[0]
+        # A filter in one branch of an OR would have to hold for the other's results too.
+        if self._filter_count() != before or None in branches:
+            raise _QuerySyntaxError
+        return "(" + " OR ".join(branches) + ")"
+
+    def parse_and(self, depth: int) -> str | None:
+        positives: list[str] = []
+        negatives: list[str] = []
+        terms = 0
+        while True:
+            token = self.peek()
+            if token is None or token[0] == ")" or token == ("op", "OR"):
+                break
+            if token == ("op", "AND"):
+                self.take()
+                self.syntax = True
+                following = self.peek()
+                if (
+                    terms == 0
+                    or following is None
+                    or following[0] == ")"
+                    or following[1]
+                    in (
+                        "AND",
+                        "OR",
+                    )
+                ):
+                    raise _QuerySyntaxError
+                continue
+            negated, expression = self.parse_unary(depth)
+            terms += 1
+            if expression is None:
+                continue
+            (negatives if negated else positives).append(expression)
+        if terms == 0:
+            raise _QuerySyntaxError
+        if not positives:
+            if negatives:
+                # FTS5 can only subtract from a match.
+                raise _QuerySyntaxError
+            return None
+        expression = positives[0] if len(positives) == 1 else "(" + " AND ".join(positives) + ")"
+        for negative in negatives:
+            expression = f"({expression} NOT {negative})"
+        return expression
+
+    def parse_unary(self, depth: int) -> tuple[bool, str | None]:
+        token = self.peek()
+        if token is not None and (token[0] == "-" or token == ("op", "NOT")):
+            self.take()
+            self.syntax = True
+            expression = self.parse_primary(depth, negated=True)
+            return True, expression
+        return False, self.parse_primary(depth, negated=False)
+
+    def parse_primary(self, depth: int, *, negated: bool) -> str | None:
+        kind, value = self.take()
+        if kind == "(":
+            self.syntax = True
+            expression = self.parse_or(depth + 1)
+            if self.take()[0] != ")" or expression is None:
+                raise _QuerySyntaxError
+            return expression
+        if kind == "phrase":
+            self.syntax = True
+            return _quote(value) if _HAS_TOKEN.search(value) else None
+        if kind == "word":
+            return self.word(value)
+        if kind == "field":
+            self.syntax = True
+            if value == "title":
+                scoped = self.parse_primary(depth + 1, negated=negated)
+                if scoped is None:
+                    raise _QuerySyntaxError
+                return f"(title : {scoped})"
+            if depth > 0 or negated:
+                raise _QuerySyntaxError
+            value_kind, text = self.take()
+            if value_kind not in ("word", "phrase") or not text.strip():
+                raise _QuerySyntaxError
+            self.filters.setdefault(value, []).append(text.strip())
+            return None
+        raise _QuerySyntaxError
+
+    def word(self, value: str) -> str | None:
+        if not _HAS_TOKEN.search(value):
+            return None
+        if value.endswith("*"):
+            stem = value.rstrip("*")
+            self.syntax = True
+            return f"{_quote(stem)} *"
+        return _quote(value)
+
+
+def parse_query(query: str) -> ParsedQuery | None:
+    """Compile ``query`` by the grammar above; None if it should be searched literally.
+
+    A single plain word compiles to the same search as the literal one and is returned
+    as None too, so the caller's handling of plain input (see services/search.py) is
+    unchanged for it.
+    """
+    try:
+        tokens = _tokenize(query)
+        parser = _Parser(tokens)
+        expression = parser.parse_or(depth=0)
+        if parser.peek() is not None:
+            # An unmatched ")".
+            raise _QuerySyntaxError
+    except _QuerySyntaxError:
+        return None
+    if expression is None and not parser.filters:
+        # Nothing to search for: no term has a token in it.
+        return None
+    if not parser.syntax and len(tokens) == 1:
+        return None
+    return ParsedQuery(
+        match=f"({expression})" if expression is not None else None,
+        filters={name: tuple(values) for name, values in parser.filters.items()},
+        bare=not parser.syntax,
+    )
@@ -0,0 +1,175 @@
+"""More like this: the documents of a project whose bodies share the most vocabulary.
+
+Answered from the similarity index (db/models/document_similarity.py), never from the
+bodies. One statement finds the candidates - the documents sharing at least one LSH
+band bucket with the given one - and reads their MinHash signatures; each is scored by
+its estimated Jaccard index with the given document's signature (utils/minhash.py) and
+the best ``limit`` are kept. The candidates are a small fraction of a large project, so
+the cost grows with how alike the project's documents are rather than with its size.
+
+Near-duplicates (the health check's NEAR_DUPLICATE rule) are found from the same stored
+signatures: a project's signatures are read once, cut into bands long enough that only
+pairs close to the threshold are likely to share one (utils.minhash.rows_for_threshold)
+and only pairs sharing a band are compared - sub-quadratic, and no body is read.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import text
+
+from sdlc_lens.utils.minhash import SIGNATURE_SIZE, rows_for_threshold, similarity, unpack
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+_CANDIDATES_SQL = text(
+    "SELECT d.id, d.doc_id, d.doc_type, d.title, d.status, s.signature "
+    "FROM document_signatures s JOIN documents d ON d.id = s.document_id "
+    "WHERE s.document_id IN ("
+    "  SELECT other.document_id FROM document_bands mine "
+    "  JOIN document_bands other ON other.project_id = mine.project_id "
+    "    AND other.band = mine.band AND other.bucket = mine.bucket "
+    "  WHERE mine.document_id = :document_id AND other.document_id != :document_id"
+    ")"
+)
+
+# Bodies shorter than this are not checked for near-duplicates: two stubs that are little
+# more than their template's sentence agree by construction, not by copy-paste, and
+# EMPTY_CONTENT already reports the emptiest of them.
+NEAR_DUPLICATE_MIN_CHARS = 200
+
+_PROJECT_SIGNATURES_SQL = text(
+    "SELECT s.document_id, s.signature FROM document_signatures s "
+    "JOIN documents d ON d.id = s.document_id "
+    "JOIN document_contents c ON c.hash = d.content_hash "
+    "WHERE d.project_id = :project_id AND c.size >= :min_chars "
+    "ORDER BY s.document_id"
+)
+
+
+@dataclass(frozen=True)
+class NearDuplicateCluster:
+    """Documents (documents.id, ascending) each nearly the same as another of them."""
+
+    document_ids: tuple[int, ...]
+    # The lowest estimated Jaccard index of the pairs that joined the cluster.
+    similarity: float
+
+
+async def near_duplicate_clusters(
+    session: AsyncSession, project_id: int, *, threshold: float
+) -> list[NearDuplicateCluster]:
+    """The project's clusters of documents whose bodies are near-duplicates.
+
+    Two documents are near-duplicates when their signatures estimate a Jaccard index of
+    at least ``threshold``, and a cluster is what those pairs connect: A like B and B
+    like C are one cluster even if A and C differ more. Candidate pairs are those
+    sharing a band of ``rows_for_threshold(threshold)`` rows, so a pair at the
+    threshold is missed about one time in twenty and one well above it almost never.
+
+    Returns
+    -------
+    list[NearDuplicateCluster]
+        Ordered by their lowest document id.
+    """
+    rows = await session.execute(
+        _PROJECT_SIGNATURES_SQL,
+        {"project_id": project_id, "min_chars": NEAR_DUPLICATE_MIN_CHARS},
+    )
+    packed = {row.document_id: row.signature for row in rows}
+    signatures: dict[int, tuple[int, ...]] = {}
+    parent = {document_id: document_id for document_id in packed}
+    weakest: dict[int, float] = {}
+
+    def values(document_id: int) -> tuple[int, ...]:
+        if document_id not in signatures:
+            signatures[document_id] = unpack(packed[document_id])
+        return signatures[document_id]
+
+    def root(document_id: int) -> int:
+        while parent[document_id] != document_id:
+            parent[document_id] = parent[parent[document_id]]
+            document_id = parent[document_id]
+        return document_id
+
+    def compare(members: list[int]) -> None:
+        for i, first in enumerate(members):
+            for second in members[i + 1 :]:
+                a, b = root(first), root(second)
+                # Already one cluster: comparing them again cannot change it, which keeps
+                # a bucket of many identical bodies linear in comparisons.
+                if a == b:
+                    continue
+                score = similarity(values(first), values(second))
+                if score < threshold:
+                    continue
+                low, high = min(a, b), max(a, b)
+                parent[high] = low
+                weakest[low] = min(score, weakest.get(low, 1.0), weakest.pop(high, 1.0))
+
+    # Bands are cut from the stored bytes (8 per value), one band at a time, rather than
+    # from unpacked values: a bytes slice is a cheap dictionary key, and only documents
+    # that are compared are ever unpacked.
+    width = rows_for_threshold(threshold) * 8
+    for start in range(0, SIGNATURE_SIZE * 8, width):
+        buckets: dict[bytes, list[int]] = {}
+        for document_id, blob in packed.items():
+            key = blob[start : start + width]
+            if key in buckets:
+                buckets[key].append(document_id)
+            else:
+                buckets[key] = [document_id]
+        for members in buckets.values():
+            if len(members) > 1:
+                compare(members)
+
+    clusters: dict[int, list[int]] = defaultdict(list)
+    for document_id in packed:
+        clusters[root(document_id)].append(document_id)
+    return [
+        NearDuplicateCluster(document_ids=tuple(members), similarity=round(weakest[key], 4))
+        for key, members in sorted(clusters.items())
+        if len(members) > 1
+    ]
+
+
+async def similar_documents(
+    session: AsyncSession, document_id: int, *, limit: int = 10
+) -> list[dict[str, Any]]:
+    """The ``limit`` documents most like ``document_id`` (a documents.id), best first.
+
+    Ties are broken by document id. A document without a signature - its body has too
+    few words to compare - is like nothing, and nothing is like it.
+
+    Returns
+    -------
+    list[dict]
+        One dictionary per document with doc_id, type, title, status and score, the
+        estimated share of the two documents' words they have in common (0 to 1).
+    """
+    mine = await session.scalar(
+        text("SELECT signature FROM document_signatures WHERE document_id = :document_id"),
+        {"document_id": document_id},
+    )
+    if mine is None:
+        return []
+    reference = unpack(mine)
+    rows = await session.execute(_CANDIDATES_SQL, {"document_id": document_id})
+    scored = [(similarity(reference, unpack(row.signature)), row) for row in rows]
+    best = heapq.nsmallest(limit, scored, key=lambda pair: (-pair[0], pair[1].id))
+    return [
+        {
+            "doc_id": row.doc_id,
+            "type": row.doc_type,
+            "title": row.title,
+            "status": row.status,
+            "score": round(score, 4),
+        }
+        for score, row in best
+        if score > 0
+    ]
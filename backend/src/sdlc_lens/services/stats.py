@@ -133,9 +133,18 @@ async def get_aggregate_stats(session: AsyncSession) -> dict:
     # Story documents grouped by (project, status): drives per-project and
     # aggregate completion from TRUE integer counts, never reconstructed from
     # a rounded percentage.
+    #
+    # The project_id IN (...) is true of every row (the foreign key sees to that). It is
+    # there for the planner: given an equality on the leading column, SQLite seeks
+    # ix_documents_project_type_status once per project and reads only the stories, in
+    # group order, from the index. Without it - and without ANALYZE statistics, which a
+    # fresh database does not have - it walks every document instead.
     story_rows = await session.execute(
         select(Document.project_id, Document.status, func.count())
-        .where(Document.doc_type == "story")
+        .where(
+            Document.project_id.in_(select(Project.id)),
+            Document.doc_type == "story",
+        )
         .group_by(Document.project_id, Document.status)
     )
     project_total_stories: dict[int, int] = {}
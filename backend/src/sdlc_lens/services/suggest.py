@@ -0,0 +1,178 @@
+"""Suggest-as-you-type: term, title and id completions from an in-memory prefix index.
+
+A keystroke in the search box must not cost a ranked ``search_documents`` query with
+snippets. Completions come from a :class:`SuggestIndex` instead: sorted arrays that a
+prefix lookup bisects, built once per corpus state and kept in its own one-entry cache
+(``suggest_cache``, services/result_cache.py) under the corpus generation, so a sync
+that changes documents makes the next keystroke build a fresh one, which replaces the
+old - and a sync that changes none, however its status moves, keeps it.
+
+* Terms are the word index's vocabulary, read from the ``documents_fts_vocab``
+  fts5vocab table (services/fts.py, migration 024) with the number of documents each
+  appears in. Only the title and content columns: the filter-key tokens are not words
+  anyone types. fts5vocab aggregates posting lists as it goes, so asking it per
+  keystroke costs tens of milliseconds for a one- or two-letter prefix on a large
+  corpus; read once and bisected, any prefix costs well under one.
+* Documents are completed by the start of their id or title, case-insensitively, from
+  one sorted key list for the corpus and one per project.
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import text
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# The last word of a query: what unicode61 (with '_' as a token character) would make a
+# token of.
+_LAST_WORD = re.compile(r"(\w+)$")
+
+
+def _fold(value: str) -> str:
+    """Lowercase and strip diacritics, as the unicode61 tokenizer does to indexed terms."""
+    decomposed = unicodedata.normalize("NFKD", value.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+@dataclass(frozen=True)
+class SuggestIndex:
+    """Sorted prefix arrays over the corpus's terms and documents."""
+
+    # Terms in sorted order, and how many documents each appears in.
+    terms: list[str]
+    term_documents: list[int]
+    # Lowercased doc ids and titles in sorted order, each with its position in
+    # ``documents``; for the whole corpus, and per project slug.
+    keys: list[tuple[str, int]]
+    keys_by_project: dict[str, list[tuple[str, int]]]
+    # (doc_id, title, doc_type, project_slug) per document.
+    documents: list[tuple[str, str, str, str]]
+    # Rough bytes of text held, summed while building: what the cache budgets by, where
+    # serialising the whole index to measure it would cost more than building it.
+    size_bytes: int
+
+
+async def build_suggest_index(session: AsyncSession) -> SuggestIndex:
+    """Read the vocabulary and every document's id and title into a :class:`SuggestIndex`."""
+    # A term in both columns of one document is counted once per column; max() of the
+    # two is a lower bound on its documents, which is all the ordering needs.
+    vocab = await session.execute(
+        text(
+            "SELECT term, MAX(doc) FROM documents_fts_vocab "
+            "WHERE col IN ('title', 'content') GROUP BY term ORDER BY term"
+        )
+    )
+    terms: list[str] = []
+    term_documents: list[int] = []
+    size = 0
+    for term, documents in vocab:
+        terms.append(term)
+        term_documents.append(documents)
+        size += len(term) + 8
+
+    rows = await session.execute(
+        text(
+            "SELECT d.doc_id, d.title, d.doc_type, p.slug "
+            "FROM documents d JOIN projects p ON p.id = d.project_id"
+        )
+    )
+    documents = [tuple(row) for row in rows]
+    keys: list[tuple[str, int]] = []
+    keys_by_project: dict[str, list[tuple[str, int]]] = {}
+    for position, (doc_id, title, doc_type, slug) in enumerate(documents):
+        entries = [(doc_id.lower(), position), (title.lower(), position)]
+        keys.extend(entries)
+        keys_by_project.setdefault(slug, []).extend(entries)
+        # The document, then its two keys in both key lists.
+        size += len(doc_id) + len(title) + len(doc_type) + len(slug)
+        size += 2 * (len(doc_id) + len(title) + 16)
+    keys.sort()
+    for project_keys in keys_by_project.values():
+        project_keys.sort()
+    return SuggestIndex(terms, term_documents, keys, keys_by_project, documents, size)
+
+
+def _complete_terms(index: SuggestIndex, prefix: str, limit: int) -> list[tuple[str, int]]:
+    """The ``limit`` terms starting with ``prefix`` that appear in the most documents."""
+    start = bisect_left(index.terms, prefix)
+    # Every term with the prefix sorts before the prefix followed by the highest code
+    # point.
+    end = bisect_left(index.terms, prefix + "\U0010ffff", start)
+    best = heapq.nsmallest(
+        limit, range(start, end), key=lambda i: (-index.term_documents[i], index.terms[i])
+    )
+    return [(index.terms[i], index.term_documents[i]) for i in best]
+
+
+def _complete_documents(
+    index: SuggestIndex,
+    prefix: str,
+    limit: int,
+    project_slug: str | None,
+    doc_type: str | None,
+) -> list[tuple[str, str, str, str]]:
+    """Up to ``limit`` documents whose id or title starts with ``prefix``, in key order."""
+    keys = index.keys if project_slug is None else index.keys_by_project.get(project_slug, [])
+    found: list[tuple[str, str, str, str]] = []
+    seen: set[int] = set()
+    position = bisect_left(keys, (prefix,))
+    while position < len(keys) and len(found) < limit:
+        key, document = keys[position]
+        if not key.startswith(prefix):
+            break
+        position += 1
+        if document in seen:
+            continue
+        doc_id, title, this_type, slug = index.documents[document]
+        if doc_type is not None and this_type != doc_type:
+            continue
+        seen.add(document)
+        found.append((doc_id, title, this_type, slug))
+    return found
+
+
+def suggest(
+    index: SuggestIndex,
+    query: str,
+    *,
+    project_slug: str | None = None,
+    doc_type: str | None = None,
+    limit: int = 8,
+) -> dict[str, Any]:
+    """Completions of ``query``: for its last word, and of document ids and titles.
+
+    Each term completion also carries ``text``, the query with its last word completed.
+    The scope narrows the document completions only; the vocabulary is the whole
+    corpus's.
+
+    Returns
+    -------
+    dict
+        Dictionary with query, terms and documents.
+    """
+    terms = []
+    last_word = _LAST_WORD.search(query)
+    if last_word is not None:
+        head = query[: last_word.start()]
+        terms = [
+            {"term": term, "documents": documents, "text": head + term}
+            for term, documents in _complete_terms(index, _fold(last_word.group(1)), limit)
+        ]
+    prefix = query.lower().strip()
+    documents = []
+    if prefix:
+        documents = [
+            {"doc_id": doc_id, "title": title, "type": this_type, "project_slug": slug}
+            for doc_id, title, this_type, slug in _complete_documents(
+                index, prefix, limit, project_slug, doc_type
+            )
+        ]
+    return {"query": query, "terms": terms, "documents": documents}
@@ -20,6 +20,14 @@ class SyncInProgressError(Exception):
         super().__init__(self.message)
 
 
+class SyncNotRunningError(Exception):
+    """Raised when a cancellation is requested for a project that is not syncing."""
+
+    def __init__(self, message: str = "No sync is running for this project"):
+        self.message = message
+        super().__init__(self.message)
+
+
 async def trigger_sync(session: AsyncSession, slug: str) -> Project:
     """Set project status to syncing and prepare for background task.
 
@@ -35,7 +43,8 @@ async def trigger_sync(session: AsyncSession, slug: str) -> Project:
     outcome = await session.execute(
         update(Project)
         .where(Project.slug == slug, Project.sync_status != "syncing")
-        .values(sync_status="syncing", sync_error=None)
+        # A cancellation aimed at an earlier sync must not stop this one.
+        .values(sync_status="syncing", sync_error=None, sync_cancel_requested=False)
     )
     await session.commit()
 
@@ -53,6 +62,39 @@ async def trigger_sync(session: AsyncSession, slug: str) -> Project:
     return project
 
 
+async def cancel_sync(session: AsyncSession, slug: str) -> Project:
+    """Ask the running sync of a project to stop at its next checkpoint.
+
+    Only raises the flag; the sync engine notices it at the next batch boundary, commits
+    what it has, and keeps its checkpoint so the next sync resumes rather than restarts.
+    The same conditional-UPDATE shape as :func:`trigger_sync`, so a request can never land
+    on a project that is not syncing (and so linger to cancel the NEXT sync).
+
+    Raises:
+        ProjectNotFoundError: If no project with the given slug exists.
+        SyncNotRunningError: If the project is not currently syncing.
+    """
+    from sdlc_lens.services.project import ProjectNotFoundError
+
+    outcome = await session.execute(
+        update(Project)
+        .where(Project.slug == slug, Project.sync_status == "syncing")
+        .values(sync_cancel_requested=True)
+    )
+    await session.commit()
+
+    if outcome.rowcount == 0:
+        existing = await session.execute(select(Project).where(Project.slug == slug))
+        if existing.scalar_one_or_none() is None:
+            raise ProjectNotFoundError
+        raise SyncNotRunningError
+
+    result = await session.execute(select(Project).where(Project.slug == slug))
+    project = result.scalar_one()
+    await session.refresh(project)
+    return project
+
+
 async def run_sync_task(
     slug: str, session_factory: async_sessionmaker[AsyncSession]
 ) -> SyncResult | None:
@@ -75,13 +117,15 @@ async def run_sync_task(
 
             sync_result = await sync_project(project, session)
             logger.info(
-                "Sync completed for '%s': added=%d updated=%d skipped=%d deleted=%d errors=%d",
+                "Sync %s for '%s': added=%d updated=%d skipped=%d deleted=%d errors=%d resumed=%d",
+                "cancelled" if sync_result.cancelled else "completed",
                 slug,
                 sync_result.added,
                 sync_result.updated,
                 sync_result.skipped,
                 sync_result.deleted,
                 sync_result.errors,
+                sync_result.resumed,
             )
             return sync_result
     except BaseException as exc:
@@ -18,6 +18,18 @@ from sqlalchemy.ext.asyncio import async_object_session
 from sdlc_lens.config import settings
 from sdlc_lens.db.models.document import Document
 from sdlc_lens.db.models.project import Project
+from sdlc_lens.db.models.sync_checkpoint import SyncCheckpoint
+from sdlc_lens.services.coherence import (
+    CORPUS_SCOPE,
+    bump_corpus_generation,
+    invalidate_local,
+)
+from sdlc_lens.services.health_check import PreviousVersion
+from sdlc_lens.services.health_report import (
+    DocumentChanges,
+    health_report_is_current,
+    refresh_health_report,
+)
 from sdlc_lens.services.parser import parse_document
 from sdlc_lens.services.project_config import (
     ProjectConfig,
@@ -69,6 +81,12 @@ _EXCLUDED_DIRS = frozenset(
 # past it (RFC-01KXARHK, D5).
 MAX_INCREMENTAL_BLOBS = 200
 
+# How many document writes a sync makes between checkpoints. Each checkpoint commits the
+# batch and records its progress, so an interrupted sync loses at most this much work, and
+# it is also where a cancellation request is noticed. Small enough that a redeploy costs
+# seconds, large enough that the commit overhead disappears against the parsing.
+SYNC_CHECKPOINT_EVERY = 100
+
 
 @dataclass
 class SyncResult:
@@ -100,6 +118,13 @@ class SyncResult:
     fetch_reason: str = ""
     blobs_fetched: int = 0
 
+    # Manifest paths carried over, already committed, from an interrupted sync's
+    # checkpoint - work this run did not have to repeat.
+    resumed: int = 0
+    # Stopped at a checkpoint by DELETE /projects/{slug}/sync. The progress so far is
+    # committed and the checkpoint kept, so the next sync resumes rather than restarts.
+    cancelled: bool = False
+
 
 # Standard metadata fields stored as dedicated columns
 _STANDARD_FIELDS = frozenset(
@@ -328,7 +353,23 @@ class FetchInfo:
     config_blob_shas: dict[str, str] | None = None
 
 
-def _full_sync_reason(existing_docs: dict[str, Document], project: Project) -> str | None:
+def _needs_reparse(doc: Document) -> bool:
+    """True when a stored row must be re-parsed even though its bytes have not moved.
+
+    The same conditions the sync loop's skip test checks: a row written by an older
+    parser epoch, or a legacy row missing the ref_id its id resolves to.
+    """
+    if (doc.parser_epoch or 0) < PARSER_EPOCH:
+        return True
+    return doc.ref_id is None and norm_id(id_head(doc.doc_id)) is not None
+
+
+def _full_sync_reason(
+    existing_docs: dict[str, Document],
+    project: Project,
+    *,
+    resuming: bool = False,
+) -> str | None:
     """Why this GitHub sync must pull the whole tarball, or None to go incremental.
 
     Each of these is a state in which an incremental fetch would be wrong or useless,
@@ -339,6 +380,15 @@ def _full_sync_reason(existing_docs: dict[str, Document], project: Project) -> s
         # instead of 1 + N.
         return "first sync"
 
+    if resuming:
+        # An interrupted sync left a checkpoint. The rows it committed already carry their
+        # blob SHA and the current epoch; the rest are exactly the "changed" set the
+        # incremental diff computes (it counts a row needing a reparse as changed). So the
+        # cold-start, backfill and reparse reasons below were paid for by the rows already
+        # written, and re-pulling the tarball would throw that work away. The blob cap
+        # still applies: if too much is left, the diff falls back to the tarball itself.
+        return None if project.config_blob_shas is not None else "config state unknown"
+
     if any(doc.blob_sha is None for doc in existing_docs.values()):
         # A row from before migration 012. We have no SHA to diff it against, so we
         # cannot know whether it changed. Pull everything once; the skip condition's
@@ -363,6 +413,7 @@ def _full_sync_reason(existing_docs: dict[str, Document], project: Project) -> s
 async def collect_github_files(
     project: Project,
     existing_docs: dict[str, Document] | None = None,
+    checkpoint: SyncCheckpoint | None = None,
 ) -> tuple[dict[str, FileEntry], ProjectConfig, FetchInfo]:
     """Collect .md files and project config from a GitHub repository.
 
@@ -378,6 +429,11 @@ async def collect_github_files(
     path an unchanged file is present with ``raw=None``: it was not downloaded, but it
     was certainly not deleted, and conflating those two is how you delete a user's corpus
     (see :class:`FileEntry`).
+
+    A ``checkpoint`` from an interrupted sync resumes it: the manifest still comes from a
+    fresh Trees call - the branch may have moved while we were down, and resuming a stale
+    snapshot would record a corpus for a commit we never read - but only the paths the
+    interrupted run had not yet committed are fetched.
     """
     from sdlc_lens.services.github_source import (
         AuthenticationError,
@@ -418,7 +474,7 @@ async def collect_github_files(
             FetchInfo(path="tarball", reason=reason, config_blob_shas=config_shas),
         )
 
-    forced = _full_sync_reason(existing_docs, project)
+    forced = _full_sync_reason(existing_docs, project, resuming=checkpoint is not None)
     if forced:
         return await _tarball(forced)
 
@@ -461,10 +517,15 @@ async def collect_github_files(
             if infer_type_and_id(Path(rel_path).name, rel_path) is not None
         }
 
+        # A row needing a reparse counts as changed even at an unchanged SHA. Outside a
+        # resume such rows already forced the tarball above; inside one they are the part
+        # of a backfill or epoch bump the interrupted run never reached.
         changed = {
             rel_path: sha
             for rel_path, sha in live.items()
-            if rel_path not in existing_docs or existing_docs[rel_path].blob_sha != sha
+            if rel_path not in existing_docs
+            or existing_docs[rel_path].blob_sha != sha
+            or _needs_reparse(existing_docs[rel_path])
         }
         if len(changed) > MAX_INCREMENTAL_BLOBS:
             # Past the cap, one-request-per-blob costs more than a single tarball. Falling
@@ -590,9 +651,13 @@ def _build_doc_attrs(
     project_id: int,
     status_vocab: dict[str, list[str]] | None = None,
     blob_sha: str | None = None,
+    parsed_mentions: list[str] | None = None,
 ) -> dict:
     """Build a dict of Document column values from parsed data.
 
+    ``parsed_mentions`` are the ids the parser found in the body; without them the
+    document extracts its own (see Document.mentions).
+
     ``status_vocab`` is the project's parsed custom vocabulary; the tokens for
     this ``doc_type`` are fed to :func:`canonical_status` so project-defined
     statuses canonicalise to themselves.
@@ -617,6 +682,8 @@ def _build_doc_attrs(
         "aliases": _norm_ref_list(parsed_meta.get("aliases")),
         "metadata_json": json.dumps(extra) if extra else None,
         "content": parsed_body,
+        # After "content": a document keeps the mentions of its current body only.
+        "mentions": parsed_mentions,
         "file_path": file_path,
         "file_hash": file_hash,
         "blob_sha": blob_sha,
@@ -625,8 +692,16 @@ def _build_doc_attrs(
     }
 
 
-async def _rebuild_fts_if_exists(session: AsyncSession) -> None:
-    """Rebuild FTS5 index if the virtual table exists."""
+async def _rebuild_fts_if_exists(
+    session: AsyncSession, changed_project_id: int | None = None
+) -> None:
+    """Rebuild FTS5 index if the virtual table exists.
+
+    The rebuild commits after the documents did, so a search in between saw the old
+    index under the new generation. ``changed_project_id`` - the project whose documents
+    this sync changed, if any - has its generation moved again with the rebuild, so no
+    client or cache keeps that answer.
+    """
     row = await session.execute(
         sql_text("SELECT name FROM sqlite_master WHERE name='documents_fts' AND type='table'")
     )
@@ -639,11 +714,75 @@ async def _rebuild_fts_if_exists(session: AsyncSession) -> None:
 
     try:
         await fts_rebuild(session)
+        if changed_project_id is not None:
+            await bump_corpus_generation(session, changed_project_id)
         await session.commit()
+        if changed_project_id is not None:
+            invalidate_local(CORPUS_SCOPE)
     except Exception:
         logger.warning("FTS5 rebuild failed after sync; search index may be stale", exc_info=True)
 
 
+async def _refresh_health_report(
+    session: AsyncSession, project_id: int, changes: DocumentChanges | None
+) -> None:
+    """Update the project's stored health report (services/health_report.py) and commit.
+
+    After the documents are committed, like the FTS rebuild, and like it a failure here
+    does not fail the sync: the report is left behind its documents, so the health check
+    runs live until the next sync rebuilds it.
+    """
+    try:
+        await refresh_health_report(session, project_id, changes)
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        logger.warning(
+            "Health report refresh failed after sync of project %d; it will be rebuilt",
+            project_id,
+            exc_info=True,
+        )
+
+
+async def _cancel_requested(session: AsyncSession, project_id: int) -> bool:
+    """Has DELETE /projects/{slug}/sync asked this sync to stop?
+
+    Read from the database rather than the loaded Project: the request is committed by
+    another session, possibly in another process.
+    """
+    flag = await session.execute(
+        select(Project.sync_cancel_requested).where(Project.id == project_id)
+    )
+    return bool(flag.scalar_one_or_none())
+
+
+async def _stop_cancelled(
+    session: AsyncSession,
+    project: Project,
+    checkpoint: SyncCheckpoint,
+    result: SyncResult,
+    done: int,
+    total: int,
+) -> None:
+    """Stop a sync at a checkpoint on request, keeping everything it committed.
+
+    The checkpoint is kept and marked "cancelled": the next manual sync resumes from it,
+    but startup will not resume it behind the operator's back.
+    """
+    checkpoint.state = "cancelled"
+    project.sync_cancel_requested = False
+    project.sync_status = "error"
+    project.sync_error = (
+        f"Sync cancelled after {done} of {total} file(s). The documents already synced are "
+        "kept; sync again to resume from where it stopped."
+    )
+    result.cancelled = True
+    await session.commit()
+    # Rows were committed, so the search index must follow them.
+    await _rebuild_fts_if_exists(session, project.id)
+    logger.info("Sync of project %d cancelled at a checkpoint (%d/%d)", project.id, done, total)
+
+
 async def sync_project(
     project: Project,
     session: AsyncSession,
@@ -654,6 +793,11 @@ async def sync_project(
     then processes the collected files: compare hashes, parse new/changed
     documents, delete removed documents, and rebuild the FTS index.
 
+    Document writes are committed in batches of ``SYNC_CHECKPOINT_EVERY``, each recorded
+    in the project's :class:`SyncCheckpoint`. An interrupted sync therefore resumes from
+    its last checkpoint, and a cancellation requested through ``sync_cancel_requested``
+    stops cleanly at the next one.
+
     Args:
         project: The Project ORM instance.
         session: Async database session.
@@ -708,10 +852,20 @@ async def sync_project(
         # it to choose a fetch strategy: what has changed can only be decided against what
         # is stored, and whether an incremental fetch is even valid depends on the stored
         # rows' blob_sha and parser_epoch (see _full_sync_reason).
+        # Without bodies (Document.stored_content is never loaded unasked): the diff goes
+        # by hashes, and a rewrite assigns the new body.
         db_result = await session.execute(
             select(Document).where(Document.project_id == project_id)
         )
         existing_docs = {doc.file_path: doc for doc in db_result.scalars().all()}
+        # Whether the stored health report describes these documents. If it does, what
+        # this sync writes and deletes is all it needs to catch up; if not, it is rebuilt.
+        health_current = await health_report_is_current(session, project_id)
+        written_docs: list[Document] = []
+        previous: list[PreviousVersion] = []
+        # An interrupted sync's progress record, if there is one. Its committed rows are
+        # already in existing_docs; the checkpoint says which paths they cover.
+        checkpoint = await session.get(SyncCheckpoint, project_id)
 
         # Step 2: Collect files from the configured source.
         #
@@ -728,10 +882,18 @@ async def sync_project(
             # A missing or malformed config must not fail the sync.
             config = await asyncio.to_thread(read_local_project_config, project.sdlc_path)
         elif project.source_type == "github":
+            # End the transaction before going to the network. Its pending "syncing"
+            # UPDATE holds SQLite's write lock and the session the single writer
+            # connection (db/session.py); kept over a tarball download they would stall
+            # every other writer - the lease heartbeat, DELETE /sync - for as long as
+            # GitHub takes. The rows loaded above stay usable (expire_on_commit=False).
+            await session.commit()
             # Reads .config.yaml / .version alongside the .md tree. Best-effort, exactly
             # like the local branch: a missing or malformed config yields an empty
             # ProjectConfig. Chooses tarball vs incremental internally.
-            fs_files, config, fetch_info = await collect_github_files(project, existing_docs)
+            fs_files, config, fetch_info = await collect_github_files(
+                project, existing_docs, checkpoint
+            )
         else:
             project.sync_status = "error"
             project.sync_error = f"Unknown source_type: {project.source_type}"
@@ -773,6 +935,36 @@ async def sync_project(
         if fetch_info.config_blob_shas is not None:
             project.config_blob_shas = json.dumps(fetch_info.config_blob_shas)
 
+        # Checkpoint the manifest before writing a single document. A path the interrupted
+        # run committed is carried over only if it still has the blob SHA it had then;
+        # anything that moved since is simply processed again.
+        done: set[str] = set()
+        if checkpoint is None:
+            checkpoint = SyncCheckpoint(project_id=project_id)
+            session.add(checkpoint)
+        else:
+            checkpointed = json.loads(checkpoint.manifest or "{}")
+            for rel_path in json.loads(checkpoint.processed_paths or "[]"):
+                entry = fs_files.get(rel_path)
+                if entry is not None and checkpointed.get(rel_path) == entry.blob_sha:
+                    done.add(rel_path)
+            result.resumed = len(done)
+            logger.info(
+                "Resuming the interrupted sync of project %d: %d of %d file(s) already done",
+                project_id,
+                len(done),
+                len(fs_files),
+            )
+        checkpoint.state = "running"
+        checkpoint.fetch_path = fetch_info.path
+        checkpoint.manifest = json.dumps({p: e.blob_sha for p, e in fs_files.items()})
+        checkpoint.processed_paths = json.dumps(sorted(done))
+        await session.commit()
+
+        if await _cancel_requested(session, project_id):
+            await _stop_cancelled(session, project, checkpoint, result, len(done), len(fs_files))
+            return result
+
         # Step 3: Process collected files
         #
         # NOTE the guard above and the deletion loop below both key off `fs_files`, and
@@ -781,7 +973,29 @@ async def sync_project(
         # ever be re-keyed to "the files we fetched": on a no-op incremental sync that set
         # is empty, which would read as an empty source (BG-01KX8BFP) or delete every
         # document. See FileEntry's docstring.
-        for rel_path, entry in fs_files.items():
+        paths = list(fs_files)
+        written = 0
+        for index, rel_path in enumerate(paths):
+            if written >= SYNC_CHECKPOINT_EVERY:
+                # Everything before `index` is finished: commit it and say so. This is also
+                # the only place a cancellation is honoured, so a cancelled sync always
+                # stops on a batch boundary with a consistent checkpoint behind it.
+                written = 0
+                done.update(paths[:index])
+                checkpoint.processed_paths = json.dumps(sorted(done))
+                # The batch is visible to readers from this commit on, so caches built on
+                # the previous corpus - in every worker, and in every client holding an
+                # ETag - are stale from it on too.
+                await bump_corpus_generation(session, project_id)
+                await session.commit()
+                invalidate_local(CORPUS_SCOPE)
+                if await _cancel_requested(session, project_id):
+                    await _stop_cancelled(
+                        session, project, checkpoint, result, len(done), len(fs_files)
+                    )
+                    return result
+
+            entry = fs_files[rel_path]
             file_hash = entry.file_hash
             raw = entry.raw
             doc = existing_docs.get(rel_path)
@@ -896,6 +1110,7 @@ async def sync_project(
                 parsed_meta=parsed.metadata,
                 parsed_title=parsed.title,
                 parsed_body=parsed.body,
+                parsed_mentions=parsed.mentions,
                 doc_type=inference.doc_type,
                 doc_id=inference.doc_id,
                 file_path=rel_path,
@@ -911,15 +1126,19 @@ async def sync_project(
 
             if doc is not None:
                 # Update - changed hash
+                previous.append(PreviousVersion(doc.doc_id, doc.epic, doc.story))
                 for key, value in attrs.items():
                     if key != "project_id":
                         setattr(doc, key, value)
+                written_docs.append(doc)
                 result.updated += 1
             else:
                 # Add - new file
                 new_doc = Document(**attrs)
                 session.add(new_doc)
+                written_docs.append(new_doc)
                 result.added += 1
+            written += 1
 
         # Step 4: Delete documents no longer in source.
         #
@@ -928,6 +1147,7 @@ async def sync_project(
         # raw=None, and an unreadable file is present with unreadable=True. Both survive.
         for rel_path, doc in existing_docs.items():
             if rel_path not in fs_files:
+                previous.append(PreviousVersion(doc.doc_id, doc.epic, doc.story))
                 await session.delete(doc)
                 result.deleted += 1
 
@@ -953,10 +1173,22 @@ async def sync_project(
             project.sync_status = "synced"
             project.sync_error = None
 
+        # Finished: the checkpoint goes in the same commit, so it exists exactly as long
+        # as the corpus is part-way through a sync.
+        await session.delete(checkpoint)
+        changed = bool(result.added or result.updated or result.deleted)
+        if changed:
+            await bump_corpus_generation(session, project_id)
         await session.commit()
+        if changed:
+            invalidate_local(CORPUS_SCOPE)
 
         # Step 6: Rebuild FTS5 index if table exists
-        await _rebuild_fts_if_exists(session)
+        await _rebuild_fts_if_exists(session, project_id if changed else None)
+
+        # Step 7: Bring the stored health report up to date with what this sync did.
+        changes = DocumentChanges({doc.id for doc in written_docs}, previous)
+        await _refresh_health_report(session, project_id, changes if health_current else None)
 
     except Exception as exc:
         await session.rollback()
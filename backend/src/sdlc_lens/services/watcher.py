@@ -0,0 +1,513 @@
+"""Auto-sync for local projects: inotify, with a tree-fingerprint fallback.
+
+``auto_sync`` used to mean "poll GitHub" and nothing else - the poller only looks at
+GitHub projects - so a local project went stale until somebody pressed Sync. For a local
+project there is nothing to poll: the files are right here, and the kernel can say when
+they change.
+
+So, for every local project with ``auto_sync`` on, this module watches its ``sdlc_path``
+and syncs when something under it changes:
+
+* **inotify** (Linux) - a watch on every directory in the tree. An event marks the
+  project dirty; the sync fires once the tree has been quiet for the debounce interval, so
+  a ``git checkout`` touching 300 files is one sync, not 300. New directories are watched
+  as they appear. Bound through ``ctypes``: three libc calls do not justify a dependency.
+* **fingerprint fallback** - inotify does not see changes made on the other side of a
+  network mount (NFS, SMB, sshfs ...), and is absent off Linux. There, each tick stats
+  the tree - directories and the files a sync reads, never opening one - into a digest,
+  and a digest that differs from the one taken at the last sync marks the project dirty.
+
+Either way a tick never walks and READS the tree; only a real change costs a sync. A
+change made while the app was down is caught when the project is first watched, by
+comparing the tree's newest mtime with ``last_synced_at``.
+
+Like the poller, this is a scheduler rather than a sync path: it goes through
+``trigger_sync`` / ``run_sync_task``, and only the elected leader watches.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import ctypes.util
+import datetime
+import hashlib
+import logging
+import os
+import struct
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from sqlalchemy import select
+
+from sdlc_lens.config import settings
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services.project import ProjectNotFoundError
+from sdlc_lens.services.sync import SyncInProgressError, run_sync_task, trigger_sync
+from sdlc_lens.services.sync_engine import _EXCLUDED_DIRS
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from sdlc_lens.services.leader import LeaderLease
+
+logger = logging.getLogger(__name__)
+
+# inotify(7) event bits.
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+    | _IN_ONLYDIR
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+# Filesystems whose changes can originate on another machine, where inotify never hears
+# about them. A project on one of these is fingerprinted instead.
+_REMOTE_FS_TYPES = frozenset(
+    {
+        "nfs",
+        "nfs4",
+        "cifs",
+        "smb3",
+        "smbfs",
+        "9p",
+        "afs",
+        "ceph",
+        "fuse.sshfs",
+        "fuse.rclone",
+        "fuse.glusterfs",
+    }
+)
+
+# The files whose change can change the corpus: the documents, and the config a sync
+# adopts (see project_config).
+_CONFIG_NAMES = frozenset({".config.yaml", ".version"})
+
+
+def _is_relevant_file(name: str) -> bool:
+    return name.endswith(".md") or name in _CONFIG_NAMES
+
+
+def _is_pruned_dir(name: str) -> bool:
+    return name in _EXCLUDED_DIRS or name.startswith(".")
+
+
+def _tree_dirs(root: Path) -> list[str]:
+    """Every directory a sync would walk under ``root``, ``root`` included."""
+    dirs: list[str] = []
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        dirs.append(current)
+        try:
+            with os.scandir(current) as entries:
+                stack.extend(
+                    entry.path
+                    for entry in entries
+                    if entry.is_dir(follow_symlinks=False) and not _is_pruned_dir(entry.name)
+                )
+        except OSError:
+            continue
+    return dirs
+
+
+def tree_fingerprint(root: Path) -> tuple[str, float]:
+    """A digest of the tree's shape and timestamps, and its newest mtime.
+
+    Stats directories (a create, delete or rename bumps the parent's mtime) and the files
+    a sync reads (an in-place write bumps only the file's own). Opens nothing.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    newest = 0.0
+    for directory in sorted(_tree_dirs(root)):
+        try:
+            info = os.stat(directory)
+            with os.scandir(directory) as entries:
+                files = sorted(
+                    (entry.name, entry.stat(follow_symlinks=False))
+                    for entry in entries
+                    if _is_relevant_file(entry.name) and entry.is_file(follow_symlinks=False)
+                )
+        except OSError:
+            digest.update(f"{directory}\0missing\n".encode())
+            continue
+        digest.update(f"{directory}\0{info.st_mtime_ns}\n".encode())
+        newest = max(newest, info.st_mtime)
+        for name, stat in files:
+            digest.update(f"{name}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+            newest = max(newest, stat.st_mtime)
+    return digest.hexdigest(), newest
+
+
+def _filesystem_type(path: Path) -> str | None:
+    """The fstype of the mount holding ``path``, from /proc/self/mounts; None if unknown."""
+    try:
+        lines = Path("/proc/self/mounts").read_text().splitlines()
+    except OSError:
+        return None
+    target = str(path)
+    best, best_type = "", None
+    for line in lines:
+        parts = line.split()
+        if len(parts) < 3:
+            continue
+        mount_point = parts[1].replace("\\040", " ")
+        inside = target == mount_point or target.startswith(mount_point.rstrip("/") + "/")
+        if inside and len(mount_point) >= len(best):
+            best, best_type = mount_point, parts[2]
+    return best_type
+
+
+def watch_mode_for(path: Path) -> str:
+    """Choose "inotify" or "poll" for a project rooted at ``path``, honouring the setting."""
+    mode = settings.local_watch_mode
+    if mode == "poll":
+        return "poll"
+    if not sys.platform.startswith("linux"):
+        return "poll"
+    if mode == "auto" and _filesystem_type(path) in _REMOTE_FS_TYPES:
+        return "poll"
+    return "inotify"
+
+
+class _Inotify:
+    """The three inotify(7) calls, via ctypes, on a non-blocking descriptor."""
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path: str) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self) -> list[tuple[int, int, str]]:
+        """Drain every pending event as (wd, mask, name)."""
+        events: list[tuple[int, int, str]] = []
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(buffer):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(buffer[offset : offset + length].rstrip(b"\0"))
+                offset += length
+                events.append((wd, mask, name))
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+@dataclass
+class _Watched:
+    """One watched project."""
+
+    slug: str
+    root: Path
+    mode: str
+    wds: set[int] = field(default_factory=set)
+    fingerprint: str | None = None
+    # Monotonic times: the first change not yet synced, and the latest.
+    dirty_since: float | None = None
+    last_change: float = 0.0
+    # Set by unwatch(): a directory walk that finishes afterwards adds no watches.
+    closed: bool = False
+
+    def mark_dirty(self, now: float) -> None:
+        if self.dirty_since is None:
+            self.dirty_since = now
+        self.last_change = now
+
+
+class LocalWatcher:
+    """Watches every auto-sync local project and syncs it after a quiet period."""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self.session_factory = session_factory
+        self.debounce = settings.local_watch_debounce_seconds
+        # A tree that never goes quiet (a build writing docs in a loop) still syncs.
+        self.max_wait = self.debounce * 10
+        self.watched: dict[str, _Watched] = {}
+        self.syncs: dict[str, asyncio.Task] = {}
+        self._wd_owner: dict[int, tuple[str, str]] = {}
+        self._inotify: _Inotify | None = None
+        self._inotify_failed = False
+
+    # -- membership -------------------------------------------------------------------
+
+    async def reconcile(self) -> None:
+        """Watch exactly the local projects that have auto_sync on."""
+        async with self.session_factory() as session:
+            rows = (
+                await session.execute(
+                    select(Project.slug, Project.sdlc_path, Project.last_synced_at).where(
+                        Project.source_type == "local",
+                        Project.auto_sync.is_(True),
+                        Project.sdlc_path.is_not(None),
+                    )
+                )
+            ).all()
+        wanted = {slug: (Path(path), synced) for slug, path, synced in rows}
+
+        for slug in list(self.watched):
+            if slug not in wanted or wanted[slug][0] != self.watched[slug].root:
+                self.unwatch(slug)
+        for slug, (root, synced) in wanted.items():
+            if slug not in self.watched:
+                await self.watch(slug, root, synced)
+
+    async def watch(
+        self, slug: str, root: Path, last_synced_at: datetime.datetime | None = None
+    ) -> None:
+        mode = watch_mode_for(root)
+        watched = _Watched(slug=slug, root=root, mode=mode)
+        if mode == "inotify" and not await self._add_tree(watched, str(root)):
+            watched.mode = "poll"
+        fingerprint, newest = await asyncio.to_thread(tree_fingerprint, root)
+        watched.fingerprint = fingerprint
+        self.watched[slug] = watched
+        # Catch up on whatever changed while nobody was watching.
+        if last_synced_at is None or newest > _epoch_seconds(last_synced_at):
+            watched.mark_dirty(time.monotonic())
+        logger.info("Watching local project '%s' (%s) at %s", slug, watched.mode, root)
+
+    def unwatch(self, slug: str) -> None:
+        watched = self.watched.pop(slug, None)
+        if watched is None:
+            return
+        watched.closed = True
+        for wd in watched.wds:
+            self._wd_owner.pop(wd, None)
+            if self._inotify is not None:
+                self._inotify.rm_watch(wd)
+
+    def unwatch_all(self) -> None:
+        for slug in list(self.watched):
+            self.unwatch(slug)
+
+    def close(self) -> None:
+        self.unwatch_all()
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    async def _add_tree(self, watched: _Watched, top: str) -> bool:
+        """Watch ``top`` and every directory below it. False means "use the fallback"."""
+        if self._inotify is None:
+            if self._inotify_failed:
+                return False
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as exc:
+                self._inotify_failed = True
+                logger.warning("inotify is unavailable (%s); local projects are polled", exc)
+                return False
+        # The walk is blocking I/O over a possibly large tree - a project being registered,
+        # a directory just moved in - so it runs off the event loop, like tree_fingerprint.
+        # Only the add_watch calls, one cheap syscall each, stay on it.
+        directories = await asyncio.to_thread(_tree_dirs, Path(top))
+        if self._inotify is None or watched.closed:
+            # Closed, or the project unwatched, while the walk ran.
+            return False
+        try:
+            for directory in directories:
+                wd = self._inotify.add_watch(directory)
+                watched.wds.add(wd)
+                self._wd_owner[wd] = (watched.slug, directory)
+        except OSError as exc:
+            # Most often ENOSPC: fs.inotify.max_user_watches is exhausted.
+            logger.warning("Cannot watch '%s' (%s); polling it instead", watched.slug, exc)
+            for wd in watched.wds:
+                self._wd_owner.pop(wd, None)
+                self._inotify.rm_watch(wd)
+            watched.wds.clear()
+            return False
+        return True
+
+    # -- change detection -------------------------------------------------------------
+
+    async def drain_events(self) -> None:
+        """Turn pending inotify events into dirty projects, and watch new directories."""
+        if self._inotify is None:
+            return
+        now = time.monotonic()
+        for wd, mask, name in self._inotify.read_events():
+            if mask & _IN_Q_OVERFLOW:
+                # Events were dropped: anything may have changed.
+                for watched in self.watched.values():
+                    if watched.mode == "inotify":
+                        watched.mark_dirty(now)
+                continue
+            owner = self._wd_owner.get(wd)
+            if owner is None:
+                continue
+            slug, directory = owner
+            watched = self.watched.get(slug)
+            if watched is None:
+                continue
+            if mask & _IN_IGNORED:
+                # The directory is gone; the kernel dropped the watch itself.
+                self._wd_owner.pop(wd, None)
+                watched.wds.discard(wd)
+                continue
+            if mask & _IN_ISDIR:
+                if _is_pruned_dir(name):
+                    continue
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    added = await self._add_tree(watched, os.path.join(directory, name))
+                    if watched.closed:
+                        # Unwatched while the new directory was being walked.
+                        continue
+                    if not added:
+                        watched.mode = "poll"
+                watched.mark_dirty(now)
+            elif mask & (_IN_DELETE_SELF | _IN_MOVE_SELF) or _is_relevant_file(name):
+                watched.mark_dirty(now)
+
+    async def poll_fingerprints(self) -> None:
+        """Mark dirty every fallback project whose tree no longer matches its fingerprint."""
+        now = time.monotonic()
+        for watched in list(self.watched.values()):
+            if watched.mode != "poll":
+                continue
+            fingerprint, _ = await asyncio.to_thread(tree_fingerprint, watched.root)
+            if fingerprint != watched.fingerprint:
+                watched.fingerprint = fingerprint
+                watched.mark_dirty(now)
+
+    # -- syncing ----------------------------------------------------------------------
+
+    async def flush(self) -> list[str]:
+        """Start a sync for every dirty project that has gone quiet. Returns their slugs."""
+        now = time.monotonic()
+        started: list[str] = []
+        for watched in list(self.watched.values()):
+            if watched.dirty_since is None:
+                continue
+            quiet = now - watched.last_change >= self.debounce
+            overdue = now - watched.dirty_since >= self.max_wait
+            running = self.syncs.get(watched.slug)
+            if not (quiet or overdue) or (running is not None and not running.done()):
+                continue
+            if await self._start_sync(watched):
+                started.append(watched.slug)
+        return started
+
+    async def _start_sync(self, watched: _Watched) -> bool:
+        async with self.session_factory() as session:
+            try:
+                await trigger_sync(session, watched.slug)
+            except SyncInProgressError:
+                # A manual or poll sync owns it. Stay dirty and try after it finishes:
+                # it may have read the tree before our change landed.
+                return False
+            except ProjectNotFoundError:
+                self.unwatch(watched.slug)
+                return False
+        # Cleared at the trigger, so a change made DURING the sync dirties it again.
+        watched.dirty_since = None
+        self.syncs[watched.slug] = asyncio.create_task(
+            run_sync_task(watched.slug, self.session_factory),
+            name=f"sdlc-lens-watch-{watched.slug}",
+        )
+        return True
+
+    async def cancel_syncs(self) -> None:
+        tasks = [task for task in self.syncs.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _epoch_seconds(moment: datetime.datetime) -> float:
+    # SQLite hands the stored UTC instant back naive.
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.UTC)
+    return moment.timestamp()
+
+
+async def _watch_loop(
+    session_factory: async_sessionmaker[AsyncSession],
+    lease: LeaderLease | None = None,
+) -> None:
+    """Drive a :class:`LocalWatcher`. Never exits except by cancellation."""
+    watcher = LocalWatcher(session_factory)
+    tick = min(0.5, watcher.debounce / 2) or 0.5
+    poll_every = settings.local_watch_poll_interval_seconds
+    # Membership (which projects have auto_sync on) changes rarely and costs a query.
+    reconcile_every = 30.0
+    last_poll = last_reconcile = float("-inf")
+    logger.info("Local project watcher started")
+    try:
+        while True:
+            try:
+                now = time.monotonic()
+                if lease is not None and not lease.held:
+                    # Only the leader watches; a follower holds no watches at all.
+                    watcher.unwatch_all()
+                    last_reconcile = float("-inf")
+                else:
+                    if now - last_reconcile >= reconcile_every:
+                        await watcher.reconcile()
+                        last_reconcile = now
+                    await watcher.drain_events()
+                    if now - last_poll >= poll_every:
+                        await watcher.poll_fingerprints()
+                        last_poll = now
+                    await watcher.flush()
+            except Exception:
+                logger.exception("Local watcher tick failed; the watcher continues")
+            await asyncio.sleep(tick)
+    except asyncio.CancelledError:
+        await watcher.cancel_syncs()
+        watcher.close()
+        logger.info("Local project watcher stopped")
+        raise
+
+
+def start_local_watcher(
+    session_factory: async_sessionmaker[AsyncSession],
+    lease: LeaderLease | None = None,
+) -> asyncio.Task | None:
+    """Start the watcher, or return None when ``local_watch_mode`` is "off"."""
+    if settings.local_watch_mode == "off":
+        return None
+    return asyncio.create_task(_watch_loop(session_factory, lease), name="sdlc-lens-watcher")
@@ -0,0 +1,152 @@
+"""MinHash signatures and LSH bands for "more like this" (document similarity).
+
+A document is reduced to the set of distinct words in its body, and two documents are as
+similar as the Jaccard index of their sets: the words they share over the words either
+has. Comparing sets directly would mean keeping every document's words; a MinHash
+signature keeps :data:`SIGNATURE_SIZE` numbers instead, and the fraction of positions at
+which two signatures agree estimates the Jaccard index (within about +-0.06 at 64).
+
+Signatures are one-permutation MinHash (Li, Owen and Zhang, 2012): each word is hashed
+once, the hash picks one of the signature's bins and the smallest remainder in each bin
+is kept. A bin no word fell into borrows the value of the next non-empty one, offset by
+the distance (rotation densification, Shrivastava and Li, 2014), which keeps agreement
+an estimate of Jaccard for short documents too. So a signature costs one pass over the
+body's words, not one pass per position, and maintaining it at sync time is cheap.
+
+Finding the documents most like one without comparing it with every other is locality-
+sensitive hashing: the signature is cut into :data:`BANDS` bands of :data:`BAND_ROWS`
+positions and each band hashed to a bucket. Documents sharing any bucket are candidates
+and only candidates are compared. With 32 bands of 2 rows a pair with Jaccard 0.1 is a
+candidate with probability 0.28, 0.2 with 0.73 and 0.3 with 0.95: "like this" for
+triage means sharing a topic's vocabulary, which is a low Jaccard index between whole
+documents, so the bands are cut for recall and the ranking is left to the signatures.
+Near-duplicate detection wants the opposite - only pairs with a high Jaccard index - and
+re-cuts the same stored signatures into fewer, longer bands (:func:`rows_for_threshold`).
+
+Pure Python, no network and no model: what the word sets hold is decided here.
+Frontmatter is already stripped from bodies; markdown heading lines are skipped as
+well, because every document of a type shares its template's headings, and so are very
+common English words.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import operator
+import re
+import struct
+
+SIGNATURE_SIZE = 64
+BANDS = 32
+BAND_ROWS = SIGNATURE_SIZE // BANDS
+# Fewer distinct words than this is too little text to be like anything.
+MIN_WORDS = 5
+
+_MASK = (1 << 64) - 1
+# Larger than any in-bin value (a 64-bit hash divided by SIGNATURE_SIZE), so a borrowed
+# value never equals a genuine one.
+_OFFSET = 1 << 58
+_PACK = struct.Struct(f"<{SIGNATURE_SIZE}Q")
+
+# A letter, then letters, digits, hyphens or apostrophes, ending in a letter or digit.
+_WORD = re.compile(r"[^\W\d_][\w'-]*[^\W_]")
+_STOPWORD_TEXT = """
+about above after again against all also and any are because been before being below
+between both but can could did does doing down during each few for from further had has
+have having her here hers herself him himself his how into its itself just more most
+must not now off once only other our ours out over own same shall she should some such
+than that the their theirs them then there these they this those through too under
+until very was were what when where which while who whom why will with would you your
+yours
+"""
+_STOPWORDS = frozenset(_STOPWORD_TEXT.split())
+
+
+def words(body: str) -> set[str]:
+    """The distinct words of ``body`` that signatures are made of.
+
+    Lowercased words of three characters or more with a letter at each end, except
+    stop words and anything on a markdown heading line.
+    """
+    found: set[str] = set()
+    for line in body.splitlines():
+        if line.lstrip().startswith("#"):
+            continue
+        for match in _WORD.finditer(line.lower()):
+            word = match.group()
+            if len(word) >= 3 and word not in _STOPWORDS:
+                found.add(word)
+    return found
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "little")
+
+
+def signature(body: str) -> tuple[int, ...] | None:
+    """The MinHash signature of ``body``'s words, or None if it has too few of them."""
+    bag = words(body)
+    if len(bag) < MIN_WORDS:
+        return None
+    bins: list[int | None] = [None] * SIGNATURE_SIZE
+    for word in bag:
+        hashed = _hash(word)
+        index, value = hashed % SIGNATURE_SIZE, hashed // SIGNATURE_SIZE
+        current = bins[index]
+        if current is None or value < current:
+            bins[index] = value
+    filled = {i: value for i, value in enumerate(bins) if value is not None}
+    order = sorted(filled)
+    result: list[int] = []
+    for i in range(SIGNATURE_SIZE):
+        if i in filled:
+            result.append(filled[i])
+            continue
+        # The next filled bin to the right, wrapping round.
+        source = next((j for j in order if j > i), order[0])
+        distance = (source - i) % SIGNATURE_SIZE
+        result.append((filled[source] + distance * _OFFSET) & _MASK)
+    return tuple(result)
+
+
+def pack(values: tuple[int, ...]) -> bytes:
+    return _PACK.pack(*values)
+
+
+def unpack(blob: bytes) -> tuple[int, ...]:
+    return _PACK.unpack(blob)
+
+
+def band_buckets(values: tuple[int, ...]) -> list[int]:
+    """One bucket per band: a signed 64-bit hash of its rows, as SQLite stores integers."""
+    buckets = []
+    for band in range(BANDS):
+        rows = values[band * BAND_ROWS : (band + 1) * BAND_ROWS]
+        digest = hashlib.blake2b(struct.pack(f"<{BAND_ROWS}Q", *rows), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, "little", signed=True))
+    return buckets
+
+
+def rows_for_threshold(threshold: float, recall: float = 0.95) -> int:
+    """The most rows per band that still make a pair with Jaccard ``threshold`` a candidate.
+
+    A pair agreeing at each position with probability ``j`` shares one of ``b`` bands of
+    ``r`` rows with probability ``1 - (1 - j**r)**b``. The longest bands for which that is
+    at least ``recall`` at the threshold let through the fewest dissimilar pairs: at 0.8,
+    16 bands of 4 rows, which make a pair at 0.9 a candidate almost surely and one at
+    0.3 only one time in eight.
+    """
+    best = 1
+    rows = 1
+    while rows <= SIGNATURE_SIZE:
+        bands = SIGNATURE_SIZE // rows
+        if 1 - (1 - threshold**rows) ** bands >= recall:
+            best = rows
+        rows *= 2
+    return best
+
+
+def similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    """The estimated Jaccard index of the word sets behind two signatures."""
+    # map(eq) rather than a generator: this runs once per candidate pair.
+    return sum(map(operator.eq, a, b)) / SIGNATURE_SIZE
@@ -0,0 +1,113 @@
+"""Opaque cursors for keyset pagination.
+
+A cursor carries the sort key of the last row a client was given - ``(sort value, id)``
+- plus a fingerprint of the query it came from. The next page is then "the rows after
+that key", which an index answers with a seek, instead of ``OFFSET n``, which makes the
+database produce and discard ``n`` rows on every request and so gets linearly slower
+the deeper the page.
+
+The fingerprint makes a cursor valid only for the query that issued it: reused with a
+different sort, order or filter it would silently return the wrong rows, so it is
+rejected instead. Cursors are URL-safe base64 JSON. They are opaque to clients, not
+secret: nothing in one is sensitive, and a forged one can only select rows the same
+request could have asked for anyway - provided it is well-formed, so
+:func:`decode_cursor` checks the key's arity and types against what the query expects
+before any of it reaches SQL.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import datetime
+import hashlib
+import json
+import math
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# The range of an SQLite INTEGER; a larger JSON number cannot be bound as a parameter.
+_INT_MIN, _INT_MAX = -(2**63), 2**63 - 1
+
+
+class InvalidCursorError(Exception):
+    """Raised when a pagination cursor is malformed or belongs to a different query."""
+
+    def __init__(self, message: str = "Invalid or expired pagination cursor"):
+        self.message = message
+        super().__init__(self.message)
+
+
+def query_fingerprint(*parts: Any) -> str:
+    """A short, stable digest of the parameters that define a result ordering."""
+    encoded = json.dumps(parts, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()[:16]
+
+
+def encode_cursor(fingerprint: str, key: list[Any]) -> str:
+    """The cursor for "the rows after ``key``" in the query ``fingerprint`` names."""
+    payload = json.dumps({"q": fingerprint, "k": key}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _key_value(value: Any, types: tuple[type, ...]) -> Any:
+    """One component of a decoded key, checked (and converted) against ``types``."""
+    if value is None:
+        if type(None) in types:
+            return None
+    elif isinstance(value, str):
+        if str in types:
+            return value
+        if datetime.datetime in types:
+            try:
+                return datetime.datetime.fromisoformat(value)
+            except ValueError:
+                pass
+    elif isinstance(value, bool):
+        # JSON true/false are not numbers, whatever Python's int subclassing says.
+        pass
+    elif isinstance(value, int):
+        if _INT_MIN <= value <= _INT_MAX:
+            if int in types:
+                return value
+            if float in types:
+                return float(value)
+    elif isinstance(value, float) and float in types and math.isfinite(value):
+        return value
+    raise InvalidCursorError
+
+
+def decode_cursor(
+    cursor: str, fingerprint: str, key_types: Sequence[type | tuple[type, ...]]
+) -> list[Any]:
+    """The key ``cursor`` carries, checked against the query it is being used with.
+
+    ``key_types`` gives the types each component of the key may have, one entry (a
+    type, or a tuple of them) per component: ``str``, ``int``, ``float`` (which an
+    integral JSON number also satisfies), ``type(None)``, or ``datetime.datetime``,
+    which accepts an ISO 8601 string and returns it parsed.
+
+    Raises:
+        InvalidCursorError: If the cursor cannot be decoded, was issued by a query
+            with different parameters, or carries a key of the wrong shape.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError from exc
+    if not isinstance(payload, dict) or not isinstance(payload.get("k"), list):
+        raise InvalidCursorError
+    if payload.get("q") != fingerprint:
+        raise InvalidCursorError(
+            "Pagination cursor does not match this query's sort, order or filters"
+        )
+    key = payload["k"]
+    if len(key) != len(key_types):
+        raise InvalidCursorError
+    return [
+        _key_value(value, types if isinstance(types, tuple) else (types,))
+        for value, types in zip(key, key_types, strict=True)
+    ]
@@ -19,6 +19,10 @@ lens is standalone, so the logic is reimplemented here rather than imported.
 from __future__ import annotations
 
 import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
 
 # Id prefix -> canonical document type (pipeline + meta types).
 PREFIX_TO_TYPE: dict[str, str] = {
@@ -143,3 +147,62 @@ def extract_ref_id(value: str | None) -> str | None:
         return None
     match = _ID_TOKEN_RE.search(stripped)
     return match.group("id") if match else None
+
+
+def extract_ref_ids(text: str | None) -> list[str]:
+    """Every artefact id mentioned anywhere in ``text``, normalised, first mention first.
+
+    Each id appears once however often it is mentioned. Used for a document body's
+    mentions, where :func:`extract_ref_id` would stop at the first.
+    """
+    if not text:
+        return []
+    ids: list[str] = []
+    for match in _ID_TOKEN_RE.finditer(text):
+        normed = norm_id(match.group("id"))
+        if normed and normed not in ids:
+            ids.append(normed)
+    return ids
+
+
+# The kinds of edge in the ``document_refs`` table (see db/models/document_ref.py).
+REF_EPIC = "epic"
+REF_STORY = "story"
+REF_DEPENDS_ON = "depends_on"
+REF_ALIAS = "alias"
+REF_MENTION = "mention"
+
+
+def reference_edges(
+    *,
+    ref_id: str | None,
+    epic: str | None,
+    story: str | None,
+    depends_on: str | None,
+    aliases: str | None,
+    body: str | None = None,
+    mentions: Sequence[str] | None = None,
+) -> list[tuple[str, str, int]]:
+    """The ``(kind, target_norm_id, position)`` edges a document declares.
+
+    Takes the document's stored columns - ``epic`` / ``story`` already normalised,
+    ``depends_on`` / ``aliases`` comma-joined normalised lists - plus the ids its body
+    mentions, which become ``mention`` edges: ``mentions`` if already extracted (the
+    parser does, see Document.mentions), else those of ``body``. ``position`` keeps each
+    kind's declared order (a dependency list is shown in the order it was written). A
+    body mentioning its own id is not a mention.
+    """
+    edges: list[tuple[str, str, int]] = []
+    for kind, value in ((REF_EPIC, epic), (REF_STORY, story)):
+        if value:
+            edges.append((kind, value, 0))
+    for kind, value in ((REF_DEPENDS_ON, depends_on), (REF_ALIAS, aliases)):
+        targets = [part for part in (value or "").split(",") if part]
+        edges.extend(
+            (kind, target, position) for position, target in enumerate(dict.fromkeys(targets))
+        )
+    if mentions is None:
+        mentions = extract_ref_ids(body)
+    mentioned = [target for target in mentions if target != ref_id]
+    edges.extend((REF_MENTION, target, position) for position, target in enumerate(mentioned))
+    return edges
@@ -1,11 +1,21 @@
 """Test fixtures for the backend test suite."""
 
+from collections.abc import Awaitable, Callable, Iterable
+
 import pytest
-from sqlalchemy import event
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from sdlc_lens.db.models import Base
+from sdlc_lens.db.models.document import Document
+from sdlc_lens.db.models.project import Project
 from sdlc_lens.main import create_app
+from sdlc_lens.services.fts import (
+    FTS5_CREATE_SQL,
+    FTS5_VOCAB_CREATE_SQL,
+    fts_rebuild,
+    trigram_create,
+)
 
 
 @pytest.fixture
@@ -36,7 +46,7 @@ async def session(engine):
 @pytest.fixture
 def app(engine):
     """Create a FastAPI app with the test database."""
-    from sdlc_lens.api.deps import get_db
+    from sdlc_lens.api.deps import get_db, get_read_db
 
     application = create_app()
 
@@ -47,5 +57,91 @@ def app(engine):
             yield sess
 
     application.dependency_overrides[get_db] = override_get_db
+    # In-memory, the reader and the writer are one database, as in production's
+    # create_engines().
+    application.dependency_overrides[get_read_db] = override_get_db
     application.state.session_factory = session_factory
+    application.state.read_session_factory = session_factory
     return application
+
+
+@pytest.fixture(autouse=True)
+def _empty_result_cache():
+    """Every test starts with empty result caches.
+
+    Its keys are unique within one database, but each test's database reuses the same
+    project ids and generations, so an entry from one test could answer the next.
+    """
+    from sdlc_lens.services.result_cache import result_cache, search_cache, suggest_cache
+
+    caches = (result_cache, search_cache, suggest_cache)
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_database_url(monkeypatch: pytest.MonkeyPatch) -> None:
+    # alembic/env.py prefers SDLC_LENS_DATABASE_URL over the config's URL, so the
+    # migration tests would otherwise upgrade whatever database the shell points at.
+    monkeypatch.delenv("SDLC_LENS_DATABASE_URL", raising=False)
+
+
+def make_document(
+    project_id: int,
+    doc_type: str,
+    doc_id: str,
+    content: str,
+    *,
+    title: str | None = None,
+    **fields,
+) -> Document:
+    """An unsaved document; the title defaults to its id."""
+    return Document(
+        project_id=project_id,
+        doc_type=doc_type,
+        doc_id=doc_id,
+        title=title if title is not None else doc_id,
+        content=content,
+        file_path=f"{doc_type}/{doc_id}.md",
+        file_hash="0" * 64,
+        **fields,
+    )
+
+
+CorpusBuilder = Callable[..., Awaitable[tuple[Project, Project]]]
+
+
+@pytest.fixture
+def build_corpus(session: AsyncSession) -> CorpusBuilder:
+    """Build the two-project search corpus: projects "alpha" and "beta".
+
+    ``documents(alpha, beta)`` returns the documents to add. The word index is created
+    and rebuilt over them; ``trigram`` and ``vocab`` add the substring index (before the
+    documents, so its triggers fill it) and the vocabulary table.
+    """
+
+    async def build(
+        documents: Callable[[Project, Project], Iterable[Document]],
+        *,
+        trigram: bool = False,
+        vocab: bool = False,
+    ) -> tuple[Project, Project]:
+        await session.execute(text(FTS5_CREATE_SQL))
+        if vocab:
+            await session.execute(text(FTS5_VOCAB_CREATE_SQL))
+        if trigram:
+            await trigram_create(session)
+        alpha = Project(slug="alpha", name="Alpha", sdlc_path="/alpha")
+        beta = Project(slug="beta", name="Beta", sdlc_path="/beta")
+        session.add_all([alpha, beta])
+        await session.flush()
+        session.add_all(documents(alpha, beta))
+        await session.commit()
+        await fts_rebuild(session)
+        await session.commit()
+        return alpha, beta
+
+    return build
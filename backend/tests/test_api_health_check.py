@@ -4,10 +4,13 @@ import datetime
 
 import pytest
 from httpx import ASGITransport, AsyncClient
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from sdlc_lens.config import Settings
 from sdlc_lens.db.models.document import Document
 from sdlc_lens.db.models.project import Project
+from sdlc_lens.services.coherence import bump_corpus_generation
 
 
 @pytest.fixture
@@ -168,3 +171,45 @@ class TestHealthCheckEndpoint:
         assert affected[0]["doc_id"] == "EP0001"
         assert affected[0]["doc_type"] == "epic"
         assert affected[0]["title"] == "Lonely Epic"
+
+    async def test_reports_near_duplicate_documents(
+        self,
+        client: AsyncClient,
+        session: AsyncSession,
+        project: Project,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Copy-pasted bodies are one NEAR_DUPLICATE finding, at the configured threshold."""
+        body = (
+            "# Checkout\n\nAs a shopper I want to pay for my basket with a saved card so "
+            "that checkout takes one click. The payment form remembers the billing address, "
+            "validates the card number, applies vouchers before tax and emails a receipt."
+        )
+        docs = [
+            _make_doc(project.id, "story", "US0001", content=body),
+            _make_doc(project.id, "story", "US0002", content=body + " Also gift cards."),
+        ]
+        session.add_all(docs)
+        await session.commit()
+
+        resp = await client.get("/api/v1/projects/health-test/health-check")
+        findings = [f for f in resp.json()["findings"] if f["rule_id"] == "NEAR_DUPLICATE"]
+        assert len(findings) == 1
+        assert [d["doc_id"] for d in findings[0]["affected_documents"]] == ["US0001", "US0002"]
+
+        # Nothing is that alike at a threshold of 1.
+        monkeypatch.setattr("sdlc_lens.config.settings.near_duplicate_threshold", 1.0)
+        session.add(_make_doc(project.id, "prd", "PRD-main"))
+        await bump_corpus_generation(session, project.id)
+        await session.commit()
+        resp = await client.get("/api/v1/projects/health-test/health-check")
+        assert [f for f in resp.json()["findings"] if f["rule_id"] == "NEAR_DUPLICATE"] == []
+
+    @pytest.mark.parametrize("threshold", ["0", "-0.5", "1.01"])
+    def test_an_out_of_range_near_duplicate_threshold_is_refused(
+        self, threshold: str, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setenv("SDLC_LENS_NEAR_DUPLICATE_THRESHOLD", threshold)
+
+        with pytest.raises(ValidationError, match="near_duplicate_threshold"):
+            Settings()
@@ -419,3 +419,37 @@ class TestDocumentListEpicStoryFields:
         # All stories in hierarchy have epic=EP0007
         for item in data["items"]:
             assert item["epic"] == "EP0007"
+
+
+class TestMentionedBy:
+    """Documents whose body mentions this one, beyond the Epic/Story/Depends on fields."""
+
+    async def test_body_mentions_are_backlinks(
+        self, client: AsyncClient, session: AsyncSession, project: Project, hierarchy: dict
+    ) -> None:
+        session.add(
+            Document(
+                project_id=project.id,
+                doc_type="bug",
+                doc_id="BG0001",
+                title="Schema migration fails",
+                content="# BG0001\n\nFound while testing US0028 - see also [[EP0007]].",
+                file_path="bugs/BG0001.md",
+                file_hash="b" * 64,
+            )
+        )
+        await session.commit()
+
+        resp = await client.get(
+            f"/api/v1/projects/{project.slug}/documents/story/US0028-database-schema/related"
+        )
+        data = resp.json()
+        assert [d["doc_id"] for d in data["mentioned_by"]] == ["BG0001"]
+        # A mention is not a hierarchy link.
+        assert "BG0001" not in [d["doc_id"] for d in data["children"]]
+
+    async def test_empty_when_nothing_mentions_it(
+        self, client: AsyncClient, project: Project, hierarchy: dict
+    ) -> None:
+        resp = await client.get(f"/api/v1/projects/{project.slug}/documents/prd/prd/related")
+        assert resp.json()["mentioned_by"] == []
@@ -7,12 +7,12 @@ import datetime
 
 import pytest
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy import text
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sdlc_lens.db.models.document import Document
 from sdlc_lens.db.models.project import Project
-from sdlc_lens.services.fts import FTS5_CREATE_SQL, fts_insert
+from sdlc_lens.services.fts import FTS5_CREATE_SQL, fts_insert, trigram_create
 
 
 @pytest.fixture
@@ -24,8 +24,9 @@ async def client(app):
 
 @pytest.fixture
 async def fts_table(session: AsyncSession) -> None:
-    """Create FTS5 virtual table for search tests."""
+    """Create the FTS5 word and trigram indexes for search tests."""
     await session.execute(text(FTS5_CREATE_SQL))
+    await trigram_create(session)
     await session.commit()
 
 
@@ -343,3 +344,70 @@ class TestResponseIncludesQueryEcho:
         assert resp.status_code == 200
         data = resp.json()
         assert data["query"] == "authentication"
+
+
+class TestFacets:
+    async def test_facets_count_every_match(self, client: AsyncClient, seed_search_data) -> None:
+        resp = await client.get("/api/v1/search", params={"q": "authentication", "per_page": 1})
+        data = resp.json()
+
+        assert len(data["items"]) == 1
+        assert data["total"] == 4
+        assert data["facets"] == {
+            "by_project": {"project-a": 3, "project-b": 1},
+            "by_type": {"story": 2, "epic": 1, "plan": 1},
+            "by_status": {"Done": 1, "In Progress": 1, "Draft": 1, "null": 1},
+        }
+
+    async def test_facets_follow_the_scope(self, client: AsyncClient, seed_search_data) -> None:
+        resp = await client.get(
+            "/api/v1/search", params={"q": "authentication", "project": "project-a"}
+        )
+
+        assert resp.json()["facets"]["by_type"] == {"story": 2, "epic": 1}
+
+    async def test_include_facets_false(self, client: AsyncClient, seed_search_data) -> None:
+        resp = await client.get(
+            "/api/v1/search", params={"q": "authentication", "include_facets": "false"}
+        )
+        data = resp.json()
+
+        assert data["facets"] is None
+        assert data["total"] == 4
+
+    async def test_no_matches_have_empty_facets(
+        self, client: AsyncClient, seed_search_data
+    ) -> None:
+        data = (await client.get("/api/v1/search", params={"q": "nonexistentterm"})).json()
+
+        assert data["facets"] == {"by_project": {}, "by_type": {}, "by_status": {}}
+
+    async def test_a_page_past_the_end_keeps_the_counts(
+        self, client: AsyncClient, seed_search_data
+    ) -> None:
+        data = (
+            await client.get("/api/v1/search", params={"q": "authentication", "page": 9})
+        ).json()
+
+        assert data["items"] == []
+        assert data["total"] == 4
+        assert data["facets"]["by_project"] == {"project-a": 3, "project-b": 1}
+
+    async def test_facets_replace_the_count(
+        self, client: AsyncClient, seed_search_data, engine
+    ) -> None:
+        statements: list[str] = []
+
+        def _capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+        try:
+            await client.get("/api/v1/search", params={"q": "authentication"})
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+
+        searches = [s for s in statements if "MATCH" in s]
+        # Facets and total in one pass, then the ranked page: no separate COUNT.
+        assert len(searches) == 2
+        assert not [s for s in searches if "GROUP BY" not in s and "COUNT(*)" in s]
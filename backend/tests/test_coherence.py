@@ -0,0 +1,111 @@
+"""The cross-worker cache invalidation channel.
+
+A worker's in-memory cache must not outlive the corpus it was built from, even when the
+corpus was changed by a sync in ANOTHER worker. The generation counters are the channel.
+"""
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services import coherence
+from sdlc_lens.services.coherence import (
+    CORPUS_SCOPE,
+    bump_generation,
+    check_generations,
+    on_invalidate,
+    read_generation,
+)
+from sdlc_lens.services.sync_engine import sync_project
+
+
+@pytest.fixture(autouse=True)
+def _fresh_process_state(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Each test is a freshly started worker."""
+    monkeypatch.setattr(coherence, "_listeners", {})
+    monkeypatch.setattr(coherence, "_seen", {})
+    monkeypatch.setattr(coherence, "_baselined", False)
+
+
+@pytest.fixture
+def factory(engine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+class TestGenerations:
+    async def test_a_scope_that_never_moved_is_generation_zero(self, session) -> None:
+        assert await read_generation(session) == 0
+
+    async def test_a_bump_lands_with_its_transaction(self, session) -> None:
+        await bump_generation(session)
+        await session.commit()
+        await bump_generation(session)
+        await session.commit()
+
+        assert await read_generation(session) == 2
+
+    async def test_a_rolled_back_write_does_not_move_the_generation(self, session) -> None:
+        await bump_generation(session)
+        await session.rollback()
+
+        assert await read_generation(session) == 0
+
+
+class TestWatcher:
+    async def test_a_change_made_elsewhere_clears_local_caches(self, factory) -> None:
+        cleared: list[str] = []
+        on_invalidate(CORPUS_SCOPE, lambda: cleared.append("corpus"))
+
+        assert await check_generations(factory) == []  # the baseline
+        # Another worker syncs.
+        async with factory() as other:
+            await bump_generation(other)
+            await other.commit()
+
+        assert await check_generations(factory) == [CORPUS_SCOPE]
+        assert cleared == ["corpus"]
+        # Nothing moved since: nothing is cleared again.
+        assert await check_generations(factory) == []
+        assert cleared == ["corpus"]
+
+    async def test_a_failing_callback_does_not_stop_the_others(self, factory) -> None:
+        cleared: list[str] = []
+
+        def _broken() -> None:
+            raise RuntimeError("boom")
+
+        on_invalidate(CORPUS_SCOPE, _broken)
+        on_invalidate(CORPUS_SCOPE, lambda: cleared.append("ok"))
+        await check_generations(factory)
+        async with factory() as other:
+            await bump_generation(other)
+            await other.commit()
+
+        await check_generations(factory)
+
+        assert cleared == ["ok"]
+
+
+class TestSyncPublishes:
+    async def test_a_sync_that_changes_documents_moves_the_corpus_generation(
+        self, session: AsyncSession, tmp_path: Path
+    ) -> None:
+        (tmp_path / "epics").mkdir()
+        (tmp_path / "epics" / "EP0001-one.md").write_text("# EP0001\n\n> **Status:** Draft\n")
+        project = Project(slug="local", name="Local", sdlc_path=str(tmp_path))
+        session.add(project)
+        await session.commit()
+        cleared: list[str] = []
+        on_invalidate(CORPUS_SCOPE, lambda: cleared.append("corpus"))
+
+        await sync_project(project, session)
+        first = await read_generation(session)
+        # A no-op re-sync changes nothing, so it invalidates nothing.
+        await sync_project(project, session)
+
+        assert first == 1
+        assert await read_generation(session) == 1
+        # The syncing worker clears its own caches without waiting for its watcher.
+        assert cleared == ["corpus"]
@@ -0,0 +1,158 @@
+"""ETag / If-None-Match on the read endpoints, keyed on the corpus generations."""
+
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sdlc_lens.api.conditional import CACHE_POLICIES, _matches, weak_etag
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services.coherence import CORPUS_SCOPE, read_generation
+from sdlc_lens.services.fts import FTS5_CREATE_SQL
+from sdlc_lens.services.sync_engine import sync_project
+
+
+@pytest.fixture
+async def client(app):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture
+async def project(session: AsyncSession, tmp_path: Path) -> Project:
+    """A synced local project with two documents."""
+    sdlc = tmp_path / "sdlc-studio"
+    for name, body in [
+        ("epics/EP0001-auth.md", "# EP0001: Auth\n\n> **Status:** Draft\n\nLogin epic."),
+        ("stories/US0001-login.md", "# US0001: Login\n\n> **Epic:** EP0001\n\nA story."),
+    ]:
+        (sdlc / name).parent.mkdir(parents=True, exist_ok=True)
+        (sdlc / name).write_text(body)
+    await session.execute(text(FTS5_CREATE_SQL))
+    p = Project(slug="etags", name="ETags", sdlc_path=str(sdlc))
+    session.add(p)
+    await session.commit()
+    await sync_project(p, session)
+    return p
+
+
+_ENDPOINTS = [
+    ("/api/v1/projects", "projects"),
+    ("/api/v1/projects/etags", "project"),
+    ("/api/v1/projects/etags/stats", "stats"),
+    ("/api/v1/projects/etags/documents", "documents"),
+    ("/api/v1/projects/etags/documents/story/US0001-login", "document"),
+    ("/api/v1/projects/etags/documents/story/US0001-login/related", "related"),
+    ("/api/v1/projects/etags/health-check", "health-check"),
+    ("/api/v1/search?q=login", "search"),
+    ("/api/v1/stats", "aggregate-stats"),
+]
+
+
+class TestConditionalGets:
+    @pytest.mark.parametrize(("url", "endpoint"), _ENDPOINTS)
+    async def test_a_matching_tag_is_a_304(
+        self, client: AsyncClient, project: Project, url: str, endpoint: str
+    ) -> None:
+        first = await client.get(url)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert etag.startswith('W/"')
+        assert first.headers["cache-control"] == CACHE_POLICIES[endpoint]
+
+        second = await client.get(url, headers={"If-None-Match": etag})
+
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+
+    async def test_a_304_runs_none_of_the_listing_queries(
+        self, client: AsyncClient, project: Project, engine
+    ) -> None:
+        url = "/api/v1/projects/etags/documents"
+        etag = (await client.get(url)).headers["etag"]
+        statements: list[str] = []
+
+        def _capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+        try:
+            resp = await client.get(url, headers={"If-None-Match": etag})
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+
+        assert resp.status_code == 304
+        # Only the project lookup that the tag is read from.
+        assert len(statements) == 1
+        assert "FROM projects" in statements[0]
+
+    async def test_errors_carry_no_validators(self, client: AsyncClient) -> None:
+        resp = await client.get("/api/v1/projects/missing/documents")
+
+        assert resp.status_code == 404
+        assert "etag" not in resp.headers
+
+
+class TestGenerations:
+    async def test_a_sync_that_changes_nothing_keeps_the_tags(
+        self, client: AsyncClient, session: AsyncSession, project: Project
+    ) -> None:
+        url = "/api/v1/projects/etags/documents"
+        before = (await client.get(url)).headers["etag"]
+        generation = project.corpus_generation
+        global_generation = await read_generation(session, CORPUS_SCOPE)
+
+        await sync_project(project, session)
+
+        assert project.corpus_generation == generation
+        assert await read_generation(session, CORPUS_SCOPE) == global_generation
+        assert (await client.get(url, headers={"If-None-Match": before})).status_code == 304
+
+    async def test_a_sync_that_changes_rows_moves_the_tags(
+        self, client: AsyncClient, session: AsyncSession, project: Project
+    ) -> None:
+        url = "/api/v1/projects/etags/documents"
+        search = "/api/v1/search?q=login"
+        before = (await client.get(url)).headers["etag"]
+        search_before = (await client.get(search)).headers["etag"]
+        generation = project.corpus_generation
+
+        story = Path(project.sdlc_path) / "stories/US0001-login.md"
+        story.write_text("# US0001: Login\n\n> **Status:** Done\n\nRewritten.")
+        await sync_project(project, session)
+
+        assert project.corpus_generation > generation
+        resp = await client.get(url, headers={"If-None-Match": before})
+        assert resp.status_code == 200
+        assert resp.headers["etag"] != before
+        assert (
+            await client.get(search, headers={"If-None-Match": search_before})
+        ).status_code == 200
+
+    async def test_project_fields_move_the_project_tag(
+        self, client: AsyncClient, project: Project
+    ) -> None:
+        before = (await client.get("/api/v1/projects")).headers["etag"]
+
+        await client.put("/api/v1/projects/etags", json={"name": "Renamed"})
+
+        resp = await client.get("/api/v1/projects", headers={"If-None-Match": before})
+        assert resp.status_code == 200
+        assert resp.json()[0]["name"] == "Renamed"
+
+
+class TestIfNoneMatch:
+    def test_weak_comparison_and_lists(self) -> None:
+        etag = weak_etag("documents", 1, 7)
+        opaque = etag[2:]
+
+        assert _matches(etag, etag)
+        assert _matches(opaque, etag)
+        assert _matches(f'W/"other", {etag}', etag)
+        assert _matches("*", etag)
+        assert not _matches('W/"other"', etag)
+        assert not _matches(None, etag)
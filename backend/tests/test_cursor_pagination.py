@@ -0,0 +1,296 @@
+"""Keyset (cursor) pagination of the document list and of search."""
+
+import datetime
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sdlc_lens.db.models.document import Document
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services.documents import list_documents_page
+from sdlc_lens.services.fts import FTS5_CREATE_SQL, fts_insert
+from sdlc_lens.services.search import search_documents
+from sdlc_lens.utils.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    query_fingerprint,
+)
+
+_BASE = datetime.datetime(2026, 1, 1)
+
+
+@pytest.fixture
+async def client(app):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture
+async def project(session: AsyncSession) -> Project:
+    """A project whose documents tie on every sort column, with some NULL statuses."""
+    p = Project(slug="pages", name="Pages", sdlc_path="/pages")
+    session.add(p)
+    await session.flush()
+    for n in range(23):
+        doc_type = ["epic", "story", "bug"][n % 3]
+        session.add(
+            Document(
+                project_id=p.id,
+                doc_type=doc_type,
+                doc_id=f"{doc_type}-{n}",
+                title=f"Title {n % 4}",
+                status=["Done", None, "Draft"][n % 3 if n % 2 else 1],
+                content=f"widget number {n} " + "widget " * (n % 5),
+                file_path=f"{n}.md",
+                file_hash="0" * 64,
+                synced_at=_BASE + datetime.timedelta(minutes=n % 6),
+            )
+        )
+    await session.commit()
+    return p
+
+
+async def _walk(session: AsyncSession, project_id: int, **kwargs) -> list[int]:
+    """Every id, page by page through the cursors."""
+    seen: list[int] = []
+    cursor = None
+    while True:
+        page = await list_documents_page(
+            session, project_id, per_page=5, cursor=cursor, with_total=False, **kwargs
+        )
+        seen += [doc.id for doc in page.items]
+        if page.next_cursor is None:
+            return seen
+        cursor = page.next_cursor
+
+
+class TestDocumentCursors:
+    @pytest.mark.parametrize("sort", ["updated_at", "title", "status", "type"])
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    async def test_cursor_walk_matches_the_offset_order(
+        self, session: AsyncSession, project: Project, sort: str, order: str
+    ) -> None:
+        everything = await list_documents_page(
+            session, project.id, sort=sort, order=order, per_page=100
+        )
+
+        walked = await _walk(session, project.id, sort=sort, order=order)
+
+        # Every document exactly once, in the same order, across ties and NULLs.
+        assert walked == [doc.id for doc in everything.items]
+        assert len(walked) == 23
+
+    async def test_cursor_walk_respects_filters(
+        self, session: AsyncSession, project: Project
+    ) -> None:
+        walked = await _walk(session, project.id, status="none", sort="title")
+
+        everything = await list_documents_page(
+            session, project.id, status="none", sort="title", per_page=100
+        )
+        assert walked == [doc.id for doc in everything.items]
+
+    async def test_the_last_page_has_no_cursor(
+        self, session: AsyncSession, project: Project
+    ) -> None:
+        page = await list_documents_page(session, project.id, per_page=23)
+
+        assert len(page.items) == 23
+        assert page.next_cursor is None
+
+    async def test_total_is_skipped_on_request(
+        self, session: AsyncSession, project: Project
+    ) -> None:
+        page = await list_documents_page(session, project.id, with_total=False)
+
+        assert page.total is None
+
+    async def test_a_cursor_is_bound_to_its_query(
+        self, session: AsyncSession, project: Project
+    ) -> None:
+        page = await list_documents_page(session, project.id, sort="title", per_page=5)
+
+        with pytest.raises(InvalidCursorError):
+            await list_documents_page(
+                session, project.id, sort="status", per_page=5, cursor=page.next_cursor
+            )
+
+
+class TestCursorEncoding:
+    def test_round_trip(self) -> None:
+        cursor = encode_cursor("abc", ["Title 1", 42])
+
+        assert decode_cursor(cursor, "abc", (str, int)) == ["Title 1", 42]
+
+    def test_dates_are_parsed(self) -> None:
+        cursor = encode_cursor("abc", [_BASE.isoformat(), 1])
+
+        assert decode_cursor(cursor, "abc", ((datetime.datetime, type(None)), int)) == [_BASE, 1]
+
+    @pytest.mark.parametrize("cursor", ["", "not base64!", "bm90IGpzb24"])
+    def test_garbage_is_rejected(self, cursor: str) -> None:
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, "abc", (str, int))
+
+    @pytest.mark.parametrize(
+        ("key", "types"),
+        [
+            ([1], (str, int)),
+            (["x", 1, 2], (str, int)),
+            (["x", "5"], (str, int)),
+            ([5, 5], (str, int)),
+            (["x", True], (str, int)),
+            (["x", 2**63], (str, int)),
+            ([None, 5], (str, int)),
+            (["yesterday", 5], (datetime.datetime, int)),
+            ([float("inf"), 5], (float, int)),
+        ],
+    )
+    def test_a_key_of_the_wrong_shape_is_rejected(self, key: list, types: tuple) -> None:
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(encode_cursor("abc", key), "abc", types)
+
+
+class TestDocumentListApi:
+    async def test_next_cursor_pages_the_list(self, client: AsyncClient, project: Project) -> None:
+        first = (
+            await client.get("/api/v1/projects/pages/documents", params={"per_page": 10})
+        ).json()
+        second = (
+            await client.get(
+                "/api/v1/projects/pages/documents",
+                params={"per_page": 10, "cursor": first["next_cursor"]},
+            )
+        ).json()
+        by_offset = (
+            await client.get(
+                "/api/v1/projects/pages/documents", params={"per_page": 10, "page": 2}
+            )
+        ).json()
+
+        assert second["items"] == by_offset["items"]
+        assert first["total"] == 23
+
+    async def test_include_total_false(self, client: AsyncClient, project: Project) -> None:
+        body = (
+            await client.get("/api/v1/projects/pages/documents", params={"include_total": "false"})
+        ).json()
+
+        assert body["total"] is None
+        assert body["pages"] is None
+        assert len(body["items"]) == 23
+
+    async def test_bad_cursor_is_a_400(self, client: AsyncClient, project: Project) -> None:
+        resp = await client.get("/api/v1/projects/pages/documents", params={"cursor": "garbage"})
+
+        assert resp.status_code == 400
+        assert resp.json()["error"]["code"] == "INVALID_CURSOR"
+
+    @pytest.mark.parametrize(
+        ("sort", "key"),
+        [
+            ("updated_at", [1]),
+            ("updated_at", ["x", 5]),
+            ("updated_at", [5, 5]),
+            ("updated_at", []),
+            ("title", [5, 5]),
+            ("title", ["x", "y"]),
+            ("title", [[], 5]),
+            ("title", ["x", 5, 6]),
+        ],
+    )
+    async def test_a_tampered_cursor_is_a_400(
+        self, client: AsyncClient, project: Project, sort: str, key: list
+    ) -> None:
+        # Re-encoded with the right fingerprint: only the key is wrong.
+        fingerprint = query_fingerprint("documents", project.id, None, None, sort, True)
+
+        resp = await client.get(
+            "/api/v1/projects/pages/documents",
+            params={"sort": sort, "cursor": encode_cursor(fingerprint, key)},
+        )
+
+        assert resp.status_code == 400
+        assert resp.json()["error"]["code"] == "INVALID_CURSOR"
+
+    async def test_an_empty_cursor_is_the_first_page(
+        self, client: AsyncClient, project: Project
+    ) -> None:
+        resp = await client.get(
+            "/api/v1/projects/pages/documents", params={"per_page": 5, "cursor": ""}
+        )
+
+        assert resp.status_code == 200
+        first = await client.get("/api/v1/projects/pages/documents", params={"per_page": 5})
+        assert resp.json()["items"] == first.json()["items"]
+
+
+class TestSearchCursors:
+    @pytest.fixture
+    async def indexed(self, session: AsyncSession, project: Project) -> None:
+        await session.execute(text(FTS5_CREATE_SQL))
+        docs = (
+            await session.execute(text("SELECT id, title, content FROM documents_fts_source"))
+        ).all()
+        for doc_id, title, content in docs:
+            await fts_insert(session, doc_id, title, content)
+        await session.commit()
+
+    async def test_cursor_walk_matches_the_ranked_order(
+        self, session: AsyncSession, indexed: None
+    ) -> None:
+        everything = await search_documents(session, query="widget", per_page=100)
+
+        walked: list[tuple[str, float]] = []
+        cursor = None
+        while True:
+            page = await search_documents(
+                session, query="widget", per_page=4, cursor=cursor, with_total=False
+            )
+            assert page["total"] is None
+            walked += [(item["doc_id"], item["score"]) for item in page["items"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert walked == [(item["doc_id"], item["score"]) for item in everything["items"]]
+        assert len(walked) == 23
+
+    async def test_a_cursor_is_bound_to_its_search(
+        self, session: AsyncSession, indexed: None
+    ) -> None:
+        page = await search_documents(session, query="widget", per_page=4)
+
+        with pytest.raises(InvalidCursorError):
+            await search_documents(session, query="number", cursor=page["next_cursor"])
+
+    async def test_bad_cursor_is_a_400(self, client: AsyncClient, indexed: None) -> None:
+        resp = await client.get("/api/v1/search", params={"q": "widget", "cursor": "xx"})
+
+        assert resp.status_code == 400
+        assert resp.json()["error"]["code"] == "INVALID_CURSOR"
+
+    @pytest.mark.parametrize("key", [[1], ["x", 5], [-1.5, "y"], [-1.5, 5, 6], [True, 5]])
+    async def test_a_tampered_cursor_is_a_400(
+        self, client: AsyncClient, indexed: None, key: list
+    ) -> None:
+        fingerprint = query_fingerprint("search", "widget", None, None)
+
+        resp = await client.get(
+            "/api/v1/search", params={"q": "widget", "cursor": encode_cursor(fingerprint, key)}
+        )
+
+        assert resp.status_code == 400
+        assert resp.json()["error"]["code"] == "INVALID_CURSOR"
+
+    async def test_an_empty_cursor_is_the_first_page(
+        self, client: AsyncClient, indexed: None
+    ) -> None:
+        resp = await client.get("/api/v1/search", params={"q": "widget", "cursor": ""})
+
+        assert resp.status_code == 200
+        assert resp.json()["total"] == 23
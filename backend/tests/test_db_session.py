@@ -0,0 +1,206 @@
+"""The SQLite performance profile and the reader/writer engine split (db/session.py)."""
+
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from sdlc_lens.config import settings
+from sdlc_lens.db.models import Base
+from sdlc_lens.db.session import connection_pragmas, create_engines
+
+
+@pytest.fixture
+async def engines(tmp_path: Path):
+    writer, reader = create_engines(f"sqlite+aiosqlite:///{tmp_path / 'lens.db'}")
+    async with writer.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield writer, reader
+    await writer.dispose()
+    await reader.dispose()
+
+
+class TestPragmas:
+    def test_the_profile_is_driven_by_settings(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings, "sqlite_busy_timeout_ms", 1234)
+        monkeypatch.setattr(settings, "sqlite_journal_mode", "delete")
+
+        pragmas = connection_pragmas(reader=False)
+
+        assert "PRAGMA busy_timeout=1234" in pragmas
+        assert "PRAGMA journal_mode=DELETE" in pragmas
+        assert "PRAGMA foreign_keys=ON" in pragmas
+
+    def test_only_readers_are_query_only_and_only_writers_set_the_journal(self) -> None:
+        reader = connection_pragmas(reader=True)
+        writer = connection_pragmas(reader=False)
+
+        assert "PRAGMA query_only=ON" in reader
+        assert not any(p.startswith("PRAGMA journal_mode") for p in reader)
+        assert "PRAGMA query_only=ON" not in writer
+
+
+class TestEngines:
+    async def test_a_file_database_runs_in_wal(self, engines) -> None:
+        writer, _ = engines
+        async with writer.connect() as conn:
+            mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+            synchronous = (await conn.execute(text("PRAGMA synchronous"))).scalar()
+
+        assert mode == "wal"
+        assert synchronous == 1  # NORMAL
+
+    async def test_the_writer_is_a_single_connection(self, engines) -> None:
+        writer, reader = engines
+
+        assert writer.pool.size() == 1
+        assert reader is not writer
+
+    async def test_the_reader_cannot_write(self, engines) -> None:
+        _, reader = engines
+
+        async with reader.connect() as conn:
+            with pytest.raises(OperationalError, match="readonly"):
+                await conn.execute(text("DELETE FROM projects"))
+
+    async def test_reads_proceed_while_a_write_transaction_is_open(self, engines) -> None:
+        """The point of WAL: a sync mid-batch does not lock the dashboard out."""
+        writer, reader = engines
+        async with writer.connect() as wconn:
+            await wconn.execute(
+                text("INSERT INTO projects (slug, name, sdlc_path) VALUES ('a', 'A', '/tmp')")
+            )
+            # Uncommitted, and holding the write lock.
+            async with reader.connect() as rconn:
+                count = (await rconn.execute(text("SELECT count(*) FROM projects"))).scalar()
+            await wconn.commit()
+
+        assert count == 0  # the last committed snapshot, without waiting
+
+    def test_an_in_memory_database_shares_one_engine(self) -> None:
+        writer, reader = create_engines("sqlite+aiosqlite:///:memory:")
+
+        assert reader is writer
+
+
+class TestNoSelfDeadlock:
+    async def test_a_triggered_sync_gets_the_writer_the_request_held(
+        self, engines, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """The request session must let go of the single writer before its sync runs."""
+        from sdlc_lens.api.deps import get_db, get_read_db
+        from sdlc_lens.main import create_app
+
+        writer, reader = engines
+        writer.pool._timeout = 2  # fail fast rather than hang if the writer is held
+        write_factory = async_sessionmaker(writer, expire_on_commit=False)
+        read_factory = async_sessionmaker(reader, expire_on_commit=False)
+        app = create_app()
+
+        async def _write():
+            async with write_factory() as session:
+                yield session
+
+        async def _read():
+            async with read_factory() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = _write
+        app.dependency_overrides[get_read_db] = _read
+        app.state.session_factory = write_factory
+        docs = tmp_path / "sdlc-studio" / "epics"
+        docs.mkdir(parents=True)
+        (docs / "EP0001-a.md").write_text("# EP0001\n\n> **Status:** Draft\n")
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://t") as client:
+            await client.post(
+                "/api/v1/projects", json={"name": "p", "sdlc_path": str(docs.parent)}
+            )
+            resp = await client.post("/api/v1/projects/p/sync")
+            project = (await client.get("/api/v1/projects/p")).json()
+
+        assert resp.status_code == 202
+        assert project["sync_status"] == "synced"
+        assert project["document_count"] == 1
+
+
+class TestReadRoutesOnTheReader:
+    """The GET endpoints on the real query_only reader pool, as in production.
+
+    Elsewhere the suite runs against one in-memory database, where the reader is the
+    writer (tests/conftest.py): a read route that wrote would pass there and fail here.
+    """
+
+    async def test_read_routes_never_write(self, engines, tmp_path: Path) -> None:
+        from sdlc_lens.api.deps import get_db, get_read_db
+        from sdlc_lens.main import create_app
+        from sdlc_lens.services.coherence import check_generations
+        from sdlc_lens.services.fts import (
+            FTS5_CREATE_SQL,
+            FTS5_VOCAB_CREATE_SQL,
+            trigram_create,
+        )
+
+        writer, reader = engines
+        write_factory = async_sessionmaker(writer, expire_on_commit=False)
+        read_factory = async_sessionmaker(reader, expire_on_commit=False)
+        async with write_factory() as session:
+            await session.execute(text(FTS5_CREATE_SQL))
+            await session.execute(text(FTS5_VOCAB_CREATE_SQL))
+            await trigram_create(session)
+            await session.commit()
+        app = create_app()
+
+        async def _write():
+            async with write_factory() as session:
+                yield session
+
+        async def _read():
+            async with read_factory() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = _write
+        app.dependency_overrides[get_read_db] = _read
+        app.state.session_factory = write_factory
+        app.state.read_session_factory = read_factory
+        sdlc = tmp_path / "sdlc-studio"
+        (sdlc / "epics").mkdir(parents=True)
+        (sdlc / "stories").mkdir()
+        (sdlc / "epics" / "EP0001-login.md").write_text(
+            "# EP0001: Login\n\n> **Status:** Draft\n\nSign-in for every user.\n"
+        )
+        (sdlc / "stories" / "US0001-password.md").write_text(
+            "# US0001: Password\n\n> **Status:** Draft\n> **Epic:** EP0001\n\n"
+            "Users sign in with a password (see EP0001).\n"
+        )
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://t") as client:
+            await client.post("/api/v1/projects", json={"name": "p", "sdlc_path": str(sdlc)})
+            await client.post("/api/v1/projects/p/sync")
+            responses = {
+                path: await client.get(path)
+                for path in (
+                    "/api/v1/projects",
+                    "/api/v1/projects/p",
+                    "/api/v1/projects/p/stats",
+                    "/api/v1/projects/p/documents",
+                    "/api/v1/projects/p/documents/story/US0001-password",
+                    "/api/v1/projects/p/documents/story/US0001-password/related",
+                    "/api/v1/projects/p/health-check",
+                    "/api/v1/stats",
+                    "/api/v1/search?q=password",
+                    "/api/v1/search?q=sswor",
+                    "/api/v1/search/suggest?q=pass",
+                    "/api/v1/system/health",
+                )
+            }
+
+        assert {path: r.status_code for path, r in responses.items()} == dict.fromkeys(
+            responses, 200
+        )
+        assert responses["/api/v1/projects/p"].json()["document_count"] == 2
+        # The coherence watcher's check runs on the reader in every worker.
+        assert await check_generations(read_factory) is not None
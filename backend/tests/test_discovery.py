@@ -0,0 +1,173 @@
+"""Discovery and bulk registration of local projects under allowed_project_base."""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from sdlc_lens.config import settings
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services.discovery import (
+    DiscoveryNotConfiguredError,
+    discover_projects,
+    find_sdlc_dirs,
+    sync_discovered,
+)
+
+
+@pytest.fixture
+def factory(engine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+@pytest.fixture
+def base(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(settings, "allowed_project_base", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+async def client(app):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+def _repo(base: Path, rel: str) -> Path:
+    sdlc = base / rel / "sdlc-studio"
+    (sdlc / "epics").mkdir(parents=True)
+    (sdlc / "epics" / "EP0001-one.md").write_text("# EP0001\n\n> **Status:** Draft\n")
+    return sdlc
+
+
+async def _slugs(session: AsyncSession) -> set[str]:
+    return set((await session.execute(select(Project.slug))).scalars().all())
+
+
+class TestFindSdlcDirs:
+    def test_finds_nested_projects(self, tmp_path: Path) -> None:
+        a = _repo(tmp_path, "alpha")
+        b = _repo(tmp_path, "team/beta")
+
+        assert find_sdlc_dirs(tmp_path) == sorted([a.resolve(), b.resolve()])
+
+    def test_prunes_excluded_and_hidden_directories(self, tmp_path: Path) -> None:
+        _repo(tmp_path, "node_modules/pkg")
+        _repo(tmp_path, ".cache/thing")
+
+        assert find_sdlc_dirs(tmp_path) == []
+
+    def test_does_not_descend_into_a_found_workspace(self, tmp_path: Path) -> None:
+        outer = _repo(tmp_path, "alpha")
+        (outer / "nested" / "sdlc-studio").mkdir(parents=True)
+
+        assert find_sdlc_dirs(tmp_path) == [outer.resolve()]
+
+    def test_does_not_follow_symlinks(self, tmp_path: Path) -> None:
+        _repo(tmp_path / "elsewhere", "gamma")
+        (tmp_path / "base").mkdir()
+        (tmp_path / "base" / "link").symlink_to(tmp_path / "elsewhere")
+
+        assert find_sdlc_dirs(tmp_path / "base") == []
+
+
+class TestDiscoverProjects:
+    async def test_registers_new_projects_and_skips_known_ones(
+        self, session: AsyncSession, base: Path
+    ) -> None:
+        _repo(base, "alpha")
+        _repo(base, "beta")
+        first = await discover_projects(session)
+
+        _repo(base, "gamma")
+        second = await discover_projects(session)
+
+        assert sorted(first.registered) == ["alpha", "beta"]
+        assert second.found == 3
+        assert second.already_registered == 2
+        assert second.registered == ["gamma"]
+        assert await _slugs(session) == {"alpha", "beta", "gamma"}
+
+    async def test_a_repeated_repo_name_falls_back_to_its_relative_path(
+        self, session: AsyncSession, base: Path
+    ) -> None:
+        _repo(base, "team-a/api")
+        _repo(base, "team-b/api")
+
+        result = await discover_projects(session)
+
+        assert sorted(result.registered) == ["api", "team-b-api"]
+        assert result.skipped == []
+
+    async def test_refuses_without_a_base(
+        self, session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, "allowed_project_base", None)
+
+        with pytest.raises(DiscoveryNotConfiguredError):
+            await discover_projects(session)
+
+
+class TestSyncDiscovered:
+    async def test_syncs_through_the_scheduler_with_bounded_parallelism(
+        self, session: AsyncSession, factory, base: Path
+    ) -> None:
+        for name in ("a", "b", "c", "d", "e"):
+            _repo(base, name)
+        slugs = (await discover_projects(session)).registered
+        running = 0
+        peak = 0
+
+        async def _run(slug: str, _factory) -> None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        with patch("sdlc_lens.services.discovery.run_sync_task", _run):
+            await sync_discovered(slugs, factory, concurrency=2)
+
+        assert peak == 2
+        statuses = (await session.execute(select(Project.sync_status))).scalars().all()
+        assert set(statuses) == {"syncing"}  # trigger_sync ran for every one
+
+    async def test_the_real_sync_populates_documents(
+        self, session: AsyncSession, factory, base: Path
+    ) -> None:
+        _repo(base, "alpha")
+        slugs = (await discover_projects(session)).registered
+
+        await sync_discovered(slugs, factory)
+
+        project = (await session.execute(select(Project))).scalar_one()
+        await session.refresh(project)
+        assert project.sync_status == "synced"
+
+
+class TestDiscoverEndpoint:
+    async def test_registers_and_returns_202(self, client: AsyncClient, base: Path) -> None:
+        _repo(base, "alpha")
+
+        with patch("sdlc_lens.api.routes.projects.sync_discovered") as syncs:
+            resp = await client.post("/api/v1/projects/discover")
+
+        assert resp.status_code == 202
+        body = resp.json()
+        assert body["registered"] == ["alpha"]
+        assert body["found"] == 1
+        syncs.assert_called_once()
+
+    async def test_is_a_conflict_without_a_base(
+        self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, "allowed_project_base", None)
+
+        resp = await client.post("/api/v1/projects/discover")
+
+        assert resp.status_code == 409
+        assert resp.json()["error"]["code"] == "DISCOVERY_NOT_CONFIGURED"
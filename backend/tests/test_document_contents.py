@@ -0,0 +1,224 @@
+"""Off-row, compressed, deduplicated document bodies (document_contents, migration 020)."""
+
+import datetime
+import sqlite3
+import zlib
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, select, text
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from sdlc_lens.db.models.document import Document
+from sdlc_lens.db.models.document_content import DocumentContent, content_digest
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services.documents import get_document
+from sdlc_lens.services.fts import FTS5_CREATE_SQL, fts_rebuild
+from sdlc_lens.services.search import search_documents
+
+_BODY = "# US0001: Login\n\nAs a user I want to log in with a passkey.\n" * 20
+
+
+async def _project(session: AsyncSession, slug: str) -> Project:
+    p = Project(slug=slug, name=slug, sdlc_path=f"/{slug}")
+    session.add(p)
+    await session.flush()
+    return p
+
+
+def _doc(project_id: int, doc_id: str, content: str) -> Document:
+    return Document(
+        project_id=project_id,
+        doc_type="story",
+        doc_id=doc_id,
+        title=doc_id,
+        content=content,
+        file_path=f"stories/{doc_id}.md",
+        file_hash="0" * 64,
+        synced_at=datetime.datetime(2026, 1, 1),
+    )
+
+
+async def _stored(session: AsyncSession) -> list[str]:
+    rows = await session.execute(select(DocumentContent.hash).order_by(DocumentContent.hash))
+    return list(rows.scalars())
+
+
+class TestStorage:
+    async def test_the_body_is_stored_compressed_and_off_row(self, session: AsyncSession) -> None:
+        p = await _project(session, "a")
+        session.add(_doc(p.id, "US0001", _BODY))
+        await session.commit()
+
+        stored = (await session.execute(select(DocumentContent))).scalar_one()
+        assert stored.hash == content_digest(_BODY)
+        assert zlib.decompress(stored.body).decode() == _BODY
+        assert len(stored.body) < stored.size == len(_BODY.encode())
+        columns = await session.execute(text("SELECT name FROM pragma_table_info('documents')"))
+        assert "content" not in set(columns.scalars())
+
+    async def test_identical_bodies_share_one_row(self, session: AsyncSession) -> None:
+        main, branch = await _project(session, "main"), await _project(session, "branch")
+        session.add_all([_doc(main.id, "US0001", _BODY), _doc(branch.id, "US0001", _BODY)])
+        await session.commit()
+
+        assert await _stored(session) == [content_digest(_BODY)]
+
+    async def test_a_fresh_load_reads_the_body(self, session: AsyncSession, engine) -> None:
+        p = await _project(session, "a")
+        session.add(_doc(p.id, "US0001", _BODY))
+        await session.commit()
+
+        factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with factory() as other:
+            doc = await get_document(other, p.id, "story", "US0001", content=True)
+            assert doc.content == _BODY
+
+    async def test_a_load_that_did_not_ask_for_the_body_neither_reads_nor_fakes_it(
+        self, session: AsyncSession, engine
+    ) -> None:
+        p = await _project(session, "a")
+        session.add(_doc(p.id, "US0001", _BODY))
+        await session.commit()
+        statements: list[str] = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        factory = async_sessionmaker(engine, expire_on_commit=False)
+        event.listen(engine.sync_engine, "before_cursor_execute", _record)
+        try:
+            async with factory() as other:
+                doc = await get_document(other, p.id, "story", "US0001")
+                with pytest.raises(InvalidRequestError):
+                    _ = doc.content
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", _record)
+
+        assert not any("document_contents" in statement for statement in statements)
+
+
+class TestPruning:
+    async def test_a_replaced_body_is_deleted(self, session: AsyncSession) -> None:
+        p = await _project(session, "a")
+        doc = _doc(p.id, "US0001", _BODY)
+        session.add(doc)
+        await session.commit()
+
+        doc.content = "Rewritten."
+        await session.commit()
+
+        assert await _stored(session) == [content_digest("Rewritten.")]
+
+    async def test_a_shared_body_survives_until_its_last_document(
+        self, session: AsyncSession
+    ) -> None:
+        p = await _project(session, "a")
+        first, second = _doc(p.id, "US0001", _BODY), _doc(p.id, "US0002", _BODY)
+        session.add_all([first, second])
+        await session.commit()
+
+        await session.delete(first)
+        await session.commit()
+        assert await _stored(session) == [content_digest(_BODY)]
+
+        await session.delete(second)
+        await session.commit()
+        assert await _stored(session) == []
+
+    async def test_deleting_a_project_sweeps_its_bodies(self, session: AsyncSession) -> None:
+        kept, dropped = await _project(session, "kept"), await _project(session, "dropped")
+        session.add_all([_doc(kept.id, "US0001", _BODY), _doc(dropped.id, "US0002", "Gone.")])
+        await session.commit()
+
+        await session.delete(dropped)
+        await session.commit()
+
+        assert await _stored(session) == [content_digest(_BODY)]
+
+
+class TestFullTextSearch:
+    async def test_the_index_reads_bodies_through_the_view(self, session: AsyncSession) -> None:
+        await session.execute(text(FTS5_CREATE_SQL))
+        p = await _project(session, "a")
+        session.add(_doc(p.id, "US0001", _BODY))
+        await session.commit()
+
+        await fts_rebuild(session)
+        await session.commit()
+        result = await search_documents(session, query="passkey")
+
+        assert [item["doc_id"] for item in result["items"]] == ["US0001"]
+        assert "<mark>passkey</mark>" in result["items"][0]["snippet"]
+
+
+class TestMigration:
+    def _config(self, db_file: Path):
+        from alembic.config import Config
+
+        backend_root = Path(__file__).resolve().parents[1]
+        # In-memory config, not alembic.ini: fileConfig() would disable existing loggers.
+        cfg = Config()
+        cfg.set_main_option("script_location", str(backend_root / "alembic"))
+        cfg.set_main_option("sqlalchemy.url", f"sqlite+aiosqlite:///{db_file}")
+        return cfg
+
+    def test_bodies_move_and_come_back(self, tmp_path: Path) -> None:
+        from alembic import command
+
+        db_file = tmp_path / "migrate.db"
+        cfg = self._config(db_file)
+        command.upgrade(cfg, "019")
+        conn = sqlite3.connect(db_file)
+        try:
+            conn.execute("INSERT INTO projects (id, slug, name) VALUES (1, 'p', 'P')")
+            conn.executemany(
+                "INSERT INTO documents (id, project_id, doc_type, doc_id, title, content, "
+                "file_path, file_hash) VALUES (?, 1, 'story', ?, ?, ?, ?, 'h')",
+                [
+                    (1, "US0001", "A", "shared widget body", "a.md"),
+                    (2, "US0002", "B", "shared widget body", "b.md"),
+                    (3, "US0003", "C", "another body", "c.md"),
+                ],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        command.upgrade(cfg, "020")
+
+        conn = sqlite3.connect(db_file)
+        conn.create_function("sdlc_inflate", 1, lambda b: zlib.decompress(b).decode())
+        try:
+            assert conn.execute("SELECT count(*) FROM document_contents").fetchone() == (2,)
+            hashes = conn.execute("SELECT content_hash FROM documents ORDER BY id").fetchall()
+            assert hashes == [
+                (content_digest("shared widget body"),),
+                (content_digest("shared widget body"),),
+                (content_digest("another body"),),
+            ]
+            # The index was rebuilt over the view.
+            matches = conn.execute(
+                "SELECT rowid FROM documents_fts WHERE documents_fts MATCH 'widget' ORDER BY rowid"
+            ).fetchall()
+            assert matches == [(1,), (2,)]
+        finally:
+            conn.close()
+
+        command.downgrade(cfg, "019")
+
+        conn = sqlite3.connect(db_file)
+        try:
+            bodies = conn.execute("SELECT id, content FROM documents ORDER BY id").fetchall()
+            tables = conn.execute(
+                "SELECT count(*) FROM sqlite_master WHERE name = 'document_contents'"
+            ).fetchone()
+        finally:
+            conn.close()
+        assert bodies == [
+            (1, "shared widget body"),
+            (2, "shared widget body"),
+            (3, "another body"),
+        ]
+        assert tables == (0,)
@@ -0,0 +1,225 @@
+"""The document_refs edge table (migration 018) and the lookups built on it."""
+
+import datetime
+import sqlite3
+from pathlib import Path
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sdlc_lens.db.models.document import Document
+from sdlc_lens.db.models.document_ref import DocumentRef
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services.documents import get_related_documents, resolve_relationships
+from sdlc_lens.utils.sdlc_ids import extract_ref_ids, id_head, norm_id, reference_edges
+
+
+async def _project(session: AsyncSession) -> Project:
+    p = Project(slug="refs", name="Refs", sdlc_path="/refs")
+    session.add(p)
+    await session.commit()
+    return p
+
+
+def _doc(project_id, doc_type, doc_id, **fields) -> Document:
+    return Document(
+        project_id=project_id,
+        doc_type=doc_type,
+        doc_id=doc_id,
+        title=doc_id,
+        ref_id=norm_id(id_head(doc_id)),
+        content=fields.pop("content", f"# {doc_id}"),
+        file_path=f"{doc_type}/{doc_id}.md",
+        file_hash="0" * 64,
+        synced_at=datetime.datetime.now(datetime.UTC),
+        **fields,
+    )
+
+
+async def _edges(session: AsyncSession, doc: Document) -> list[tuple[str, str, int]]:
+    rows = await session.execute(
+        select(DocumentRef.kind, DocumentRef.target_norm_id, DocumentRef.position)
+        .where(DocumentRef.src_doc_id == doc.id)
+        .order_by(DocumentRef.kind, DocumentRef.position)
+    )
+    return [tuple(row) for row in rows]
+
+
+class TestReferenceEdges:
+    def test_every_kind_in_declared_order(self) -> None:
+        edges = reference_edges(
+            ref_id="US0001",
+            epic="EP0001",
+            story=None,
+            depends_on="US0003,US0002,US0003",
+            aliases="US0900",
+            body="Blocked by BG-0004 until US0001 (this story) and BG0004 land.",
+        )
+
+        assert edges == [
+            ("epic", "EP0001", 0),
+            ("depends_on", "US0003", 0),
+            ("depends_on", "US0002", 1),
+            ("alias", "US0900", 0),
+            # Normalised and deduplicated; the document's own id is not a mention.
+            ("mention", "BG0004", 0),
+        ]
+
+    def test_extract_ref_ids_finds_every_id_once(self) -> None:
+        text = "See [[CR-0496]], US-01JQK3F8 and [EP0007](../epics/EP0007-x.md); CR0496 again."
+
+        assert extract_ref_ids(text) == ["CR0496", "US01JQK3F8", "EP0007"]
+
+
+class TestMaintainedAtFlush:
+    async def test_inserted_documents_get_their_edges(self, session: AsyncSession) -> None:
+        p = await _project(session)
+        story = _doc(p.id, "story", "US0001", epic="EP0001", depends_on="US0002")
+        session.add(story)
+        await session.commit()
+
+        assert await _edges(session, story) == [
+            ("depends_on", "US0002", 0),
+            ("epic", "EP0001", 0),
+        ]
+
+    async def test_a_changed_source_column_rewrites_the_edges(self, session: AsyncSession) -> None:
+        p = await _project(session)
+        story = _doc(p.id, "story", "US0001", depends_on="US0002")
+        session.add(story)
+        await session.commit()
+
+        story.depends_on = "US0005"
+        story.content = "Mentions BG0001."
+        await session.commit()
+
+        assert await _edges(session, story) == [
+            ("depends_on", "US0005", 0),
+            ("mention", "BG0001", 0),
+        ]
+
+    async def test_mentions_handed_over_by_the_parser_are_used(
+        self, session: AsyncSession
+    ) -> None:
+        p = await _project(session)
+        story = _doc(p.id, "story", "US0001", content="Mentions BG0001.")
+        # As the sync does: the parser found them, so the body is not scanned again.
+        story.mentions = ["BG0002"]
+        session.add(story)
+        await session.commit()
+
+        assert await _edges(session, story) == [("mention", "BG0002", 0)]
+
+    async def test_deleting_a_document_deletes_its_edges(self, session: AsyncSession) -> None:
+        p = await _project(session)
+        story = _doc(p.id, "story", "US0001", depends_on="US0002")
+        session.add(story)
+        await session.commit()
+
+        await session.delete(story)
+        await session.commit()
+
+        remaining = await session.execute(select(DocumentRef))
+        assert remaining.scalars().all() == []
+
+
+class TestRelationshipLookups:
+    async def test_dependents_and_aliases_resolve_without_like(
+        self, session: AsyncSession, engine
+    ) -> None:
+        p = await _project(session)
+        target = _doc(p.id, "story", "US-01JQK3F8", aliases="US0042")
+        dependant = _doc(p.id, "story", "US0050", depends_on="US0042")
+        other = _doc(p.id, "story", "US0051", depends_on="US0420,US00421")
+        session.add_all([target, dependant, other])
+        await session.commit()
+
+        statements: list[str] = []
+
+        def _capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+        try:
+            _, _, depends_on, _ = await get_related_documents(session, p.id, dependant)
+            await get_related_documents(session, p.id, target)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+
+        # US0042 resolves to the renumbered story through its alias edge.
+        assert [d.doc_id for d in depends_on] == ["US-01JQK3F8"]
+        assert statements
+        assert not any(" LIKE " in s.upper() for s in statements)
+
+    async def test_dependents_are_found_through_the_reverse_index(
+        self, session: AsyncSession
+    ) -> None:
+        p = await _project(session)
+        target = _doc(p.id, "story", "US0042")
+        first = _doc(p.id, "story", "US0050", depends_on="US0001,US0042")
+        second = _doc(p.id, "bug", "BG0001", depends_on="US0042")
+        near_miss = _doc(p.id, "story", "US0051", depends_on="US00420")
+        session.add_all([target, first, second, near_miss])
+        await session.commit()
+
+        _, _, _, dependents = await get_related_documents(session, p.id, target)
+
+        assert [d.doc_id for d in dependents] == ["BG0001", "US0050"]
+
+    async def test_mentioned_by_any_of_the_documents_ids(self, session: AsyncSession) -> None:
+        p = await _project(session)
+        target = _doc(p.id, "story", "US-01JQK3F8", aliases="US0042", content="Me: US0042.")
+        by_id = _doc(p.id, "bug", "BG0001", content="Blocked until [[US-01JQK3F8]] lands.")
+        by_alias = _doc(p.id, "story", "US0050", content="Follows on from US0042.")
+        near_miss = _doc(p.id, "story", "US0051", content="Not US00420, nor US0043.")
+        session.add_all([target, by_id, by_alias, near_miss])
+        await session.commit()
+
+        related = await resolve_relationships(session, p.id, [target, by_id])
+
+        assert [d.doc_id for d in related[target.id].mentioned_by] == ["BG0001", "US0050"]
+        assert related[by_id.id].mentioned_by == []
+
+
+class TestMigrationBackfill:
+    def test_existing_documents_are_backfilled(self, tmp_path: Path) -> None:
+        from alembic import command
+        from alembic.config import Config
+
+        backend_root = Path(__file__).resolve().parents[1]
+        db_file = tmp_path / "migrate.db"
+        # In-memory config, not alembic.ini: fileConfig() would disable existing loggers.
+        cfg = Config()
+        cfg.set_main_option("script_location", str(backend_root / "alembic"))
+        cfg.set_main_option("sqlalchemy.url", f"sqlite+aiosqlite:///{db_file}")
+        command.upgrade(cfg, "017")
+
+        conn = sqlite3.connect(db_file)
+        try:
+            conn.execute("INSERT INTO projects (id, slug, name) VALUES (1, 'p', 'P')")
+            conn.execute(
+                "INSERT INTO documents (id, project_id, doc_type, doc_id, title, ref_id, "
+                "depends_on, aliases, content, file_path, file_hash) VALUES "
+                "(7, 1, 'story', 'US0001', 'S', 'US0001', 'US0002,US0003', 'US0900', "
+                "'Fixes BG0001.', 'a.md', 'h')"
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        command.upgrade(cfg, "head")
+
+        conn = sqlite3.connect(db_file)
+        try:
+            rows = conn.execute(
+                "SELECT src_doc_id, project_id, kind, target_norm_id, position "
+                "FROM document_refs ORDER BY kind, position"
+            ).fetchall()
+        finally:
+            conn.close()
+        assert rows == [
+            (7, 1, "alias", "US0900", 0),
+            (7, 1, "depends_on", "US0002", 0),
+            (7, 1, "depends_on", "US0003", 1),
+            (7, 1, "mention", "BG0001", 0),
+        ]
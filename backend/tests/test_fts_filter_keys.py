@@ -0,0 +1,165 @@
+"""Scoped search filters inside the FTS5 index (project_key / type_key, migration 022)."""
+
+import sqlite3
+import zlib
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services.fts import text_match, type_key
+from sdlc_lens.services.search import search_documents
+from tests.conftest import make_document
+
+
+@pytest.fixture
+async def corpus(build_corpus) -> tuple[Project, Project]:
+    return await build_corpus(
+        lambda alpha, beta: [
+            make_document(alpha.id, "story", "US0001", "The login widget."),
+            make_document(alpha.id, "test-spec", "TS0001", "Tests for the login widget."),
+            make_document(alpha.id, "test", "TE0001", "A login widget test."),
+            make_document(beta.id, "story", "US0001", "The login widget, on another branch."),
+            make_document(beta.id, "story", "US0002", f"Mentions p{alpha.id} and t73746f7279."),
+        ]
+    )
+
+
+def _hits(result: dict) -> list[tuple[str, str]]:
+    return sorted((item["project_slug"], item["doc_id"]) for item in result["items"])
+
+
+class TestScopedSearch:
+    async def test_a_project_scope_returns_only_its_documents(
+        self, session: AsyncSession, corpus
+    ) -> None:
+        result = await search_documents(session, query="login", project_slug="beta")
+
+        assert _hits(result) == [("beta", "US0001")]
+        assert result["total"] == 1
+
+    async def test_a_type_scope_is_exact(self, session: AsyncSession, corpus) -> None:
+        # "test-spec" tokenises as "test spec"; the key must not match the type "test".
+        test = await search_documents(session, query="widget", doc_type="test")
+        spec = await search_documents(session, query="widget", doc_type="test-spec")
+
+        assert _hits(test) == [("alpha", "TE0001")]
+        assert _hits(spec) == [("alpha", "TS0001")]
+
+    async def test_both_scopes_together(self, session: AsyncSession, corpus) -> None:
+        result = await search_documents(
+            session, query="login", project_slug="alpha", doc_type="story"
+        )
+
+        assert _hits(result) == [("alpha", "US0001")]
+
+    async def test_an_unknown_project_matches_nothing(self, session: AsyncSession, corpus) -> None:
+        result = await search_documents(session, query="login", project_slug="missing")
+
+        assert result["items"] == []
+        assert result["total"] == 0
+
+    async def test_the_query_never_matches_a_key(self, session: AsyncSession, corpus) -> None:
+        alpha, _ = corpus
+
+        for query in (f"p{alpha.id}", type_key("story")):
+            # The word index: the one with key columns.
+            result = await search_documents(session, query=query, mode="words")
+            assert _hits(result) == [("beta", "US0002")]
+
+    async def test_the_keys_do_not_change_the_scores(self, session: AsyncSession, corpus) -> None:
+        everywhere = await search_documents(session, query="login")
+        scoped = await search_documents(session, query="login", project_slug="alpha")
+
+        scores = {(i["project_slug"], i["doc_id"]): i["score"] for i in everywhere["items"]}
+        for item in scoped["items"]:
+            assert item["score"] == scores[(item["project_slug"], item["doc_id"])]
+
+    async def test_the_count_reads_only_the_index(
+        self, session: AsyncSession, corpus, engine
+    ) -> None:
+        statements: list[str] = []
+
+        def _capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+        try:
+            await search_documents(session, query="login", project_slug="alpha", with_facets=False)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+
+        count = next(s for s in statements if "COUNT(*)" in s)
+        assert "JOIN" not in count
+
+
+class TestTextMatch:
+    def test_the_phrase_is_confined_to_the_text_columns(self) -> None:
+        assert text_match('"login"') == '{title content} : "login"'
+        assert text_match('"login"', project_id=3, doc_type="story") == (
+            '{title content} : "login" AND project_key : p3 AND type_key : t73746f7279'
+        )
+
+
+class TestMigration:
+    def _config(self, db_file: Path):
+        from alembic.config import Config
+
+        backend_root = Path(__file__).resolve().parents[1]
+        # In-memory config, not alembic.ini: fileConfig() would disable existing loggers.
+        cfg = Config()
+        cfg.set_main_option("script_location", str(backend_root / "alembic"))
+        cfg.set_main_option("sqlalchemy.url", f"sqlite+aiosqlite:///{db_file}")
+        return cfg
+
+    def _match(self, db_file: Path, expression: str) -> list[tuple[int]]:
+        conn = sqlite3.connect(db_file)
+        conn.create_function("sdlc_inflate", 1, lambda b: zlib.decompress(b).decode())
+        try:
+            return conn.execute(
+                "SELECT rowid FROM documents_fts WHERE documents_fts MATCH ? ORDER BY rowid",
+                (expression,),
+            ).fetchall()
+        finally:
+            conn.close()
+
+    def test_the_index_gains_the_keys_and_loses_them_again(self, tmp_path: Path) -> None:
+        from alembic import command
+
+        from sdlc_lens.db.models.document_content import content_digest, deflate
+
+        db_file = tmp_path / "migrate.db"
+        cfg = self._config(db_file)
+        command.upgrade(cfg, "021")
+        conn = sqlite3.connect(db_file)
+        try:
+            conn.execute(
+                "INSERT INTO projects (id, slug, name) VALUES (1, 'a', 'A'), (2, 'b', 'B')"
+            )
+            body = "shared widget body"
+            conn.execute(
+                "INSERT INTO document_contents (hash, body, size) VALUES (?, ?, ?)",
+                (content_digest(body), deflate(body), len(body)),
+            )
+            conn.executemany(
+                "INSERT INTO documents (id, project_id, doc_type, doc_id, title, "
+                "content_hash, file_path, file_hash) VALUES (?, ?, ?, ?, 'T', ?, 'f.md', 'h')",
+                [
+                    (1, 1, "story", "US0001", content_digest(body)),
+                    (2, 2, "epic", "EP0001", content_digest(body)),
+                ],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        command.upgrade(cfg, "022")
+
+        assert self._match(db_file, "widget AND project_key : p2") == [(2,)]
+        assert self._match(db_file, f"widget AND type_key : {type_key('story')}") == [(1,)]
+
+        command.downgrade(cfg, "021")
+
+        assert self._match(db_file, "widget") == [(1,), (2,)]
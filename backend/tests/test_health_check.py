@@ -11,6 +11,7 @@ from sdlc_lens.services.health_check import (
     HealthCheckResult,
     run_health_check,
 )
+from sdlc_lens.services.similarity import NearDuplicateCluster
 
 _NOW = datetime.datetime(2026, 2, 18, 12, 0, 0, tzinfo=datetime.UTC)
 _RECENT = datetime.datetime(2026, 2, 17, 12, 0, 0, tzinfo=datetime.UTC)
@@ -688,6 +689,40 @@ class TestDuplicateDocId:
         assert _find(result, "DUPLICATE_DOC_ID") == []
 
 
+class TestNearDuplicate:
+    def test_fires_once_per_cluster(self):
+        docs = [
+            _doc(doc_type="story", doc_id="US0001"),
+            _doc(doc_type="story", doc_id="US0002"),
+            _doc(doc_type="plan", doc_id="PL0001"),
+        ]
+        for n, doc in enumerate(docs, start=1):
+            doc.id = n
+        clusters = [NearDuplicateCluster(document_ids=(1, 3), similarity=0.875)]
+
+        result = run_health_check(
+            docs, project_slug="test-project", now=_NOW, near_duplicates=clusters
+        )
+
+        findings = _find(result, "NEAR_DUPLICATE")
+        assert len(findings) == 1
+        assert findings[0].severity == "medium"
+        assert "88%" in findings[0].message
+        assert [d.doc_id for d in findings[0].affected_documents] == ["US0001", "PL0001"]
+
+    def test_archives_do_not_make_a_cluster(self):
+        docs = [_doc(doc_id="US0001"), _doc(doc_id="_archive-v1")]
+        for n, doc in enumerate(docs, start=1):
+            doc.id = n
+        clusters = [NearDuplicateCluster(document_ids=(1, 2), similarity=1.0)]
+
+        result = run_health_check(
+            docs, project_slug="test-project", now=_NOW, near_duplicates=clusters
+        )
+
+        assert _find(result, "NEAR_DUPLICATE") == []
+
+
 class TestEmptyContent:
     def test_fires_for_stub_document(self):
         docs = [_doc(doc_type="story", doc_id="US0001", content="# Title")]
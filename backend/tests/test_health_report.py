@@ -0,0 +1,312 @@
+"""The stored health report: incremental re-checks, sync maintenance and the read path."""
+
+import datetime
+import random
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sdlc_lens.db.models.document import Document
+from sdlc_lens.db.models.health_report import HealthReportFinding
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services import health_report
+from sdlc_lens.services.coherence import bump_corpus_generation
+from sdlc_lens.services.documents import get_health_check_documents
+from sdlc_lens.services.health_check import (
+    DOCUMENT_RULE_IDS,
+    RELATIONSHIP_RULE_IDS,
+    PreviousVersion,
+    recheck_documents,
+    run_health_check,
+)
+from sdlc_lens.services.health_report import check_project_health, read_health_report
+from sdlc_lens.services.sync_engine import sync_project
+
+_NOW = datetime.datetime(2026, 2, 18, 12, 0, 0, tzinfo=datetime.UTC)
+_BODY = "This document has enough content to pass the empty-content check."
+
+
+@pytest.fixture
+async def client(app):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+def _doc(id_: int, doc_type: str, doc_id: str, **fields) -> Document:
+    columns = {
+        "title": doc_id,
+        "status": "Draft",
+        "owner": "Darren",
+        "priority": "P1",
+        "story_points": 3,
+        "content": _BODY,
+        "file_path": f"{doc_type}s/{doc_id}-{id_}.md",
+        "file_hash": "a" * 64,
+        "synced_at": _NOW,
+    }
+    columns.update(fields)
+    return Document(id=id_, project_id=1, doc_type=doc_type, doc_id=doc_id, **columns)
+
+
+def _findings(pairs) -> list[str]:
+    return sorted(repr((anchor, finding)) for anchor, finding in pairs)
+
+
+def _apply(store: list, recheck) -> list:
+    """What refresh_health_report does to the stored findings, in memory."""
+    kept = [
+        (anchor, finding)
+        for anchor, finding in store
+        if anchor is not None
+        and not (anchor in recheck.changed_ids and finding.rule_id in DOCUMENT_RULE_IDS)
+        and not (anchor in recheck.neighbour_ids and finding.rule_id in RELATIONSHIP_RULE_IDS)
+    ]
+    return kept + recheck.findings
+
+
+class TestRecheck:
+    def test_a_full_recheck_is_the_health_check(self) -> None:
+        docs = [
+            _doc(1, "epic", "EP0001", status="Done"),
+            _doc(2, "story", "US0001", epic="EP0001", priority=None),
+            _doc(3, "plan", "PL0001", story="US0099"),
+            _doc(4, "story", "US0002", epic="EP0001", content="Stub"),
+        ]
+
+        recheck = recheck_documents(docs, docs)
+        findings = run_health_check(docs, "p", now=_NOW).findings
+
+        assert sorted(repr(f) for _, f in recheck.findings) == sorted(repr(f) for f in findings)
+        # Every finding but the project-level ones is about the document it names first.
+        assert all(
+            anchor == (f.affected_documents[0].document_id if f.affected_documents else None)
+            for anchor, f in recheck.findings
+        )
+
+    def test_a_new_plan_rechecks_its_story_only(self) -> None:
+        docs = [
+            _doc(1, "epic", "EP0001"),
+            _doc(2, "story", "US0001", epic="EP0001"),
+            _doc(3, "story", "US0002", epic="EP0001"),
+        ]
+        plan = _doc(4, "plan", "PL0001", story="US0001")
+
+        recheck = recheck_documents([*docs, plan], [plan])
+
+        assert recheck.changed_ids == {4}
+        assert recheck.neighbour_ids == {2, 4}
+        assert not [
+            f for anchor, f in recheck.findings if anchor == 2 and f.rule_id == "MISSING_PLAN"
+        ]
+
+    def test_a_deleted_story_rechecks_what_named_it(self) -> None:
+        docs = [
+            _doc(1, "epic", "EP0001", status="Done"),
+            _doc(3, "plan", "PL0001", story="US0001"),
+            _doc(4, "story", "US0002"),
+        ]
+
+        recheck = recheck_documents(docs, [], [PreviousVersion("US0001", "EP0001", None)])
+
+        assert recheck.neighbour_ids == {1, 3}
+        rules = {(anchor, f.rule_id) for anchor, f in recheck.findings}
+        assert (1, "EPIC_NO_STORIES") in rules
+        assert (3, "ORPHAN_REFERENCE") in rules
+
+    def test_incremental_rechecks_match_full_ones(self) -> None:
+        rng = random.Random(50)
+        types = ("story", "epic", "plan", "test-spec", "bug", "prd", "retro")
+        statuses = (None, "Draft", "Done", "In Progress", "Won't Implement", "inbox")
+        prefixes = {"story": "US", "epic": "EP", "plan": "PL", "test-spec": "TS", "bug": "BG"}
+
+        def random_doc(id_: int) -> Document:
+            doc_type = rng.choice(types)
+            prefix = prefixes.get(doc_type)
+            doc_id = f"{prefix}{rng.randint(1, 8):04d}" if prefix else doc_type
+            return _doc(
+                id_,
+                doc_type,
+                doc_id,
+                status=rng.choice(statuses),
+                owner=rng.choice((None, "Darren")),
+                epic=rng.choice((None, f"EP{rng.randint(1, 8):04d}")),
+                story=rng.choice((None, f"US{rng.randint(1, 8):04d}")),
+                content=rng.choice(("Stub", _BODY)),
+            )
+
+        for _ in range(40):
+            docs = [random_doc(n) for n in range(1, rng.randint(2, 40))]
+            store = recheck_documents(docs, docs).findings
+            next_id = len(docs) + 1
+            for _ in range(3):
+                changed, previous = [], []
+                for _ in range(rng.randint(1, 5)):
+                    if not docs:
+                        break
+                    old = rng.choice(docs)
+                    previous.append(PreviousVersion(old.doc_id, old.epic, old.story))
+                    docs.remove(old)
+                    changed = [doc for doc in changed if doc is not old]
+                    if rng.random() < 0.6:
+                        new = random_doc(old.id if rng.random() < 0.7 else next_id)
+                        next_id += 1
+                        docs.append(new)
+                        changed.append(new)
+                docs.sort(key=lambda doc: doc.id)
+                live = {doc.id for doc in docs}
+                store = [(a, f) for a, f in store if a is None or a in live]
+
+                store = _apply(store, recheck_documents(docs, changed, previous))
+
+                assert _findings(store) == _findings(recheck_documents(docs, docs).findings)
+
+
+def _write_md(base: Path, rel_path: str, content: str) -> None:
+    full = base / rel_path
+    full.parent.mkdir(parents=True, exist_ok=True)
+    full.write_text(content, encoding="utf-8")
+
+
+def _md(doc_id: str, status: str = "Draft", **fields: str) -> str:
+    lines = [f"> **Status:** {status}", "> **Owner:** Darren", "> **Priority:** P1"]
+    lines += ["> **Story Points:** 3"]
+    lines += [f"> **{name.title()}:** {value}" for name, value in fields.items()]
+    return "\n".join(lines) + f"\n\n# {doc_id}: Title\n\n{_BODY}\n"
+
+
+@pytest.fixture
+async def synced(session: AsyncSession, tmp_path: Path) -> tuple[Project, Path]:
+    sdlc = tmp_path / "sdlc-studio"
+    _write_md(sdlc, "prd.md", f"# PRD\n\n{_BODY}")
+    _write_md(sdlc, "epics/EP0001-one.md", _md("EP0001"))
+    _write_md(sdlc, "stories/US0001-one.md", _md("US0001", epic="EP0001"))
+    _write_md(sdlc, "stories/US0002-two.md", _md("US0002", epic="EP0001"))
+    _write_md(sdlc, "plans/PL0001-one.md", _md("PL0001", story="US0001"))
+    project = Project(slug="health", name="Health", sdlc_path=str(sdlc))
+    session.add(project)
+    await session.commit()
+    await sync_project(project, session)
+    return project, sdlc
+
+
+async def _live(session: AsyncSession, project: Project):
+    return run_health_check(await get_health_check_documents(session, project.id), "health")
+
+
+def _same(stored, live) -> None:
+    assert sorted(map(repr, stored.findings)) == sorted(map(repr, live.findings))
+    assert (stored.score, stored.summary, stored.total_documents) == (
+        live.score,
+        live.summary,
+        live.total_documents,
+    )
+
+
+class TestSyncMaintainsTheReport:
+    async def test_a_sync_stores_the_report(self, session: AsyncSession, synced) -> None:
+        project, _ = synced
+
+        stored = await read_health_report(session, project.id, "health")
+
+        assert stored is not None
+        _same(stored, await _live(session, project))
+        assert {f.rule_id for f in stored.findings} >= {"MISSING_TRD", "MISSING_PLAN"}
+
+    async def test_a_resync_rechecks_only_what_it_changed(
+        self, session: AsyncSession, synced, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        project, sdlc = synced
+        rechecked: list[list[int]] = []
+        recheck = health_report.recheck_documents
+
+        def spy(documents, changed, *args, **kwargs):
+            rechecked.append([doc.id for doc in changed])
+            return recheck(documents, changed, *args, **kwargs)
+
+        monkeypatch.setattr(health_report, "recheck_documents", spy)
+        _write_md(sdlc, "plans/PL0002-two.md", _md("PL0002", story="US0002"))
+        (sdlc / "plans/PL0001-one.md").unlink()
+        _write_md(sdlc, "stories/US0001-one.md", _md("US0001", "Done", epic="EP0001"))
+
+        await sync_project(project, session)
+
+        # The new plan and the rewritten story, not the project.
+        assert len(rechecked) == 1 and len(rechecked[0]) == 2
+        stored = await read_health_report(session, project.id, "health")
+        _same(stored, await _live(session, project))
+        messages = [f.message for f in stored.findings if f.rule_id == "MISSING_PLAN"]
+        assert messages == []
+
+    async def test_a_deleted_documents_findings_go_with_it(
+        self, session: AsyncSession, synced
+    ) -> None:
+        project, sdlc = synced
+        (sdlc / "stories/US0002-two.md").unlink()
+
+        await sync_project(project, session)
+
+        stored = await read_health_report(session, project.id, "health")
+        assert "US0002" not in repr(stored.findings)
+        _same(stored, await _live(session, project))
+
+    async def test_other_writes_fall_back_to_a_live_check_until_the_next_sync(
+        self, session: AsyncSession, synced
+    ) -> None:
+        project, _ = synced
+        session.add(
+            Document(
+                project_id=project.id,
+                doc_type="trd",
+                doc_id="trd",
+                title="TRD",
+                content=_BODY,
+                file_path="trd.md",
+                file_hash="a" * 64,
+            )
+        )
+        await bump_corpus_generation(session, project.id)
+        await session.commit()
+
+        assert await read_health_report(session, project.id, "health") is None
+        live = await check_project_health(session, project.id, "health")
+        assert "MISSING_TRD" not in {f.rule_id for f in live.findings}
+
+        await sync_project(project, session)
+
+        # The sync does not know the document (no trd.md), so it deletes it - and rebuilds.
+        stored = await read_health_report(session, project.id, "health")
+        assert stored is not None
+        _same(stored, await _live(session, project))
+
+    async def test_stale_documents_are_judged_on_read(self, session: AsyncSession, synced) -> None:
+        project, _ = synced
+        later = datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=31)
+
+        stored = await read_health_report(session, project.id, "health", now=later)
+
+        stale = [f for f in stored.findings if f.rule_id == "STALE_DOCUMENT"]
+        assert len(stale) == stored.total_documents == 5
+        # In report order: after every stored rule but NEAR_DUPLICATE.
+        assert stored.findings[-len(stale) :] == stale
+
+
+class TestEndpoint:
+    async def test_serves_the_stored_report(
+        self, client: AsyncClient, session: AsyncSession, synced, monkeypatch
+    ) -> None:
+        def live_check(*args, **kwargs):
+            raise AssertionError("the stored report is current")
+
+        monkeypatch.setattr(health_report, "run_health_check", live_check)
+
+        response = await client.get("/api/v1/projects/health/health-check")
+
+        assert response.status_code == 200
+        body = response.json()
+        rows = (await session.scalars(select(HealthReportFinding))).all()
+        assert len(body["findings"]) == len(rows) > 0
+        assert body["total_documents"] == 5
@@ -0,0 +1,198 @@
+"""Lease-based leader election between workers sharing one database.
+
+Several uvicorn workers each run the app's lifespan. Exactly one of them may run the
+poller; when it dies another must take over. The properties pinned here:
+
+* two workers cannot both hold the lease;
+* a lease that stops being renewed is taken over once it expires;
+* a clean release hands it over at once;
+* a worker that is not the leader does not poll.
+"""
+
+import asyncio
+import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from sdlc_lens.db.models.lease import Lease
+from sdlc_lens.services.leader import LeaderLease, _heartbeat
+
+
+@pytest.fixture
+def factory(engine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def _expire(factory, name: str = "leader") -> None:
+    """Age the lease into the past, as if its holder had been SIGKILLed long ago."""
+    async with factory() as session:
+        await session.execute(
+            update(Lease)
+            .where(Lease.name == name)
+            .values(expires_at=datetime.datetime(2000, 1, 1))
+        )
+        await session.commit()
+
+
+class TestLease:
+    async def test_exactly_one_worker_wins(self, factory) -> None:
+        a, b = LeaderLease(factory, ttl_seconds=30), LeaderLease(factory, ttl_seconds=30)
+
+        assert await a.acquire() is True
+        assert await b.acquire() is False
+        assert a.held and not b.held
+
+    async def test_the_leader_renews_its_own_lease(self, factory) -> None:
+        a, b = LeaderLease(factory, ttl_seconds=30), LeaderLease(factory, ttl_seconds=30)
+        await a.acquire()
+
+        assert await a.acquire() is True
+        assert await b.acquire() is False
+
+    async def test_a_follower_checks_the_reader_and_leaves_the_writer_alone(self, factory) -> None:
+        def writer():
+            raise AssertionError("a follower of a live lease needs no write")
+
+        a = LeaderLease(factory, ttl_seconds=30)
+        b = LeaderLease(writer, ttl_seconds=30, read_factory=factory)
+        await a.acquire()
+
+        assert await b.acquire() is False
+        assert not b.held
+
+    async def test_a_follower_takes_an_expired_lease_through_the_writer(self, factory) -> None:
+        a = LeaderLease(factory, ttl_seconds=30)
+        b = LeaderLease(factory, ttl_seconds=30, read_factory=factory)
+        await a.acquire()
+        await _expire(factory)
+
+        assert await b.acquire() is True
+        assert await a.acquire() is False
+
+    async def test_an_expired_lease_is_taken_over(self, factory) -> None:
+        a, b = LeaderLease(factory, ttl_seconds=30), LeaderLease(factory, ttl_seconds=30)
+        await a.acquire()
+        await _expire(factory)
+
+        assert await b.acquire() is True
+        # The old leader finds out at its next renewal rather than carrying on regardless.
+        assert await a.acquire() is False
+        assert not a.held
+
+    async def test_a_released_lease_is_free_at_once(self, factory) -> None:
+        a, b = LeaderLease(factory, ttl_seconds=30), LeaderLease(factory, ttl_seconds=30)
+        await a.acquire()
+
+        await a.release()
+
+        assert not a.held
+        assert await b.acquire() is True
+
+    async def test_releasing_a_lease_held_by_another_is_a_no_op(self, factory) -> None:
+        a, b = LeaderLease(factory, ttl_seconds=30), LeaderLease(factory, ttl_seconds=30)
+        await a.acquire()
+
+        await b.release()
+
+        assert await b.acquire() is False
+
+    async def test_held_lapses_with_the_ttl_even_without_a_renewal(self, factory) -> None:
+        """A leader whose heartbeat stalls must stop acting as leader by itself."""
+        a = LeaderLease(factory, ttl_seconds=30)
+        await a.acquire()
+        later = datetime.datetime.now(datetime.UTC).replace(tzinfo=None) + datetime.timedelta(
+            seconds=31
+        )
+
+        with patch("sdlc_lens.services.leader._utcnow", return_value=later):
+            assert not a.held
+
+
+class TestHeartbeat:
+    async def test_start_up_work_runs_once_on_election(self, factory) -> None:
+        lease = LeaderLease(factory, ttl_seconds=30)
+        elected = AsyncMock()
+        beats = 0
+
+        async def _sleep(_: float) -> None:
+            nonlocal beats
+            beats += 1
+            if beats == 3:
+                raise asyncio.CancelledError
+
+        with (
+            patch("sdlc_lens.services.leader.asyncio.sleep", _sleep),
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await _heartbeat(lease, elected)
+
+        assert lease.held
+        elected.assert_awaited_once()
+
+    async def test_a_follower_never_runs_start_up_work(self, factory) -> None:
+        await LeaderLease(factory, ttl_seconds=30).acquire()
+        follower = LeaderLease(factory, ttl_seconds=30)
+        elected = AsyncMock()
+
+        async def _sleep(_: float) -> None:
+            raise asyncio.CancelledError
+
+        with (
+            patch("sdlc_lens.services.leader.asyncio.sleep", _sleep),
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await _heartbeat(follower, elected)
+
+        assert not follower.held
+        elected.assert_not_awaited()
+
+
+class TestPollerFollowsTheLease:
+    async def test_a_follower_does_not_sweep(self, factory) -> None:
+        from sdlc_lens.services.poller import _poll_loop
+
+        await LeaderLease(factory, ttl_seconds=30).acquire()
+        follower = LeaderLease(factory, ttl_seconds=30)
+        sweeps = AsyncMock(return_value={})
+        ticks = 0
+
+        async def _sleep(_: float) -> None:
+            nonlocal ticks
+            ticks += 1
+            if ticks == 3:
+                raise asyncio.CancelledError
+
+        with (
+            patch("sdlc_lens.services.poller.asyncio.sleep", _sleep),
+            patch("sdlc_lens.services.poller.poll_once", sweeps),
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await _poll_loop(factory, 300, follower)
+
+        sweeps.assert_not_awaited()
+
+    async def test_the_leader_sweeps(self, factory) -> None:
+        from sdlc_lens.services.poller import _poll_loop
+
+        leader = LeaderLease(factory, ttl_seconds=30)
+        await leader.acquire()
+        sweeps = AsyncMock(return_value={})
+        ticks = 0
+
+        async def _sleep(_: float) -> None:
+            nonlocal ticks
+            ticks += 1
+            if ticks == 3:
+                raise asyncio.CancelledError
+
+        with (
+            patch("sdlc_lens.services.poller.asyncio.sleep", _sleep),
+            patch("sdlc_lens.services.poller.poll_once", sweeps),
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await _poll_loop(factory, 300, leader)
+
+        assert sweeps.await_count == 2
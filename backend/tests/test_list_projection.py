@@ -0,0 +1,170 @@
+"""Column projection: listings and the health check never load what they do not show."""
+
+import datetime
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sdlc_lens.db.models.document import Document
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services.documents import (
+    HEALTH_CHECK_CONTENT_CHARS,
+    get_all_documents,
+    get_health_check_documents,
+    list_documents_page,
+)
+from sdlc_lens.services.health_check import run_health_check
+
+_LONG = "Lorem ipsum dolor sit amet. " * 1000
+
+
+@pytest.fixture
+async def client(app):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture
+async def project(session: AsyncSession) -> Project:
+    p = Project(slug="proj", name="Proj", sdlc_path="/proj")
+    session.add(p)
+    await session.flush()
+    docs = [
+        ("epic", "EP0001", None, _LONG),
+        ("story", "US0001", "EP0001", _LONG),
+        # The epic is only named in the body, past the point the others are cut at.
+        ("story", "US0002", None, _LONG + "\n**Epic:** [EP0001](../epics/EP0001.md)\n"),
+        ("test-spec", "TS0001", None, "# TS0001\n\nShort."),
+        ("bug", "BG0001", None, " " * (HEALTH_CHECK_CONTENT_CHARS + 10) + "# Bug"),
+    ]
+    for n, (doc_type, doc_id, epic, content) in enumerate(docs):
+        session.add(
+            Document(
+                project_id=p.id,
+                doc_type=doc_type,
+                doc_id=doc_id,
+                title=doc_id,
+                status="Draft",
+                epic=epic,
+                content=content,
+                metadata_json='{"big": "' + "x" * 5000 + '"}',
+                file_path=f"{doc_id}.md",
+                file_hash="0" * 64,
+                synced_at=datetime.datetime(2026, 1, 1) + datetime.timedelta(minutes=n),
+            )
+        )
+    await session.commit()
+    return p
+
+
+@pytest.fixture
+def statements(engine):
+    captured: list[str] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+    yield captured
+    event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+
+
+class TestListingProjection:
+    async def test_the_listing_never_selects_content_or_metadata(
+        self, session: AsyncSession, project: Project, statements: list[str]
+    ) -> None:
+        page = await list_documents_page(session, project.id)
+
+        assert len(page.items) == 5
+        selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+        assert selects
+        for statement in selects:
+            assert "content" not in statement
+            assert "metadata_json" not in statement
+
+    async def test_fields_narrows_the_columns_read(
+        self, session: AsyncSession, project: Project, statements: list[str]
+    ) -> None:
+        page = await list_documents_page(
+            session, project.id, fields=["doc_id"], with_total=False, sort="title", order="asc"
+        )
+
+        (listing,) = statements
+        # The id and sort column for the cursor, and the one field asked for.
+        assert "owner" not in listing
+        assert "documents.doc_id" in listing
+        assert page.items[0].doc_id == "BG0001"
+        assert page.items[0].owner is None
+
+
+class TestListingApi:
+    async def test_fields_returns_only_those_fields(
+        self, client: AsyncClient, project: Project
+    ) -> None:
+        resp = await client.get(
+            "/api/v1/projects/proj/documents",
+            params={"fields": "doc_id,title", "sort": "title", "order": "asc"},
+        )
+
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["items"][0] == {"doc_id": "BG0001", "title": "BG0001"}
+        assert body["total"] == 5
+        assert body["next_cursor"] is None
+
+    async def test_without_fields_every_field_is_returned(
+        self, client: AsyncClient, project: Project
+    ) -> None:
+        resp = await client.get("/api/v1/projects/proj/documents")
+
+        assert set(resp.json()["items"][0]) == {
+            "doc_id",
+            "type",
+            "title",
+            "status",
+            "owner",
+            "priority",
+            "story_points",
+            "epic",
+            "story",
+            "updated_at",
+        }
+
+    @pytest.mark.parametrize("fields", ["doc_id,content", ",", "metadata_json"])
+    async def test_unknown_fields_are_rejected(
+        self, client: AsyncClient, project: Project, fields: str
+    ) -> None:
+        resp = await client.get("/api/v1/projects/proj/documents", params={"fields": fields})
+
+        assert resp.status_code == 422
+        assert resp.json()["error"]["code"] == "VALIDATION_ERROR"
+
+
+class TestHealthCheckProjection:
+    async def test_findings_match_a_full_load(
+        self, session: AsyncSession, project: Project
+    ) -> None:
+        full = run_health_check(await get_all_documents(session, project.id), "proj")
+        session.expunge_all()
+
+        light = run_health_check(await get_health_check_documents(session, project.id), "proj")
+
+        assert [(f.rule_id, f.affected_documents) for f in light.findings] == [
+            (f.rule_id, f.affected_documents) for f in full.findings
+        ]
+        assert light.score == full.score
+
+    async def test_bodies_are_cut_unless_a_rule_needs_them(
+        self, session: AsyncSession, project: Project, statements: list[str]
+    ) -> None:
+        rows = await get_health_check_documents(session, project.id)
+
+        lengths = {row.doc_id: len(row.content) for row in rows}
+        assert lengths["EP0001"] == HEALTH_CHECK_CONTENT_CHARS
+        assert lengths["US0001"] == HEALTH_CHECK_CONTENT_CHARS
+        # No epic column: the rule looks for one in the whole body.
+        assert lengths["US0002"] > HEALTH_CHECK_CONTENT_CHARS
+        assert "metadata_json" not in statements[0]
@@ -297,3 +297,20 @@ class TestInlineSeparatedHeader:
         content = "> **Status:** In Progress\n\nBody."
         result = parse_document(content)
         assert result.metadata["status"] == "In Progress"
+
+
+class TestBodyMentions:
+    """Ids mentioned in the body are found by the parse, frontmatter excluded."""
+
+    def test_mentions_in_body_order(self) -> None:
+        content = (
+            "# US0010: Checkout\n\n"
+            "> **Epic:** EP0001\n\n"
+            "Blocked by [[BG-01KX8B82]] and US0003; see [CR0496](../crs/CR0496.md), US0003.\n"
+        )
+        result = parse_document(content)
+        # The heading and frontmatter above the body are not mentions.
+        assert result.mentions == ["BG01KX8B82", "US0003", "CR0496"]
+
+    def test_no_mentions(self) -> None:
+        assert parse_document("> **Status:** Done\n\nPlain prose.").mentions == []
@@ -12,6 +12,7 @@ Both are tested by their failure, not by their happy path.
 """
 
 import asyncio
+import datetime
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -113,6 +114,25 @@ class TestHeadShaPoll:
         assert sync.await_count == 0
         assert (await _get(factory)).last_synced_at == before
 
+    @pytest.mark.asyncio
+    async def test_a_sweep_in_which_nothing_moved_only_reads(
+        self, session: AsyncSession, factory
+    ) -> None:
+        """Its reads go to the reader pool; the single writer is not asked for at all."""
+        await _project(session)
+
+        def writer():
+            raise AssertionError("nothing moved, so nothing should be written")
+
+        with patch(
+            "sdlc_lens.services.github_source.fetch_branch_head_sha",
+            new_callable=AsyncMock,
+            return_value=HEAD_OLD,
+        ):
+            results = await poll_once(writer, read_factory=factory)
+
+        assert results == {"gh": PollResult.UNCHANGED}
+
     @pytest.mark.asyncio
     async def test_moved_head_syncs_and_advances(self, session: AsyncSession, factory) -> None:
         await _project(session)
@@ -280,7 +300,7 @@ class TestIsolationAndBackoff:
         # The bad project raises; the good one must still be polled.
         polled: list[str] = []
 
-        async def _poll(slug, fac):  # noqa: ANN001
+        async def _poll(slug, fac, read_factory=None):  # noqa: ANN001
             polled.append(slug)
             if slug == "bad":
                 raise RuntimeError("a poll blew up in a way poll_project promised it would not")
@@ -625,6 +645,27 @@ class TestShutdownDoesNotBrickAProject:
         async with factory() as s:
             await real_trigger(s, "gh")  # must not raise SyncInProgressError
 
+    @pytest.mark.asyncio
+    async def test_a_sync_started_since_boot_is_not_reset(
+        self, session: AsyncSession, factory
+    ) -> None:
+        """The leader resets after the app is serving; a sync triggered meanwhile is real."""
+        from sdlc_lens.services.poller import reset_stuck_syncing
+
+        booted_at = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+        project = await _project(session)
+        project.sync_status = "syncing"
+        await session.commit()
+
+        assert await reset_stuck_syncing(factory, started_before=booted_at) == 0
+        assert (await _get(factory)).sync_status == "syncing"
+
+        # The same status written by a previous process is stranded.
+        project.updated_at = booted_at - datetime.timedelta(minutes=5)
+        await session.commit()
+        assert await reset_stuck_syncing(factory, started_before=booted_at) == 1
+        assert (await _get(factory)).sync_status == "error"
+
     @pytest.mark.asyncio
     async def test_a_healthy_project_is_not_disturbed_by_the_reset(
         self, session: AsyncSession, factory
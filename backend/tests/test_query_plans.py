@@ -0,0 +1,214 @@
+"""Query-plan regression tests for the hot document queries (migration 017).
+
+Each test runs a real service function, captures the SQL it sent, and asks SQLite for
+``EXPLAIN QUERY PLAN`` on exactly that statement with exactly those parameters. A plan
+that scans the documents table, or sorts through a temp B-tree, fails - so a change to a
+query or to the indexes that quietly loses an access path is caught here, by name,
+rather than by a dashboard that gets slower as the corpus grows.
+
+``SCAN documents USING COVERING INDEX`` is allowed: the aggregate stats read every row
+by design, and reading them from a narrow index rather than the table is the point.
+"""
+
+import datetime
+
+import pytest
+from sqlalchemy import event
+
+from sdlc_lens.db.models.document import Document
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services.documents import get_document, list_documents, list_documents_page
+from sdlc_lens.services.health_report import read_health_report, refresh_health_report
+from sdlc_lens.services.stats import get_aggregate_stats, get_project_stats
+
+_TYPES = ["epic", "story", "bug", "plan", "test-spec"]
+_STATUSES = ["Draft", "In Progress", "Done", None]
+
+
+@pytest.fixture
+async def corpus(session):
+    """Two projects with a spread of types, statuses, titles and sync times."""
+    projects = [Project(slug=f"p{i}", name=f"P{i}", sdlc_path=f"/p{i}") for i in range(2)]
+    session.add_all(projects)
+    await session.flush()
+    base = datetime.datetime(2026, 1, 1)
+    for project in projects:
+        for n in range(200):
+            doc_type = _TYPES[n % len(_TYPES)]
+            session.add(
+                Document(
+                    project_id=project.id,
+                    doc_type=doc_type,
+                    doc_id=f"{doc_type.upper()}-{n:04d}",
+                    title=f"Document {n:04d}",
+                    status=_STATUSES[n % len(_STATUSES)],
+                    content="body",
+                    file_path=f"{doc_type}/{n}.md",
+                    file_hash="0" * 64,
+                    synced_at=base + datetime.timedelta(minutes=n),
+                )
+            )
+    await session.commit()
+    return projects[0]
+
+
+@pytest.fixture
+def captured(engine):
+    """Every SELECT the session sends to the documents table, with its parameters."""
+    statements: list[tuple[str, tuple]] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "documents" in statement:
+            statements.append((statement, tuple(parameters or ())))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+    yield statements
+    event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+
+
+async def _plans(engine, statements: list[tuple[str, tuple]]) -> list[list[str]]:
+    plans = []
+    async with engine.connect() as conn:
+        for statement, parameters in statements:
+            rows = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plans.append([row[3] for row in rows])
+    return plans
+
+
+def _problems(plan: list[str]) -> list[str]:
+    """The plan lines that mean the query lost its index."""
+    return [
+        line
+        for line in plan
+        if (line.startswith("SCAN documents") and "COVERING INDEX" not in line)
+        or "USE TEMP B-TREE" in line
+    ]
+
+
+async def _assert_indexed(engine, statements: list[tuple[str, tuple]]) -> None:
+    assert statements, "the service ran no documents query"
+    for (statement, _), plan in zip(statements, await _plans(engine, statements), strict=True):
+        assert not _problems(plan), f"{statement}\n-> {plan}"
+
+
+class TestListDocuments:
+    @pytest.mark.parametrize("sort", ["updated_at", "title", "status", "type"])
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    async def test_unfiltered_sorts(self, session, engine, corpus, captured, sort, order):
+        await list_documents(session, corpus.id, sort=sort, order=order)
+
+        # The count and the page.
+        assert len(captured) == 2
+        await _assert_indexed(engine, captured)
+
+    @pytest.mark.parametrize("sort", ["updated_at", "title", "status"])
+    async def test_filtered_by_type(self, session, engine, corpus, captured, sort):
+        await list_documents(session, corpus.id, doc_type="story", sort=sort)
+
+        await _assert_indexed(engine, captured)
+
+    @pytest.mark.parametrize("status", ["Done", "none"])
+    async def test_filtered_by_status_in_the_default_order(
+        self, session, engine, corpus, captured, status
+    ):
+        await list_documents(session, corpus.id, status=status)
+
+        await _assert_indexed(engine, captured)
+
+    async def test_a_later_page_still_reads_in_index_order(
+        self, session, engine, corpus, captured
+    ):
+        documents, total = await list_documents(session, corpus.id, page=3, per_page=20)
+
+        assert total == 200
+        assert len(documents) == 20
+        await _assert_indexed(engine, captured)
+
+
+class TestCursorPages:
+    @pytest.mark.parametrize("sort", ["updated_at", "title", "status", "type"])
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    async def test_a_cursor_page_seeks_instead_of_skipping(
+        self, session, engine, corpus, captured, sort, order
+    ):
+        first = await list_documents_page(session, corpus.id, sort=sort, order=order)
+        captured.clear()
+
+        await list_documents_page(
+            session, corpus.id, sort=sort, order=order, cursor=first.next_cursor, with_total=False
+        )
+
+        assert len(captured) == 1
+        await _assert_indexed(engine, captured)
+
+    @pytest.mark.parametrize(
+        ("sort", "index"),
+        [("status", "ix_documents_project_status"), ("type", "ix_documents_project_type")],
+    )
+    async def test_sorting_by_status_or_type_needs_the_two_column_index(
+        self, session, engine, corpus, captured, sort, index
+    ):
+        # Not a redundant prefix of ix_documents_project_status_synced or
+        # ix_documents_project_type_status: those order (sort column, synced_at or
+        # status, id), and the cursor's (sort column, id) needs the id right after.
+        first = await list_documents_page(session, corpus.id, sort=sort)
+        captured.clear()
+
+        await list_documents_page(
+            session, corpus.id, sort=sort, cursor=first.next_cursor, with_total=False
+        )
+
+        plans = await _plans(engine, captured)
+        assert any(f"{index} " in line for line in plans[0]), plans[0]
+        await _assert_indexed(engine, captured)
+
+
+class TestGetDocument:
+    async def test_lookup_seeks_the_composite_index(self, session, engine, corpus, captured):
+        await get_document(session, corpus.id, "story", "STORY-0001")
+
+        plans = await _plans(engine, captured)
+        assert any("ix_documents_project_type_doc_id" in line for line in plans[0])
+        assert not _problems(plans[0])
+
+
+class TestStats:
+    async def test_project_stats(self, session, engine, corpus, captured):
+        await get_project_stats(session, corpus)
+
+        # By type, by status, and story completion.
+        assert len(captured) == 3
+        await _assert_indexed(engine, captured)
+
+    async def test_project_stats_are_answered_from_covering_indexes(
+        self, session, engine, corpus, captured
+    ):
+        await get_project_stats(session, corpus)
+
+        for plan in await _plans(engine, captured):
+            assert any("COVERING INDEX" in line for line in plan), plan
+
+    async def test_aggregate_stats(self, session, engine, corpus, captured):
+        await get_aggregate_stats(session)
+
+        await _assert_indexed(engine, captured)
+
+
+class TestHealthReport:
+    async def test_stale_documents_are_read_from_the_sync_time_index(
+        self, session, engine, corpus, captured
+    ):
+        await refresh_health_report(session, corpus.id)
+        await session.commit()
+        captured.clear()
+
+        # 30 days after the hundredth document was synced.
+        later = datetime.datetime(2026, 1, 31, 1, 40, tzinfo=datetime.UTC)
+        report = await read_health_report(session, corpus.id, "p0", now=later)
+
+        assert sum(f.rule_id == "STALE_DOCUMENT" for f in report.findings) == 100
+        reads = [(sql, params) for sql, params in captured if "FROM documents" in sql]
+        assert len(reads) == 1
+        plans = await _plans(engine, reads)
+        assert any("ix_documents_project_synced" in line for line in plans[0]), plans[0]
+        await _assert_indexed(engine, reads)
@@ -2,11 +2,12 @@
 
 import datetime
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sdlc_lens.db.models.document import Document
 from sdlc_lens.db.models.project import Project
-from sdlc_lens.services.documents import get_related_documents
+from sdlc_lens.services.documents import get_related_documents, resolve_relationships
 from sdlc_lens.utils.sdlc_ids import id_head, norm_id
 
 
@@ -133,3 +134,71 @@ async def test_self_reference_not_linked(session: AsyncSession) -> None:
     assert children == []
     assert depends_on == []
     assert dependents == []
+
+
+def _count_queries(engine) -> list[str]:
+    """Start recording the statements ``engine`` runs (for the rest of the test)."""
+    statements: list[str] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    # The engine fixture is per test, so the listener goes with it.
+    event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+    return statements
+
+
+async def test_every_relationship_resolves_in_one_query(session: AsyncSession, engine) -> None:
+    p = await _project(session)
+    epic = _doc(p.id, "epic", "EP0001-top")
+    # The story is referenced by an OLD id, so the epic is reached through an alias hop.
+    story = _doc(p.id, "story", "US-01KX8CCC-renamed", epic="EP0001", aliases=norm_id("US0001"))
+    dep = _doc(p.id, "bug", "BG0001-dep")
+    plan = _doc(p.id, "plan", "PL0001-plan", story="US0001", depends_on=norm_id("BG0001"))
+    child = _doc(p.id, "test-spec", "TS0001-child", story="US0001")
+    dependent = _doc(p.id, "cr", "CR0001-later", depends_on=norm_id("PL0001"))
+    session.add_all([epic, story, dep, plan, child, dependent])
+    await session.commit()
+
+    statements = _count_queries(engine)
+    parents, children, depends_on, dependents = await get_related_documents(session, p.id, plan)
+
+    assert len(statements) == 1
+    assert [d.doc_id for d in parents] == ["US-01KX8CCC-renamed", "EP0001-top"]
+    assert children == []
+    assert [d.doc_id for d in depends_on] == ["BG0001-dep"]
+    assert [d.doc_id for d in dependents] == ["CR0001-later"]
+
+
+async def test_batch_matches_one_at_a_time_in_a_single_query(
+    session: AsyncSession, engine
+) -> None:
+    p = await _project(session)
+    epic = _doc(p.id, "epic", "EP0001-top")
+    stories = [
+        _doc(p.id, "story", f"US000{n}-s", epic="EP0001", depends_on=norm_id(f"US000{n - 1}"))
+        for n in range(1, 5)
+    ]
+    tasks = [_doc(p.id, "plan", f"PL000{n}-p", story=f"US000{n}") for n in range(1, 5)]
+    docs = [epic, *stories, *tasks]
+    session.add_all(docs)
+    await session.commit()
+
+    one_by_one = {}
+    for doc in docs:
+        one_by_one[doc.id] = await get_related_documents(session, p.id, doc)
+
+    statements = _count_queries(engine)
+    batch = await resolve_relationships(session, p.id, docs)
+
+    assert len(statements) == 1
+    for doc in docs:
+        related = batch[doc.id]
+        assert (
+            related.parents,
+            related.children,
+            related.depends_on,
+            related.dependents,
+        ) == one_by_one[doc.id]
+    assert [d.doc_id for d in batch[epic.id].children] == [s.doc_id for s in stories]
+    assert [d.doc_id for d in batch[stories[1].id].dependents] == ["US0003-s"]
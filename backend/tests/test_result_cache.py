@@ -0,0 +1,278 @@
+"""The generation-keyed result cache behind stats, health check and relationships."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services.fts import FTS5_CREATE_SQL
+from sdlc_lens.services.result_cache import (
+    OverloadedError,
+    ResultCache,
+    estimate_size,
+    result_cache,
+)
+from sdlc_lens.services.sync_engine import sync_project
+
+
+class _Value(BaseModel):
+    text: str
+
+
+@pytest.fixture
+async def client(app):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture
+async def project(session: AsyncSession, tmp_path: Path) -> Project:
+    sdlc = tmp_path / "sdlc-studio"
+    for name, body in [
+        ("epics/EP0001-auth.md", "# EP0001: Auth\n\n> **Status:** Draft\n\nLogin epic."),
+        ("stories/US0001-login.md", "# US0001: Login\n\n> **Epic:** EP0001\n\nA story."),
+    ]:
+        (sdlc / name).parent.mkdir(parents=True, exist_ok=True)
+        (sdlc / name).write_text(body)
+    await session.execute(text(FTS5_CREATE_SQL))
+    p = Project(slug="cached", name="Cached", sdlc_path=str(sdlc))
+    session.add(p)
+    await session.commit()
+    await sync_project(p, session)
+    return p
+
+
+class TestResultCache:
+    def test_least_recently_used_is_evicted_first(self) -> None:
+        cache = ResultCache(max_entries=2, max_bytes=10_000)
+        cache.put("a", _Value(text="a"))
+        cache.put("b", _Value(text="b"))
+        cache.get("a")
+
+        cache.put("c", _Value(text="c"))
+
+        assert cache.get("b") == (False, None)
+        assert cache.get("a")[0] and cache.get("c")[0]
+        assert cache.evictions == 1
+
+    def test_the_byte_bound_evicts_too(self) -> None:
+        value = _Value(text="x" * 100)
+        size = estimate_size(value)
+        cache = ResultCache(max_entries=100, max_bytes=size * 2)
+
+        for key in "abc":
+            cache.put(key, value)
+
+        assert len(cache) == 2
+        assert cache.size_bytes == size * 2
+        assert cache.evictions == 1
+
+    def test_a_value_larger_than_the_budget_is_not_stored(self) -> None:
+        cache = ResultCache(max_entries=100, max_bytes=10)
+        cache.put("small", "x")
+
+        cache.put("big", _Value(text="x" * 100))
+
+        assert cache.get("big") == (False, None)
+        assert cache.get("small") == (True, "x")
+
+    def test_zero_entries_disables_it(self) -> None:
+        cache = ResultCache(max_entries=0, max_bytes=10_000)
+        cache.put("a", "a")
+
+        assert len(cache) == 0
+
+    async def test_get_or_compute_counts_hits_and_misses(self) -> None:
+        cache = ResultCache(max_entries=10, max_bytes=10_000)
+        calls = []
+
+        async def compute() -> str:
+            calls.append(1)
+            return "value"
+
+        assert await cache.get_or_compute("k", compute) == "value"
+        assert await cache.get_or_compute("k", compute) == "value"
+
+        assert len(calls) == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+
+class TestSingleFlight:
+    async def test_concurrent_misses_share_one_computation(self) -> None:
+        cache = ResultCache(max_entries=10, max_bytes=10_000)
+        release = asyncio.Event()
+        calls = []
+
+        async def compute() -> str:
+            calls.append(1)
+            await release.wait()
+            return "value"
+
+        tasks = [asyncio.create_task(cache.get_or_compute("k", compute)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*tasks) == ["value"] * 5
+        assert len(calls) == 1
+        assert cache.coalesced == 4
+
+    async def test_a_failure_reaches_every_waiter_and_is_not_kept(self) -> None:
+        cache = ResultCache(max_entries=10, max_bytes=10_000)
+        release = asyncio.Event()
+
+        async def failing() -> str:
+            await release.wait()
+            raise LookupError("gone")
+
+        tasks = [asyncio.create_task(cache.get_or_compute("k", failing)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(isinstance(r, LookupError) for r in results)
+
+        async def working() -> str:
+            return "value"
+
+        assert await cache.get_or_compute("k", working) == "value"
+
+    async def test_a_waiter_takes_over_from_a_cancelled_computation(self) -> None:
+        cache = ResultCache(max_entries=10, max_bytes=10_000)
+
+        async def stuck() -> str:
+            await asyncio.Event().wait()
+            return "never"
+
+        async def working() -> str:
+            return "value"
+
+        leader = asyncio.create_task(cache.get_or_compute("k", stuck))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_compute("k", working))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await waiter == "value"
+
+    async def test_past_the_limit_a_new_computation_is_refused(self) -> None:
+        cache = ResultCache(
+            max_entries=10, max_bytes=10_000, max_concurrent=1, retry_after_seconds=7
+        )
+        release = asyncio.Event()
+
+        async def slow() -> str:
+            await release.wait()
+            return "value"
+
+        busy = asyncio.create_task(cache.get_or_compute("a", slow))
+        await asyncio.sleep(0)
+
+        with pytest.raises(OverloadedError) as excinfo:
+            await cache.get_or_compute("b", slow)
+        # The same key joins the running computation instead.
+        joined = asyncio.create_task(cache.get_or_compute("a", slow))
+        await asyncio.sleep(0)
+        release.set()
+
+        assert excinfo.value.retry_after == 7
+        assert await busy == await joined == "value"
+        assert cache.rejected == 1
+        # A hit needs no slot.
+        assert await cache.get_or_compute("a", slow) == "value"
+
+
+class TestCachedEndpoints:
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "/api/v1/stats",
+            "/api/v1/projects/cached/stats",
+            "/api/v1/projects/cached/health-check",
+            "/api/v1/projects/cached/documents/story/US0001-login/related",
+        ],
+    )
+    async def test_a_repeat_reads_no_documents(
+        self, client: AsyncClient, project: Project, engine, url: str
+    ) -> None:
+        first = await client.get(url)
+        hits = result_cache.hits
+        statements: list[str] = []
+
+        def _capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+        try:
+            second = await client.get(url)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        # The key's inputs - the project row, the generation - and nothing else.
+        assert not [s for s in statements if "documents" in s]
+        assert result_cache.hits == hits + 1
+
+    async def test_a_changing_sync_recomputes(
+        self, client: AsyncClient, session: AsyncSession, project: Project
+    ) -> None:
+        before = (await client.get("/api/v1/projects/cached/stats")).json()
+        hits = result_cache.hits
+        assert before["by_status"] == {"Draft": 1, "null": 1}
+
+        story = Path(project.sdlc_path) / "stories/US0001-login.md"
+        story.write_text("# US0001: Login\n\n> **Status:** Done\n\nShipped.")
+        await sync_project(project, session)
+
+        after = (await client.get("/api/v1/projects/cached/stats")).json()
+        assert after["by_status"] == {"Draft": 1, "Done": 1}
+        assert result_cache.hits == hits
+
+    async def test_a_missing_document_is_not_cached(
+        self, client: AsyncClient, project: Project
+    ) -> None:
+        url = "/api/v1/projects/cached/documents/story/US9999/related"
+
+        assert (await client.get(url)).status_code == 404
+        assert len(result_cache) == 0
+
+    async def test_a_saturated_limit_is_a_503(
+        self, client: AsyncClient, project: Project, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(result_cache, "max_concurrent", 1)
+        monkeypatch.setattr(result_cache, "retry_after_seconds", 3)
+        release = asyncio.Event()
+
+        async def elsewhere() -> None:
+            await release.wait()
+
+        busy = asyncio.create_task(result_cache.get_or_compute("another-report", elsewhere))
+        await asyncio.sleep(0)
+        try:
+            resp = await client.get("/api/v1/projects/cached/health-check")
+        finally:
+            release.set()
+            await busy
+
+        assert resp.status_code == 503
+        assert resp.headers["retry-after"] == "3"
+        assert resp.json()["error"]["code"] == "OVERLOADED"
+        assert (await client.get("/api/v1/projects/cached/health-check")).status_code == 200
+
+    async def test_the_counters_are_exposed(self, client: AsyncClient, project: Project) -> None:
+        await client.get("/api/v1/stats")
+        await client.get("/api/v1/stats")
+
+        resp = await client.get("/api/v1/system/cache")
+
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["entries"] == 1
+        assert body["size_bytes"] > 0
+        assert body["hits"] - body["misses"] == result_cache.hits - result_cache.misses
@@ -0,0 +1,161 @@
+"""The search result cache: GET /api/v1/search pages kept per corpus state."""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sdlc_lens.db.models.document import Document
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services.coherence import bump_corpus_generation
+from sdlc_lens.services.fts import FTS5_CREATE_SQL, fts_rebuild, trigram_create
+from sdlc_lens.services.result_cache import ResultCache, result_cache, search_cache
+from sdlc_lens.services.search import normalise_query
+
+
+@pytest.fixture
+async def client(app):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+def _doc(project_id: int, doc_id: str, title: str, content: str) -> Document:
+    return Document(
+        project_id=project_id,
+        doc_type="story",
+        doc_id=doc_id,
+        title=title,
+        content=content,
+        file_path=f"stories/{doc_id}.md",
+        file_hash="0" * 64,
+    )
+
+
+@pytest.fixture
+async def project(session: AsyncSession) -> Project:
+    await session.execute(text(FTS5_CREATE_SQL))
+    await trigram_create(session)
+    project = Project(slug="alpha", name="Alpha", sdlc_path="/alpha")
+    session.add(project)
+    await session.flush()
+    session.add_all(
+        [_doc(project.id, f"US{n:04d}", f"Token {n}", "Token rotation.") for n in range(5)]
+    )
+    await session.commit()
+    await fts_rebuild(session)
+    await session.commit()
+    return project
+
+
+@pytest.fixture
+def matches(engine):
+    """The FTS5 MATCH statements run while the test does."""
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "MATCH" in statement:
+            statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(engine.sync_engine, "before_cursor_execute", _record)
+
+
+class TestNormaliseQuery:
+    def test_collapses_whitespace_and_keeps_case(self) -> None:
+        assert normalise_query("  token \t rotation\n") == "token rotation"
+        assert normalise_query("a OR b") == "a OR b"
+
+
+class TestSearchCache:
+    async def test_a_repeated_search_runs_no_query(
+        self, client: AsyncClient, project: Project, matches: list[str]
+    ) -> None:
+        hits = search_cache.hits
+        first = await client.get("/api/v1/search", params={"q": "token"})
+        ran = len(matches)
+        again = await client.get("/api/v1/search", params={"q": "  token "})
+
+        assert ran > 0
+        assert len(matches) == ran
+        assert again.json() == first.json()
+        assert search_cache.hits == hits + 1
+
+    async def test_pages_and_filters_are_keyed_apart(
+        self, client: AsyncClient, project: Project
+    ) -> None:
+        hits = search_cache.hits
+        first = await client.get("/api/v1/search", params={"q": "token", "per_page": 2})
+        second = await client.get(
+            "/api/v1/search",
+            params={"q": "token", "per_page": 2, "cursor": first.json()["next_cursor"]},
+        )
+        stories = await client.get("/api/v1/search", params={"q": "token", "type": "story"})
+
+        first_ids = {item["doc_id"] for item in first.json()["items"]}
+        second_ids = {item["doc_id"] for item in second.json()["items"]}
+        assert first_ids.isdisjoint(second_ids)
+        assert stories.json()["total"] == 5
+        assert search_cache.hits == hits
+        assert len(search_cache) == 3
+
+    async def test_a_sync_invalidates_it(
+        self, client: AsyncClient, session: AsyncSession, project: Project
+    ) -> None:
+        hits = search_cache.hits
+        before = await client.get("/api/v1/search", params={"q": "token"})
+
+        session.add(_doc(project.id, "US0099", "Token expiry", "Token expiry."))
+        await session.commit()
+        await fts_rebuild(session)
+        await bump_corpus_generation(session, project.id)
+        await session.commit()
+        after = await client.get("/api/v1/search", params={"q": "token"})
+
+        assert before.json()["total"] == 5
+        assert after.json()["total"] == 6
+        assert search_cache.hits == hits
+
+    async def test_an_invalid_cursor_is_not_cached(
+        self, client: AsyncClient, project: Project
+    ) -> None:
+        params = {"q": "token", "cursor": "not-a-cursor"}
+
+        assert (await client.get("/api/v1/search", params=params)).status_code == 400
+        assert (await client.get("/api/v1/search", params=params)).status_code == 400
+        assert len(search_cache) == 0
+
+    async def test_it_does_not_use_the_report_cache(
+        self, client: AsyncClient, project: Project
+    ) -> None:
+        await client.get("/api/v1/search", params={"q": "token"})
+
+        assert len(result_cache) == 0
+
+    async def test_the_counters_are_exposed(self, client: AsyncClient, project: Project) -> None:
+        await client.get("/api/v1/search", params={"q": "token"})
+        await client.get("/api/v1/search", params={"q": "token"})
+
+        resp = await client.get("/api/v1/system/cache/search")
+
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["entries"] == 1
+        assert body["hits"] == search_cache.hits
+        assert body["hit_rate"] == round(search_cache.hit_rate, 4)
+        assert body["max_entries"] == search_cache.max_entries
+
+
+class TestHitRate:
+    def test_is_hits_per_lookup(self) -> None:
+        cache = ResultCache(max_entries=4, max_bytes=1024)
+        assert cache.hit_rate == 0.0
+
+        cache.put("k", 1)
+        cache.get("k")
+        cache.get("k")
+        cache.get("other")
+
+        assert cache.hit_rate == pytest.approx(2 / 3)
+        assert cache.stats()["hit_rate"] == 0.6667
@@ -0,0 +1,261 @@
+"""Structured search queries: services/search_query.py and its use by search_documents."""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services.search import search_documents
+from sdlc_lens.services.search_query import parse_query
+from tests.conftest import make_document
+
+
+@pytest.fixture
+async def client(app):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture
+async def corpus(build_corpus) -> tuple[Project, Project]:
+    return await build_corpus(
+        lambda alpha, beta: [
+            make_document(
+                alpha.id,
+                "story",
+                "US0001",
+                "Rotate the token nightly.",
+                title="Token rotation",
+                status="Draft",
+                owner="Alice",
+            ),
+            make_document(
+                alpha.id,
+                "story",
+                "US0002",
+                "Token rotation for the legacy authenticator.",
+                title="Legacy tokens",
+                status="In Progress",
+                owner="Bob",
+            ),
+            make_document(
+                alpha.id,
+                "epic",
+                "EP0001",
+                "Login and tokens.",
+                title="Authentication",
+                status="Draft",
+            ),
+            make_document(
+                beta.id,
+                "story",
+                "US0003",
+                "Rotation of keys.",
+                title="Authorise",
+                status="Done",
+                owner="alice",
+            ),
+            make_document(
+                beta.id,
+                "bug",
+                "BG0001",
+                "Login fails: token NOT found.",
+                title="Crash (AND more)",
+            ),
+        ],
+        trigram=True,
+    )
+
+
+def _hits(result: dict) -> list[str]:
+    return sorted(item["doc_id"] for item in result["items"])
+
+
+class TestParse:
+    def test_terms_are_quoted_and_combined(self) -> None:
+        parsed = parse_query('"token rotation" -legacy auth*')
+
+        assert parsed is not None
+        assert parsed.match == '((("token rotation" AND "auth" *) NOT "legacy"))'
+        assert parsed.filters == {}
+        assert not parsed.bare
+
+    def test_or_binds_looser_than_and(self) -> None:
+        parsed = parse_query("a OR b c")
+
+        assert parsed is not None
+        assert parsed.match == '(("a" OR ("b" AND "c")))'
+
+    def test_filters_are_collected(self) -> None:
+        parsed = parse_query('status:draft owner:alice status:"in progress" type:story x')
+
+        assert parsed is not None
+        assert parsed.match == '("x")'
+        assert parsed.filters == {
+            "status": ("draft", "in progress"),
+            "owner": ("alice",),
+            "type": ("story",),
+        }
+
+    def test_title_scope(self) -> None:
+        parsed = parse_query("title:(login OR logout) flow")
+
+        assert parsed is not None
+        assert parsed.match == '(((title : ("login" OR "logout")) AND "flow"))'
+
+    def test_filters_alone_match_everything_they_allow(self) -> None:
+        parsed = parse_query("type:bug status:open")
+
+        assert parsed is not None
+        assert parsed.match is None
+        assert parsed.filters == {"type": ("bug",), "status": ("open",)}
+        assert not parsed.bare
+
+    def test_plain_words_are_bare(self) -> None:
+        parsed = parse_query("token rotation")
+
+        assert parsed is not None
+        assert parsed.bare
+        # An unknown field is a word like any other.
+        assert parse_query("foo:bar baz").match == '(("foo:bar" AND "baz"))'
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "token",
+            '"unclosed phrase',
+            "(unclosed group",
+            "unopened)",
+            "()",
+            "dangling AND",
+            "AND leading",
+            "a AND AND b",
+            "a OR",
+            "-only -exclusions",
+            "NOT alone",
+            "(status:draft x)",
+            "-status:draft x",
+            "status:draft OR x",
+            "status: x",
+            "title:",
+            "a OR -b",
+        ],
+    )
+    def test_degrades_to_literal(self, query: str) -> None:
+        assert parse_query(query) is None
+
+    def test_operator_characters_stay_inside_quotes(self) -> None:
+        parsed = parse_query('x "a"" NEAR(b" {title}:c')
+
+        assert parsed is not None
+        # Every term is one FTS5 string: no column filter or NEAR reaches the expression.
+        assert parsed.match == '(("x" AND "a" AND " NEAR(b" AND "{title}:c"))'
+
+
+class TestSearch:
+    async def test_phrase_and_exclusion(self, session: AsyncSession, corpus) -> None:
+        result = await search_documents(session, query='"token rotation" -legacy')
+
+        assert _hits(result) == ["US0001"]
+        assert result["mode"] == "words"
+
+    async def test_prefix(self, session: AsyncSession, corpus) -> None:
+        result = await search_documents(session, query="authent*")
+
+        assert _hits(result) == ["EP0001", "US0002"]
+
+    async def test_boolean_and_grouping(self, session: AsyncSession, corpus) -> None:
+        result = await search_documents(session, query="(login OR rotation) token")
+
+        assert _hits(result) == ["BG0001", "US0001", "US0002"]
+
+    async def test_title_scope(self, session: AsyncSession, corpus) -> None:
+        result = await search_documents(session, query="title:token*")
+
+        assert _hits(result) == ["US0001", "US0002"]
+
+    async def test_status_and_owner_filters(self, session: AsyncSession, corpus) -> None:
+        drafts = await search_documents(session, query="status:draft token*")
+        in_progress = await search_documents(session, query='status:"in progress" token')
+        alice = await search_documents(session, query="owner:ALICE rotation*")
+
+        assert _hits(drafts) == ["EP0001", "US0001"]
+        assert _hits(in_progress) == ["US0002"]
+        assert _hits(alice) == ["US0001", "US0003"]
+        assert alice["total"] == 2
+        assert alice["facets"]["by_project"] == {"alpha": 1, "beta": 1}
+
+    async def test_type_and_project_filters(self, session: AsyncSession, corpus) -> None:
+        stories = await search_documents(session, query="type:story rotation")
+        either = await search_documents(session, query="project:alpha project:beta login")
+        unknown = await search_documents(session, query="project:gamma login")
+
+        assert _hits(stories) == ["US0001", "US0002", "US0003"]
+        assert _hits(either) == ["BG0001", "EP0001"]
+        assert _hits(unknown) == []
+
+    async def test_filters_narrow_the_scope(self, session: AsyncSession, corpus) -> None:
+        narrowed = await search_documents(
+            session, query="type:story rotation", project_slug="beta"
+        )
+        disjoint = await search_documents(session, query="type:bug rotation", doc_type="story")
+
+        assert _hits(narrowed) == ["US0003"]
+        assert disjoint["total"] == 0
+
+    async def test_filters_alone_list_every_document_they_allow(
+        self, session: AsyncSession, corpus
+    ) -> None:
+        drafts = await search_documents(session, query="status:draft")
+        bugs = await search_documents(session, query="type:bug")
+        done_stories = await search_documents(session, query="type:story status:done")
+        scoped = await search_documents(session, query="owner:alice", project_slug="alpha")
+
+        assert _hits(drafts) == ["EP0001", "US0001"]
+        assert drafts["mode"] == "words"
+        assert drafts["total"] == 2
+        assert drafts["facets"]["by_type"] == {"epic": 1, "story": 1}
+        assert _hits(bugs) == ["BG0001"]
+        assert _hits(done_stories) == ["US0003"]
+        assert _hits(scoped) == ["US0001"]
+
+    async def test_malformed_input_is_searched_literally(
+        self, session: AsyncSession, corpus
+    ) -> None:
+        result = await search_documents(session, query='token NOT "')
+
+        # The phrase "token NOT", not token without anything.
+        assert _hits(result) == ["BG0001"]
+        # The phrase as written: "Crash (AND more)" is only found literally.
+        assert _hits(await search_documents(session, query="(AND more")) == ["BG0001"]
+
+    async def test_only_plain_words_fall_back_to_substrings(
+        self, session: AsyncSession, corpus
+    ) -> None:
+        plain = await search_documents(session, query="rotat nightl")
+        structured = await search_documents(session, query='"rotat nightl"')
+
+        assert plain["mode"] == "substring"
+        assert structured["mode"] == "words"
+        assert structured["items"] == []
+
+    async def test_pages_continue_by_cursor(self, session: AsyncSession, corpus) -> None:
+        first = await search_documents(session, query="token* -crash", per_page=2)
+        second = await search_documents(
+            session, query="token* -crash", per_page=2, cursor=first["next_cursor"]
+        )
+
+        assert len(first["items"]) == 2
+        assert sorted(_hits(first) + _hits(second)) == ["EP0001", "US0001", "US0002"]
+        assert second["next_cursor"] is None
+
+
+class TestEndpoint:
+    async def test_structured_query(self, client: AsyncClient, corpus) -> None:
+        response = await client.get(
+            "/api/v1/search", params={"q": "type:story -legacy token*", "project": "alpha"}
+        )
+
+        assert response.status_code == 200
+        assert [item["doc_id"] for item in response.json()["items"]] == ["US0001"]
@@ -0,0 +1,196 @@
+"""Search suggestions: GET /api/v1/search/suggest and services/suggest.py."""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services.coherence import bump_corpus_generation
+from sdlc_lens.services.result_cache import ResultCache, estimate_size, suggest_cache
+from sdlc_lens.services.suggest import build_suggest_index, suggest
+from tests.conftest import make_document
+
+
+@pytest.fixture
+async def client(app):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture
+async def corpus(build_corpus) -> tuple[Project, Project]:
+    return await build_corpus(
+        lambda alpha, beta: [
+            make_document(
+                alpha.id, "story", "US0042", "Authorise the author.", title="Authentication"
+            ),
+            make_document(
+                alpha.id, "story", "US0043", "Authorise every change.", title="Audit log"
+            ),
+            make_document(
+                alpha.id, "epic", "EP0001", "Authorise, audit, report.", title="Accounts"
+            ),
+            make_document(
+                beta.id, "story", "US0001", "Café opening hours.", title="Autumn release"
+            ),
+        ],
+        vocab=True,
+    )
+
+
+class TestTerms:
+    async def test_the_most_used_completions_come_first(
+        self, session: AsyncSession, corpus
+    ) -> None:
+        index = await build_suggest_index(session)
+
+        result = suggest(index, "aut", limit=3)
+
+        # Ties broken alphabetically: "autumn" is the fourth.
+        assert [t["term"] for t in result["terms"]] == ["authorise", "authentication", "author"]
+        assert result["terms"][0]["documents"] == 3
+
+    async def test_the_last_word_is_completed_in_place(
+        self, session: AsyncSession, corpus
+    ) -> None:
+        index = await build_suggest_index(session)
+
+        result = suggest(index, "login AUD")
+
+        assert [t["text"] for t in result["terms"]] == ["login audit"]
+
+    async def test_filter_keys_and_diacritics(self, session: AsyncSession, corpus) -> None:
+        alpha, _ = corpus
+        index = await build_suggest_index(session)
+
+        assert suggest(index, f"p{alpha.id}")["terms"] == []
+        assert [t["term"] for t in suggest(index, "caf")["terms"]] == ["cafe"]
+        assert [t["term"] for t in suggest(index, "café")["terms"]] == ["cafe"]
+
+    async def test_a_trailing_space_completes_no_term(self, session: AsyncSession, corpus) -> None:
+        index = await build_suggest_index(session)
+
+        assert suggest(index, "audit ")["terms"] == []
+
+
+class TestDocuments:
+    async def test_ids_and_titles_complete_by_prefix(self, session: AsyncSession, corpus) -> None:
+        index = await build_suggest_index(session)
+
+        by_id = suggest(index, "us004")["documents"]
+        by_title = suggest(index, "Audit")["documents"]
+
+        assert [d["doc_id"] for d in by_id] == ["US0042", "US0043"]
+        assert [d["doc_id"] for d in by_title] == ["US0043"]
+
+    async def test_the_scope_narrows_them(self, session: AsyncSession, corpus) -> None:
+        index = await build_suggest_index(session)
+
+        assert [d["doc_id"] for d in suggest(index, "us", project_slug="beta")["documents"]] == [
+            "US0001"
+        ]
+        assert suggest(index, "us", doc_type="epic")["documents"] == []
+        assert suggest(index, "us", project_slug="missing")["documents"] == []
+
+    async def test_a_document_is_listed_once(self, session: AsyncSession, corpus) -> None:
+        _, beta = corpus
+        session.add(make_document(beta.id, "bug", "BG0001", "x", title="BG0001 crash"))
+        await session.commit()
+        index = await build_suggest_index(session)
+
+        assert [d["doc_id"] for d in suggest(index, "bg")["documents"]] == ["BG0001"]
+
+
+class TestEndpoint:
+    async def test_suggests_terms_and_documents(self, client: AsyncClient, corpus) -> None:
+        response = await client.get("/api/v1/search/suggest", params={"q": "US00", "limit": 2})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["query"] == "US00"
+        assert [d["doc_id"] for d in body["documents"]] == ["US0001", "US0042"]
+        assert response.headers["cache-control"] == "private, no-cache"
+
+    async def test_the_index_is_built_once_per_corpus_state(
+        self, client: AsyncClient, session: AsyncSession, corpus
+    ) -> None:
+        alpha, _ = corpus
+        await client.get("/api/v1/search/suggest", params={"q": "a"})
+        built = suggest_cache.misses
+
+        await client.get("/api/v1/search/suggest", params={"q": "au"})
+        assert suggest_cache.misses == built
+
+        session.add(make_document(alpha.id, "bug", "BG0009", "x", title="Autosave lost"))
+        await bump_corpus_generation(session, alpha.id)
+        await session.commit()
+        response = await client.get("/api/v1/search/suggest", params={"q": "autos"})
+
+        assert suggest_cache.misses == built + 1
+        assert [d["doc_id"] for d in response.json()["documents"]] == ["BG0009"]
+        # The new index replaced the old one.
+        assert len(suggest_cache) == 1
+
+    async def test_a_sync_that_changes_no_document_keeps_the_index(
+        self, client: AsyncClient, session: AsyncSession, corpus
+    ) -> None:
+        alpha, _ = corpus
+        await client.get("/api/v1/search/suggest", params={"q": "a"})
+        built = suggest_cache.misses
+
+        # A sync starting and finishing moves the project row, and so the ETag.
+        alpha.sync_status = "syncing"
+        await session.commit()
+        await client.get("/api/v1/search/suggest", params={"q": "au"})
+        alpha.sync_status = "synced"
+        await session.commit()
+        await client.get("/api/v1/search/suggest", params={"q": "aut"})
+
+        assert suggest_cache.misses == built
+
+    async def test_revalidates(self, client: AsyncClient, corpus) -> None:
+        first = await client.get("/api/v1/search/suggest", params={"q": "au"})
+        again = await client.get(
+            "/api/v1/search/suggest",
+            params={"q": "au"},
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+
+        assert again.status_code == 304
+
+    async def test_an_empty_query_is_rejected(self, client: AsyncClient, corpus) -> None:
+        response = await client.get("/api/v1/search/suggest", params={"q": ""})
+
+        assert response.status_code == 422
+
+
+class TestCaching:
+    async def test_the_index_counts_its_own_size(self, session: AsyncSession, corpus) -> None:
+        index = await build_suggest_index(session)
+
+        assert estimate_size(index) == index.size_bytes
+        # Same order of magnitude as the text it holds, without serialising it.
+        assert index.size_bytes > sum(map(len, index.terms))
+
+    async def test_an_index_too_big_to_cache_is_logged(
+        self, session: AsyncSession, corpus, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        cache = ResultCache(max_entries=1, max_bytes=16)
+
+        with caplog.at_level("WARNING", logger="sdlc_lens.services.result_cache"):
+            await cache.get_or_compute("etag", lambda: build_suggest_index(session))
+
+        assert len(cache) == 0
+        assert "Not caching 'etag'" in caplog.text
+
+    async def test_its_counters_are_exposed(self, client: AsyncClient, corpus) -> None:
+        await client.get("/api/v1/search/suggest", params={"q": "au"})
+
+        resp = await client.get("/api/v1/system/cache/suggest")
+
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["entries"] == 1
+        assert body["max_entries"] == 1
+        assert body["misses"] == suggest_cache.misses
@@ -0,0 +1,272 @@
+"""More like this: utils/minhash.py, the similarity index and GET .../similar."""
+
+import sqlite3
+import zlib
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sdlc_lens.db.models.document import Document
+from sdlc_lens.db.models.document_content import content_digest, deflate
+from sdlc_lens.db.models.document_similarity import DocumentBand, DocumentSignature
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services.coherence import bump_corpus_generation
+from sdlc_lens.services.similarity import near_duplicate_clusters, similar_documents
+from sdlc_lens.utils import minhash
+from tests.conftest import make_document
+
+LOGIN = (
+    "The login flow validates the session token and refreshes the token on expiry. "
+    "Users sign in with a password and a one-time code."
+)
+LOGOUT_BUG = (
+    "Users are logged out because the session token expiry is not refreshed by the "
+    "login flow. The one-time code prompt appears again."
+)
+# Long enough for the near-duplicate check (services.similarity.NEAR_DUPLICATE_MIN_CHARS).
+CHECKOUT = (
+    "As a shopper I want to pay for my basket with a saved card so that checkout takes "
+    "one click. The payment form remembers the billing address, validates the card "
+    "number, applies vouchers before tax and emails a receipt once the order is placed."
+)
+REPORT = "Quarterly reporting dashboard shows revenue charts grouped by region and product line."
+
+
+@pytest.fixture
+async def client(app):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture
+async def corpus(build_corpus) -> tuple[Project, Project]:
+    return await build_corpus(
+        lambda alpha, beta: [
+            make_document(alpha.id, "story", "US0001", LOGIN),
+            make_document(alpha.id, "bug", "BG0001", LOGOUT_BUG),
+            make_document(alpha.id, "story", "US0002", REPORT),
+            make_document(alpha.id, "story", "US0003", "Too short."),
+            # The same body in another project is not "like" anything in this one.
+            make_document(beta.id, "story", "US0001", LOGIN),
+        ]
+    )
+
+
+async def _id(session: AsyncSession, project: Project, doc_id: str) -> int:
+    return await session.scalar(
+        select(Document.id).where(Document.project_id == project.id, Document.doc_id == doc_id)
+    )
+
+
+async def _rows(session: AsyncSession, model) -> int:
+    return await session.scalar(select(func.count()).select_from(model))
+
+
+class TestMinHash:
+    def test_words_skip_headings_and_stop_words(self) -> None:
+        body = "# Acceptance criteria\nThe user's token is refreshed at 10:00 - or not."
+
+        assert minhash.words(body) == {"user's", "token", "refreshed"}
+
+    def test_similarity_estimates_jaccard(self) -> None:
+        login, bug, report = map(minhash.signature, (LOGIN, LOGOUT_BUG, REPORT))
+        exact = minhash.words(LOGIN) & minhash.words(LOGOUT_BUG)
+        jaccard = len(exact) / len(minhash.words(LOGIN) | minhash.words(LOGOUT_BUG))
+
+        assert minhash.similarity(login, login) == 1.0
+        assert minhash.similarity(login, bug) == pytest.approx(jaccard, abs=0.2)
+        assert minhash.similarity(login, report) == 0.0
+
+    def test_signatures_pack_and_band(self) -> None:
+        values = minhash.signature(LOGIN)
+
+        assert len(values) == minhash.SIGNATURE_SIZE
+        assert minhash.unpack(minhash.pack(values)) == values
+        assert len(minhash.band_buckets(values)) == minhash.BANDS
+        assert minhash.signature("Too short.") is None
+
+
+class TestIndexMaintenance:
+    async def test_written_documents_are_indexed(self, session: AsyncSession, corpus) -> None:
+        # Four of the five documents have enough words.
+        assert await _rows(session, DocumentSignature) == 4
+        assert await _rows(session, DocumentBand) == 4 * minhash.BANDS
+
+    async def test_only_a_changed_body_is_reindexed(self, session: AsyncSession, corpus) -> None:
+        alpha, _ = corpus
+        doc = await session.get(Document, await _id(session, alpha, "US0002"))
+        before = await session.get(DocumentSignature, doc.id)
+        signature = before.signature
+
+        doc.title = "Renamed"
+        await session.commit()
+        await session.refresh(before)
+        assert before.signature == signature
+
+        doc.content = LOGIN
+        await session.commit()
+        await session.refresh(before)
+        assert minhash.unpack(before.signature) == minhash.signature(LOGIN)
+
+    async def test_deleted_documents_leave_the_index(self, session: AsyncSession, corpus) -> None:
+        alpha, _ = corpus
+        await session.delete(await session.get(Document, await _id(session, alpha, "BG0001")))
+        await session.commit()
+
+        assert await _rows(session, DocumentSignature) == 3
+        assert await _rows(session, DocumentBand) == 3 * minhash.BANDS
+
+
+class TestSimilarDocuments:
+    async def test_ranks_the_project_by_shared_vocabulary(
+        self, session: AsyncSession, corpus
+    ) -> None:
+        alpha, _ = corpus
+        session.add(make_document(alpha.id, "cr", "CR0001", LOGIN))
+        await session.commit()
+
+        similar = await similar_documents(session, await _id(session, alpha, "US0001"))
+
+        assert [item["doc_id"] for item in similar] == ["CR0001", "BG0001"]
+        assert similar[0]["score"] == 1.0
+        assert 0 < similar[1]["score"] < 1
+
+    async def test_a_document_too_short_to_compare_has_none(
+        self, session: AsyncSession, corpus
+    ) -> None:
+        alpha, _ = corpus
+
+        assert await similar_documents(session, await _id(session, alpha, "US0003")) == []
+
+
+class TestNearDuplicates:
+    async def test_clusters_copies_and_ignores_the_rest(
+        self, session: AsyncSession, corpus
+    ) -> None:
+        alpha, beta = corpus
+        session.add_all(
+            [
+                make_document(alpha.id, "story", "US0010", CHECKOUT),
+                make_document(alpha.id, "story", "US0011", CHECKOUT + " Copied from US0010."),
+                make_document(alpha.id, "plan", "PL0010", CHECKOUT),
+                # The same body in another project is not a duplicate of anything here.
+                make_document(beta.id, "story", "US0010", CHECKOUT),
+            ]
+        )
+        await session.commit()
+
+        clusters = await near_duplicate_clusters(session, alpha.id, threshold=0.8)
+
+        ids = [await _id(session, alpha, doc_id) for doc_id in ("US0010", "US0011", "PL0010")]
+        assert [cluster.document_ids for cluster in clusters] == [tuple(sorted(ids))]
+        assert 0.8 <= clusters[0].similarity < 1
+
+    async def test_short_bodies_are_not_duplicates(self, session: AsyncSession, corpus) -> None:
+        alpha, _ = corpus
+        # LOGIN is in US0001 already: shorter than the check's minimum.
+        session.add(make_document(alpha.id, "cr", "CR0001", LOGIN))
+        await session.commit()
+
+        assert await near_duplicate_clusters(session, alpha.id, threshold=0.8) == []
+
+    def test_bands_lengthen_with_the_threshold(self) -> None:
+        assert minhash.rows_for_threshold(0.5) == 2
+        assert minhash.rows_for_threshold(0.8) == 4
+        assert minhash.rows_for_threshold(0.9) == 8
+
+
+class TestEndpoint:
+    async def test_similar(self, client: AsyncClient, corpus) -> None:
+        response = await client.get("/api/v1/projects/alpha/documents/bug/BG0001/similar")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["doc_id"] == "BG0001"
+        assert [item["doc_id"] for item in body["similar"]] == ["US0001"]
+        assert body["similar"][0]["type"] == "story"
+        assert response.headers["cache-control"] == "no-cache"
+
+    async def test_limit(self, client: AsyncClient, session: AsyncSession, corpus) -> None:
+        alpha, _ = corpus
+        session.add_all([make_document(alpha.id, "cr", f"CR000{n}", LOGIN) for n in range(3)])
+        await session.commit()
+
+        response = await client.get(
+            "/api/v1/projects/alpha/documents/story/US0001/similar", params={"limit": 2}
+        )
+
+        assert [item["doc_id"] for item in response.json()["similar"]] == ["CR0000", "CR0001"]
+
+    async def test_a_sync_changes_the_answer(
+        self, client: AsyncClient, session: AsyncSession, corpus
+    ) -> None:
+        alpha, _ = corpus
+        url = "/api/v1/projects/alpha/documents/story/US0002/similar"
+        assert (await client.get(url)).json()["similar"] == []
+
+        session.add(make_document(alpha.id, "epic", "EP0001", REPORT + " Revenue by region."))
+        await bump_corpus_generation(session, alpha.id)
+        await session.commit()
+
+        assert [item["doc_id"] for item in (await client.get(url)).json()["similar"]] == ["EP0001"]
+
+    async def test_unknown_document_and_project(self, client: AsyncClient, corpus) -> None:
+        missing_doc = await client.get("/api/v1/projects/alpha/documents/bug/BG0404/similar")
+        missing_project = await client.get("/api/v1/projects/nope/documents/bug/BG0001/similar")
+
+        assert missing_doc.status_code == 404
+        assert missing_doc.json()["error"]["code"] == "NOT_FOUND"
+        assert missing_project.status_code == 404
+
+
+class TestMigrationBackfill:
+    def test_existing_documents_are_backfilled(self, tmp_path: Path) -> None:
+        from alembic import command
+        from alembic.config import Config
+
+        backend_root = Path(__file__).resolve().parents[1]
+        db_file = tmp_path / "migrate.db"
+        # In-memory config, not alembic.ini: fileConfig() would disable existing loggers.
+        cfg = Config()
+        cfg.set_main_option("script_location", str(backend_root / "alembic"))
+        cfg.set_main_option("sqlalchemy.url", f"sqlite+aiosqlite:///{db_file}")
+        command.upgrade(cfg, "024")
+
+        conn = sqlite3.connect(db_file)
+        # The trigram index's triggers read bodies through it, as the app's connections do.
+        conn.create_function("sdlc_inflate", 1, lambda b: zlib.decompress(b).decode())
+        try:
+            conn.execute("INSERT INTO projects (id, slug, name) VALUES (1, 'p', 'P')")
+            for doc_id, body in ((7, LOGIN), (8, "Too short.")):
+                conn.execute(
+                    "INSERT INTO document_contents (hash, body, size) VALUES (?, ?, ?)",
+                    (content_digest(body), deflate(body), len(body)),
+                )
+                conn.execute(
+                    "INSERT INTO documents (id, project_id, doc_type, doc_id, title, "
+                    "content_hash, file_path, file_hash) "
+                    "VALUES (?, 1, 'story', ?, 'S', ?, ?, 'h')",
+                    (doc_id, f"US000{doc_id}", content_digest(body), f"{doc_id}.md"),
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+        command.upgrade(cfg, "head")
+
+        conn = sqlite3.connect(db_file)
+        try:
+            signatures = conn.execute(
+                "SELECT document_id, signature FROM document_signatures"
+            ).fetchall()
+            bands = conn.execute("SELECT COUNT(*) FROM document_bands").fetchone()[0]
+        finally:
+            conn.close()
+        assert [(doc_id, minhash.unpack(blob)) for doc_id, blob in signatures] == [
+            (7, minhash.signature(LOGIN))
+        ]
+        assert bands == minhash.BANDS
@@ -11,6 +11,7 @@ from pathlib import Path
 import pytest
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from sdlc_lens.db.models.document import Document
 from sdlc_lens.db.models.project import Project
@@ -384,7 +385,11 @@ class TestSyncUpdatesChanged:
         assert result.added == 0
 
         doc = (
-            await session.execute(select(Document).where(Document.project_id == project.id))
+            await session.execute(
+                select(Document)
+                .where(Document.project_id == project.id)
+                .options(joinedload(Document.stored_content))
+            )
         ).scalar_one()
         assert "Updated." in doc.content
         assert doc.status == "Done"
@@ -605,7 +610,11 @@ class TestSyncPopulatesFields:
         await sync_project(project, session)
 
         doc = (
-            await session.execute(select(Document).where(Document.project_id == project.id))
+            await session.execute(
+                select(Document)
+                .where(Document.project_id == project.id)
+                .options(joinedload(Document.stored_content))
+            )
         ).scalar_one()
 
         assert doc.doc_type == "epic"
@@ -688,7 +697,11 @@ class TestSyncEdgeCases:
         await sync_project(project, session)
 
         doc = (
-            await session.execute(select(Document).where(Document.project_id == project.id))
+            await session.execute(
+                select(Document)
+                .where(Document.project_id == project.id)
+                .options(joinedload(Document.stored_content))
+            )
         ).scalar_one()
         assert doc.title == "PRD"
         assert "\ufeff" not in doc.content
@@ -0,0 +1,331 @@
+"""Checkpointed, cancellable syncs.
+
+A sync commits its documents in batches and records each batch in a SyncCheckpoint. The
+properties pinned here:
+
+* an interrupted sync keeps what it committed, and the next run resumes rather than
+  re-downloading and re-parsing everything;
+* a cancellation stops at a batch boundary, keeps its progress, and is not silently
+  restarted at the next boot;
+* a completed sync leaves no checkpoint behind.
+"""
+
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from sdlc_lens.db.models.document import Document
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.db.models.sync_checkpoint import SyncCheckpoint
+from sdlc_lens.services.github_source import RepoTree
+from sdlc_lens.services.parser import parse_document
+from sdlc_lens.services.sync_engine import sync_project
+from sdlc_lens.utils.hashing import compute_blob_sha, compute_hash
+
+FILES = {
+    "epics/EP0001-one.md": b"# EP0001\n\n> **Status:** Draft\n\nEpic one",
+    "stories/US0001-one.md": b"# US0001\n\n> **Status:** Draft\n\nStory one",
+    "plans/PL0001-one.md": b"# PL0001\n\n> **Status:** Draft\n\nPlan one",
+}
+
+
+@pytest.fixture
+def factory(engine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+@pytest.fixture
+async def client(app):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+def _write_files(root: Path) -> None:
+    for rel_path, raw in FILES.items():
+        full = root / rel_path
+        full.parent.mkdir(parents=True, exist_ok=True)
+        full.write_bytes(raw)
+
+
+async def _local_project(session: AsyncSession, root: Path) -> Project:
+    project = Project(slug="local", name="Local", sdlc_path=str(root))
+    session.add(project)
+    await session.commit()
+    await session.refresh(project)
+    return project
+
+
+async def _github_project(session: AsyncSession) -> Project:
+    project = Project(
+        slug="gh",
+        name="GH",
+        source_type="github",
+        repo_url="https://github.com/owner/repo",
+        repo_branch="main",
+        repo_path="sdlc-studio",
+    )
+    session.add(project)
+    await session.commit()
+    await session.refresh(project)
+    return project
+
+
+async def _doc_paths(session: AsyncSession, project_id: int) -> set[str]:
+    rows = await session.execute(
+        select(Document.file_path).where(Document.project_id == project_id)
+    )
+    return set(rows.scalars().all())
+
+
+async def _checkpoint(session: AsyncSession, project_id: int) -> SyncCheckpoint | None:
+    return await session.get(SyncCheckpoint, project_id, populate_existing=True)
+
+
+def _failing_parser(after: int):
+    """A parse_document that parses ``after`` documents, then dies like a killed process."""
+    calls = {"n": 0}
+
+    def _parse(text: str):
+        calls["n"] += 1
+        if calls["n"] > after:
+            raise RuntimeError("process killed")
+        return parse_document(text)
+
+    return _parse
+
+
+class TestCompletedSync:
+    async def test_a_finished_sync_leaves_no_checkpoint(
+        self, session: AsyncSession, tmp_path: Path
+    ) -> None:
+        _write_files(tmp_path)
+        project = await _local_project(session, tmp_path)
+
+        result = await sync_project(project, session)
+
+        assert result.completed
+        assert result.resumed == 0
+        assert await _checkpoint(session, project.id) is None
+
+
+class TestInterruptedSync:
+    async def test_committed_batches_survive_an_interruption(
+        self, session: AsyncSession, tmp_path: Path
+    ) -> None:
+        _write_files(tmp_path)
+        project = await _local_project(session, tmp_path)
+
+        with (
+            patch("sdlc_lens.services.sync_engine.SYNC_CHECKPOINT_EVERY", 1),
+            patch("sdlc_lens.services.sync_engine.parse_document", _failing_parser(2)),
+        ):
+            result = await sync_project(project, session)
+
+        assert not result.completed
+        # The two documents written before the failure were checkpointed, not rolled back.
+        assert len(await _doc_paths(session, project.id)) == 2
+        checkpoint = await _checkpoint(session, project.id)
+        assert checkpoint is not None
+        assert checkpoint.state == "running"
+        assert len(json.loads(checkpoint.processed_paths)) == 2
+        assert set(json.loads(checkpoint.manifest)) == set(FILES)
+
+    async def test_the_next_local_sync_resumes_and_clears_the_checkpoint(
+        self, session: AsyncSession, tmp_path: Path
+    ) -> None:
+        _write_files(tmp_path)
+        project = await _local_project(session, tmp_path)
+        with (
+            patch("sdlc_lens.services.sync_engine.SYNC_CHECKPOINT_EVERY", 1),
+            patch("sdlc_lens.services.sync_engine.parse_document", _failing_parser(2)),
+        ):
+            await sync_project(project, session)
+
+        result = await sync_project(project, session)
+
+        assert result.completed
+        assert result.resumed == 2
+        # Only the document the interrupted run never reached is parsed again.
+        assert result.added == 1
+        assert result.skipped == 2
+        assert await _doc_paths(session, project.id) == set(FILES)
+        assert await _checkpoint(session, project.id) is None
+
+    async def test_a_resumed_sync_can_update_and_delete(
+        self, session: AsyncSession, tmp_path: Path
+    ) -> None:
+        _write_files(tmp_path)
+        project = await _local_project(session, tmp_path)
+        await sync_project(project, session)
+        (tmp_path / "epics/EP0001-one.md").write_bytes(
+            b"# EP0001\n\n> **Status:** Done\n\nEpic one"
+        )
+        (tmp_path / "plans/PL0001-one.md").unlink()
+        with patch("sdlc_lens.services.sync_engine.parse_document", _failing_parser(0)):
+            interrupted = await sync_project(project, session)
+        assert not interrupted.completed
+
+        result = await sync_project(project, session)
+
+        assert result.completed
+        assert (result.updated, result.deleted) == (1, 1)
+        assert await _doc_paths(session, project.id) == set(FILES) - {"plans/PL0001-one.md"}
+        assert await _checkpoint(session, project.id) is None
+
+    async def test_a_resumed_github_sync_fetches_only_the_remainder(
+        self, session: AsyncSession
+    ) -> None:
+        """The interrupted first sync paid for a tarball; the resume must not pay again."""
+        project = await _github_project(session)
+        tarball = AsyncMock(return_value=({p: (compute_hash(c), c) for p, c in FILES.items()}, {}))
+        with (
+            patch("sdlc_lens.services.github_source.fetch_github_files_and_config", tarball),
+            patch("sdlc_lens.services.sync_engine.SYNC_CHECKPOINT_EVERY", 1),
+            patch("sdlc_lens.services.sync_engine.parse_document", _failing_parser(2)),
+        ):
+            await sync_project(project, session)
+        assert tarball.await_count == 1
+        done = await _doc_paths(session, project.id)
+        (remaining,) = set(FILES) - done
+
+        tree = RepoTree(
+            md_blobs={p: compute_blob_sha(c) for p, c in FILES.items()},
+            config_blobs={},
+            truncated=False,
+        )
+        blobs = AsyncMock(return_value={remaining: FILES[remaining]})
+        with (
+            patch("sdlc_lens.services.github_source.fetch_github_files_and_config", tarball),
+            patch("sdlc_lens.services.github_source.fetch_github_tree", return_value=tree),
+            patch("sdlc_lens.services.github_source.fetch_github_blobs", blobs),
+        ):
+            result = await sync_project(project, session)
+
+        assert tarball.await_count == 1, "the resume downloaded the tarball again"
+        assert result.fetch_path == "incremental"
+        fetched = blobs.await_args.kwargs["blob_shas"]
+        assert fetched == {remaining: compute_blob_sha(FILES[remaining])}
+        assert result.resumed == 2
+        assert result.completed
+        assert await _doc_paths(session, project.id) == set(FILES)
+        assert await _checkpoint(session, project.id) is None
+
+
+class TestCancellation:
+    async def test_a_cancelled_sync_stops_at_a_checkpoint_and_keeps_its_progress(
+        self, session: AsyncSession, tmp_path: Path
+    ) -> None:
+        _write_files(tmp_path)
+        project = await _local_project(session, tmp_path)
+        # Honoured at the second batch boundary: two documents are already written.
+        checks = AsyncMock(side_effect=[False, False, True])
+        with (
+            patch("sdlc_lens.services.sync_engine.SYNC_CHECKPOINT_EVERY", 1),
+            patch("sdlc_lens.services.sync_engine._cancel_requested", checks),
+        ):
+            result = await sync_project(project, session)
+
+        assert result.cancelled
+        assert not result.completed
+        assert len(await _doc_paths(session, project.id)) == 2
+        checkpoint = await _checkpoint(session, project.id)
+        assert checkpoint is not None
+        assert checkpoint.state == "cancelled"
+        refreshed = await session.get(Project, project.id, populate_existing=True)
+        assert refreshed.sync_status == "error"
+        assert "cancelled" in (refreshed.sync_error or "").lower()
+        assert refreshed.sync_cancel_requested is False
+
+        # The next sync picks up where the cancelled one stopped.
+        result = await sync_project(project, session)
+        assert result.completed
+        assert result.resumed == 2
+        assert result.added == 1
+
+    async def test_the_flag_stops_the_sync_before_any_document_is_written(
+        self, session: AsyncSession, tmp_path: Path
+    ) -> None:
+        _write_files(tmp_path)
+        project = await _local_project(session, tmp_path)
+        project.sync_cancel_requested = True
+        await session.commit()
+
+        result = await sync_project(project, session)
+
+        assert result.cancelled
+        assert await _doc_paths(session, project.id) == set()
+
+
+class TestCancelEndpoint:
+    async def test_cancelling_a_running_sync_raises_the_flag(
+        self, client: AsyncClient, session: AsyncSession, tmp_path: Path
+    ) -> None:
+        project = await _local_project(session, tmp_path)
+        project.sync_status = "syncing"
+        await session.commit()
+
+        resp = await client.delete("/api/v1/projects/local/sync")
+
+        assert resp.status_code == 202
+        assert resp.json()["message"] == "Cancellation requested"
+        refreshed = await session.get(Project, project.id, populate_existing=True)
+        assert refreshed.sync_cancel_requested is True
+
+    async def test_cancelling_when_nothing_runs_is_a_conflict(
+        self, client: AsyncClient, session: AsyncSession, tmp_path: Path
+    ) -> None:
+        await _local_project(session, tmp_path)
+
+        resp = await client.delete("/api/v1/projects/local/sync")
+
+        assert resp.status_code == 409
+        assert resp.json()["error"]["code"] == "SYNC_NOT_RUNNING"
+
+    async def test_cancelling_an_unknown_project_is_404(self, client: AsyncClient) -> None:
+        resp = await client.delete("/api/v1/projects/missing/sync")
+        assert resp.status_code == 404
+
+    async def test_a_new_sync_clears_a_stale_request(
+        self, session: AsyncSession, tmp_path: Path
+    ) -> None:
+        from sdlc_lens.services.sync import trigger_sync
+
+        project = await _local_project(session, tmp_path)
+        project.sync_cancel_requested = True
+        await session.commit()
+
+        await trigger_sync(session, "local")
+
+        refreshed = await session.get(Project, project.id)
+        assert refreshed.sync_cancel_requested is False
+
+
+class TestResumeAtStartup:
+    async def test_running_checkpoints_resume_and_cancelled_ones_do_not(
+        self, session: AsyncSession, factory, tmp_path: Path
+    ) -> None:
+        from sdlc_lens.services.poller import reset_stuck_syncing, resume_interrupted_syncs
+
+        interrupted = await _local_project(session, tmp_path)
+        interrupted.sync_status = "syncing"
+        cancelled = Project(slug="cancelled", name="Cancelled", sdlc_path=str(tmp_path))
+        session.add(cancelled)
+        await session.flush()
+        session.add(SyncCheckpoint(project_id=interrupted.id, state="running"))
+        session.add(SyncCheckpoint(project_id=cancelled.id, state="cancelled"))
+        await session.commit()
+
+        runs = AsyncMock(return_value=None)
+        await reset_stuck_syncing(factory)
+        with patch("sdlc_lens.services.poller.run_sync_task", runs):
+            tasks = await resume_interrupted_syncs(factory)
+            for task in tasks:
+                await task
+
+        assert [call.args[0] for call in runs.await_args_list] == ["local"]
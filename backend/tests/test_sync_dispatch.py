@@ -274,11 +274,25 @@ class TestSyncDispatchGitHub:
             result = await sync_project(project, session)
             # The collector is handed what we already hold: it cannot decide between the
             # tarball and an incremental fetch without it (US-01KXCCTV).
-            mock_collect.assert_called_once_with(project, {})
+            mock_collect.assert_called_once_with(project, {}, None)
 
         assert result.added == 1
         assert project.sync_status == "synced"
 
+    async def test_the_fetch_holds_no_transaction(self, session: AsyncSession) -> None:
+        """A download must not keep the single writer connection, or the write lock."""
+        project = await _create_github_project(session)
+        during_fetch: list[bool] = []
+
+        async def _collect(*args):
+            during_fetch.append(session.in_transaction())
+            return {}, ProjectConfig(), FetchInfo()
+
+        with patch("sdlc_lens.services.sync_engine.collect_github_files", side_effect=_collect):
+            await sync_project(project, session)
+
+        assert during_fetch == [False]
+
     # TC0312: sync_project handles github source error gracefully
     async def test_github_error_handled(self, session: AsyncSession) -> None:
         project = await _create_github_project(session)
@@ -0,0 +1,254 @@
+"""Substring and id-fragment search through the trigram index (migration 023)."""
+
+import sqlite3
+import zlib
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services.search import search_documents
+from tests.conftest import make_document
+
+
+@pytest.fixture
+async def client(app):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture
+async def corpus(build_corpus) -> tuple[Project, Project]:
+    return await build_corpus(
+        lambda alpha, beta: [
+            make_document(alpha.id, "story", "US0042", "The authentication flow.", title="Login"),
+            make_document(
+                alpha.id, "epic", "EP0001", "Everything about accounts.", title="Accounts"
+            ),
+            make_document(beta.id, "story", "US0043", "Ends the session.", title="Logout"),
+        ],
+        trigram=True,
+    )
+
+
+async def _indexed(session: AsyncSession, phrase: str) -> list[str]:
+    rows = await session.execute(
+        text(
+            "SELECT d.doc_id FROM documents_trigram JOIN documents d "
+            "ON documents_trigram.rowid = d.id WHERE documents_trigram MATCH :q ORDER BY d.doc_id"
+        ),
+        {"q": f'"{phrase}"'},
+    )
+    return [doc_id for (doc_id,) in rows]
+
+
+def _hits(result: dict) -> list[str]:
+    return sorted(item["doc_id"] for item in result["items"])
+
+
+class TestTriggers:
+    async def test_writes_keep_the_index_current(self, session: AsyncSession, corpus) -> None:
+        alpha, _ = corpus
+        doc = make_document(alpha.id, "bug", "BG0007", "Segfault on startup.", title="Crash")
+        session.add(doc)
+        await session.commit()
+        assert await _indexed(session, "egfaul") == ["BG0007"]
+
+        doc.content = "Hangs on startup."
+        doc.title = "Hang"
+        await session.commit()
+        assert await _indexed(session, "egfaul") == []
+        assert await _indexed(session, "angs on") == ["BG0007"]
+
+        await session.delete(doc)
+        await session.commit()
+        assert await _indexed(session, "angs on") == []
+
+    async def test_deleting_a_project_unindexes_its_documents(
+        self, session: AsyncSession, corpus
+    ) -> None:
+        _, beta = corpus
+        await session.delete(beta)
+        await session.commit()
+
+        assert await _indexed(session, "US004") == ["US0042"]
+        # Every 'delete' carried the values that were indexed.
+        await session.execute(
+            text("INSERT INTO documents_trigram(documents_trigram) VALUES('integrity-check')")
+        )
+
+
+class TestRouting:
+    async def test_an_id_fragment_is_a_substring(self, session: AsyncSession, corpus) -> None:
+        result = await search_documents(session, query="US00")
+
+        assert result["mode"] == "substring"
+        assert _hits(result) == ["US0042", "US0043"]
+        assert result["total"] == 2
+
+    async def test_a_word_fragment_falls_back_to_substrings(
+        self, session: AsyncSession, corpus
+    ) -> None:
+        words = await search_documents(session, query="thentic", mode="words")
+        auto = await search_documents(session, query="thentic")
+
+        assert words["items"] == []
+        assert auto["mode"] == "substring"
+        assert _hits(auto) == ["US0042"]
+        assert "<mark>" in auto["items"][0]["snippet"]
+
+    async def test_whole_words_stay_on_the_word_index(self, session: AsyncSession, corpus) -> None:
+        result = await search_documents(session, query="authentication")
+
+        assert result["mode"] == "words"
+        assert _hits(result) == ["US0042"]
+
+    async def test_substrings_honour_the_scope(self, session: AsyncSession, corpus) -> None:
+        scoped = await search_documents(session, query="US00", project_slug="beta")
+        typed = await search_documents(session, query="ccount", doc_type="story")
+
+        assert _hits(scoped) == ["US0043"]
+        assert scoped["facets"]["by_project"] == {"beta": 1}
+        assert typed["items"] == []
+
+    async def test_shorter_than_a_trigram_matches_nothing(
+        self, session: AsyncSession, corpus
+    ) -> None:
+        result = await search_documents(session, query="US", mode="substring")
+
+        assert result["items"] == []
+        assert result["total"] == 0
+
+    async def test_a_cursor_continues_by_substring(self, session: AsyncSession, corpus) -> None:
+        first = await search_documents(session, query="US00", per_page=1)
+        second = await search_documents(
+            session, query="US00", per_page=1, cursor=first["next_cursor"]
+        )
+
+        assert second["mode"] == "substring"
+        assert _hits(first) + _hits(second) in (["US0042", "US0043"], ["US0043", "US0042"])
+        assert second["next_cursor"] is None
+
+    @pytest.mark.parametrize("with_total", [True, False])
+    async def test_offset_pages_of_a_fallback_stay_substrings(
+        self, session: AsyncSession, corpus, with_total: bool
+    ) -> None:
+        # "ion" is in authentication and session, but no whole word.
+        pages = [
+            await search_documents(session, query="ion", per_page=1, page=n, with_total=with_total)
+            for n in (1, 2, 3)
+        ]
+
+        assert [page["mode"] for page in pages] == ["substring"] * 3
+        assert _hits(pages[0]) + _hits(pages[1]) in (["US0042", "US0043"], ["US0043", "US0042"])
+        assert pages[2]["items"] == []
+        if with_total:
+            assert [page["total"] for page in pages] == [2, 2, 2]
+
+    @pytest.mark.parametrize("with_total", [True, False])
+    async def test_a_page_past_the_word_matches_stays_words(
+        self, session: AsyncSession, corpus, with_total: bool
+    ) -> None:
+        result = await search_documents(
+            session, query="authentication", page=2, with_total=with_total
+        )
+
+        assert result["mode"] == "words"
+        assert result["items"] == []
+
+
+class TestEndpoint:
+    async def test_mode_is_reported(self, client: AsyncClient, session, corpus) -> None:
+        auto = await client.get("/api/v1/search", params={"q": "01KX"})
+        words = await client.get("/api/v1/search", params={"q": "US00", "mode": "words"})
+
+        assert auto.status_code == 200
+        assert auto.json()["mode"] == "substring"
+        assert words.json()["mode"] == "words"
+        assert words.json()["items"] == []
+
+    async def test_page_two_of_a_fallback(self, client: AsyncClient, corpus) -> None:
+        second = await client.get("/api/v1/search", params={"q": "ion", "per_page": 1, "page": 2})
+
+        assert second.json()["mode"] == "substring"
+        assert second.json()["total"] == 2
+        assert len(second.json()["items"]) == 1
+
+    async def test_an_unknown_mode_is_rejected(self, client: AsyncClient, corpus) -> None:
+        response = await client.get("/api/v1/search", params={"q": "login", "mode": "fuzzy"})
+
+        assert response.status_code == 422
+
+
+class TestMigration:
+    def _config(self, db_file: Path):
+        from alembic.config import Config
+
+        backend_root = Path(__file__).resolve().parents[1]
+        # In-memory config, not alembic.ini: fileConfig() would disable existing loggers.
+        cfg = Config()
+        cfg.set_main_option("script_location", str(backend_root / "alembic"))
+        cfg.set_main_option("sqlalchemy.url", f"sqlite+aiosqlite:///{db_file}")
+        return cfg
+
+    def _connect(self, db_file: Path) -> sqlite3.Connection:
+        conn = sqlite3.connect(db_file)
+        conn.create_function("sdlc_inflate", 1, lambda b: zlib.decompress(b).decode())
+        return conn
+
+    def test_existing_documents_are_indexed_and_the_index_goes_again(self, tmp_path: Path) -> None:
+        from alembic import command
+
+        from sdlc_lens.db.models.document_content import content_digest, deflate
+
+        db_file = tmp_path / "migrate.db"
+        cfg = self._config(db_file)
+        command.upgrade(cfg, "022")
+        conn = self._connect(db_file)
+        try:
+            conn.execute("INSERT INTO projects (id, slug, name) VALUES (1, 'a', 'A')")
+            body = "the authentication flow"
+            conn.execute(
+                "INSERT INTO document_contents (hash, body, size) VALUES (?, ?, ?)",
+                (content_digest(body), deflate(body), len(body)),
+            )
+            conn.execute(
+                "INSERT INTO documents (id, project_id, doc_type, doc_id, title, content_hash, "
+                "file_path, file_hash) VALUES (1, 1, 'story', 'US0042', 'T', ?, 'f.md', 'h')",
+                (content_digest(body),),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        command.upgrade(cfg, "023")
+
+        conn = self._connect(db_file)
+        try:
+            match = "SELECT rowid FROM documents_trigram WHERE documents_trigram MATCH ?"
+            assert conn.execute(match, ('"thentic"',)).fetchall() == [(1,)]
+            assert conn.execute(match, ('"US004"',)).fetchall() == [(1,)]
+            # The triggers follow later writes.
+            conn.execute("DELETE FROM documents WHERE id = 1")
+            assert conn.execute(match, ('"US004"',)).fetchall() == []
+            conn.rollback()
+        finally:
+            conn.close()
+
+        command.downgrade(cfg, "022")
+
+        conn = sqlite3.connect(db_file)
+        try:
+            names = {
+                name
+                for (name,) in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE name LIKE 'documents_trigram%'"
+                )
+            }
+        finally:
+            conn.close()
+        assert names == set()
@@ -0,0 +1,295 @@
+"""Auto-sync for local projects: inotify with a tree-fingerprint fallback.
+
+A change under a watched local project must reach the corpus by itself, once per burst of
+edits, through the ordinary trigger_sync/run_sync_task path - and a tree that inotify
+cannot see must still be noticed, without reading a single file per tick.
+"""
+
+import asyncio
+import datetime
+import os
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from sdlc_lens.config import settings
+from sdlc_lens.db.models.project import Project
+from sdlc_lens.services import watcher as watcher_module
+from sdlc_lens.services.watcher import LocalWatcher, tree_fingerprint, watch_mode_for
+
+linux_only = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux")
+
+
+@pytest.fixture
+def factory(engine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+@pytest.fixture(autouse=True)
+def _no_debounce(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "local_watch_debounce_seconds", 0.0)
+    monkeypatch.setattr(settings, "local_watch_mode", "auto")
+
+
+@pytest.fixture
+def runs():
+    mock = AsyncMock(return_value=None)
+    with patch("sdlc_lens.services.watcher.run_sync_task", mock):
+        yield mock
+
+
+def _tree(root: Path) -> Path:
+    (root / "epics").mkdir(parents=True)
+    (root / "epics" / "EP0001-one.md").write_text("# EP0001\n\n> **Status:** Draft\n")
+    return root
+
+
+async def _project(
+    session: AsyncSession, root: Path, *, slug: str = "local", auto_sync: bool = True
+) -> Project:
+    project = Project(
+        slug=slug,
+        name=slug,
+        sdlc_path=str(root),
+        auto_sync=auto_sync,
+        sync_status="synced",
+        # "Just synced", so watching it does not trigger a catch-up sync.
+        last_synced_at=datetime.datetime.now(datetime.UTC) + datetime.timedelta(minutes=1),
+    )
+    session.add(project)
+    await session.commit()
+    return project
+
+
+class TestTreeFingerprint:
+    def test_moves_on_an_in_place_edit_a_create_and_a_delete(self, tmp_path: Path) -> None:
+        root = _tree(tmp_path)
+        doc = root / "epics" / "EP0001-one.md"
+        first, _ = tree_fingerprint(root)
+
+        with doc.open("a") as fh:
+            fh.write("more\n")
+        os.utime(doc, ns=(1, 10**18))
+        second, _ = tree_fingerprint(root)
+        (root / "epics" / "EP0002-two.md").write_text("# EP0002\n")
+        third, _ = tree_fingerprint(root)
+        doc.unlink()
+        fourth, _ = tree_fingerprint(root)
+
+        assert len({first, second, third, fourth}) == 4
+
+    def test_ignores_what_a_sync_would_ignore(self, tmp_path: Path) -> None:
+        root = _tree(tmp_path)
+        (root / "node_modules").mkdir()
+        (root / "node_modules" / "README.md").write_text("x")
+        (root / "notes.txt").write_text("x")
+        before, _ = tree_fingerprint(root)
+
+        # In-place writes: no directory mtime moves, only the files' own.
+        (root / "node_modules" / "README.md").write_text("changed")
+        (root / "notes.txt").write_text("changed")
+
+        assert tree_fingerprint(root)[0] == before
+
+
+class TestWatchMode:
+    def test_a_network_mount_is_polled(self, tmp_path: Path) -> None:
+        with patch("sdlc_lens.services.watcher._filesystem_type", return_value="nfs4"):
+            assert watch_mode_for(tmp_path) == "poll"
+
+    def test_poll_can_be_forced(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings, "local_watch_mode", "poll")
+        assert watch_mode_for(tmp_path) == "poll"
+
+
+@linux_only
+class TestInotify:
+    async def test_an_edit_triggers_one_sync(
+        self, session: AsyncSession, factory, tmp_path: Path, runs
+    ) -> None:
+        root = _tree(tmp_path)
+        await _project(session, root)
+        watcher = LocalWatcher(factory)
+        try:
+            await watcher.reconcile()
+            assert watcher.watched["local"].mode == "inotify"
+            assert await watcher.flush() == []
+
+            for n in range(5):  # a burst
+                (root / "epics" / f"EP000{n + 2}-x.md").write_text("# x\n")
+            await watcher.drain_events()
+            started = await watcher.flush()
+            await asyncio.gather(*watcher.syncs.values())
+        finally:
+            watcher.close()
+
+        assert started == ["local"]
+        runs.assert_awaited_once()
+
+    async def test_a_new_directory_is_watched_too(
+        self, session: AsyncSession, factory, tmp_path: Path, runs
+    ) -> None:
+        root = _tree(tmp_path)
+        await _project(session, root)
+        watcher = LocalWatcher(factory)
+        try:
+            await watcher.reconcile()
+            (root / "stories").mkdir()
+            await watcher.drain_events()
+            await watcher.flush()
+            await asyncio.gather(*watcher.syncs.values())
+            assert watcher.watched["local"].dirty_since is None
+
+            (root / "stories" / "US0001-a.md").write_text("# US0001\n")
+            await watcher.drain_events()
+
+            assert watcher.watched["local"].dirty_since is not None
+        finally:
+            watcher.close()
+
+    async def test_the_tree_walk_runs_off_the_event_loop(
+        self, session: AsyncSession, factory, tmp_path: Path, runs, monkeypatch
+    ) -> None:
+        root = _tree(tmp_path)
+        await _project(session, root)
+        loop_thread = threading.get_ident()
+        walked_in: list[int] = []
+        walk = watcher_module._tree_dirs
+
+        def _walk(top: Path) -> list[str]:
+            walked_in.append(threading.get_ident())
+            return walk(top)
+
+        monkeypatch.setattr(watcher_module, "_tree_dirs", _walk)
+        watcher = LocalWatcher(factory)
+        try:
+            await watcher.reconcile()
+            (root / "stories").mkdir()
+            await watcher.drain_events()
+        finally:
+            watcher.close()
+
+        # Registering the project and its fingerprint, then the new directory.
+        assert len(walked_in) >= 2
+        assert loop_thread not in walked_in
+
+    async def test_a_directory_walked_after_unwatching_adds_no_watches(
+        self, session: AsyncSession, factory, tmp_path: Path, runs, monkeypatch
+    ) -> None:
+        root = _tree(tmp_path)
+        await _project(session, root)
+        watcher = LocalWatcher(factory)
+        walk = watcher_module._tree_dirs
+
+        def _walk(top: Path) -> list[str]:
+            watcher.unwatch("local")  # as a reconcile would, mid-walk
+            return walk(top)
+
+        try:
+            await watcher.reconcile()
+            monkeypatch.setattr(watcher_module, "_tree_dirs", _walk)
+            (root / "stories").mkdir()
+            await watcher.drain_events()
+
+            assert watcher._wd_owner == {}
+        finally:
+            watcher.close()
+
+    async def test_irrelevant_files_do_not_sync(
+        self, session: AsyncSession, factory, tmp_path: Path, runs
+    ) -> None:
+        root = _tree(tmp_path)
+        await _project(session, root)
+        watcher = LocalWatcher(factory)
+        try:
+            await watcher.reconcile()
+            (root / "epics" / ".EP0001-one.md.swp").write_text("x")
+            (root / "epics" / "scratch.txt").write_text("x")
+            await watcher.drain_events()
+            assert await watcher.flush() == []
+        finally:
+            watcher.close()
+
+    async def test_debounce_waits_for_quiet(
+        self, session: AsyncSession, factory, tmp_path: Path, runs, monkeypatch
+    ) -> None:
+        monkeypatch.setattr(settings, "local_watch_debounce_seconds", 60.0)
+        root = _tree(tmp_path)
+        await _project(session, root)
+        watcher = LocalWatcher(factory)
+        try:
+            await watcher.reconcile()
+            (root / "epics" / "EP0009-x.md").write_text("# x\n")
+            await watcher.drain_events()
+
+            assert await watcher.flush() == []
+            assert watcher.watched["local"].dirty_since is not None
+        finally:
+            watcher.close()
+
+
+class TestFallback:
+    async def test_a_polled_project_syncs_when_its_fingerprint_moves(
+        self, session: AsyncSession, factory, tmp_path: Path, runs, monkeypatch
+    ) -> None:
+        monkeypatch.setattr(settings, "local_watch_mode", "poll")
+        root = _tree(tmp_path)
+        await _project(session, root)
+        watcher = LocalWatcher(factory)
+        await watcher.reconcile()
+        await watcher.poll_fingerprints()
+        assert await watcher.flush() == []
+
+        (root / "epics" / "EP0002-two.md").write_text("# EP0002\n")
+        await watcher.poll_fingerprints()
+
+        assert await watcher.flush() == ["local"]
+
+
+class TestMembershipAndCatchUp:
+    async def test_only_local_auto_sync_projects_are_watched(
+        self, session: AsyncSession, factory, tmp_path: Path, monkeypatch
+    ) -> None:
+        monkeypatch.setattr(settings, "local_watch_mode", "poll")
+        await _project(session, _tree(tmp_path / "a"), slug="on")
+        await _project(session, _tree(tmp_path / "b"), slug="off", auto_sync=False)
+        session.add(
+            Project(slug="gh", name="gh", source_type="github", repo_url="x", auto_sync=True)
+        )
+        await session.commit()
+        watcher = LocalWatcher(factory)
+
+        await watcher.reconcile()
+
+        assert set(watcher.watched) == {"on"}
+
+    async def test_a_change_made_while_down_is_caught_up(
+        self, session: AsyncSession, factory, tmp_path: Path, runs, monkeypatch
+    ) -> None:
+        monkeypatch.setattr(settings, "local_watch_mode", "poll")
+        project = await _project(session, _tree(tmp_path))
+        project.last_synced_at = datetime.datetime(2000, 1, 1, tzinfo=datetime.UTC)
+        await session.commit()
+        watcher = LocalWatcher(factory)
+
+        await watcher.reconcile()
+
+        assert await watcher.flush() == ["local"]
+
+    async def test_a_running_sync_keeps_the_project_dirty(
+        self, session: AsyncSession, factory, tmp_path: Path, runs, monkeypatch
+    ) -> None:
+        monkeypatch.setattr(settings, "local_watch_mode", "poll")
+        project = await _project(session, _tree(tmp_path))
+        project.last_synced_at = None
+        project.sync_status = "syncing"
+        await session.commit()
+        watcher = LocalWatcher(factory)
+        await watcher.reconcile()
+
+        assert await watcher.flush() == []
+        assert watcher.watched["local"].dirty_since is not None
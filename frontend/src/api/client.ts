@@ -14,6 +14,8 @@ import type {
   ProjectStats,
   ProjectUpdate,
   SearchResponse,
+  SimilarDocuments,
+  SuggestResponse,
   SyncTriggerResponse,
 } from "../types/index.ts";
 
@@ -143,6 +145,23 @@ export async function fetchRelatedDocuments(
   return res.json() as Promise<DocumentRelationships>;
 }
 
+/** Fetch the documents of the project whose content is most like a document's. */
+export async function fetchSimilarDocuments(
+  slug: string,
+  type: string,
+  docId: string,
+  limit?: number,
+): Promise<SimilarDocuments> {
+  const query = limit === undefined ? "" : `?limit=${limit}`;
+  const res = await fetch(
+    `${BASE}/projects/${slug}/documents/${type}/${docId}/similar${query}`,
+  );
+  if (!res.ok) {
+    throw new Error(await extractErrorMessage(res));
+  }
+  return res.json() as Promise<SimilarDocuments>;
+}
+
 /** Fetch aggregate stats across all projects. */
 export async function fetchAggregateStats(): Promise<AggregateStats> {
   const res = await fetch(`${BASE}/stats`);
@@ -354,3 +373,15 @@ export async function fetchSearchResults(
   }
   return res.json() as Promise<SearchResponse>;
 }
+
+/** Complete a partly typed search query (cheap enough for every keystroke). */
+export async function fetchSearchSuggestions(
+  params: Record<string, string>,
+): Promise<SuggestResponse> {
+  const query = new URLSearchParams(params).toString();
+  const res = await fetch(`${BASE}/search/suggest?${query}`);
+  if (!res.ok) {
+    throw new Error(await extractErrorMessage(res));
+  }
+  return res.json() as Promise<SuggestResponse>;
+}
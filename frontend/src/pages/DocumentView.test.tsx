@@ -505,6 +505,37 @@ describe("CR-01KX8YD6: dependency relationships", () => {
   });
 });
 
+describe("body-mention backlinks", () => {
+  it("renders mentioned_by as a labelled link section", async () => {
+    mockFetchDocument.mockResolvedValueOnce(crDocument);
+    mockFetchRelated.mockResolvedValueOnce({
+      doc_id: crDocument.doc_id,
+      type: crDocument.type,
+      title: crDocument.title,
+      parents: [],
+      children: [],
+      mentioned_by: [
+        {
+          doc_id: "BG-01CCCCCCCC-c",
+          type: "bug",
+          title: "Mentioning Bug",
+          status: "Open",
+        },
+      ],
+    });
+    renderDocumentView("/projects/testproject/documents/cr/CR-01KX8YD6-display-v3");
+    await waitFor(() => {
+      expect(screen.getByText("Mentioned by")).toBeInTheDocument();
+    });
+
+    const mentioning = screen.getByText("Mentioning Bug").closest("a");
+    expect(mentioning).toHaveAttribute(
+      "href",
+      "/projects/testproject/documents/bug/BG-01CCCCCCCC-c",
+    );
+  });
+});
+
 // ---------------------------------------------------------------------------
 // CR-01KXASF9: read-only document view typography and enrichment
 // ---------------------------------------------------------------------------
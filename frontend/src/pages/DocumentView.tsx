@@ -219,10 +219,12 @@ export function DocumentView(): React.JSX.Element {
   const hasChildren = related !== null && related.children.length > 0;
   const dependsOn = related?.depends_on ?? [];
   const dependents = related?.dependents ?? [];
+  const mentionedBy = related?.mentioned_by ?? [];
   const hasDependsOn = dependsOn.length > 0;
   const hasDependents = dependents.length > 0;
+  const hasMentionedBy = mentionedBy.length > 0;
   const hasRelationships =
-    hasParents || hasChildren || hasDependsOn || hasDependents;
+    hasParents || hasChildren || hasDependsOn || hasDependents || hasMentionedBy;
 
   // Split metadata into promoted (known v3 fields) and the remaining generic rows.
   const promotedMetadata = doc.metadata
@@ -374,7 +376,7 @@ export function DocumentView(): React.JSX.Element {
             )}
 
             {hasChildren && (
-              <div className={hasDependsOn || hasDependents ? "mb-3" : ""}>
+              <div className={hasDependsOn || hasDependents || hasMentionedBy ? "mb-3" : ""}>
                 <h4 className="mb-1 text-xs font-medium text-text-tertiary">
                   Children
                 </h4>
@@ -387,7 +389,7 @@ export function DocumentView(): React.JSX.Element {
             )}
 
             {hasDependsOn && (
-              <div className={hasDependents ? "mb-3" : ""}>
+              <div className={hasDependents || hasMentionedBy ? "mb-3" : ""}>
                 <h4 className="mb-1 text-xs font-medium text-text-tertiary">
                   Depends on
                 </h4>
@@ -400,7 +402,7 @@ export function DocumentView(): React.JSX.Element {
             )}
 
             {hasDependents && (
-              <div>
+              <div className={hasMentionedBy ? "mb-3" : ""}>
                 <h4 className="mb-1 text-xs font-medium text-text-tertiary">
                   Dependents
                 </h4>
@@ -411,6 +413,19 @@ export function DocumentView(): React.JSX.Element {
                 </div>
               </div>
             )}
+
+            {hasMentionedBy && (
+              <div>
+                <h4 className="mb-1 text-xs font-medium text-text-tertiary">
+                  Mentioned by
+                </h4>
+                <div className="-mx-2 space-y-0.5">
+                  {mentionedBy.map((d) => (
+                    <RelatedDocLink key={d.doc_id} item={d} slug={slug!} fromTree={fromTree} />
+                  ))}
+                </div>
+              </div>
+            )}
           </div>
         )}
       </aside>
@@ -138,6 +138,8 @@ export interface PaginatedDocuments {
   page: number;
   per_page: number;
   pages: number;
+  /** Keyset cursor for the next page (pass as ?cursor=); null on the last page. */
+  next_cursor?: string | null;
 }
 
 /** Per-project summary in aggregate stats. */
@@ -205,6 +207,21 @@ export interface DocumentRelationships {
   children: RelatedDocumentItem[];
   depends_on?: RelatedDocumentItem[];
   dependents?: RelatedDocumentItem[];
+  /** Documents whose body mentions this one ("what links here"). */
+  mentioned_by?: RelatedDocumentItem[];
+}
+
+/** A document whose content is like another's, with the estimated share of words in common. */
+export interface SimilarDocumentItem extends RelatedDocumentItem {
+  score: number;
+}
+
+/** Response from GET /projects/{slug}/documents/{type}/{docId}/similar. */
+export interface SimilarDocuments {
+  doc_id: string;
+  type: string;
+  title: string;
+  similar: SimilarDocumentItem[];
 }
 
 /** A document affected by a health check finding. */
@@ -246,11 +263,48 @@ export interface SearchResultItem {
   score: number;
 }
 
+/** How many search matches fall in each project, type and status ("null": none). */
+export interface SearchFacets {
+  by_project: Record<string, number>;
+  by_type: Record<string, number>;
+  by_status: Record<string, number>;
+}
+
 /** Search response from GET /api/v1/search. */
 export interface SearchResponse {
   items: SearchResultItem[];
   total: number;
+  /** Match counts for filter chips; null when requested with include_facets=false. */
+  facets?: SearchFacets | null;
+  /** The index that answered: whole words, or substrings of ids, titles and bodies. */
+  mode?: "words" | "substring";
   query: string;
   page: number;
   per_page: number;
+  /** Keyset cursor for the next page (pass as ?cursor=); null on the last page. */
+  next_cursor?: string | null;
+}
+
+/** A completion of the query's last word, from GET /api/v1/search/suggest. */
+export interface SuggestedTerm {
+  term: string;
+  /** How many documents the term appears in (a lower bound). */
+  documents: number;
+  /** The whole query with its last word completed. */
+  text: string;
+}
+
+/** A document whose id or title starts with the query. */
+export interface SuggestedDocument {
+  doc_id: string;
+  title: string;
+  type: string;
+  project_slug: string;
+}
+
+/** Suggestion response from GET /api/v1/search/suggest. */
+export interface SuggestResponse {
+  query: string;
+  terms: SuggestedTerm[];
+  documents: SuggestedDocument[];
 }